@@ -0,0 +1,5 @@
+"""性能計測用ベンチマークスクリプト.
+
+各スクリプトは backend ディレクトリから ``uv run python -m benchmarks.<name>``
+で実行する。
+"""
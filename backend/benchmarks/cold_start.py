@@ -0,0 +1,125 @@
+"""コールドスタート時の初回応答までの時間のベンチマーク.
+
+Dockerイメージのエントリーポイントと同じく ``uvicorn src.main:app`` を
+別プロセスで起動し、プロセスの起動から指定パス（既定は /api/v1/health）が
+初めて200を返すまでの時間を計測する。起動ごとに新しいプロセスを使うため、
+インポート・アプリケーションの構築・lifespan の起動処理をすべて含む。
+
+データベースは一時ディレクトリのSQLiteファイルを使用する（ヘルスチェックは
+データベースに問い合わせないが、起動後のウォームアップは接続を確立し、
+通知の配信ワーカーはテーブルを参照する）。
+
+--no-bytecode を指定すると、コンパイル済みのバイトコード（.pyc）が無い状態
+（バイトコードをコンパイルしていないイメージ）を再現して計測する。
+
+使用例:
+    uv run python -m benchmarks.cold_start --runs 5
+    uv run python -m benchmarks.cold_start --runs 5 --no-bytecode
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from src.models import Base
+
+# 初回応答を待つ上限（秒）
+_TIMEOUT_SECONDS = 60
+
+
+def _free_port() -> int:
+    """空いているTCPポートを返す."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get_status(port: int, path: str) -> int | None:
+    """GETリクエストのステータスコードを返す（接続できない場合はNone）."""
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+            sock.sendall(
+                f"GET {path} HTTP/1.1\r\nHost: localhost\r\n"
+                "Connection: close\r\n\r\n".encode()
+            )
+            status_line = sock.recv(64).split(b"\r\n", 1)[0]
+    except OSError:
+        return None
+    parts = status_line.split()
+    return int(parts[1]) if len(parts) > 1 else None
+
+
+def _measure_ms(path: str, env: dict[str, str]) -> float:
+    """サーバーを起動し、初回の200応答までの時間（ミリ秒）を返す."""
+    port = _free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+    try:
+        while _get_status(port, path) != 200:
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with code {server.returncode}")
+            if time.perf_counter() - start > _TIMEOUT_SECONDS:
+                raise TimeoutError(f"no response from {path}")
+            time.sleep(0.005)
+        return (time.perf_counter() - start) * 1000
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="起動回数")
+    parser.add_argument("--path", default="/api/v1/health", help="初回応答を待つパス")
+    parser.add_argument(
+        "--no-bytecode",
+        action="store_true",
+        help="コンパイル済みのバイトコードを使わずに起動する",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "cold_start.db"
+        schema_engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(schema_engine)
+        schema_engine.dispose()
+        env = {**os.environ, "DATABASE_URL": f"sqlite+aiosqlite:///{db_path}"}
+        if args.no_bytecode:
+            # 空のキャッシュディレクトリを指定し、書き込みも抑止する
+            env["PYTHONPYCACHEPREFIX"] = str(Path(tmp) / "pycache")
+            env["PYTHONDONTWRITEBYTECODE"] = "1"
+        else:
+            _measure_ms(args.path, env)  # バイトコードの生成
+        results = [_measure_ms(args.path, env) for _ in range(args.runs)]
+
+    label = "no bytecode" if args.no_bytecode else "bytecode"
+    print(f"time to first response ({args.path}, {label}, {args.runs} runs)")
+    print(f"  min:    {min(results):8.1f} ms")
+    print(f"  median: {statistics.median(results):8.1f} ms")
+    print(f"  max:    {max(results):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""顧客の会社名検索インデックスのベンチマーク.
+
+地名・業種・カナの語を組み合わせた会社名を指定件数（デフォルト50万件）生成し、
+次を計測する。
+
+- インデックスの構築時間と構築前後の最大RSS
+- 検索語の長さ・ヒット件数別の search(limit=20) の処理時間（p50 / p99）
+- 従来方式（全件の正規化済み会社名を走査する LIKE '%…%' 相当）の処理時間
+- 会社名変更の差分反映時間
+- 鮮度の確認（ensure_loaded）を含めた1回の検索の処理時間。版数の確認間隔内
+  （問い合わせなし）と、毎回版数を確認する場合（DATA_VERSION の主キーの1行を
+  SQLiteのメモリDBに問い合わせる）を計測する
+
+使用例:
+    uv run python -m benchmarks.customer_search --customers 500000
+"""
+
+import argparse
+import asyncio
+import random
+import resource
+import statistics
+import time
+from collections.abc import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.models import Base, DataVersion
+from src.services.customer_search import CustomerSearchIndex, normalize
+
+PLACES = ["東京", "大阪", "名古屋", "札幌", "福岡", "横浜", "神戸", "京都", "仙台"]
+INDUSTRIES = ["商事", "物産", "工業", "建設", "製作所", "販売", "運輸", "電機", "食品"]
+KANA = [
+    "アルファ",
+    "ベータ",
+    "サクラ",
+    "ミドリ",
+    "ヤマト",
+    "ｻﾝﾗｲｽﾞ",
+    "テクノ",
+    "グローバル",
+    "フューチャー",
+    "Ｎｅｘｔ",
+]
+FORMS = ["株式会社{}", "{}株式会社", "有限会社{}", "{}(株)", "{}"]
+
+QUERIES = {
+    "1文字": ["東", "さ", "工"],
+    "2文字": ["大阪", "てく", "製作"],
+    "語(多)": ["アルファ", "ｻｸﾗ", "next"],
+    "語+業種": ["ヤマト運輸", "みどり食品", "テクノ電機"],
+    "番号付き": ["サクラ工業123", "京都グローバル4567", "ベータ販売89012"],
+    "該当なし": ["存在しない会社", "zzz"],
+}
+
+
+def _generate_rows(count: int, rng: random.Random) -> list[tuple[int, str, bool]]:
+    rows = []
+    for customer_id in range(1, count + 1):
+        name = (
+            rng.choice(PLACES)
+            + rng.choice(KANA)
+            + rng.choice(INDUSTRIES)
+            + str(customer_id)
+        )
+        # 約5%を論理削除済みとする
+        rows.append((customer_id, rng.choice(FORMS).format(name), rng.random() >= 0.05))
+    return rows
+
+
+def _max_rss_mb() -> float:
+    # Linuxでは ru_maxrss はKB単位
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _latencies_us(
+    func: Callable[[str], object], query: str, repeat: int
+) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(query)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return samples
+
+
+def _p99(samples: list[float]) -> float:
+    return statistics.quantiles(samples, n=100)[98]
+
+
+async def _checked_search_us(
+    index: CustomerSearchIndex, query: str, repeat: int, limit: int
+) -> dict[str, list[float]]:
+    """ensure_loaded を含めた検索の処理時間を版数の確認間隔ごとに計測する."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    samples: dict[str, list[float]] = {}
+    async with AsyncSession(engine) as db:
+        db.add(DataVersion(table_name="CUSTOMER", version=index.version or 0))
+        await db.commit()
+        for label, check_seconds in (("間隔内", 5.0), ("毎回確認", 0.0)):
+            index.check_seconds = check_seconds
+            samples[label] = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await index.ensure_loaded(db)
+                index.search(query, limit=limit)
+                samples[label].append((time.perf_counter() - start) * 1_000_000)
+    await engine.dispose()
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--customers", type=int, default=500000, help="顧客数")
+    parser.add_argument("--repeat", type=int, default=200, help="検索語ごとの試行回数")
+    parser.add_argument("--limit", type=int, default=20, help="検索結果の最大件数")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    rows = _generate_rows(args.customers, rng)
+
+    rss_before = _max_rss_mb()
+    index = CustomerSearchIndex()
+    start = time.perf_counter()
+    index.build(rows, version=0)
+    build_s = time.perf_counter() - start
+    rss_after = _max_rss_mb()
+
+    keys = [(customer_id, normalize(name)) for customer_id, name, _ in rows]
+
+    def scan(query: str) -> list[int]:
+        key = normalize(query)
+        return [customer_id for customer_id, name in keys if key in name][: args.limit]
+
+    def search(query: str) -> list[int]:
+        return index.search(query, limit=args.limit)
+
+    print(f"customers : {args.customers:,}")
+    print(
+        f"build     : {build_s:.1f} s, max RSS {rss_before:,.0f} -> {rss_after:,.0f} MB"
+    )
+    print(f"{'query':<12}{'hits':>9}{'p50 us':>10}{'p99 us':>10}{'scan p50 us':>14}")
+    for label, queries in QUERIES.items():
+        samples: list[float] = []
+        scan_samples: list[float] = []
+        hits = 0
+        for query in queries:
+            hits = max(hits, len(index.search(query)))
+            samples += _latencies_us(search, query, args.repeat)
+            scan_samples += _latencies_us(scan, query, 3)
+        print(
+            f"{label:<12}{hits:>9,}{statistics.median(samples):>10.1f}"
+            f"{_p99(samples):>10.1f}{statistics.median(scan_samples):>14,.0f}"
+        )
+
+    renames = [
+        (rng.randint(1, args.customers), f"株式会社リネーム{n}") for n in range(1000)
+    ]
+    start = time.perf_counter()
+    for customer_id, name in renames:
+        index.upsert(customer_id, name, True)
+    update_us = (time.perf_counter() - start) / len(renames) * 1_000_000
+    print(f"upsert    : {update_us:.1f} us/update")
+
+    # 差分反映は版数を進めないため、構築時の版数のまま計測する
+    checked = asyncio.run(
+        _checked_search_us(index, "ヤマト運輸", args.repeat, args.limit)
+    )
+    for label, samples in checked.items():
+        print(
+            f"checked   : {label:<6} p50 {statistics.median(samples):.1f} us, "
+            f"p99 {_p99(samples):.1f} us (ensure_loaded + search)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""上長・部下階層インデックスのベンチマーク.
+
+指定人数（デフォルト1万人）の多階層組織図を生成し、次を計測する。
+
+- インデックス構築時間と全員分の推移的閉包の計算時間
+- is_manager / is_subordinate_of の1回あたり処理時間
+- 従来方式（全担当者を走査する any(...)）の is_manager 処理時間
+- 上長変更の差分反映時間
+
+使用例:
+    uv run python -m benchmarks.hierarchy_index --salespersons 10000
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+
+from src.services.hierarchy import HierarchyIndex
+
+
+def _generate_org_chart(count: int, fan_out: int) -> list[tuple[int, int | None]]:
+    """各上長が最大 fan_out 人の部下を持つ組織図を生成する."""
+    rows: list[tuple[int, int | None]] = [(1, None)]
+    for salesperson_id in range(2, count + 1):
+        rows.append((salesperson_id, (salesperson_id - 2) // fan_out + 1))
+    return rows
+
+
+def _per_call_us(func: Callable[..., object], args_list: list[tuple]) -> float:
+    start = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--salespersons", type=int, default=10000, help="担当者数")
+    parser.add_argument("--fan-out", type=int, default=8, help="1上長あたりの部下数")
+    parser.add_argument("--lookups", type=int, default=100000, help="判定回数")
+    args = parser.parse_args()
+
+    rows = _generate_org_chart(args.salespersons, args.fan_out)
+    rng = random.Random(0)
+    ids = [row[0] for row in rows]
+
+    index = HierarchyIndex()
+    start = time.perf_counter()
+    index.build(rows)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    index.subordinates(1)  # 最上位から全員分の閉包を計算
+    closure_ms = (time.perf_counter() - start) * 1000
+
+    lookup_ids = [(rng.choice(ids),) for _ in range(args.lookups)]
+    pairs = [(rng.choice(ids), rng.choice(ids)) for _ in range(args.lookups)]
+    is_manager_us = _per_call_us(index.is_manager, lookup_ids)
+    is_subordinate_us = _per_call_us(index.is_subordinate_of, pairs)
+
+    manager_of = dict(rows)
+
+    def scan_is_manager(salesperson_id: int) -> bool:
+        return manager_of[salesperson_id] is None or any(
+            manager_id == salesperson_id
+            for other_id, manager_id in rows
+            if other_id != salesperson_id
+        )
+
+    scan_us = _per_call_us(scan_is_manager, lookup_ids[:200])
+
+    moves = [(rng.choice(ids[1:]), rng.choice(ids[:100])) for _ in range(1000)]
+    start = time.perf_counter()
+    for salesperson_id, manager_id in moves:
+        if not index.is_subordinate_of(manager_id, salesperson_id):
+            index.upsert(salesperson_id, manager_id)
+            index.subordinates(1)
+    update_us = (time.perf_counter() - start) / len(moves) * 1_000_000
+
+    print(f"salespersons      : {args.salespersons} (fan-out {args.fan_out})")
+    print(f"build             : {build_ms:8.2f} ms")
+    print(f"full closure      : {closure_ms:8.2f} ms")
+    print(f"is_manager        : {is_manager_us:8.3f} us/call")
+    print(f"is_subordinate_of : {is_subordinate_us:8.3f} us/call")
+    print(f"scan is_manager   : {scan_us:8.1f} us/call (従来方式)")
+    print(f"upsert + reclosure: {update_us:8.1f} us/update")
+
+
+if __name__ == "__main__":
+    main()
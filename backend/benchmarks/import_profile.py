@@ -0,0 +1,85 @@
+"""アプリケーションのインポート時間のプロファイル.
+
+``python -X importtime -c "import src.main"`` を別プロセスで実行し、
+モジュールごとのインポート時間を集計する。コールドスタート時の
+（初回リクエストまでの）時間のうち、インポートにかかる時間の内訳を確認する。
+
+- パッケージ別: 自身の時間（self）をトップレベルのパッケージごとに合計
+- モジュール別: 自身の時間が長いモジュールの上位
+- アプリケーション: src 配下のモジュールの累積時間（配下のインポートを含む）
+
+--runs 回実行し、モジュールごとに最小値を用いる（ディスクキャッシュや
+他プロセスの影響を除く）。1回目は .pyc の生成を含むため、既定で捨てる。
+
+使用例:
+    uv run python -m benchmarks.import_profile --runs 5 --top 20
+"""
+
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+
+
+def _import_times(module: str) -> dict[str, tuple[int, int]]:
+    """モジュールごとの（自身の時間, 累積時間）をマイクロ秒で返す."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # 例: "import time:       224 |     179127 |       src.core"
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="src.main", help="インポートするモジュール")
+    parser.add_argument("--runs", type=int, default=5, help="計測回数")
+    parser.add_argument("--top", type=int, default=15, help="表示するモジュール数")
+    args = parser.parse_args()
+
+    _import_times(args.module)  # .pyc の生成
+    best: dict[str, tuple[int, int]] = {}
+    for _ in range(args.runs):
+        for name, (self_us, cumulative_us) in _import_times(args.module).items():
+            prev = best.get(name)
+            best[name] = (
+                (self_us, cumulative_us)
+                if prev is None
+                else (min(prev[0], self_us), min(prev[1], cumulative_us))
+            )
+
+    total_ms = best[args.module][1] / 1000
+    print(f"import {args.module}: {total_ms:.1f} ms ({len(best)} modules)\n")
+
+    packages: dict[str, int] = defaultdict(int)
+    for name, (self_us, _) in best.items():
+        packages[name.split(".", 1)[0]] += self_us
+    print("by package (self):")
+    for package, self_us in sorted(packages.items(), key=lambda kv: -kv[1])[: args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {self_us / 10 / total_ms:5.1f}%  {package}")
+
+    print("\nby module (self):")
+    for name, (self_us, _) in sorted(best.items(), key=lambda kv: -kv[1][0])[
+        : args.top
+    ]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    print("\napplication modules (cumulative):")
+    for name, (_, cumulative_us) in sorted(
+        ((n, t) for n, t in best.items() if n == "src" or n.startswith("src.")),
+        key=lambda kv: -kv[1][1],
+    )[: args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""APIの負荷試験（スループット・応答時間の回帰確認）.
+
+benchmarks.seed で件数を指定して投入したSQLiteファイルに対し、アプリケーションを
+プロセス内のASGIクライアントから呼び出す。--concurrency 件の仮想ユーザーが
+--duration 秒の間、次のシナリオを重みに従ってランダムに実行し、シナリオごとの
+スループット（件/秒）と応答時間の p50・p95・p99 を計測する。
+
+- report_list: GET /reports（日報一覧の1ページ目）
+- report_detail: GET /reports/{id}（自分の日報）
+- report_comments: GET /reports/{id}/comments
+- dashboard: GET /dashboard
+- customer_select: GET /customers/select?q=...
+- salesperson_select: GET /salespersons/select
+- post_comment: POST /reports/{id}/comments（部下の日報へのコメント）
+
+仮想ユーザーは毎回ランダムな営業担当者としてリクエストする。
+
+結果はJSONで --baseline に比較用の基準として保存する（ファイルが無い場合、
+または --update-baseline を指定した場合）。基準がある場合は比較し、
+いずれかのシナリオの p95 が基準より --threshold の割合を超えて遅くなった場合、
+またはスループットが同じ割合を超えて下がった場合は終了コード1で終了する。
+投入件数・同時実行数が基準と異なる場合、比較結果は参考値となる。
+
+使用例:
+    uv run python -m benchmarks.load_test --salespersons 2000 --reports 1000000
+    uv run python -m benchmarks.load_test --no-seed --duration 30 --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from httpx import ASGITransport, AsyncClient, Response
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.seed import SeedConfig, seed_database
+from src.core.database import get_db
+from src.core.security import create_access_token
+from src.main import app
+
+DEFAULT_BASELINE = Path(__file__).with_name("load_test_baseline.json")
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """投入済みデータの件数（リクエストの対象を選ぶために用いる）."""
+
+    salespersons: int
+    fan_out: int
+    customers: int
+    reports: int
+
+    def report_of(self, rng: random.Random, salesperson_id: int) -> int:
+        """営業担当者の日報IDをランダムに返す（seed の採番規則に従う）."""
+        days = max(1, (self.reports - salesperson_id) // self.salespersons + 1)
+        return rng.randrange(days) * self.salespersons + salesperson_id
+
+    def manager_of(self, salesperson_id: int) -> int:
+        """直属の上長のID（最上位の場合は本人）を返す."""
+        if salesperson_id == 1:
+            return 1
+        return (salesperson_id - 2) // self.fan_out + 1
+
+
+type Scenario = Callable[[AsyncClient, Dataset, random.Random], Awaitable[Response]]
+
+
+@cache
+def _headers(salesperson_id: int) -> dict[str, str]:
+    token = create_access_token(
+        {"sub": str(salesperson_id), "email": f"user{salesperson_id}@example.com"}
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _user(data: Dataset, rng: random.Random) -> int:
+    return rng.randint(1, data.salespersons)
+
+
+async def _report_list(
+    client: AsyncClient, data: Dataset, rng: random.Random
+) -> Response:
+    return await client.get("/api/v1/reports", headers=_headers(_user(data, rng)))
+
+
+async def _report_detail(
+    client: AsyncClient, data: Dataset, rng: random.Random
+) -> Response:
+    user = _user(data, rng)
+    return await client.get(
+        f"/api/v1/reports/{data.report_of(rng, user)}", headers=_headers(user)
+    )
+
+
+async def _report_comments(
+    client: AsyncClient, data: Dataset, rng: random.Random
+) -> Response:
+    user = _user(data, rng)
+    return await client.get(
+        f"/api/v1/reports/{data.report_of(rng, user)}/comments",
+        headers=_headers(user),
+    )
+
+
+async def _dashboard(
+    client: AsyncClient, data: Dataset, rng: random.Random
+) -> Response:
+    return await client.get("/api/v1/dashboard", headers=_headers(_user(data, rng)))
+
+
+async def _customer_select(
+    client: AsyncClient, data: Dataset, rng: random.Random
+) -> Response:
+    return await client.get(
+        "/api/v1/customers/select",
+        params={"q": f"サンプル{rng.randint(1, data.customers)}"},
+        headers=_headers(_user(data, rng)),
+    )
+
+
+async def _salesperson_select(
+    client: AsyncClient, data: Dataset, rng: random.Random
+) -> Response:
+    return await client.get(
+        "/api/v1/salespersons/select", headers=_headers(_user(data, rng))
+    )
+
+
+async def _post_comment(
+    client: AsyncClient, data: Dataset, rng: random.Random
+) -> Response:
+    owner = _user(data, rng)
+    return await client.post(
+        f"/api/v1/reports/{data.report_of(rng, owner)}/comments",
+        json={"comment_text": "確認しました"},
+        headers=_headers(data.manager_of(owner)),
+    )
+
+
+# シナリオと実行の重み
+SCENARIOS: dict[str, tuple[Scenario, int]] = {
+    "report_list": (_report_list, 30),
+    "report_detail": (_report_detail, 25),
+    "report_comments": (_report_comments, 10),
+    "dashboard": (_dashboard, 15),
+    "customer_select": (_customer_select, 10),
+    "salesperson_select": (_salesperson_select, 5),
+    "post_comment": (_post_comment, 5),
+}
+
+
+@dataclass
+class Samples:
+    """シナリオごとの計測値."""
+
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+def _summary(samples: Samples, seconds: float) -> dict[str, float | int]:
+    """件数・スループット・応答時間の分位点を返す."""
+    latencies = samples.latencies_ms
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        "requests": len(latencies),
+        "errors": samples.errors,
+        "rps": round(len(latencies) / seconds, 1),
+        "p50_ms": round(p50, 2),
+        "p95_ms": round(p95, 2),
+        "p99_ms": round(p99, 2),
+    }
+
+
+async def _run(
+    db_path: Path, data: Dataset, concurrency: int, duration: float, seed: int
+) -> dict[str, Any]:
+    """負荷をかけ、シナリオごとの集計を返す."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}",
+        pool_size=concurrency,
+        connect_args={"timeout": 30},
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    app.dependency_overrides[get_db] = override_get_db
+    # しきい値を超えたリクエストの警告ログは計測の妨げになるため抑止する
+    logging.getLogger("src.core.query_stats").setLevel(logging.ERROR)
+    names = list(SCENARIOS)
+    weights = [weight for _, weight in SCENARIOS.values()]
+    samples = {name: Samples() for name in names}
+
+    async def user(client: AsyncClient, rng: random.Random, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            response = await SCENARIOS[name][0](client, data, rng)
+            samples[name].latencies_ms.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                samples[name].errors += 1
+
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            # ウォームアップ（インデックス・キャッシュの構築）
+            warm_rng = random.Random(seed)
+            for scenario, _ in SCENARIOS.values():
+                await scenario(client, data, warm_rng)
+
+            start = time.perf_counter()
+            deadline = start + duration
+            await asyncio.gather(
+                *(
+                    user(client, random.Random(seed + n + 1), deadline)
+                    for n in range(concurrency)
+                )
+            )
+            elapsed = time.perf_counter() - start
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        await engine.dispose()
+
+    total = Samples(
+        [ms for s in samples.values() for ms in s.latencies_ms],
+        sum(s.errors for s in samples.values()),
+    )
+    return {
+        "config": {**asdict(data), "concurrency": concurrency, "duration": duration},
+        "total": _summary(total, elapsed),
+        "scenarios": {name: _summary(s, elapsed) for name, s in samples.items()},
+    }
+
+
+def _compare(
+    result: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[str]:
+    """基準との差を表示し、回帰したシナリオの一覧を返す."""
+    if result["config"] != baseline["config"]:
+        print("warning: config differs from the baseline; comparison is indicative")
+    regressions: list[str] = []
+    print(
+        f"\n{'scenario':>20} {'p95 base':>10} {'p95 now':>10} {'rps base':>10} "
+        f"{'rps now':>10}"
+    )
+    for name, now in {"total": result["total"], **result["scenarios"]}.items():
+        base = baseline["total"] if name == "total" else baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        slower = now["p95_ms"] > base["p95_ms"] * (1 + threshold)
+        fewer = now["rps"] < base["rps"] * (1 - threshold)
+        mark = "  REGRESSION" if slower or fewer else ""
+        print(
+            f"{name:>20} {base['p95_ms']:10.2f} {now['p95_ms']:10.2f} "
+            f"{base['rps']:10.1f} {now['rps']:10.1f}{mark}"
+        )
+        if mark:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--db", type=Path, default=Path("bench.db"), help="SQLiteファイル"
+    )
+    parser.add_argument("--salespersons", type=int, default=2000, help="担当者数")
+    parser.add_argument("--customers", type=int, default=SeedConfig.customers)
+    parser.add_argument("--reports", type=int, default=1000000, help="日報件数")
+    parser.add_argument("--no-seed", action="store_true", help="既存のDBをそのまま使う")
+    parser.add_argument("--concurrency", type=int, default=16, help="仮想ユーザー数")
+    parser.add_argument("--duration", type=float, default=20, help="計測秒数")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    parser.add_argument(
+        "--baseline", type=Path, default=DEFAULT_BASELINE, help="基準のJSONファイル"
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="結果を基準として保存する"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="回帰とみなす悪化の割合"
+    )
+    args = parser.parse_args()
+
+    config = SeedConfig(
+        salespersons=args.salespersons,
+        customers=args.customers,
+        reports=args.reports,
+    )
+    if not args.no_seed:
+        engine = create_engine(f"sqlite:///{args.db}")
+        start = time.perf_counter()
+        counts = seed_database(engine, config)
+        engine.dispose()
+        print(
+            ", ".join(f"{name}={count}" for name, count in counts.items())
+            + f" seeded in {time.perf_counter() - start:.1f}s"
+        )
+
+    data = Dataset(
+        salespersons=config.salespersons,
+        fan_out=config.fan_out,
+        customers=config.customers,
+        reports=config.reports,
+    )
+    result = asyncio.run(
+        _run(args.db, data, args.concurrency, args.duration, args.seed)
+    )
+
+    print(
+        f"\n{'scenario':>20} {'requests':>9} {'errors':>7} {'rps':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for name, s in {"total": result["total"], **result["scenarios"]}.items():
+        print(
+            f"{name:>20} {s['requests']:9d} {s['errors']:7d} {s['rps']:8.1f} "
+            f"{s['p50_ms']:8.2f} {s['p95_ms']:8.2f} {s['p99_ms']:8.2f}"
+        )
+
+    if args.update_baseline or not args.baseline.exists():
+        args.baseline.write_text(
+            json.dumps(result, ensure_ascii=False, indent=2) + "\n"
+        )
+        print(f"\nbaseline saved to {args.baseline}")
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    regressions = _compare(result, baseline, args.threshold)
+    if regressions:
+        print(f"regressed (> {args.threshold:.0%}): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
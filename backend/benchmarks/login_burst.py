@@ -0,0 +1,158 @@
+"""ログイン集中時のヘルスチェック応答時間ベンチマーク.
+
+ログインを同時に大量発行している間に /api/v1/health を一定間隔で呼び出し、
+その応答時間分布を計測する。bcrypt検証をイベントループ上で直接実行する
+従来方式（inline）とワーカープール方式（pool）を比較する。
+
+使用例:
+    uv run python -m benchmarks.login_burst --logins 40 --workers 4
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import AsyncGenerator
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.api.v1 import auth
+from src.core.database import get_db
+from src.core.password_pool import PasswordHashPool
+from src.core.security import get_password_hash
+from src.main import app
+from src.models import Base, Salesperson
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "password123"
+
+
+class InlinePool(PasswordHashPool):
+    """イベントループ上で直接実行する比較用プール（従来方式）."""
+
+    async def run[T](self, func, *args):  # type: ignore[override]
+        return func(*args)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index]
+
+
+async def _probe_health(
+    client: AsyncClient, stop: asyncio.Event
+) -> tuple[list[float], float]:
+    """停止指示まで10ms間隔でヘルスチェックを呼び出し応答時間を記録する.
+
+    Returns:
+        応答時間（ms）のリストと、呼び出し間隔の最大値（ms）
+    """
+    latencies: list[float] = []
+    max_gap = 0.0
+    previous = time.perf_counter()
+    while not stop.is_set():
+        start = time.perf_counter()
+        max_gap = max(max_gap, (start - previous) * 1000)
+        previous = start
+        await client.get("/api/v1/health")
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.01)
+    # 停止直前までイベントループが止まっていた場合も間隔に含める
+    max_gap = max(max_gap, (time.perf_counter() - previous) * 1000)
+    return latencies, max_gap
+
+
+async def _run_scenario(pool: PasswordHashPool, logins: int) -> dict[str, float]:
+    auth.password_pool = pool
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        # アイドル時の基準値
+        idle_stop = asyncio.Event()
+        idle_task = asyncio.create_task(_probe_health(client, idle_stop))
+        await asyncio.sleep(0.5)
+        idle_stop.set()
+        idle, _ = await idle_task
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_health(client, stop))
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    "/api/v1/auth/login",
+                    json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD},
+                )
+                for _ in range(logins)
+            )
+        )
+        elapsed = time.perf_counter() - start
+        stop.set()
+        busy, max_gap = await probe
+
+    pool.shutdown()
+    codes = [r.status_code for r in responses]
+    return {
+        "burst_seconds": elapsed,
+        "ok": codes.count(200),
+        "rejected": codes.count(503),
+        "idle_p50_ms": statistics.median(idle),
+        "busy_samples": len(busy),
+        "busy_p50_ms": statistics.median(busy),
+        "busy_p99_ms": _percentile(busy, 99),
+        "busy_max_ms": max(busy),
+        "max_gap_ms": max_gap,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=20, help="同時ログイン数")
+    parser.add_argument("--workers", type=int, default=4, help="プールのスレッド数")
+    parser.add_argument("--queue", type=int, default=64, help="プールの待機上限")
+    args = parser.parse_args()
+
+    # インメモリSQLiteにベンチマーク用ユーザーを登録する
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with session_factory() as db:
+        db.add(
+            Salesperson(
+                name="ベンチマーク",
+                email=BENCH_EMAIL,
+                password_hash=get_password_hash(BENCH_PASSWORD),
+            )
+        )
+        await db.commit()
+
+    async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    scenarios = {
+        "inline": InlinePool(max_workers=1, max_queue=args.logins),
+        "pool": PasswordHashPool(max_workers=args.workers, max_queue=args.queue),
+    }
+    for name, pool in scenarios.items():
+        result = await _run_scenario(pool, args.logins)
+        print(
+            f"{name:>6}: logins={args.logins} ok={result['ok']} "
+            f"rejected={result['rejected']} burst={result['burst_seconds']:.2f}s | "
+            f"health idle p50={result['idle_p50_ms']:.2f}ms "
+            f"busy p50={result['busy_p50_ms']:.2f}ms "
+            f"p99={result['busy_p99_ms']:.2f}ms max={result['busy_max_ms']:.2f}ms "
+            f"(n={result['busy_samples']}, max_gap={result['max_gap_ms']:.0f}ms)"
+        )
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
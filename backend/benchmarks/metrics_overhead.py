@@ -0,0 +1,106 @@
+"""MetricsMiddleware のオーバーヘッドのベンチマーク.
+
+何もしない ASGI アプリケーション（ステータス200・空の本文を返す）を直接
+呼び出した場合と、MetricsMiddleware を通した場合の1リクエストあたりの
+処理時間を比較し、その差（ミドルウェアが加える時間）を表示する。
+ルート数（--routes）の分だけパスのテンプレートを切り替えて呼び出す。
+
+差が --budget-us を超えた場合は終了コード1で終了する（CIでの確認用）。
+あわせて、集計済みの状態での render() の時間を表示する。
+
+使用例:
+    uv run python -m benchmarks.metrics_overhead --iterations 200000 --budget-us 10
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import MetricsMiddleware, RequestMetrics, render
+
+_START: Message = {"type": "http.response.start", "status": 200, "headers": []}
+_BODY: Message = {"type": "http.response.body", "body": b""}
+
+
+async def _endpoint(scope: Scope, _receive: Receive, send: Send) -> None:
+    """ルーティング済みのパスで空の本文を返すアプリケーション."""
+    scope["route"] = scope["_route"]
+    await send(_START)
+    await send(_BODY)
+
+
+async def _receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(_message: Message) -> None:
+    return None
+
+
+async def _measure_us(app: ASGIApp, scopes: list[Scope], iterations: int) -> float:
+    """1リクエストあたりの平均処理時間（マイクロ秒）を返す."""
+    for scope in scopes:  # ウォームアップ
+        await app(dict(scope), _receive, _send)
+    count = len(scopes)
+    start = time.perf_counter()
+    for n in range(iterations):
+        await app(dict(scopes[n % count]), _receive, _send)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200_000, help="リクエスト数")
+    parser.add_argument("--routes", type=int, default=20, help="ルート数")
+    parser.add_argument(
+        "--budget-us",
+        type=float,
+        default=10.0,
+        help="1リクエストあたりに許容する追加時間（マイクロ秒）",
+    )
+    args = parser.parse_args()
+
+    scopes: list[Scope] = [
+        {
+            "type": "http",
+            "method": "GET",
+            "path": f"/api/v1/resource{n}/1",
+            "_route": SimpleNamespace(path=f"/api/v1/resource{n}/{{item_id}}"),
+        }
+        for n in range(args.routes)
+    ]
+    metrics = RequestMetrics()
+    wrapped = MetricsMiddleware(_endpoint, metrics=metrics)
+
+    # 交互に計測し、それぞれの最小値を用いる（他プロセスの影響を除く）
+    bare_us = wrapped_us = float("inf")
+    for _ in range(3):
+        bare_us = min(bare_us, await _measure_us(_endpoint, scopes, args.iterations))
+        wrapped_us = min(
+            wrapped_us, await _measure_us(wrapped, scopes, args.iterations)
+        )
+    overhead_us = wrapped_us - bare_us
+
+    start = time.perf_counter()
+    body = render(metrics)
+    render_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{'bare':>10}: {bare_us:8.3f} us/request")
+    print(f"{'middleware':>10}: {wrapped_us:8.3f} us/request")
+    print(f"{'overhead':>10}: {overhead_us:8.3f} us/request (budget {args.budget_us})")
+    print(
+        f"{'render':>10}: {render_ms:8.3f} ms "
+        f"({args.routes} routes, {len(body.splitlines())} lines)"
+    )
+    if overhead_us > args.budget_us:
+        print("overhead exceeds budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
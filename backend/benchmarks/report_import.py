@@ -0,0 +1,181 @@
+"""日報一括インポートのベンチマーク.
+
+担当者・顧客のみを投入したSQLiteファイルに対し、NDJSONファイルの日報を
+import_reports() で一括登録し、処理時間・件数/秒・最大RSSを計測する。
+比較として、同じ日報の一部をORMで1件ずつ登録（POST /reports 相当）した場合の
+件数/秒も計測する。
+
+入力ファイルは逐次生成し、インポートも逐次解析するため、最大RSSは
+日報件数ではなくバッチサイズに比例する。
+
+使用例:
+    uv run python -m benchmarks.report_import --reports 250000 --visits 4
+    uv run python -m benchmarks.report_import --batch-size 5000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from datetime import timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.seed import START_DATE, SeedConfig, seed_database
+from src.models import DailyReport, ReportComment, ReportStatus, VisitRecord
+from src.schemas.report_import import ImportReport
+from src.services.report_import import import_reports, iter_lines, parse_records
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _write_ndjson(path: Path, args: argparse.Namespace) -> None:
+    """担当者ごとに連続した日付の日報をNDJSONで書き出す."""
+    rng = random.Random(0)
+    statuses = [s.value for s in ReportStatus]
+    with path.open("w", encoding="utf-8") as f:
+        for n in range(args.reports):
+            salesperson_id = n % args.salespersons + 1
+            report_date = START_DATE + timedelta(days=n // args.salespersons)
+            record = {
+                "salesperson_id": salesperson_id,
+                "report_date": report_date.isoformat(),
+                "status": rng.choice(statuses),
+                "problem": "特になし",
+                "visits": [
+                    {
+                        "customer_id": rng.randint(1, args.customers),
+                        "visit_content": "定期訪問",
+                        "visit_time": "10:00",
+                    }
+                    for _ in range(args.visits)
+                ],
+                "comments": [
+                    {
+                        "commenter_id": max((salesperson_id - 2) // 8 + 1, 1),
+                        "comment_text": "確認しました",
+                    }
+                ]
+                if n % 2 == 0
+                else [],
+            }
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+
+
+async def _read_chunks(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+def _max_rss_mb() -> float:
+    # Linuxでは ru_maxrss はKB単位
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _orm_rate(
+    factory: async_sessionmaker[AsyncSession], path: Path, count: int
+) -> float:
+    """先頭 count 件をORMで1件ずつ登録し、件数/秒を返す."""
+    with path.open(encoding="utf-8") as f:
+        records = [
+            ImportReport.model_validate_json(line)
+            for _, line in zip(range(count), f, strict=False)
+        ]
+    start = time.perf_counter()
+    async with factory() as db:
+        for n, record in enumerate(records):
+            # インポート済みの日報と重複しないよう、開始日より前の日付で登録する
+            report = DailyReport(
+                salesperson_id=record.salesperson_id,
+                report_date=START_DATE - timedelta(days=1 + n),
+                status=record.status,
+                visit_records=[
+                    VisitRecord(
+                        customer_id=visit.customer_id,
+                        visit_content=visit.visit_content,
+                        visit_time=visit.visit_time,
+                        display_order=order,
+                    )
+                    for order, visit in enumerate(record.visits)
+                ],
+                comments=[
+                    ReportComment(
+                        commenter_id=c.commenter_id, comment_text=c.comment_text
+                    )
+                    for c in record.comments
+                ],
+            )
+            db.add(report)
+            await db.commit()
+    return len(records) / (time.perf_counter() - start)
+
+
+async def _run(db_path: Path, source: Path, args: argparse.Namespace) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    rss_before = _max_rss_mb()
+    start = time.perf_counter()
+    async with factory() as db:
+        result = await import_reports(
+            db,
+            parse_records(iter_lines(_read_chunks(source)), "ndjson"),
+            batch_size=args.batch_size,
+        )
+    elapsed = time.perf_counter() - start
+    rows = result.reports + result.visits + result.comments
+    print(
+        f"bulk: reports={result.reports} visits={result.visits}"
+        f" comments={result.comments} failed={result.failed}"
+    )
+    print(
+        f"bulk: {elapsed:.1f}s, {result.reports / elapsed:,.0f} reports/s,"
+        f" {rows / elapsed:,.0f} rows/s,"
+        f" max RSS {rss_before:.0f} -> {_max_rss_mb():.0f} MB"
+    )
+    if args.orm_sample:
+        rate = await _orm_rate(factory, source, args.orm_sample)
+        print(f"orm : {rate:,.0f} reports/s ({args.orm_sample} reports)")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reports", type=int, default=250000, help="日報件数")
+    parser.add_argument("--visits", type=int, default=4, help="日報あたり訪問記録数")
+    parser.add_argument("--salespersons", type=int, default=1000, help="担当者数")
+    parser.add_argument("--customers", type=int, default=5000, help="顧客数")
+    parser.add_argument("--batch-size", type=int, default=1000, help="バッチサイズ")
+    parser.add_argument(
+        "--orm-sample", type=int, default=200, help="ORMで比較登録する件数"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "import.db"
+        source = Path(tmp) / "reports.ndjson"
+        engine = create_engine(f"sqlite:///{db_path}")
+        seed_database(
+            engine,
+            SeedConfig(
+                salespersons=args.salespersons,
+                customers=args.customers,
+                reports=0,
+                comments_per_report=0,
+            ),
+        )
+        engine.dispose()
+        _write_ndjson(source, args)
+        print(f"input: {source.stat().st_size / 1024 / 1024:.0f} MB")
+        asyncio.run(_run(db_path, source, args))
+
+
+if __name__ == "__main__":
+    main()
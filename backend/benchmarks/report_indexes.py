@@ -0,0 +1,187 @@
+"""日報関連インデックスのベンチマーク.
+
+benchmarks.seed でデータを投入したDBに対し、複合インデックス追加前（ER図記載の
+単一列インデックスのみ）と追加後で、次のクエリの実行計画と処理時間（p50/p99）を比較する。
+
+- report_list        : GET /reports（部下の日報、日付範囲）
+- report_list_status : GET /reports（部下の日報、日付範囲 + ステータス）
+- recent_reports     : ダッシュボードの直近7日間の自分の日報
+- unread_comments    : ダッシュボードの未読コメント数（自分の日報への他者のコメント）
+- report_comments    : GET /reports/{id}/comments（日報のコメントを投稿日時順に取得）
+
+使用例:
+    uv run python -m benchmarks.report_indexes --reports 1000000
+    uv run python -m benchmarks.report_indexes --db bench.db --no-seed
+"""
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import Connection, Index, Select, create_engine, func, select
+
+from benchmarks.seed import SeedConfig, seed_database
+from src.models import DailyReport, ReportComment, ReportStatus, Salesperson
+from src.services.hierarchy import HierarchyIndex
+from src.services.reports import ReportListFilter, build_report_list_query
+
+# 複合インデックス追加前に存在した、置き換え対象のインデックス
+BASELINE_INDEXES = [
+    Index("ix_REPORT_COMMENT_report_id", ReportComment.__table__.c.report_id),
+]
+# 本ベンチマークで効果を確認する複合インデックス
+COMPOSITE_INDEXES = [
+    index
+    for table in (DailyReport.__table__, ReportComment.__table__)
+    for index in table.indexes
+    if len(index.columns) > 1
+]
+
+
+def _queries(conn: Connection) -> dict[str, Select]:
+    """計測対象のクエリを構築する."""
+    rows = conn.execute(select(Salesperson.salesperson_id, Salesperson.manager_id))
+    hierarchy = HierarchyIndex()
+    hierarchy.build([(row[0], row[1]) for row in rows])
+    # 最上位の直属の部下（配下が全体の1/8程度の中間管理職）と、その配下の末端の担当者
+    manager_id = min(hierarchy.direct_subordinates(1))
+    visible_ids = hierarchy.self_and_subordinates(manager_id)
+    member_id = max(visible_ids)
+
+    today = conn.execute(select(func.max(DailyReport.report_date))).scalar_one()
+    if isinstance(today, str):
+        today = date.fromisoformat(today)
+    report_id = conn.execute(
+        select(ReportComment.report_id).order_by(ReportComment.report_id.desc())
+    ).scalar()
+
+    return {
+        "report_list": build_report_list_query(
+            ReportListFilter(visible_ids, date_from=today - timedelta(days=90)),
+            manager_id,
+            20,
+        ),
+        "report_list_status": build_report_list_query(
+            ReportListFilter(
+                visible_ids,
+                date_from=today - timedelta(days=90),
+                status=ReportStatus.SUBMITTED,
+            ),
+            manager_id,
+            20,
+        ),
+        "recent_reports": build_report_list_query(
+            ReportListFilter({member_id}, date_from=today - timedelta(days=7)),
+            member_id,
+            7,
+            include_total=False,
+        ),
+        "unread_comments": (
+            select(func.count())
+            .select_from(ReportComment)
+            .join(DailyReport, DailyReport.report_id == ReportComment.report_id)
+            .where(
+                DailyReport.salesperson_id == member_id,
+                ReportComment.commenter_id != member_id,
+                ReportComment.created_at >= today - timedelta(days=30),
+            )
+        ),
+        "report_comments": (
+            select(ReportComment.comment_id, ReportComment.commenter_id)
+            .where(ReportComment.report_id == report_id)
+            .order_by(ReportComment.created_at)
+        ),
+    }
+
+
+def _explain(conn: Connection, query: Select) -> list[str]:
+    compiled = query.compile(conn, compile_kwargs={"literal_binds": True})
+    if conn.dialect.name == "sqlite":
+        result = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")
+        return [row[3] for row in result]
+    result = conn.exec_driver_sql(f"EXPLAIN {compiled}").mappings()
+    return [
+        f"{row['table']}: type={row['type']} key={row['key']} rows={row['rows']}"
+        f" extra={row['Extra']}"
+        for row in result
+    ]
+
+
+def _percentiles(func_: Callable[[], object], repeat: int) -> tuple[float, float]:
+    """p50/p99（ミリ秒）を返す."""
+    samples: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func_()
+        samples.append((time.perf_counter() - start) * 1000)
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return statistics.median(samples), quantiles[98]
+
+
+def _run(conn: Connection, label: str, repeat: int) -> dict[str, tuple[float, float]]:
+    results: dict[str, tuple[float, float]] = {}
+    print(f"== {label}")
+    for name, query in _queries(conn).items():
+        plan = _explain(conn, query)
+        results[name] = _percentiles(lambda q=query: conn.execute(q).all(), repeat)
+        print(f"-- {name}")
+        for line in plan:
+            print(f"   {line}")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--db", type=Path, default=Path("bench.db"), help="SQLiteファイル"
+    )
+    parser.add_argument("--url", help="同期DB URL（指定時は --db より優先）")
+    parser.add_argument("--reports", type=int, default=1000000, help="日報件数")
+    parser.add_argument("--salespersons", type=int, default=1000, help="担当者数")
+    parser.add_argument("--repeat", type=int, default=200, help="計測回数")
+    parser.add_argument("--no-seed", action="store_true", help="既存のDBをそのまま使う")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url or f"sqlite:///{args.db}")
+    if not args.no_seed:
+        start = time.perf_counter()
+        counts = seed_database(
+            engine,
+            SeedConfig(salespersons=args.salespersons, reports=args.reports),
+        )
+        print(
+            f"seeded {counts['reports']} reports in {time.perf_counter() - start:.1f}s"
+        )
+
+    with engine.connect() as conn:
+        for index in COMPOSITE_INDEXES:
+            index.drop(conn, checkfirst=True)
+        for index in BASELINE_INDEXES:
+            index.create(conn, checkfirst=True)
+        conn.commit()
+        before = _run(conn, "before (single-column indexes)", args.repeat)
+
+        for index in BASELINE_INDEXES:
+            index.drop(conn)
+        for index in COMPOSITE_INDEXES:
+            index.create(conn)
+        conn.commit()
+        after = _run(conn, "after (composite indexes)", args.repeat)
+    engine.dispose()
+
+    print(
+        f"{'query':<20} {'p50 before':>11} {'p50 after':>10} {'p99 before':>11} {'p99 after':>10}"
+    )
+    for name, (p50_before, p99_before) in before.items():
+        p50_after, p99_after = after[name]
+        print(
+            f"{name:<20} {p50_before:>11.2f} {p50_after:>10.2f}"
+            f" {p99_before:>11.2f} {p99_after:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
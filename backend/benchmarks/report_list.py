@@ -0,0 +1,164 @@
+"""日報一覧クエリのベンチマーク.
+
+benchmarks.seed で指定件数（デフォルト100万件）の日報を投入したSQLiteファイルに対し、
+次の方式で日報一覧の1ページ取得時間を per_page ごとに計測する。
+
+- single: build_report_list_query による1ページ1クエリ（OFFSET + 総件数）
+- cursor: 同クエリのカーソル方式（キーセット、総件数なし）
+- n+1   : ページのSELECT + 行ごとの訪問件数・コメント件数のCOUNT（従来方式）
+
+最上位の上長（全担当者が閲覧範囲）で、1ページ目と深いページの両方を計測する。
+総件数のCOUNTは閲覧範囲の全日報を走査するため、件数が多い場合は支配的になる。
+
+使用例:
+    uv run python -m benchmarks.report_list --reports 1000000
+    uv run python -m benchmarks.report_list --db bench.db --no-seed
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.seed import SeedConfig, seed_database
+from src.models import DailyReport, ReportComment, VisitRecord
+from src.services.reports import ReportListFilter, build_report_list_query
+
+VIEWER_ID = 1
+
+
+async def _single(
+    db: AsyncSession, filters: ReportListFilter, per_page: int, page: int
+) -> float:
+    start = time.perf_counter()
+    result = await db.execute(
+        build_report_list_query(filters, VIEWER_ID, per_page, (page - 1) * per_page)
+    )
+    result.all()
+    return time.perf_counter() - start
+
+
+async def _cursor(
+    db: AsyncSession, filters: ReportListFilter, per_page: int, page: int
+) -> float:
+    after = None
+    if page > 1:
+        # 前ページ末尾の並び順キー（クライアントが保持する next_cursor に相当）
+        result = await db.execute(
+            select(DailyReport.report_date, DailyReport.report_id)
+            .where(*filters.conditions())
+            .order_by(DailyReport.report_date.desc(), DailyReport.report_id.desc())
+            .limit(1)
+            .offset((page - 1) * per_page - 1)
+        )
+        report_date, report_id = result.one()
+        after = (report_date, report_id)
+    start = time.perf_counter()
+    result = await db.execute(
+        build_report_list_query(
+            filters, VIEWER_ID, per_page + 1, after=after, include_total=False
+        )
+    )
+    result.all()
+    return time.perf_counter() - start
+
+
+async def _n_plus_one(
+    db: AsyncSession, filters: ReportListFilter, per_page: int, page: int
+) -> float:
+    start = time.perf_counter()
+    conditions = filters.conditions()
+    await db.scalar(select(func.count()).select_from(DailyReport).where(*conditions))
+    result = await db.execute(
+        select(DailyReport.report_id)
+        .where(*conditions)
+        .order_by(DailyReport.report_date.desc(), DailyReport.report_id.desc())
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+    )
+    for report_id in result.scalars().all():
+        await db.scalar(
+            select(func.count())
+            .select_from(VisitRecord)
+            .where(VisitRecord.report_id == report_id)
+        )
+        await db.scalar(
+            select(func.count())
+            .select_from(ReportComment)
+            .where(ReportComment.report_id == report_id)
+        )
+    return time.perf_counter() - start
+
+
+async def _measure(
+    session_factory: async_sessionmaker[AsyncSession],
+    query: Callable[[AsyncSession, ReportListFilter, int, int], Awaitable[float]],
+    filters: ReportListFilter,
+    per_page: int,
+    page: int,
+    repeat: int,
+) -> float:
+    """中央値（ミリ秒）を返す."""
+    async with session_factory() as db:
+        samples = [
+            await query(db, filters, per_page, page) * 1000 for _ in range(repeat)
+        ]
+    return statistics.median(samples)
+
+
+async def _run(db_path: Path, salespersons: int, repeat: int, deep_page: int) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    filters = ReportListFilter(salesperson_ids=frozenset(range(1, salespersons + 1)))
+
+    print(
+        f"{'per_page':>8} {'page':>6} {'single(ms)':>11} {'cursor(ms)':>11} {'n+1(ms)':>9}"
+    )
+    for per_page in (10, 20, 50, 100):
+        for page in (1, deep_page):
+            timings = [
+                await _measure(session_factory, query, filters, per_page, page, repeat)
+                for query in (_single, _cursor, _n_plus_one)
+            ]
+            single_ms, cursor_ms, n1_ms = timings
+            print(
+                f"{per_page:>8} {page:>6} {single_ms:>11.2f} {cursor_ms:>11.2f}"
+                f" {n1_ms:>9.2f}"
+            )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--db", type=Path, default=Path("bench.db"), help="SQLiteファイル"
+    )
+    parser.add_argument("--reports", type=int, default=1000000, help="日報件数")
+    parser.add_argument("--salespersons", type=int, default=1000, help="担当者数")
+    parser.add_argument("--repeat", type=int, default=5, help="計測回数")
+    parser.add_argument("--deep-page", type=int, default=100, help="深いページの番号")
+    parser.add_argument("--no-seed", action="store_true", help="既存のDBをそのまま使う")
+    args = parser.parse_args()
+
+    if not args.no_seed:
+        engine = create_engine(f"sqlite:///{args.db}")
+        start = time.perf_counter()
+        counts = seed_database(
+            engine,
+            SeedConfig(salespersons=args.salespersons, reports=args.reports),
+        )
+        engine.dispose()
+        print(
+            f"seeded {counts['reports']} reports in {time.perf_counter() - start:.1f}s"
+        )
+
+    asyncio.run(_run(args.db, args.salespersons, args.repeat, args.deep_page))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""日報一覧レスポンスの直列化ベンチマーク.
+
+指定件数（デフォルト100件）の日報一覧1ページを SuccessResponse に包み、
+1回あたりの直列化時間と1秒あたりのページ数を比較する。
+
+- fastapi: FastAPIの既定の経路（response_model による再検証とJSON互換の
+  dict・listへの変換の後、JSONResponse で文字列化）
+- model: ModelJSONResponse（pydantic-coreのシリアライザで直接JSONにする）
+
+両者の出力が同一のバイト列であることも確認する。
+
+使用例:
+    uv run python -m benchmarks.response_serialization --items 100
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from src.core.responses import ModelJSONResponse
+from src.main import app
+from src.models import ReportStatus
+from src.schemas.common import PaginatedData, Pagination, SuccessResponse
+from src.schemas.report import ReportListItem
+
+
+def _build_page(items: int) -> SuccessResponse:
+    """日報一覧の1ページ分のレスポンスを生成する."""
+    created = datetime(2026, 1, 1, 18, 30)
+    return SuccessResponse(
+        data=PaginatedData(
+            items=[
+                ReportListItem(
+                    report_id=n,
+                    report_date=date(2026, 1, 1) + timedelta(days=n),
+                    salesperson_id=n % 10 + 1,
+                    salesperson_name=f"営業担当{n % 10 + 1}",
+                    status=ReportStatus.SUBMITTED,
+                    status_label="提出済",
+                    visit_count=n % 5,
+                    comment_count=n % 3,
+                    has_unread_comments=n % 2 == 0,
+                    created_at=created,
+                    updated_at=created + timedelta(minutes=n),
+                )
+                for n in range(1, items + 1)
+            ],
+            pagination=Pagination(
+                current_page=1, per_page=items, total_count=1000, total_pages=10
+            ),
+        )
+    )
+
+
+def _measure_us(render: Callable[[], bytes], iterations: int) -> float:
+    """1回あたりの平均処理時間（マイクロ秒）を返す."""
+    render()  # ウォームアップ
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100, help="1ページの日報件数")
+    parser.add_argument("--iterations", type=int, default=5000, help="試行回数")
+    args = parser.parse_args()
+
+    route = next(
+        r for r in app.routes if isinstance(r, APIRoute) and r.path == "/api/v1/reports"
+    )
+    page = _build_page(args.items)
+    loop = asyncio.new_event_loop()
+
+    def fastapi_path() -> bytes:
+        content = loop.run_until_complete(
+            serialize_response(field=route.response_field, response_content=page)
+        )
+        return JSONResponse(content).body
+
+    def model_path() -> bytes:
+        return ModelJSONResponse(page).body
+
+    assert fastapi_path() == model_path()
+
+    print(f"items     : {args.items}, {len(model_path()):,} bytes/page")
+    print(f"{'path':<10}{'us/page':>10}{'pages/s':>10}")
+    baseline = 0.0
+    for label, render in (("fastapi", fastapi_path), ("model", model_path)):
+        elapsed = _measure_us(render, args.iterations)
+        baseline = baseline or elapsed
+        print(
+            f"{label:<10}{elapsed:>10.1f}{1_000_000 / elapsed:>10,.0f}"
+            f"  (x{baseline / elapsed:.2f})"
+        )
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""get_current_user のキャッシュ有無による解決時間ベンチマーク.
+
+同一トークンで get_current_user を繰り返し呼び出し、次の3条件の
+1回あたり処理時間を比較する。
+
+- uncached: 毎回JWT検証とSALESPERSONのSELECTを実行
+- token: 検証済みトークンのみキャッシュ（毎回SELECT）
+- token+identity: トークンとログインユーザー情報の両方をキャッシュ
+
+データベースはインメモリSQLiteを使用する。
+
+使用例:
+    uv run python -m benchmarks.token_cache --iterations 50000
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.core.cache import CacheStats
+from src.core.dependencies import get_current_user, token_cache
+from src.core.identity import identity_cache
+from src.core.security import create_access_token
+from src.models import Base, Salesperson
+
+
+async def _measure(token: str, db: AsyncSession, iterations: int) -> float:
+    """1回あたりの平均処理時間（マイクロ秒）を返す."""
+    await get_current_user(token, db)  # ウォームアップ
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await get_current_user(token, db)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def _configure(token_size: int, identity_size: int) -> None:
+    """キャッシュの件数上限を設定し、内容と統計をリセットする."""
+    token_cache.max_size = token_size
+    token_cache.clear()
+    token_cache.stats = CacheStats()
+    identity_cache._cache.max_size = identity_size
+    identity_cache.clear()
+    identity_cache._cache.stats = CacheStats()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000, help="呼び出し回数")
+    args = parser.parse_args()
+
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    token = create_access_token({"sub": "1", "email": "yamada@example.com"})
+    token_size = token_cache.max_size
+    identity_size = identity_cache._cache.max_size
+
+    async with AsyncSession(engine) as db:
+        db.add(
+            Salesperson(
+                salesperson_id=1,
+                name="山田太郎",
+                email="yamada@example.com",
+                password_hash="x",
+            )
+        )
+        await db.commit()
+
+        results = {}
+        for name, sizes in {
+            "uncached": (0, 0),
+            "token": (token_size, 0),
+            "token+identity": (token_size, identity_size),
+        }.items():
+            _configure(*sizes)
+            results[name] = await _measure(token, db, args.iterations)
+
+    await engine.dispose()
+
+    baseline = results["uncached"]
+    for name, elapsed in results.items():
+        print(f"{name:>15}: {elapsed:8.2f} us/call  ({baseline / elapsed:.1f}x)")
+    print(
+        f"{'token stats':>15}: hits={token_cache.stats.hits} "
+        f"misses={token_cache.stats.misses}"
+    )
+    print(
+        f"{'identity stats':>15}: hits={identity_cache.stats.hits} "
+        f"misses={identity_cache.stats.misses}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
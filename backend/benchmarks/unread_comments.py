@@ -0,0 +1,153 @@
+"""未読コメント判定のベンチマーク.
+
+benchmarks.seed でデータを投入したDBに対し、次の2方式で未読の有無・件数の
+取得時間（p50/p99）を比較する。
+
+- scan   : 既読マーカーの last_read_comment_id より後の他者のコメントを都度走査する
+- counter: 既読マーカーに保持した未読コメント数を参照する（現在の実装）
+
+計測対象は日報一覧1ページ分（20件）の未読有無と、ダッシュボードの未読コメント数。
+scan はコメント件数に比例して遅くなるが、counter はコメント件数に依存しない。
+
+使用例:
+    uv run python -m benchmarks.unread_comments --reports 1000000 --comments 100
+    uv run python -m benchmarks.unread_comments --db bench.db --no-seed
+"""
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from sqlalchemy import Connection, Select, create_engine, exists, func, select
+
+from benchmarks.seed import SeedConfig, seed_database
+from src.models import DailyReport, ReportComment, ReportReadMarker
+
+PAGE_SIZE = 20
+
+
+def _last_read(viewer_id: int) -> Select:
+    return (
+        select(ReportReadMarker.last_read_comment_id)
+        .where(
+            ReportReadMarker.salesperson_id == viewer_id,
+            ReportReadMarker.report_id == ReportComment.report_id,
+        )
+        .scalar_subquery()
+    )
+
+
+def _queries(conn: Connection, viewer_id: int) -> dict[str, dict[str, Select]]:
+    """計測対象のクエリを方式ごとに構築する."""
+    page_ids = (
+        conn.execute(
+            select(DailyReport.report_id)
+            .where(DailyReport.salesperson_id == viewer_id)
+            .order_by(DailyReport.report_date.desc())
+            .limit(PAGE_SIZE)
+        )
+        .scalars()
+        .all()
+    )
+    unread_comment = (
+        ReportComment.commenter_id != viewer_id,
+        ReportComment.comment_id > func.coalesce(_last_read(viewer_id), 0),
+    )
+    return {
+        "list_page": {
+            "scan": select(
+                DailyReport.report_id,
+                exists().where(
+                    ReportComment.report_id == DailyReport.report_id, *unread_comment
+                ),
+            ).where(DailyReport.report_id.in_(page_ids)),
+            "counter": select(
+                DailyReport.report_id,
+                exists().where(
+                    ReportReadMarker.salesperson_id == viewer_id,
+                    ReportReadMarker.report_id == DailyReport.report_id,
+                    ReportReadMarker.unread_count > 0,
+                ),
+            ).where(DailyReport.report_id.in_(page_ids)),
+        },
+        "dashboard_count": {
+            "scan": (
+                select(func.count())
+                .select_from(ReportComment)
+                .join(DailyReport, DailyReport.report_id == ReportComment.report_id)
+                .where(DailyReport.salesperson_id == viewer_id, *unread_comment)
+            ),
+            "counter": select(
+                func.coalesce(func.sum(ReportReadMarker.unread_count), 0)
+            ).where(
+                ReportReadMarker.salesperson_id == viewer_id,
+                ReportReadMarker.unread_count > 0,
+            ),
+        },
+    }
+
+
+def _percentiles(func_: Callable[[], object], repeat: int) -> tuple[float, float]:
+    """p50/p99（ミリ秒）を返す."""
+    samples: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func_()
+        samples.append((time.perf_counter() - start) * 1000)
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return statistics.median(samples), quantiles[98]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--db", type=Path, default=Path("bench.db"), help="SQLiteファイル"
+    )
+    parser.add_argument("--url", help="同期DB URL（指定時は --db より優先）")
+    parser.add_argument("--reports", type=int, default=1000000, help="日報件数")
+    parser.add_argument(
+        "--comments", type=int, default=100, help="日報あたりコメント数"
+    )
+    parser.add_argument("--salespersons", type=int, default=1000, help="担当者数")
+    parser.add_argument("--viewer", type=int, default=500, help="閲覧者の担当者ID")
+    parser.add_argument("--repeat", type=int, default=200, help="計測回数")
+    parser.add_argument("--no-seed", action="store_true", help="既存のDBをそのまま使う")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url or f"sqlite:///{args.db}")
+    if not args.no_seed:
+        start = time.perf_counter()
+        counts = seed_database(
+            engine,
+            SeedConfig(
+                salespersons=args.salespersons,
+                reports=args.reports,
+                visits_per_report=0,
+                comments_per_report=args.comments,
+            ),
+        )
+        print(
+            f"seeded {counts['reports']} reports / {counts['comments']} comments"
+            f" in {time.perf_counter() - start:.1f}s"
+        )
+
+    print(f"{'query':<16} {'method':<8} {'p50 ms':>8} {'p99 ms':>8}")
+    with engine.connect() as conn:
+        for name, methods in _queries(conn, args.viewer).items():
+            results = {
+                method: conn.execute(query).all() for method, query in methods.items()
+            }
+            # 両方式の結果が一致することを確認してから計測する
+            assert results["scan"] == results["counter"], name
+            for method, query in methods.items():
+                p50, p99 = _percentiles(
+                    lambda q=query: conn.execute(q).all(), args.repeat
+                )
+                print(f"{name:<16} {method:<8} {p50:>8.2f} {p99:>8.2f}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,63 +3,47 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import settings
+from src.core.database import get_db
 from src.core.dependencies import CurrentUser, get_current_user
-from src.core.security import create_access_token, verify_password
+from src.core.password_pool import PasswordPoolSaturatedError, password_pool
+from src.core.security import create_access_token
+from src.models import Salesperson
 from src.schemas.auth import LoginData, LoginRequest, LoginUser, LogoutData
 from src.schemas.common import ErrorDetail, ErrorResponse, SuccessResponse
+from src.services.hierarchy import hierarchy_index
 
 router = APIRouter(prefix="/auth", tags=["認証"])
 
-# 仮のユーザーデータ（実際はDBから取得）
-# TODO: Issue #6, #7 でDB接続実装後に置き換え
-MOCK_USERS = {
-    "yamada@example.com": {
-        "salesperson_id": 1,
-        "name": "山田太郎",
-        "email": "yamada@example.com",
-        # パスワード: password123
-        "password_hash": "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/X4.DfZyJzJX1X1X1O",
-        "manager_id": 10,
-        "is_active": True,
-    },
-    "sato@example.com": {
-        "salesperson_id": 10,
-        "name": "佐藤課長",
-        "email": "sato@example.com",
-        # パスワード: password123
-        "password_hash": "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/X4.DfZyJzJX1X1X1O",
-        "manager_id": None,
-        "is_active": True,
-    },
-    "inactive@example.com": {
-        "salesperson_id": 99,
-        "name": "無効ユーザー",
-        "email": "inactive@example.com",
-        "password_hash": "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/X4.DfZyJzJX1X1X1O",
-        "manager_id": 10,
-        "is_active": False,
-    },
-}
 
-
-def authenticate_user(email: str, password: str) -> dict | None:
+async def authenticate_user(
+    db: AsyncSession, email: str, password: str
+) -> Salesperson | None:
     """ユーザー認証を行う.
 
+    パスワード検証はワーカープールで実行し、イベントループをブロックしない。
+
     Args:
+        db: データベースセッション
         email: メールアドレス
         password: パスワード
 
     Returns:
-        認証成功時はユーザー情報、失敗時はNone
+        認証成功時は営業担当者、失敗時はNone
+
+    Raises:
+        PasswordPoolSaturatedError: パスワード検証プールが飽和している場合
     """
-    user = MOCK_USERS.get(email)
+    result = await db.execute(select(Salesperson).where(Salesperson.email == email))
+    user = result.scalar_one_or_none()
     if not user:
         return None
-    if not user["is_active"]:
+    if not user.is_active:
         return None
-    if not verify_password(password, user["password_hash"]):
+    if not await password_pool.verify(password, user.password_hash):
         return None
     return user
 
@@ -69,23 +53,39 @@ def authenticate_user(email: str, password: str) -> dict | None:
     response_model=SuccessResponse[LoginData],
     responses={
         401: {"model": ErrorResponse, "description": "認証エラー"},
+        503: {"model": ErrorResponse, "description": "認証処理の混雑"},
     },
     summary="ログイン",
     description="メールアドレスとパスワードで認証し、アクセストークンを発行する",
 )
-async def login(request: LoginRequest) -> SuccessResponse[LoginData]:
+async def login(
+    request: LoginRequest,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> SuccessResponse[LoginData]:
     """ログイン認証を行い、アクセストークンを発行する.
 
     Args:
         request: ログインリクエスト
+        db: データベースセッション
 
     Returns:
         アクセストークンとユーザー情報
 
     Raises:
-        HTTPException: 認証失敗時
+        HTTPException: 認証失敗時、または認証処理が混雑している場合
     """
-    user = authenticate_user(request.email, request.password)
+    try:
+        user = await authenticate_user(db, request.email, request.password)
+    except PasswordPoolSaturatedError:
+        # 待ち行列を伸ばさず即座に拒否し、クライアントに再試行を促す
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=ErrorDetail(
+                code="SERVICE_UNAVAILABLE",
+                message="ただいま混み合っています。しばらくしてから再度お試しください",
+            ).model_dump(),
+            headers={"Retry-After": str(settings.password_hash_retry_after_seconds)},
+        ) from None
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -96,27 +96,25 @@ async def login(request: LoginRequest) -> SuccessResponse[LoginData]:
         )
 
     # 上長かどうかを判定（manager_idがNullまたは他のユーザーのmanager_idに設定されている場合）
-    is_manager = user["manager_id"] is None or any(
-        u["manager_id"] == user["salesperson_id"]
-        for u in MOCK_USERS.values()
-        if u["salesperson_id"] != user["salesperson_id"]
-    )
+    # 階層インデックスを参照するため、担当者数によらずクエリは発行しない
+    await hierarchy_index.ensure_loaded(db)
+    is_manager = hierarchy_index.is_manager(user.salesperson_id)
 
     # アクセストークンを生成
     access_token = create_access_token(
-        data={"sub": str(user["salesperson_id"]), "email": user["email"]}
+        data={"sub": str(user.salesperson_id), "email": user.email}
     )
 
     login_user = LoginUser(
-        salesperson_id=user["salesperson_id"],
-        name=user["name"],
-        email=user["email"],
+        salesperson_id=user.salesperson_id,
+        name=user.name,
+        email=user.email,
         is_manager=is_manager,
     )
 
     login_data = LoginData(
         access_token=access_token,
-        expires_in=settings.JWT_EXPIRE_SECONDS,
+        expires_in=settings.jwt_expire_seconds,
         user=login_user,
     )
 
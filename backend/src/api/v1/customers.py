@@ -0,0 +1,310 @@
+"""顧客API."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.dependencies import CurrentUser, get_current_user, get_read_db
+from src.core.etag import compute_etag, not_modified
+from src.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from src.core.responses import model_response
+from src.models import Customer
+from src.schemas.common import (
+    CursorPaginatedData,
+    CursorPagination,
+    ErrorDetail,
+    ErrorResponse,
+    PaginatedData,
+    Pagination,
+    SelectItem,
+    SelectListData,
+    SuccessResponse,
+)
+from src.schemas.customer import CustomerItem
+from src.services import data_version
+from src.services.customer_search import customer_search_index
+
+router = APIRouter(prefix="/customers", tags=["顧客"])
+
+
+async def _list_customers_after(
+    db: AsyncSession,
+    company_name: str | None,
+    is_active: bool | None,
+    cursor: str,
+    per_page: int,
+    *,
+    with_total: bool,
+) -> tuple[list[Customer], str | None, int | None]:
+    """カーソル位置から顧客一覧の1ページを取得する.
+
+    会社名の指定がない場合は顧客IDをキーに、次ページの有無を判定するため
+    per_page + 1 件を取得する。指定がある場合は検索結果の位置と直前の顧客IDを
+    カーソルとし、前ページの取得後に検索結果が変わっても直前の顧客の次から返す。
+
+    Args:
+        db: データベースセッション
+        company_name: 会社名（部分一致）
+        is_active: 有効フラグ
+        cursor: 前ページの next_cursor（空文字の場合は先頭から）
+        per_page: 1ページあたり件数
+        with_total: 総件数を集計するかどうか
+
+    Returns:
+        顧客一覧、次ページのカーソル（最終ページの場合はNone）、総件数（未要求時はNone）
+
+    Raises:
+        InvalidCursorError: カーソルが不正な場合
+    """
+    if company_name:
+        position, last_id = _decode_search_cursor(cursor) if cursor else (0, None)
+        await customer_search_index.ensure_loaded(db)
+        matched = customer_search_index.search(company_name, is_active=is_active)
+        start = _resume_position(matched, position, last_id)
+        end = start + per_page
+        next_cursor = (
+            encode_cursor(end, matched[end - 1]) if end < len(matched) else None
+        )
+        items = await _get_customers_by_ids(db, matched[start:end])
+        return items, next_cursor, len(matched) if with_total else None
+
+    after = _decode_id_cursor(cursor) if cursor else None
+    conditions = _active_conditions(is_active)
+    query = select(Customer).where(*conditions)
+    if after is not None:
+        query = query.where(Customer.customer_id > after)
+    items = list(
+        await db.scalars(query.order_by(Customer.customer_id).limit(per_page + 1))
+    )
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        next_cursor = encode_cursor(items[-1].customer_id)
+    total_count = None
+    if with_total:
+        total_count = (
+            await db.scalar(
+                select(func.count()).select_from(Customer).where(*conditions)
+            )
+        ) or 0
+    return items, next_cursor, total_count
+
+
+def _decode_id_cursor(cursor: str) -> int:
+    """顧客ID順のカーソルを直前の顧客IDに復元する."""
+    (customer_id,) = decode_cursor(cursor, 1)
+    if not isinstance(customer_id, int):
+        raise InvalidCursorError(cursor)
+    return customer_id
+
+
+def _decode_search_cursor(cursor: str) -> tuple[int, int]:
+    """会社名検索のカーソルを（次の位置, 直前の顧客ID）に復元する."""
+    position, customer_id = decode_cursor(cursor, 2)
+    if not isinstance(position, int) or not isinstance(customer_id, int):
+        raise InvalidCursorError(cursor)
+    if position < 1:  # 2ページ目以降のカーソルのみ発行する
+        raise InvalidCursorError(cursor)
+    return position, customer_id
+
+
+def _resume_position(matched: list[int], position: int, last_id: int | None) -> int:
+    """検索結果のうち、前ページの続きの位置を返す.
+
+    前ページの取得後に顧客が追加・削除されて位置がずれた場合は、
+    直前の顧客IDの位置から再開する。直前の顧客が検索結果から外れた場合は、
+    以降の顧客が1つ前に詰まったものとしてその位置から再開する。
+    """
+    if last_id is None:
+        return 0
+    if position <= len(matched) and matched[position - 1] == last_id:
+        return position
+    if last_id in matched:
+        return matched.index(last_id) + 1
+    return min(position - 1, len(matched))
+
+
+async def _get_customers_by_ids(db: AsyncSession, ids: list[int]) -> list[Customer]:
+    """顧客IDの順に顧客を取得する（インデックスの反映前に削除された顧客は除く）."""
+    customers = {
+        c.customer_id: c
+        for c in await db.scalars(select(Customer).where(Customer.customer_id.in_(ids)))
+    }
+    return [customers[i] for i in ids if i in customers]
+
+
+def _active_conditions(is_active: bool | None) -> list[ColumnElement[bool]]:
+    """有効フラグの絞り込み条件を返す."""
+    return [] if is_active is None else [Customer.is_active == is_active]
+
+
+@router.get(
+    "",
+    response_model=SuccessResponse[
+        PaginatedData[CustomerItem] | CursorPaginatedData[CustomerItem]
+    ],
+    responses={
+        400: {"model": ErrorResponse, "description": "カーソル不正"},
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+    },
+    summary="顧客一覧取得",
+    description="顧客一覧を取得する",
+)
+async def get_customers(
+    _current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    company_name: Annotated[str | None, Query(description="会社名（部分一致）")] = None,
+    is_active: Annotated[bool | None, Query(description="有効フラグ")] = None,
+    page: Annotated[int, Query(ge=1, description="ページ番号")] = 1,
+    per_page: Annotated[int, Query(ge=1, le=100, description="1ページあたり件数")] = 20,
+    cursor: Annotated[
+        str | None,
+        Query(description="カーソル（指定時はカーソル方式。空文字で先頭ページ）"),
+    ] = None,
+    with_total: Annotated[
+        bool, Query(description="カーソル方式で総件数を返すかどうか")
+    ] = False,
+) -> Response:
+    """顧客一覧を取得する.
+
+    会社名が指定された場合は検索インデックスで一致度の高い順に並べ、
+    該当ページの顧客のみをデータベースから取得する。
+    指定がない場合は顧客IDの順に返す。
+    cursor が指定された場合は page を無視し、前ページの next_cursor の続きから取得する。
+
+    Args:
+        _current_user: 現在のログインユーザー（認証検証用）
+        db: データベースセッション
+        company_name: 会社名（部分一致）
+        is_active: 有効フラグ
+        page: ページ番号
+        per_page: 1ページあたり件数
+        cursor: カーソル
+        with_total: カーソル方式で総件数を返すかどうか
+
+    Returns:
+        顧客一覧とページネーション情報
+
+    Raises:
+        HTTPException: カーソルが不正な場合
+    """
+    if cursor is not None:
+        try:
+            items, next_cursor, total_count = await _list_customers_after(
+                db, company_name, is_active, cursor, per_page, with_total=with_total
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ErrorDetail(
+                    code="BAD_REQUEST", message="カーソルが不正です"
+                ).model_dump(),
+            ) from e
+        return model_response(
+            SuccessResponse(
+                data=CursorPaginatedData(
+                    items=[CustomerItem.model_validate(c) for c in items],
+                    pagination=CursorPagination(
+                        per_page=per_page,
+                        next_cursor=next_cursor,
+                        has_next=next_cursor is not None,
+                        total_count=total_count,
+                    ),
+                )
+            )
+        )
+
+    offset = (page - 1) * per_page
+    if company_name:
+        await customer_search_index.ensure_loaded(db)
+        matched = customer_search_index.search(company_name, is_active=is_active)
+        total_count = len(matched)
+        items = await _get_customers_by_ids(db, matched[offset : offset + per_page])
+    else:
+        conditions = _active_conditions(is_active)
+        total_count = await db.scalar(
+            select(func.count()).select_from(Customer).where(*conditions)
+        )
+        items = list(
+            await db.scalars(
+                select(Customer)
+                .where(*conditions)
+                .order_by(Customer.customer_id)
+                .offset(offset)
+                .limit(per_page)
+            )
+        )
+    return model_response(
+        SuccessResponse(
+            data=PaginatedData(
+                items=[CustomerItem.model_validate(c) for c in items],
+                pagination=Pagination(
+                    current_page=page,
+                    per_page=per_page,
+                    total_count=total_count or 0,
+                    total_pages=((total_count or 0) + per_page - 1) // per_page,
+                ),
+            )
+        )
+    )
+
+
+@router.get(
+    "/select",
+    response_model=SuccessResponse[SelectListData],
+    responses={
+        304: {"description": "If-None-Match のETagから変更なし"},
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+    },
+    summary="顧客セレクトボックス用リスト取得",
+    description="有効な顧客の選択肢を取得する",
+)
+async def get_customer_options(
+    request: Request,
+    response: Response,
+    _current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    q: Annotated[str | None, Query(description="会社名（部分一致）")] = None,
+    limit: Annotated[
+        int, Query(ge=1, le=100, description="会社名指定時の最大件数")
+    ] = 20,
+) -> Response:
+    """顧客セレクトボックス用の選択肢を取得する.
+
+    会社名が指定された場合は一致度の高い順に最大 limit 件を返す。
+    ETagは DATA_VERSION の顧客の版数から計算するため（インスタンスによらず
+    同じ値になる）、If-None-Match が一致する場合は一覧を取得せずに304を返す。
+
+    Args:
+        request: リクエスト（If-None-Match の参照用）
+        response: レスポンス（ETag・Cache-Controlの設定用）
+        _current_user: 現在のログインユーザー（認証検証用）
+        db: データベースセッション
+        q: 会社名（部分一致）
+        limit: 会社名指定時の最大件数
+
+    Returns:
+        選択肢の一覧、または304レスポンス
+    """
+    version = await data_version.current_version(db, Customer.__tablename__)
+    etag = compute_etag(version, q, limit if q else None)
+    cached = not_modified(
+        request,
+        response,
+        etag,
+        f"private, max-age={settings.select_list_max_age_seconds}",
+    )
+    if cached is not None:
+        return cached
+
+    await customer_search_index.ensure_loaded(db, version)
+    ids = customer_search_index.search(q or "", limit=limit if q else None)
+    items = []
+    for customer_id in ids:
+        label = customer_search_index.company_name(customer_id)
+        if label is not None:
+            items.append(SelectItem(value=customer_id, label=label))
+    return model_response(SuccessResponse(data=SelectListData(items=items)), response)
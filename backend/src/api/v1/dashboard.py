@@ -0,0 +1,44 @@
+"""ダッシュボードAPI."""
+
+from datetime import date
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.dependencies import CurrentUser, get_current_user, get_read_db
+from src.core.responses import model_response
+from src.schemas.common import ErrorResponse, SuccessResponse
+from src.schemas.dashboard import DashboardData
+from src.services.dashboard import dashboard_store
+
+router = APIRouter(prefix="/dashboard", tags=["ダッシュボード"])
+
+
+@router.get(
+    "",
+    response_model=SuccessResponse[DashboardData],
+    responses={
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+    },
+    summary="ダッシュボード情報取得",
+    description="本日の日報の状況・未読コメント数・直近7日間の日報を取得する",
+)
+async def get_dashboard(
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> Response:
+    """ダッシュボード情報を取得する.
+
+    営業担当者ごとに保持している集計から返すため、通常はクエリを発行しない。
+
+    Args:
+        current_user: 現在のログインユーザー
+        db: データベースセッション
+
+    Returns:
+        ダッシュボード情報
+    """
+    today = date.today()
+    summary = await dashboard_store.get(db, current_user.salesperson_id, today)
+    return model_response(SuccessResponse(data=summary.to_dashboard(today)))
@@ -0,0 +1,1020 @@
+"""日報API."""
+
+from datetime import date
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.core.config import settings
+from src.core.database import get_db
+from src.core.dependencies import CurrentUser, get_current_user, get_read_db
+from src.core.etag import compute_etag, not_modified
+from src.core.pagination import InvalidCursorError
+from src.core.responses import model_response
+from src.models import DailyReport, ReportComment, ReportStatus, VisitRecord
+from src.schemas.comment import (
+    CommentCreate,
+    CommentCreateData,
+    CommentListData,
+    CommentReadData,
+    CommentReadUpdate,
+)
+from src.schemas.common import (
+    CursorPaginatedData,
+    CursorPagination,
+    ErrorDetail,
+    ErrorResponse,
+    PaginatedData,
+    Pagination,
+    SuccessResponse,
+)
+from src.schemas.report import (
+    ReportAutosave,
+    ReportAutosaveData,
+    ReportDetail,
+    ReportListItem,
+    ReportStatusData,
+    ReportUpdate,
+    ReportUpdateData,
+    ReportVersionCheck,
+)
+from src.schemas.report_import import ImportResult
+from src.services.autosave import autosave_buffer
+from src.services.comments import list_comments, mark_read
+from src.services.hierarchy import hierarchy_index
+from src.services.outbox import (
+    COMMENT_POSTED,
+    REPORT_CONFIRMED,
+    REPORT_SUBMITTED,
+    enqueue,
+)
+from src.services.report_export import stream_report_csv
+from src.services.report_import import (
+    ImportFormat,
+    import_reports,
+    iter_lines,
+    parse_records,
+)
+from src.services.reports import (
+    ReportListFilter,
+    get_report_detail,
+    get_report_version,
+    list_reports,
+    list_reports_after,
+)
+from src.services.visit_records import (
+    UnknownVisitRecordError,
+    diff_visit_records,
+    has_unknown_customers,
+    save_report_changes,
+)
+
+router = APIRouter(prefix="/reports", tags=["日報"])
+
+
+async def _visible_salesperson_ids(
+    db: AsyncSession, current_user: CurrentUser, salesperson_id: int | None
+) -> frozenset[int]:
+    """閲覧対象の営業担当者IDを決定する.
+
+    本人と全階層の部下の日報を閲覧できる。担当者が指定された場合は
+    閲覧可能範囲に含まれることを確認する。
+
+    Args:
+        db: データベースセッション
+        current_user: 現在のログインユーザー
+        salesperson_id: 指定された営業担当者ID
+
+    Returns:
+        閲覧対象の営業担当者IDの集合
+
+    Raises:
+        HTTPException: 閲覧権限のない担当者が指定された場合（403 Forbidden）
+    """
+    await hierarchy_index.ensure_loaded(db)
+    visible_ids = hierarchy_index.self_and_subordinates(current_user.salesperson_id)
+    if salesperson_id is None:
+        return visible_ids
+    if salesperson_id not in visible_ids:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=ErrorDetail(
+                code="FORBIDDEN",
+                message="指定された担当者の日報を閲覧する権限がありません",
+            ).model_dump(),
+        )
+    return frozenset({salesperson_id})
+
+
+def _report_not_found() -> HTTPException:
+    """日報が存在しない場合の404エラーを生成する."""
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=ErrorDetail(
+            code="NOT_FOUND", message="日報が見つかりません"
+        ).model_dump(),
+    )
+
+
+async def _check_report_visible(
+    db: AsyncSession, current_user: CurrentUser, owner_id: int
+) -> None:
+    """本人または上位の上長として日報を閲覧できることを確認する.
+
+    Args:
+        db: データベースセッション
+        current_user: 現在のログインユーザー
+        owner_id: 日報の営業担当者ID
+
+    Raises:
+        HTTPException: 閲覧権限がない場合（403 Forbidden）
+    """
+    await hierarchy_index.ensure_loaded(db)
+    if owner_id not in hierarchy_index.self_and_subordinates(
+        current_user.salesperson_id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=ErrorDetail(
+                code="FORBIDDEN", message="この日報を閲覧する権限がありません"
+            ).model_dump(),
+        )
+
+
+@router.get(
+    "",
+    response_model=SuccessResponse[
+        PaginatedData[ReportListItem] | CursorPaginatedData[ReportListItem]
+    ],
+    responses={
+        400: {"model": ErrorResponse, "description": "カーソル不正"},
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+        403: {"model": ErrorResponse, "description": "権限エラー"},
+    },
+    summary="日報一覧取得",
+    description="自分と部下の日報一覧を取得する",
+)
+async def get_reports(
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    date_from: Annotated[date | None, Query(description="検索開始日")] = None,
+    date_to: Annotated[date | None, Query(description="検索終了日")] = None,
+    salesperson_id: Annotated[
+        int | None, Query(description="営業担当者ID（上長のみ指定可能）")
+    ] = None,
+    report_status: Annotated[
+        ReportStatus | None, Query(alias="status", description="ステータス")
+    ] = None,
+    page: Annotated[int, Query(ge=1, description="ページ番号")] = 1,
+    per_page: Annotated[int, Query(ge=1, le=100, description="1ページあたり件数")] = 20,
+    cursor: Annotated[
+        str | None,
+        Query(description="カーソル（指定時はカーソル方式。空文字で先頭ページ）"),
+    ] = None,
+    with_total: Annotated[
+        bool, Query(description="カーソル方式で総件数を返すかどうか")
+    ] = False,
+) -> Response:
+    """日報一覧を取得する.
+
+    訪問件数・コメント件数・未読有無を含めて1ページを1回のクエリで取得する。
+    cursor が指定された場合は page を無視し、前ページの next_cursor の続きから取得する。
+
+    Args:
+        current_user: 現在のログインユーザー
+        db: データベースセッション
+        date_from: 検索開始日
+        date_to: 検索終了日
+        salesperson_id: 営業担当者ID
+        report_status: ステータス
+        page: ページ番号
+        per_page: 1ページあたり件数
+        cursor: カーソル
+        with_total: カーソル方式で総件数を返すかどうか
+
+    Returns:
+        日報一覧とページネーション情報
+
+    Raises:
+        HTTPException: カーソルが不正な場合、閲覧権限のない担当者が指定された場合
+    """
+    filters = ReportListFilter(
+        salesperson_ids=await _visible_salesperson_ids(
+            db, current_user, salesperson_id
+        ),
+        date_from=date_from,
+        date_to=date_to,
+        status=report_status,
+    )
+    if cursor is not None:
+        try:
+            items, next_cursor, total_count = await list_reports_after(
+                db,
+                filters,
+                current_user.salesperson_id,
+                cursor,
+                per_page,
+                with_total=with_total,
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ErrorDetail(
+                    code="BAD_REQUEST", message="カーソルが不正です"
+                ).model_dump(),
+            ) from e
+        return model_response(
+            SuccessResponse(
+                data=CursorPaginatedData(
+                    items=items,
+                    pagination=CursorPagination(
+                        per_page=per_page,
+                        next_cursor=next_cursor,
+                        has_next=next_cursor is not None,
+                        total_count=total_count,
+                    ),
+                )
+            )
+        )
+
+    items, total_count = await list_reports(
+        db, filters, current_user.salesperson_id, page, per_page
+    )
+    return model_response(
+        SuccessResponse(
+            data=PaginatedData(
+                items=items,
+                pagination=Pagination(
+                    current_page=page,
+                    per_page=per_page,
+                    total_count=total_count,
+                    total_pages=(total_count + per_page - 1) // per_page,
+                ),
+            )
+        )
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"text/csv": {}}, "description": "日報のCSV"},
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+        403: {"model": ErrorResponse, "description": "権限エラー"},
+    },
+    summary="日報エクスポート",
+    description="自分と部下の日報を訪問記録ごとCSVで出力する",
+)
+async def export_reports(
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    date_from: Annotated[date | None, Query(description="検索開始日")] = None,
+    date_to: Annotated[date | None, Query(description="検索終了日")] = None,
+    salesperson_id: Annotated[
+        int | None, Query(description="営業担当者ID（上長のみ指定可能）")
+    ] = None,
+    report_status: Annotated[
+        ReportStatus | None, Query(alias="status", description="ステータス")
+    ] = None,
+) -> StreamingResponse:
+    """日報を訪問記録ごとCSVで出力する.
+
+    検索条件は日報一覧と同じ。結果をサーバーサイドカーソルで逐次取得して
+    出力するため、件数によらずメモリ使用量は一定となる。
+
+    Args:
+        current_user: 現在のログインユーザー
+        db: データベースセッション
+        date_from: 検索開始日
+        date_to: 検索終了日
+        salesperson_id: 営業担当者ID
+        report_status: ステータス
+
+    Returns:
+        CSVのストリーミングレスポンス
+
+    Raises:
+        HTTPException: 閲覧権限のない担当者が指定された場合（403 Forbidden）
+    """
+    filters = ReportListFilter(
+        salesperson_ids=await _visible_salesperson_ids(
+            db, current_user, salesperson_id
+        ),
+        date_from=date_from,
+        date_to=date_to,
+        status=report_status,
+    )
+    return StreamingResponse(
+        stream_report_csv(db, filters, settings.export_fetch_size),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="reports.csv"'},
+    )
+
+
+@router.get(
+    "/{report_id}",
+    response_model=SuccessResponse[ReportDetail],
+    responses={
+        304: {"description": "If-None-Match のETagから変更なし"},
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+        403: {"model": ErrorResponse, "description": "権限エラー"},
+        404: {"model": ErrorResponse, "description": "日報が存在しない"},
+    },
+    summary="日報詳細取得",
+    description="日報の詳細を訪問記録・コメントごと取得する",
+)
+async def get_report(
+    report_id: int,
+    request: Request,
+    response: Response,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> Response:
+    """日報の詳細を取得する.
+
+    内容を決める値を1回のクエリで取得してETagを計算し、If-None-Match が一致する
+    場合は日報本体を読み込まずに304を返す。編集・確認の可否は閲覧者ごとに
+    異なるため、ETagにも含める。
+
+    Args:
+        report_id: 日報ID
+        request: リクエスト（If-None-Match の参照用）
+        response: レスポンス（ETag・Cache-Controlの設定用）
+        current_user: 現在のログインユーザー
+        db: データベースセッション
+
+    Returns:
+        日報詳細、または304レスポンス
+
+    Raises:
+        HTTPException: 日報が存在しない場合（404）、閲覧権限がない場合（403）
+    """
+    version = await get_report_version(db, report_id)
+    if version is None:
+        raise _report_not_found()
+    await _check_report_visible(db, current_user, version.salesperson_id)
+    viewer_id = current_user.salesperson_id
+    can_edit = (
+        version.salesperson_id == viewer_id and version.status == ReportStatus.DRAFT
+    )
+    can_confirm = version.status == ReportStatus.SUBMITTED and (
+        hierarchy_index.is_subordinate_of(version.salesperson_id, viewer_id)
+    )
+    etag = compute_etag(*version.parts, can_edit, can_confirm)
+    cached = not_modified(request, response, etag, "private, no-cache")
+    if cached is not None:
+        return cached
+
+    detail = await get_report_detail(
+        db, report_id, can_edit=can_edit, can_confirm=can_confirm
+    )
+    if detail is None:
+        # 集計クエリの後に削除された場合
+        raise _report_not_found()
+    return model_response(SuccessResponse(data=detail), response)
+
+
+def _unprocessable(message: str) -> HTTPException:
+    """状態により操作できない場合の422エラーを生成する."""
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+        detail=ErrorDetail(code="VALIDATION_ERROR", message=message).model_dump(),
+    )
+
+
+def _conflict(message: str) -> HTTPException:
+    """競合により操作できない場合の409エラーを生成する."""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=ErrorDetail(code="CONFLICT", message=message).model_dump(),
+    )
+
+
+_STALE_MESSAGE = "日報が他の操作で更新されています。最新の内容を取得してください"
+_DISCARDED_MESSAGE = (
+    "日報が他の操作で更新されたため、保存前の自動保存の内容を破棄しました。"
+    "最新の内容を取得してください"
+)
+
+
+def _check_version(report: DailyReport, version: int | None) -> None:
+    """クライアントが取得した版数が日報の版数と一致することを確認する.
+
+    Args:
+        report: 日報
+        version: クライアントが取得した版数（Noneの場合は確認しない）
+
+    Raises:
+        HTTPException: 版数が一致しない場合（409 Conflict）
+    """
+    if version is not None and version != report.version:
+        raise _conflict(_STALE_MESSAGE)
+
+
+async def _flush_or_conflict(db: AsyncSession) -> None:
+    """変更を書き込み、読み込み後に他の操作で更新されていた場合は409とする.
+
+    日報の更新は読み込み時の版数を条件とする（DailyReport の version_id_col）。
+    行ロックは書き込みからコミットまでの間のみで、読み込みからは取らない。
+
+    Args:
+        db: データベースセッション
+
+    Raises:
+        HTTPException: 読み込み後に日報が更新されていた場合（409 Conflict）
+    """
+    try:
+        await db.flush()
+    except StaleDataError as e:
+        raise _conflict(_STALE_MESSAGE) from e
+
+
+async def _submit(db: AsyncSession, report: DailyReport) -> None:
+    """日報を提出済にし、上長への通知を登録する."""
+    report.status = ReportStatus.SUBMITTED
+    await hierarchy_index.ensure_loaded(db)
+    enqueue(
+        db,
+        REPORT_SUBMITTED,
+        {
+            "report_id": report.report_id,
+            "salesperson_id": report.salesperson_id,
+            "report_date": report.report_date.isoformat(),
+            "recipient_ids": hierarchy_index.managers_of(report.salesperson_id),
+        },
+    )
+
+
+@router.put(
+    "/{report_id}",
+    response_model=SuccessResponse[ReportUpdateData],
+    responses={
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+        403: {"model": ErrorResponse, "description": "権限エラー"},
+        404: {"model": ErrorResponse, "description": "日報が存在しない"},
+        409: {
+            "model": ErrorResponse,
+            "description": "他の操作で更新済み、指定日の日報が既に存在する",
+        },
+        422: {"model": ErrorResponse, "description": "バリデーションエラー"},
+    },
+    summary="日報更新",
+    description="下書きの日報を訪問記録ごと更新する",
+)
+async def update_report(
+    report_id: int,
+    body: ReportUpdate,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> SuccessResponse[ReportUpdateData]:
+    """日報を更新する.
+
+    リクエストの version が日報の版数と一致する場合のみ更新する（楽観的排他制御）。
+    読み込み後に他の端末・上長の操作で更新された場合も、書き込み時の版数の
+    比較で検出して409を返すため、後の書き込みが先の更新を上書きすることはない。
+
+    訪問記録は既存の訪問記録との差分（追加・変更・削除）のみを書き込む。
+    書き込み待ちの自動保存は、更新の前に書き込む。
+
+    Args:
+        report_id: 日報ID
+        body: 更新内容
+        current_user: 現在のログインユーザー
+        db: データベースセッション
+
+    Returns:
+        更新後の日報のステータスと版数
+
+    Raises:
+        HTTPException: 日報が存在しない場合（404）、本人の下書きでない場合（403）、
+            版数が一致しない場合・指定日の日報が既に存在する場合（409）、
+            顧客・訪問記録が存在しない場合・提出時に訪問記録が0件の場合（422）
+    """
+    await autosave_buffer.flush_report(db, report_id)
+    report = await db.get(DailyReport, report_id)
+    if report is None:
+        raise _report_not_found()
+    if (
+        report.salesperson_id != current_user.salesperson_id
+        or report.status != ReportStatus.DRAFT
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=ErrorDetail(
+                code="FORBIDDEN", message="この日報を編集する権限がありません"
+            ).model_dump(),
+        )
+    _check_version(report, body.version)
+    if body.status == ReportStatus.CONFIRMED:
+        raise _unprocessable("ステータスには下書きまたは提出済を指定してください")
+    if body.status == ReportStatus.SUBMITTED and not body.visit_records:
+        raise _unprocessable("提出には訪問記録が1件以上必要です")
+    try:
+        diff = await diff_visit_records(db, report_id, body.visit_records)
+    except UnknownVisitRecordError as e:
+        raise _unprocessable("日報に存在しない訪問記録が指定されています") from e
+    if await has_unknown_customers(db, diff):
+        raise _unprocessable("存在しない顧客が指定されています")
+    if body.report_date != report.report_date and await db.scalar(
+        select(DailyReport.report_id).where(
+            DailyReport.salesperson_id == report.salesperson_id,
+            DailyReport.report_date == body.report_date,
+        )
+    ):
+        raise _conflict("指定日の日報が既に存在します")
+
+    report.report_date = body.report_date
+    report.problem = body.problem
+    report.plan = body.plan
+    if body.status == ReportStatus.SUBMITTED:
+        await _submit(db, report)
+    try:
+        await save_report_changes(db, report, diff)
+    except StaleDataError as e:
+        raise _conflict(_STALE_MESSAGE) from e
+    return SuccessResponse(
+        data=ReportUpdateData(
+            report_id=report_id,
+            status=report.status,
+            version=report.version,
+            message="日報を更新しました",
+        )
+    )
+
+
+@router.patch(
+    "/{report_id}",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=SuccessResponse[ReportAutosaveData],
+    responses={
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+        403: {"model": ErrorResponse, "description": "権限エラー"},
+        404: {"model": ErrorResponse, "description": "日報が存在しない"},
+        409: {"model": ErrorResponse, "description": "他の操作で更新済み"},
+        422: {"model": ErrorResponse, "description": "バリデーションエラー"},
+    },
+    summary="日報の自動保存",
+    description="下書きの日報の変更された項目を受け付け、まとめて書き込む",
+)
+async def autosave_report(
+    report_id: int,
+    body: ReportAutosave,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> SuccessResponse[ReportAutosaveData]:
+    """下書きの日報を自動保存する.
+
+    変更された項目をプロセス内に保持し、連続する自動保存をまとめて書き込む
+    （services/autosave 参照）。書き込み待ちの内容がある日報は、ステータスと
+    版数のみを参照し、他の操作（別インスタンスでの提出・更新を含む）で書き込めなく
+    なっていれば保持中の内容を破棄して409を返す。応答の version は書き込み後の
+    日報の版数で、続く自動保存・更新・提出ではこの版数を指定する。
+
+    Args:
+        report_id: 日報ID
+        body: 変更された項目
+        current_user: 現在のログインユーザー
+        db: データベースセッション
+
+    Returns:
+        書き込み後の日報の版数
+
+    Raises:
+        HTTPException: 日報が存在しない場合（404）、本人の下書きでない場合（403）、
+            版数が一致しない場合・保持中の内容を書き込めなくなった場合（409）
+    """
+    draft = autosave_buffer.get(report_id)
+    if draft is None:
+        await autosave_buffer.wait_flushed(report_id)
+        report = await db.get(DailyReport, report_id)
+        if report is None:
+            raise _report_not_found()
+        owner_id, version = report.salesperson_id, report.version
+        editable = report.status == ReportStatus.DRAFT
+    else:
+        current = (
+            await db.execute(
+                select(DailyReport.status, DailyReport.version).where(
+                    DailyReport.report_id == report_id
+                )
+            )
+        ).one_or_none()
+        if current is None:
+            autosave_buffer.discard(report_id, draft)
+            raise _report_not_found()
+        if (
+            current.status != ReportStatus.DRAFT
+            or current.version != draft.base_version
+        ):
+            autosave_buffer.discard(report_id, draft)
+            raise _conflict(_DISCARDED_MESSAGE)
+        owner_id, version = draft.salesperson_id, draft.base_version
+        editable = True
+    if owner_id != current_user.salesperson_id or not editable:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=ErrorDetail(
+                code="FORBIDDEN", message="この日報を編集する権限がありません"
+            ).model_dump(),
+        )
+    # 書き込み待ちの内容がある場合は、その受付前の版数（直前の自動保存の応答を
+    # 受け取る前に送られた場合）と書き込み後の版数のいずれも認める
+    allowed = {version} if draft is None else {version, draft.saved_version}
+    if body.version not in allowed:
+        raise _conflict(_STALE_MESSAGE)
+
+    changes = {
+        name: getattr(body, name) for name in body.model_fields_set - {"version"}
+    }
+    draft = autosave_buffer.add(report_id, owner_id, version, changes)
+    return SuccessResponse(
+        data=ReportAutosaveData(
+            report_id=report_id,
+            version=draft.saved_version,
+            message="自動保存を受け付けました",
+        )
+    )
+
+
+@router.put(
+    "/{report_id}/submit",
+    response_model=SuccessResponse[ReportStatusData],
+    responses={
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+        403: {"model": ErrorResponse, "description": "権限エラー"},
+        404: {"model": ErrorResponse, "description": "日報が存在しない"},
+        409: {"model": ErrorResponse, "description": "他の操作で更新済み"},
+        422: {"model": ErrorResponse, "description": "下書きでない、訪問記録が0件"},
+    },
+    summary="日報提出",
+    description="日報を提出済にし、上長に通知する",
+)
+async def submit_report(
+    report_id: int,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    body: ReportVersionCheck | None = None,
+) -> SuccessResponse[ReportStatusData]:
+    """日報を提出する.
+
+    上長への通知はステータスの変更と同じトランザクションで登録し、
+    バックグラウンドで配信する。同時に提出・更新された場合は、先に書き込んだ
+    操作のみが成功する。書き込み待ちの自動保存は、提出の前に書き込む。
+
+    Args:
+        report_id: 日報ID
+        current_user: 現在のログインユーザー
+        db: データベースセッション
+        body: クライアントが取得した版数（任意）
+
+    Returns:
+        提出後の日報のステータスと版数
+
+    Raises:
+        HTTPException: 日報が存在しない場合（404）、本人の日報でない場合（403）、
+            版数が一致しない場合・他の操作で更新された場合（409）、
+            下書きでない場合・訪問記録が0件の場合（422）
+    """
+    await autosave_buffer.flush_report(db, report_id)
+    report = await db.get(DailyReport, report_id)
+    if report is None:
+        raise _report_not_found()
+    if report.salesperson_id != current_user.salesperson_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=ErrorDetail(
+                code="FORBIDDEN", message="この日報を提出する権限がありません"
+            ).model_dump(),
+        )
+    _check_version(report, body.version if body else None)
+    if report.status != ReportStatus.DRAFT:
+        raise _unprocessable("下書きの日報のみ提出できます")
+    visit_count = await db.scalar(
+        select(func.count())
+        .select_from(VisitRecord)
+        .where(VisitRecord.report_id == report_id)
+    )
+    if not visit_count:
+        raise _unprocessable("提出には訪問記録が1件以上必要です")
+
+    await _submit(db, report)
+    await _flush_or_conflict(db)
+    return SuccessResponse(
+        data=ReportStatusData(
+            report_id=report_id,
+            status=report.status,
+            version=report.version,
+            message="日報を提出しました",
+        )
+    )
+
+
+@router.put(
+    "/{report_id}/confirm",
+    response_model=SuccessResponse[ReportStatusData],
+    responses={
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+        403: {"model": ErrorResponse, "description": "権限エラー"},
+        404: {"model": ErrorResponse, "description": "日報が存在しない"},
+        409: {"model": ErrorResponse, "description": "他の操作で更新済み"},
+        422: {"model": ErrorResponse, "description": "提出済でない"},
+    },
+    summary="日報確認",
+    description="部下の日報を確認済にし、作成者に通知する",
+)
+async def confirm_report(
+    report_id: int,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    body: ReportVersionCheck | None = None,
+) -> SuccessResponse[ReportStatusData]:
+    """日報を確認済にする.
+
+    作成者への通知はステータスの変更と同じトランザクションで登録し、
+    バックグラウンドで配信する。同時に確認された場合は、先に書き込んだ
+    操作のみが成功する。
+
+    Args:
+        report_id: 日報ID
+        current_user: 現在のログインユーザー
+        db: データベースセッション
+        body: クライアントが取得した版数（任意）
+
+    Returns:
+        確認後の日報のステータスと版数
+
+    Raises:
+        HTTPException: 日報が存在しない場合（404）、上位の上長でない場合（403）、
+            版数が一致しない場合・他の操作で更新された場合（409）、
+            提出済でない場合（422）
+    """
+    report = await db.get(DailyReport, report_id)
+    if report is None:
+        raise _report_not_found()
+    await hierarchy_index.ensure_loaded(db)
+    if not hierarchy_index.is_subordinate_of(
+        report.salesperson_id, current_user.salesperson_id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=ErrorDetail(
+                code="FORBIDDEN", message="この日報を確認する権限がありません"
+            ).model_dump(),
+        )
+    _check_version(report, body.version if body else None)
+    if report.status != ReportStatus.SUBMITTED:
+        raise _unprocessable("提出済の日報のみ確認できます")
+
+    report.status = ReportStatus.CONFIRMED
+    enqueue(
+        db,
+        REPORT_CONFIRMED,
+        {
+            "report_id": report_id,
+            "salesperson_id": report.salesperson_id,
+            "report_date": report.report_date.isoformat(),
+            "confirmed_by": current_user.salesperson_id,
+            "recipient_ids": [report.salesperson_id],
+        },
+    )
+    await _flush_or_conflict(db)
+    return SuccessResponse(
+        data=ReportStatusData(
+            report_id=report_id,
+            status=report.status,
+            version=report.version,
+            message="日報を確認済みにしました",
+        )
+    )
+
+
+@router.get(
+    "/{report_id}/comments",
+    response_model=SuccessResponse[CommentListData],
+    responses={
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+        403: {"model": ErrorResponse, "description": "権限エラー"},
+        404: {"model": ErrorResponse, "description": "日報が存在しない"},
+    },
+    summary="コメント一覧取得",
+    description="日報のコメント一覧を取得する（既読は PUT /comments/read で記録する）",
+)
+async def get_report_comments(
+    report_id: int,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> Response:
+    """日報のコメント一覧を取得する.
+
+    参照のみで既読は記録しない。クライアントは表示した最後のコメントIDを
+    PUT /reports/{report_id}/comments/read で送信する。
+
+    Args:
+        report_id: 日報ID
+        current_user: 現在のログインユーザー
+        db: データベースセッション
+
+    Returns:
+        投稿順のコメント一覧
+
+    Raises:
+        HTTPException: 日報が存在しない場合（404）、閲覧権限がない場合（403）
+    """
+    owner_id = await db.scalar(
+        select(DailyReport.salesperson_id).where(DailyReport.report_id == report_id)
+    )
+    if owner_id is None:
+        raise _report_not_found()
+    await _check_report_visible(db, current_user, owner_id)
+
+    comments = await list_comments(db, report_id)
+    return model_response(SuccessResponse(data=CommentListData(items=comments)))
+
+
+@router.put(
+    "/{report_id}/comments/read",
+    response_model=SuccessResponse[CommentReadData],
+    responses={
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+        403: {"model": ErrorResponse, "description": "権限エラー"},
+        404: {"model": ErrorResponse, "description": "日報が存在しない"},
+    },
+    summary="コメント既読記録",
+    description="表示した最後のコメントまでを閲覧者の既読にする",
+)
+async def mark_report_comments_read(
+    report_id: int,
+    body: CommentReadUpdate,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> SuccessResponse[CommentReadData]:
+    """日報のコメントを指定したコメントまで既読にする.
+
+    閲覧者の未読コメント数を更新し、日報一覧・ダッシュボードに反映する。
+    既読の位置は戻らないため、同じ内容で繰り返し呼び出してもよい。
+
+    Args:
+        report_id: 日報ID
+        body: 表示した最後のコメントID
+        current_user: 現在のログインユーザー
+        db: データベースセッション
+
+    Returns:
+        記録した既読位置と残りの未読コメント数
+
+    Raises:
+        HTTPException: 日報が存在しない場合（404）、閲覧権限がない場合（403）
+    """
+    owner_id = await db.scalar(
+        select(DailyReport.salesperson_id).where(DailyReport.report_id == report_id)
+    )
+    if owner_id is None:
+        raise _report_not_found()
+    await _check_report_visible(db, current_user, owner_id)
+
+    last_read, unread_count = await mark_read(
+        db, current_user.salesperson_id, report_id, body.last_comment_id
+    )
+    return SuccessResponse(
+        data=CommentReadData(
+            report_id=report_id,
+            last_read_comment_id=last_read,
+            unread_count=unread_count,
+        )
+    )
+
+
+@router.post(
+    "/{report_id}/comments",
+    response_model=SuccessResponse[CommentCreateData],
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+        403: {"model": ErrorResponse, "description": "権限エラー"},
+        404: {"model": ErrorResponse, "description": "日報が存在しない"},
+    },
+    summary="コメント投稿",
+    description="日報にコメントを投稿し、作成者と上長に通知する",
+)
+async def post_report_comment(
+    report_id: int,
+    body: CommentCreate,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> SuccessResponse[CommentCreateData]:
+    """日報にコメントを投稿する.
+
+    日報を閲覧できる作成者・上位の上長（投稿者を除く）への通知は
+    コメントの登録と同じトランザクションで登録し、バックグラウンドで配信する。
+
+    Args:
+        report_id: 日報ID
+        body: コメント内容
+        current_user: 現在のログインユーザー
+        db: データベースセッション
+
+    Returns:
+        登録したコメントのID
+
+    Raises:
+        HTTPException: 日報が存在しない場合（404）、閲覧権限がない場合（403）
+    """
+    owner_id = await db.scalar(
+        select(DailyReport.salesperson_id).where(DailyReport.report_id == report_id)
+    )
+    if owner_id is None:
+        raise _report_not_found()
+    await _check_report_visible(db, current_user, owner_id)
+
+    commenter_id = current_user.salesperson_id
+    comment = ReportComment(
+        report_id=report_id, commenter_id=commenter_id, comment_text=body.comment_text
+    )
+    db.add(comment)
+    await db.flush()
+    enqueue(
+        db,
+        COMMENT_POSTED,
+        {
+            "report_id": report_id,
+            "comment_id": comment.comment_id,
+            "commenter_id": commenter_id,
+            "recipient_ids": [
+                reader_id
+                for reader_id in [owner_id, *hierarchy_index.managers_of(owner_id)]
+                if reader_id != commenter_id
+            ],
+        },
+    )
+    return SuccessResponse(
+        data=CommentCreateData(
+            comment_id=comment.comment_id, message="コメントを投稿しました"
+        )
+    )
+
+
+# 一括インポートで受け付けるContent-Type
+IMPORT_CONTENT_TYPES: dict[str, ImportFormat] = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+
+@router.post(
+    "/import",
+    response_model=SuccessResponse[ImportResult],
+    responses={
+        400: {"model": ErrorResponse, "description": "未対応の形式"},
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+    },
+    summary="日報一括インポート",
+    description="NDJSONまたはCSVの日報を訪問記録・コメントごと一括登録する",
+)
+async def post_reports_import(
+    request: Request,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> SuccessResponse[ImportResult]:
+    """日報を一括登録する.
+
+    リクエスト本文を逐次解析し、import_batch_size 件ごとにコミットする。
+    自分と全階層の部下の日報のみ登録でき、取り込めなかったレコードは
+    行番号付きのエラーとして返す。
+
+    Args:
+        request: リクエスト（本文をストリームとして読み込む）
+        current_user: 現在のログインユーザー
+        db: データベースセッション
+
+    Returns:
+        登録件数と取り込めなかったレコードのエラー
+
+    Raises:
+        HTTPException: Content-Typeが未対応の場合（400 Bad Request）
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    import_format = IMPORT_CONTENT_TYPES.get(content_type.lower())
+    if import_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ErrorDetail(
+                code="BAD_REQUEST",
+                message="Content-Typeは application/x-ndjson または text/csv を指定してください",
+            ).model_dump(),
+        )
+    await hierarchy_index.ensure_loaded(db)
+    result = await import_reports(
+        db,
+        parse_records(iter_lines(request.stream()), import_format),
+        batch_size=settings.import_batch_size,
+        allowed_salesperson_ids=hierarchy_index.self_and_subordinates(
+            current_user.salesperson_id
+        ),
+    )
+    return SuccessResponse(data=result)
@@ -0,0 +1,80 @@
+"""営業担当者API."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.dependencies import CurrentUser, get_current_user, get_read_db
+from src.core.etag import compute_etag, not_modified
+from src.core.responses import model_response
+from src.models import Salesperson
+from src.schemas.common import (
+    ErrorResponse,
+    SelectItem,
+    SelectListData,
+    SuccessResponse,
+)
+from src.services import data_version
+
+router = APIRouter(prefix="/salespersons", tags=["営業担当者"])
+
+data_version.track(Salesperson)
+
+
+@router.get(
+    "/select",
+    response_model=SuccessResponse[SelectListData],
+    responses={
+        304: {"description": "If-None-Match のETagから変更なし"},
+        401: {"model": ErrorResponse, "description": "認証エラー"},
+    },
+    summary="営業担当者セレクトボックス用リスト取得",
+    description="有効な営業担当者の選択肢を取得する",
+)
+async def get_salesperson_options(
+    request: Request,
+    response: Response,
+    _current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> Response:
+    """営業担当者セレクトボックス用の選択肢を取得する.
+
+    DATA_VERSION の営業担当者の版数からETagを計算し、
+    If-None-Match が一致する場合は一覧を取得せずに304を返す。
+
+    Args:
+        request: リクエスト（If-None-Match の参照用）
+        response: レスポンス（ETag・Cache-Controlの設定用）
+        _current_user: 現在のログインユーザー（認証検証用）
+        db: データベースセッション
+
+    Returns:
+        営業担当者IDの順の選択肢一覧、または304レスポンス
+    """
+    version = await data_version.current_version(db, Salesperson.__tablename__)
+    etag = compute_etag(version)
+    cached = not_modified(
+        request,
+        response,
+        etag,
+        f"private, max-age={settings.select_list_max_age_seconds}",
+    )
+    if cached is not None:
+        return cached
+
+    result = await db.execute(
+        select(Salesperson.salesperson_id, Salesperson.name)
+        .where(Salesperson.is_active.is_(True))
+        .order_by(Salesperson.salesperson_id)
+    )
+    return model_response(
+        SuccessResponse(
+            data=SelectListData(
+                items=[SelectItem(value=row[0], label=row[1]) for row in result]
+            )
+        ),
+        response,
+    )
@@ -0,0 +1 @@
+"""運用向けコマンドラインツール."""
@@ -0,0 +1,76 @@
+"""日報一括インポートのコマンドラインツール.
+
+POST /reports/import と同じ処理で、ファイルから日報を一括登録する。
+登録権限の確認は行わない。
+
+使用例:
+    uv run python -m src.cli.import_reports reports.ndjson
+    uv run python -m src.cli.import_reports reports.csv --format csv --batch-size 5000
+"""
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal, close_db
+from src.schemas.report_import import ImportResult
+from src.services.report_import import (
+    ImportFormat,
+    import_reports,
+    iter_lines,
+    parse_records,
+)
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def _read_chunks(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+async def run(path: Path, import_format: ImportFormat, batch_size: int) -> ImportResult:
+    """ファイルから日報を一括登録する.
+
+    Args:
+        path: 入力ファイル
+        import_format: 入力形式
+        batch_size: 1トランザクションで登録する日報の件数
+
+    Returns:
+        インポート結果
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            return await import_reports(
+                db,
+                parse_records(iter_lines(_read_chunks(path)), import_format),
+                batch_size=batch_size,
+            )
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", type=Path, help="入力ファイル")
+    parser.add_argument(
+        "--format",
+        choices=["ndjson", "csv"],
+        help="入力形式（省略時は拡張子 .csv ならCSV、それ以外はNDJSON）",
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.import_batch_size)
+    args = parser.parse_args()
+
+    import_format: ImportFormat = args.format or (
+        "csv" if args.path.suffix.lower() == ".csv" else "ndjson"
+    )
+    result = asyncio.run(run(args.path, import_format, args.batch_size))
+    print(result.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,11 @@
 """コアパッケージ."""
+
+from .config import get_settings, settings
+from .database import get_db, get_db_context
+
+__all__ = [
+    "get_db",
+    "get_db_context",
+    "get_settings",
+    "settings",
+]
@@ -0,0 +1,141 @@
+"""プロセス内キャッシュ.
+
+LRU方式の件数上限とエントリごとの有効期限を持つ軽量なキャッシュを提供する。
+FastAPIのリクエスト処理は単一のイベントループ上で実行されるため、
+スレッド間の排他制御は行わない。
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheStats:
+    """キャッシュの統計情報."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """ヒット率（0.0〜1.0）."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class TTLCache[K: Hashable, V]:
+    """件数上限と有効期限付きのLRUキャッシュ.
+
+    Attributes:
+        max_size: 保持する最大件数（0以下の場合はキャッシュしない）
+        default_ttl: 有効期限を指定せずに登録した場合の有効秒数
+        stats: 統計情報
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        default_ttl: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """キャッシュを初期化する.
+
+        Args:
+            max_size: 保持する最大件数
+            default_ttl: デフォルトの有効秒数（Noneの場合は無期限）
+            clock: 現在時刻（エポック秒）を返す関数
+        """
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return self.peek(key) is not None  # type: ignore[arg-type]
+
+    def get(self, key: K) -> V | None:
+        """値を取得する.
+
+        有効期限切れのエントリは削除してNoneを返す。
+
+        Args:
+            key: キー
+
+        Returns:
+            キャッシュされた値（存在しない場合はNone）
+        """
+        value = self.peek(key)
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def peek(self, key: K) -> V | None:
+        """統計やLRU順序を更新せずに値を取得する.
+
+        Args:
+            key: キー
+
+        Returns:
+            キャッシュされた値（存在しない場合はNone）
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            return None
+        return value
+
+    def set(
+        self,
+        key: K,
+        value: V,
+        ttl: float | None = None,
+        expires_at: float | None = None,
+    ) -> None:
+        """値を登録する.
+
+        Args:
+            key: キー
+            value: 値
+            ttl: 有効秒数（省略時はdefault_ttl）
+            expires_at: 有効期限（エポック秒）。ttlより優先される
+        """
+        if self.max_size <= 0:
+            return
+        if expires_at is None:
+            ttl = self.default_ttl if ttl is None else ttl
+            expires_at = None if ttl is None else self._clock() + ttl
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def delete(self, key: K) -> bool:
+        """値を削除する.
+
+        Args:
+            key: キー
+
+        Returns:
+            削除した場合True
+        """
+        return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """全エントリを削除する."""
+        self._entries.clear()
@@ -1,41 +1,182 @@
 """データベース接続モジュール.
 
 SQLAlchemy AsyncSessionの設定とFastAPI依存性注入用の関数を提供する。
+
+コネクションプールは接続の取得時間を記録し、pool_stats() で利用状況を返す。
+起動直後のリクエストが接続確立を待たないよう、warm_up_pool() で
+あらかじめ接続を確立しておく。
+
+読み取り専用レプリカが設定されている場合、参照系APIのセッション（get_read_db）は
+レプリカにラウンドロビンで振り分ける。接続に失敗したレプリカは一定時間
+振り分け対象から外し、利用できるレプリカがなければプライマリを使う。
+更新をコミットした営業担当者の参照は、レプリケーションの遅延で自分の更新が
+見えなくならないよう一定時間プライマリに向ける（read-your-writes）。
 """
 
-from collections.abc import AsyncGenerator
+import asyncio
+import logging
+import time
+from collections.abc import AsyncGenerator, Callable, Sequence
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 
+from sqlalchemy import PoolProxiedConnection, event, text
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from src.core.cache import TTLCache
 from src.core.config import settings
+from src.models import Base
+
+logger = logging.getLogger(__name__)
 
 
-class Base(DeclarativeBase):
-    """SQLAlchemyモデルの基底クラス.
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """接続の取得回数と取得時間を記録するコネクションプール.
 
-    全てのORMモデルはこのクラスを継承する。
+    取得時間にはプールの空き待ちと、新規接続の確立・接続確認（pre_ping）を含む。
     """
 
-    pass
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        super().__init__(*args, **kwargs)
+        self.acquisitions = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connect(self) -> PoolProxiedConnection:
+        """接続を取得し、取得にかかった時間を記録する."""
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.acquisitions += 1
+            self.wait_seconds_total += elapsed
+            self.wait_seconds_max = max(self.wait_seconds_max, elapsed)
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """コネクションプールの利用状況."""
+
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    acquisitions: int
+    wait_ms_avg: float
+    wait_ms_max: float
+
+
+class ReplicaSet:
+    """読み取り専用レプリカの振り分け先.
+
+    利用できるレプリカをラウンドロビンで返す。接続に失敗したレプリカは
+    retry_seconds の間、振り分け対象から外す。
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        retry_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """振り分け先を初期化する.
+
+        Args:
+            engines: レプリカのエンジン
+            retry_seconds: 接続に失敗したレプリカを振り分け対象から外す秒数
+            clock: 現在時刻（秒）を返す関数
+        """
+        self.engines = list(engines)
+        self.retry_seconds = retry_seconds
+        self._clock = clock
+        self._next = 0
+        self._down_until: dict[int, float] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def candidates(self) -> list[AsyncEngine]:
+        """今回のリクエストで試すレプリカを優先順に返す.
+
+        呼び出しごとに先頭のレプリカを1つずつずらし、
+        振り分け対象から外しているレプリカは含めない。
+
+        Returns:
+            利用できるレプリカのエンジン（すべて停止中の場合は空）
+        """
+        count = len(self.engines)
+        if not count:
+            return []
+        start = self._next
+        self._next = (start + 1) % count
+        return [
+            engine
+            for engine in self.engines[start:] + self.engines[:start]
+            if not self.is_down(engine)
+        ]
+
+    def mark_down(self, engine: AsyncEngine) -> None:
+        """接続に失敗したレプリカを一定時間振り分け対象から外す.
+
+        Args:
+            engine: 接続に失敗したレプリカのエンジン
+        """
+        self._down_until[id(engine)] = self._clock() + self.retry_seconds
+
+    def is_down(self, engine: AsyncEngine) -> bool:
+        """レプリカを振り分け対象から外しているかを返す.
+
+        Args:
+            engine: レプリカのエンジン
+
+        Returns:
+            振り分け対象から外している場合True
+        """
+        return self._down_until.get(id(engine), 0.0) > self._clock()
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    """接続プール設定を適用した非同期エンジンを作成する."""
+    return create_async_engine(
+        url,
+        echo=settings.debug,  # デバッグモード時はSQLをログ出力
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=True,  # 接続確認を行う
+    )
 
 
 # 非同期エンジンの作成
-engine = create_async_engine(
-    settings.async_database_url,
-    echo=settings.debug,  # デバッグモード時はSQLをログ出力
-    pool_size=settings.db_pool_size,
-    max_overflow=settings.db_max_overflow,
-    pool_timeout=settings.db_pool_timeout,
-    pool_recycle=settings.db_pool_recycle,
-    pool_pre_ping=True,  # 接続確認を行う
+engine = _create_engine(settings.async_database_url)
+
+# 読み取り専用レプリカ
+replicas = ReplicaSet(
+    [_create_engine(url) for url in settings.async_replica_urls],
+    retry_seconds=settings.db_replica_retry_seconds,
+)
+
+# 直近に更新をコミットした営業担当者（この間の参照はプライマリに向ける）
+recent_writers: TTLCache[int, bool] = TTLCache(
+    max_size=10000, default_ttl=settings.db_replica_sticky_seconds
 )
 
+# セッションを使用している営業担当者のIDを保持する session.info のキー
+SESSION_USER_KEY = "salesperson_id"
+_WROTE_KEY = "wrote"
+
 # 非同期セッションファクトリ
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -45,6 +186,44 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# レプリカ用セッションファクトリ（接続はリクエストごとに選んで指定する）
+ReplicaSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flush(session: Session, _flush_context: UOWTransaction) -> None:
+    """ORMオブジェクトの変更を書き込んだセッションに印を付ける."""
+    session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_dml(orm_execute_state: ORMExecuteState) -> None:
+    """INSERT・UPDATE・DELETE文を実行したセッションに印を付ける."""
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_writer(session: Session) -> None:
+    """更新をコミットした営業担当者の参照を一定時間プライマリに向ける."""
+    salesperson_id = session.info.get(SESSION_USER_KEY)
+    if session.info.pop(_WROTE_KEY, False) and salesperson_id is not None:
+        recent_writers.set(salesperson_id, True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_writes(session: Session) -> None:
+    """ロールバックした変更は更新として扱わない."""
+    session.info.pop(_WROTE_KEY, None)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """FastAPI依存性注入用のデータベースセッション取得関数.
@@ -71,6 +250,51 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+@asynccontextmanager
+async def replica_session(
+    salesperson_id: int | None = None,
+) -> AsyncGenerator[AsyncSession | None, None]:
+    """読み取り専用レプリカのセッションを取得する.
+
+    レプリカをラウンドロビンで選び、接続を確保してからセッションを返す。
+    接続に失敗したレプリカは振り分け対象から外して次のレプリカを試す。
+    セッションは参照専用のため、終了時にロールバックする。
+
+    Args:
+        salesperson_id: 参照する営業担当者のID（直近に更新をコミットしている場合は
+            レプリカを使わない）
+
+    Yields:
+        レプリカのセッション。レプリカが設定されていない場合、すべて接続できない
+        場合、直近に更新をコミットしている場合はNone（プライマリを使うこと）
+    """
+    if salesperson_id is not None and recent_writers.peek(salesperson_id):
+        yield None
+        return
+    for replica in replicas.candidates():
+        try:
+            conn = await replica.connect()
+        except (SQLAlchemyError, OSError) as e:
+            replicas.mark_down(replica)
+            logger.warning("read replica %s is unavailable: %s", replica.url, e)
+            continue
+        try:
+            async with ReplicaSessionLocal(bind=conn) as session:
+                try:
+                    yield session
+                finally:
+                    await session.rollback()
+        except DBAPIError as e:
+            # 処理中に接続が切れたレプリカは以降の振り分け対象から外す
+            if e.connection_invalidated:
+                replicas.mark_down(replica)
+            raise
+        finally:
+            await conn.close()
+        return
+    yield None
+
+
 @asynccontextmanager
 async def get_db_context() -> AsyncGenerator[AsyncSession, None]:
     """コンテキストマネージャとしてのデータベースセッション取得.
@@ -110,3 +334,76 @@ async def close_db() -> None:
     アプリケーション終了時に呼び出す。
     """
     await engine.dispose()
+    for replica in replicas.engines:
+        await replica.dispose()
+
+
+def pool_stats(target: AsyncEngine | None = None) -> PoolStats:
+    """コネクションプールの利用状況を返す.
+
+    Args:
+        target: 対象のエンジン（省略時はアプリケーションのエンジン）
+
+    Returns:
+        プールの利用状況。overflow はプールサイズを超えて確立された接続数
+        （未使用の枠がある場合は負数）
+    """
+    pool = (target or engine).pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        raise TypeError(f"unsupported pool class: {type(pool).__name__}")
+    acquisitions = pool.acquisitions
+    return PoolStats(
+        size=pool.size(),
+        checked_out=pool.checkedout(),
+        checked_in=pool.checkedin(),
+        overflow=pool.overflow(),
+        acquisitions=acquisitions,
+        wait_ms_avg=(
+            pool.wait_seconds_total / acquisitions * 1000 if acquisitions else 0.0
+        ),
+        wait_ms_max=pool.wait_seconds_max * 1000,
+    )
+
+
+async def warm_up_pool(target: AsyncEngine | None = None, count: int = 0) -> int:
+    """コネクションプールにあらかじめ接続を確立しておく.
+
+    count 件の接続を同時に取得して確認クエリを実行し、プールに戻す。
+    プールサイズを超える接続はプールに残らないため、件数はプールサイズを上限とする。
+    データベースに接続できない場合は起動を妨げず、警告を出力して中断する。
+
+    Args:
+        target: 対象のエンジン（省略時はアプリケーションのエンジン）
+        count: 確立する接続数
+
+    Returns:
+        確立した接続数
+    """
+    target = target or engine
+    size = getattr(target.pool, "size", None)
+    if callable(size):
+        count = min(count, size())
+    if count <= 0:
+        return 0
+
+    async def open_connection() -> AsyncConnection:
+        conn = await target.connect()
+        await conn.execute(text("SELECT 1"))
+        return conn
+
+    results = await asyncio.gather(
+        *(open_connection() for _ in range(count)), return_exceptions=True
+    )
+    connections = [r for r in results if isinstance(r, AsyncConnection)]
+    await asyncio.gather(*(conn.close() for conn in connections))
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        if not isinstance(errors[0], SQLAlchemyError | OSError):
+            raise errors[0]
+        logger.warning(
+            "connection pool warm-up failed (%d/%d): %s",
+            len(errors),
+            count,
+            errors[0],
+        )
+    return len(connections)
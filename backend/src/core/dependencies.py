@@ -1,67 +1,130 @@
 """認証用Dependency."""
 
+import hashlib
+import secrets
+from collections.abc import AsyncGenerator
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from .security import decode_access_token
+from .cache import TTLCache
+from .config import settings
+from .database import SESSION_USER_KEY, get_db, replica_session
+from .identity import CurrentUser, identity_cache
+from .security import TokenData, decode_access_token
 
 # OAuth2のトークン取得エンドポイント
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-class CurrentUser(BaseModel):
-    """現在のログインユーザー情報."""
+# 検証済みトークンのキャッシュ（キーはトークンのSHA-256ダイジェスト）
+# 同一トークンによる繰り返しの署名検証・ペイロード解析を省略する
+token_cache: TTLCache[bytes, TokenData] = TTLCache(
+    max_size=settings.token_cache_max_size
+)
 
-    salesperson_id: int
-    email: str | None = None
-    name: str | None = None
-    manager_id: int | None = None
-    is_active: bool = True
+
+def _token_digest(token: str) -> bytes:
+    """トークンのキャッシュキーを生成する."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _unauthorized(message: str) -> HTTPException:
+    """401エラーを生成する."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail={
+            "success": False,
+            "error": {
+                "code": "UNAUTHORIZED",
+                "message": message,
+            },
+        },
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _verify_token(token: str) -> TokenData | None:
+    """トークンを検証する（検証済みトークンはキャッシュから返す）.
+
+    Args:
+        token: JWTトークン
+
+    Returns:
+        トークンのペイロード（無効な場合はNone）
+    """
+    digest = _token_digest(token)
+    token_data = token_cache.get(digest)
+    if token_data is not None:
+        return token_data
+
+    token_data = decode_access_token(token)
+    if token_data is None or token_data.salesperson_id is None:
+        return None
+    # 有効期限のないトークンはキャッシュしない
+    if token_data.exp is not None:
+        token_cache.set(digest, token_data, expires_at=token_data.exp)
+    return token_data
 
 
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
+    db: Annotated[AsyncSession, Depends(get_db)],
 ) -> CurrentUser:
     """現在のログインユーザーを取得する.
 
-    JWTトークンを検証し、ユーザー情報を返す。
-    トークンが無効な場合は401エラーを返す。
+    JWTトークンを検証し、データベースの営業担当者情報を返す。
+    トークンが無効な場合、ユーザーが存在しない場合、
+    無効化されている場合は401エラーを返す。
+
+    検証済みのトークンはその有効期限まで、営業担当者情報は
+    identity_cache のTTLの間キャッシュされるため、通常はクエリを発行しない。
 
     Args:
         token: Authorizationヘッダーから取得したJWTトークン
+        db: データベースセッション
 
     Returns:
         現在のログインユーザー情報
 
     Raises:
-        HTTPException: トークンが無効な場合（401 Unauthorized）
+        HTTPException: トークンが無効、またはユーザーが無効な場合（401 Unauthorized）
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail={
-            "success": False,
-            "error": {
-                "code": "UNAUTHORIZED",
-                "message": "認証に失敗しました",
-            },
-        },
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    token_data = decode_access_token(token)
+    token_data = _verify_token(token)
     if token_data is None or token_data.salesperson_id is None:
-        raise credentials_exception
-
-    # TODO: データベースからユーザー情報を取得して、
-    # is_active=Falseのユーザーを弾く処理を追加
-    # 現時点ではトークンの情報のみを返す
-    return CurrentUser(
-        salesperson_id=token_data.salesperson_id,
-        email=token_data.email,
-    )
+        raise _unauthorized("認証に失敗しました")
+
+    current_user = await identity_cache.get(db, token_data.salesperson_id)
+    if current_user is None:
+        raise _unauthorized("認証に失敗しました")
+    if not current_user.is_active:
+        raise _unauthorized("このアカウントは無効化されています")
+    # コミット時に更新者を記録し、以降の参照をプライマリに向けるため
+    db.info[SESSION_USER_KEY] = current_user.salesperson_id
+    return current_user
+
+
+async def get_read_db(
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> AsyncGenerator[AsyncSession, None]:
+    """参照系API用のデータベースセッションを取得する.
+
+    読み取り専用レプリカが設定されている場合はレプリカのセッションを返す。
+    レプリカを利用できない場合、またはログインユーザーが直近に更新を
+    コミットしている場合は、プライマリのセッションを返す。
+
+    Args:
+        current_user: 現在のログインユーザー
+        db: プライマリのデータベースセッション
+
+    Yields:
+        AsyncSession: データベースセッション
+    """
+    async with replica_session(current_user.salesperson_id) as session:
+        yield session if session is not None else db
 
 
 async def get_current_active_user(
@@ -92,3 +155,38 @@ async def get_current_active_user(
             },
         )
     return current_user
+
+
+def verify_metrics_access(
+    authorization: Annotated[str | None, Header()] = None,
+) -> None:
+    """メトリクスの取得が許可されているか確認する.
+
+    METRICS_ENABLED が無効の場合はエンドポイントが無いものとして404を返す。
+    METRICS_TOKEN が設定されている場合は、Authorization ヘッダーの
+    Bearerトークンが一致しなければ401を返す。
+
+    Args:
+        authorization: Authorizationヘッダー
+
+    Raises:
+        HTTPException: 公開していない場合（404）、トークンが一致しない場合（401）
+    """
+    if not settings.metrics_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "NOT_FOUND",
+                    "message": "メトリクスは公開されていません",
+                },
+            },
+        )
+    if not settings.metrics_token:
+        return
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.encode(), settings.metrics_token.encode()
+    ):
+        raise _unauthorized("メトリクスの取得には認証が必要です")
@@ -0,0 +1,67 @@
+"""ETagによる条件付きGET.
+
+レスポンスの内容を決める値（更新日時・件数・バージョンなど）からETagを計算し、
+リクエストの If-None-Match と一致する場合は本文を取得・生成せずに
+304 Not Modified を返す。
+
+ETagは本文のバイト列ではなく内容を決める値から計算するため、
+弱いETag（W/"..."）とする。
+"""
+
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+def compute_etag(*parts: object) -> str:
+    """レスポンスの内容を決める値からETagを計算する.
+
+    Args:
+        parts: 内容を決める値（repr() が値を一意に表すもの）
+
+    Returns:
+        弱いETag
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match ヘッダーがETagに一致するかを弱い比較で判定する.
+
+    Args:
+        if_none_match: If-None-Match ヘッダーの値
+        etag: 現在のETag
+
+    Returns:
+        一致する場合True
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
+
+
+def not_modified(
+    request: Request, response: Response, etag: str, cache_control: str
+) -> Response | None:
+    """ETag・Cache-Controlを設定し、クライアントのキャッシュが有効なら304を返す.
+
+    Args:
+        request: リクエスト
+        response: 200応答に設定するヘッダーの出力先
+        etag: 現在のETag
+        cache_control: Cache-Control ヘッダーの値
+
+    Returns:
+        キャッシュが有効な場合は304レスポンス、それ以外はNone
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
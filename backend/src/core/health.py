@@ -0,0 +1,200 @@
+"""レディネスプローブ（依存先の確認）.
+
+Cloud Run などのプローブは、リクエストを受け付けられるか（レディネス）を
+定期的に確認する。本モジュールでは起動時のウォームアップの完了、データベースへの接続と
+コネクションプールの空きを確認し、確認結果を cache_seconds 秒の間保持する。
+
+- warm_up: track_warm_up() で登録したウォームアップ（マッパーの構成・
+  コネクションプールの事前接続など）が終わるまで利用不可とする。
+  完了時に保持中の結果を破棄し、次のプローブで利用可能を返す
+
+- database: エンジンから接続を取得して ``SELECT 1`` を実行する（接続の取得時に
+  pool_pre_ping による接続確認も行われる）。timeout_seconds 秒で打ち切る
+- db_pool: 使用中の接続数が、プールの上限（pool_size + max_overflow）に対して
+  saturation 以上であれば利用不可とする
+
+保持期間内のプローブは保持中の結果を返し、確認中に届いたプローブは
+実行中の確認の結果を待つ。プローブが集中しても、データベースへの問い合わせは
+保持期間ごとに最大1回となる。
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.config import settings
+from src.core.database import engine, pool_stats
+
+
+@dataclass(frozen=True)
+class DependencyCheck:
+    """依存先の確認結果.
+
+    Attributes:
+        ok: 利用できる場合True
+        latency_ms: 確認にかかった時間（ミリ秒）
+        detail: 利用できない理由・補足
+    """
+
+    ok: bool
+    latency_ms: float
+    detail: str | None = None
+
+
+@dataclass(frozen=True)
+class ReadinessReport:
+    """レディネスの確認結果.
+
+    Attributes:
+        checks: 依存先ごとの確認結果
+        checked_at: 確認した時刻（clock の値）
+    """
+
+    checks: dict[str, DependencyCheck]
+    checked_at: float
+
+    @property
+    def ready(self) -> bool:
+        """すべての依存先を利用できる場合True."""
+        return all(check.ok for check in self.checks.values())
+
+
+class ReadinessProbe:
+    """確認結果を一定時間保持するレディネスプローブ.
+
+    Attributes:
+        cache_seconds: 確認結果を保持する秒数
+        timeout_seconds: データベースの確認を打ち切る秒数
+        saturation: 利用不可とするプールの使用率（0〜1）
+    """
+
+    def __init__(
+        self,
+        target: AsyncEngine,
+        *,
+        cache_seconds: float,
+        timeout_seconds: float,
+        saturation: float,
+        max_overflow: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """プローブを初期化する.
+
+        Args:
+            target: 確認するエンジン
+            cache_seconds: 確認結果を保持する秒数
+            timeout_seconds: データベースの確認を打ち切る秒数
+            saturation: 利用不可とするプールの使用率（0〜1）
+            max_overflow: プールサイズを超えて確立できる接続数
+            clock: 現在時刻（秒）を返す関数
+        """
+        self.cache_seconds = cache_seconds
+        self.timeout_seconds = timeout_seconds
+        self.saturation = saturation
+        self._target = target
+        self._max_overflow = max_overflow
+        self._clock = clock
+        self._report: ReadinessReport | None = None
+        self._checking: asyncio.Task[ReadinessReport] | None = None
+        self._warm_up: asyncio.Task[None] | None = None
+
+    def cached(self) -> ReadinessReport | None:
+        """保持期間内の確認結果を返す（無い場合はNone）."""
+        report = self._report
+        if report is None or self._clock() - report.checked_at >= self.cache_seconds:
+            return None
+        return report
+
+    def clear(self) -> None:
+        """保持中の確認結果を破棄する."""
+        self._report = None
+
+    def track_warm_up(self, task: asyncio.Task[None]) -> None:
+        """完了するまで利用不可とするウォームアップを登録する.
+
+        Args:
+            task: ウォームアップのタスク
+        """
+        self._warm_up = task
+        self.clear()
+        task.add_done_callback(lambda _task: self.clear())
+
+    async def check(self) -> tuple[ReadinessReport, bool]:
+        """レディネスを確認する.
+
+        保持期間内の結果があればそれを返し、確認中であればその結果を待つ。
+
+        Returns:
+            確認結果と、保持中の結果を返した場合True
+        """
+        report = self.cached()
+        if report is not None:
+            return report, True
+        if self._checking is None or self._checking.done():
+            self._checking = asyncio.create_task(self._run())
+        # 待っているプローブが切断されても確認は中断しない
+        return await asyncio.shield(self._checking), False
+
+    async def _run(self) -> ReadinessReport:
+        """依存先を確認し、結果を保持する."""
+        checks = {
+            "warm_up": self._check_warm_up(),
+            "database": await self._check_database(),
+            "db_pool": self._check_pool(),
+        }
+        self._report = ReadinessReport(checks, self._clock())
+        return self._report
+
+    def _check_warm_up(self) -> DependencyCheck:
+        """起動時のウォームアップが終わっているか確認する."""
+        if self._warm_up is None or self._warm_up.done():
+            return DependencyCheck(True, 0.0)
+        return DependencyCheck(False, 0.0, "in progress")
+
+    async def _check_database(self) -> DependencyCheck:
+        """接続を取得して SELECT 1 を実行する."""
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout_seconds):
+                async with self._target.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+        except TimeoutError:
+            return DependencyCheck(False, _elapsed_ms(start), "timeout")
+        except Exception as e:
+            return DependencyCheck(False, _elapsed_ms(start), type(e).__name__)
+        return DependencyCheck(True, _elapsed_ms(start))
+
+    def _check_pool(self) -> DependencyCheck:
+        """使用中の接続数がプールの上限に近づいていないか確認する."""
+        start = time.perf_counter()
+        try:
+            stats = pool_stats(self._target)
+        except TypeError:
+            # 利用状況を記録しないプール（テスト用のエンジンなど）
+            return DependencyCheck(True, _elapsed_ms(start), "not instrumented")
+        capacity = stats.size + self._max_overflow
+        usage = stats.checked_out / capacity if capacity else 1.0
+        return DependencyCheck(
+            usage < self.saturation,
+            _elapsed_ms(start),
+            f"{stats.checked_out}/{capacity} connections in use",
+        )
+
+
+def _elapsed_ms(start: float) -> float:
+    """start からの経過時間（ミリ秒、小数第2位まで）を返す."""
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+# アプリケーション全体で共有するプローブ
+readiness_probe = ReadinessProbe(
+    engine,
+    cache_seconds=settings.readiness_cache_seconds,
+    timeout_seconds=settings.readiness_timeout_seconds,
+    saturation=settings.readiness_pool_saturation,
+    max_overflow=settings.db_max_overflow,
+)
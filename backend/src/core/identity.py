@@ -0,0 +1,140 @@
+"""ログインユーザー情報（アイデンティティ）のキャッシュ.
+
+認証済みリクエストごとに SALESPERSON を SELECT するとクエリ数が倍増するため、
+営業担当者の氏名・上長・有効フラグをプロセス内にキャッシュする。
+
+キャッシュは次の2つの方法で無効化される。
+
+- 同一プロセス内でのORM経由の更新・削除: コミット時に該当エントリを即座に削除
+- 他インスタンスでの更新: TTL（identity_cache_ttl_seconds）経過後に再読み込み
+
+これにより、無効化されたアカウントは最長でもTTL秒以内に拒否される。
+ORMを経由しない一括UPDATEなどを行う場合は identity_cache.invalidate() を
+明示的に呼び出すこと。
+"""
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapper, Session, object_session
+
+from src.core.cache import CacheStats, TTLCache
+from src.core.config import settings
+from src.models import Salesperson
+
+# コミット待ちの無効化対象IDをSession.infoに保持するキー
+_PENDING_KEY = "identity_cache_pending_invalidations"
+
+
+class CurrentUser(BaseModel):
+    """現在のログインユーザー情報.
+
+    キャッシュで複数リクエストから共有されるため変更不可とする。
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    salesperson_id: int
+    email: str | None = None
+    name: str | None = None
+    manager_id: int | None = None
+    is_active: bool = True
+
+
+class IdentityCache:
+    """営業担当者IDをキーとしたログインユーザー情報のキャッシュ."""
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        """キャッシュを初期化する.
+
+        Args:
+            max_size: 保持する最大件数
+            ttl_seconds: エントリの有効秒数
+        """
+        self._cache: TTLCache[int, CurrentUser] = TTLCache(
+            max_size=max_size, default_ttl=ttl_seconds
+        )
+
+    @property
+    def stats(self) -> CacheStats:
+        """キャッシュの統計情報."""
+        return self._cache.stats
+
+    async def get(self, db: AsyncSession, salesperson_id: int) -> CurrentUser | None:
+        """ログインユーザー情報を取得する.
+
+        キャッシュに存在しない場合のみデータベースから読み込む。
+
+        Args:
+            db: データベースセッション
+            salesperson_id: 営業担当者ID
+
+        Returns:
+            ログインユーザー情報（存在しない場合はNone）
+        """
+        user = self._cache.get(salesperson_id)
+        if user is not None:
+            return user
+
+        result = await db.execute(
+            select(
+                Salesperson.salesperson_id,
+                Salesperson.email,
+                Salesperson.name,
+                Salesperson.manager_id,
+                Salesperson.is_active,
+            ).where(Salesperson.salesperson_id == salesperson_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        user = CurrentUser.model_validate(row._asdict())
+        self._cache.set(salesperson_id, user)
+        return user
+
+    def invalidate(self, salesperson_id: int) -> None:
+        """指定した営業担当者のエントリを削除する.
+
+        Args:
+            salesperson_id: 営業担当者ID
+        """
+        self._cache.delete(salesperson_id)
+
+    def clear(self) -> None:
+        """全エントリを削除する."""
+        self._cache.clear()
+
+
+identity_cache = IdentityCache(
+    max_size=settings.identity_cache_max_size,
+    ttl_seconds=settings.identity_cache_ttl_seconds,
+)
+
+
+@event.listens_for(Salesperson, "after_update")
+@event.listens_for(Salesperson, "after_delete")
+def _mark_salesperson_changed(
+    _mapper: Mapper, _connection: object, target: Salesperson
+) -> None:
+    """更新・削除された営業担当者をコミット時の無効化対象として記録する.
+
+    フラッシュ時点で削除すると、コミット前に他リクエストが旧データを
+    再キャッシュする可能性があるため、削除はコミット後に行う。
+    """
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.salesperson_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    """コミットされた更新をキャッシュに反映する."""
+    for salesperson_id in session.info.pop(_PENDING_KEY, ()):
+        identity_cache.invalidate(salesperson_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    """ロールバックされた更新の無効化対象を破棄する."""
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,272 @@
+"""Prometheus形式のメトリクス.
+
+リクエストの処理時間・処理中の件数・ステータスコード別の件数・未処理例外の件数と、
+コネクションプールの利用状況を Prometheus のテキスト形式（/metrics）で返す。
+
+- MetricsMiddleware: リクエストごとにルート（パスのテンプレート）単位で集計する。
+  どのルートにも一致しないリクエストは route="unmatched" にまとめ、
+  ラベルの種類がパスの数だけ増えないようにする
+- render(): 集計とコネクションプールの利用状況をテキスト形式で返す
+
+集計はイベントループのスレッドからのみ更新するため、ロックを使わずに
+整数・浮動小数点数を直接加算する（加算の間に他のリクエストの処理は割り込まない）。
+"""
+
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from dataclasses import asdict
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.database import PoolStats, engine, pool_stats, replicas
+
+# 処理時間のヒストグラムのバケットの上限（秒）
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# テキスト形式のContent-Type
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# どのルートにも一致しないリクエストのルート名
+UNMATCHED_ROUTE = "unmatched"
+
+type RouteKey = tuple[str, str]
+
+
+class Histogram:
+    """バケットごとの件数と合計を保持するヒストグラム.
+
+    Attributes:
+        counts: バケットごとの件数（累積ではない。末尾は最大のバケットを超えた件数）
+        total: 観測値の合計
+    """
+
+    __slots__ = ("bounds", "counts", "total")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """ヒストグラムを初期化する.
+
+        Args:
+            bounds: バケットの上限（昇順）
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        """観測値を加える.
+
+        Args:
+            value: 観測値
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def cumulative(self) -> Iterator[tuple[str, int]]:
+        """バケットの上限（le）と、その上限以下の件数を順に返す."""
+        count = 0
+        for bound, n in zip((*self.bounds, float("inf")), self.counts, strict=True):
+            count += n
+            yield ("+Inf" if bound == float("inf") else repr(bound)), count
+
+
+class RequestMetrics:
+    """リクエストの集計.
+
+    Attributes:
+        in_flight: 処理中のリクエスト数
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """集計を初期化する.
+
+        Args:
+            buckets: 処理時間のヒストグラムのバケットの上限（秒）
+        """
+        self.buckets = buckets
+        self.in_flight = 0
+        self.latency: dict[RouteKey, Histogram] = {}
+        self.responses: dict[tuple[str, str, int], int] = {}
+        self.exceptions: dict[RouteKey, int] = {}
+
+    def observe(
+        self, method: str, route: str, status: int, seconds: float, *, failed: bool
+    ) -> None:
+        """完了したリクエストを集計に加える.
+
+        Args:
+            method: HTTPメソッド
+            route: ルート（パスのテンプレート）
+            status: ステータスコード
+            seconds: 処理時間（秒）
+            failed: 未処理の例外で終了した場合True
+        """
+        key = (method, route)
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = Histogram(self.buckets)
+        histogram.observe(seconds)
+        response_key = (method, route, status)
+        self.responses[response_key] = self.responses.get(response_key, 0) + 1
+        if failed:
+            self.exceptions[key] = self.exceptions.get(key, 0) + 1
+
+    def clear(self) -> None:
+        """集計をリセットする（処理中のリクエスト数は除く）."""
+        self.latency.clear()
+        self.responses.clear()
+        self.exceptions.clear()
+
+
+# アプリケーション全体で共有する集計
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """リクエストの処理時間・件数をルートごとに集計する."""
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics | None = None) -> None:
+        """ミドルウェアを初期化する.
+
+        Args:
+            app: ASGIアプリケーション
+            metrics: 集計先（省略時はアプリケーション全体の集計）
+        """
+        self.app = app
+        self.metrics = metrics or request_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """リクエストを処理し、処理時間とステータスコードを集計する."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics = self.metrics
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        failed = True
+        try:
+            await self.app(scope, receive, send_with_status)
+            failed = False
+        finally:
+            metrics.in_flight -= 1
+            route = scope.get("route")
+            metrics.observe(
+                scope["method"],
+                route.path if route is not None else UNMATCHED_ROUTE,
+                status,
+                time.perf_counter() - start,
+                failed=failed,
+            )
+
+
+def _escape(value: object) -> str:
+    """ラベルの値をテキスト形式の規則でエスケープする."""
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _labels(**labels: object) -> str:
+    """ラベルをテキスト形式で返す."""
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _pool_lines(pools: dict[str, PoolStats]) -> list[str]:
+    """コネクションプールの利用状況の行を返す."""
+    lines: list[str] = []
+    for name, kind, help_text, field_name, scale in (
+        ("db_pool_size", "gauge", "Configured pool size.", "size", 1),
+        ("db_pool_checked_out", "gauge", "Connections in use.", "checked_out", 1),
+        ("db_pool_checked_in", "gauge", "Idle connections.", "checked_in", 1),
+        (
+            "db_pool_overflow",
+            "gauge",
+            "Connections beyond the pool size (negative while slots are free).",
+            "overflow",
+            1,
+        ),
+        (
+            "db_pool_acquisitions_total",
+            "counter",
+            "Connection checkouts.",
+            "acquisitions",
+            1,
+        ),
+        (
+            "db_pool_wait_seconds_max",
+            "gauge",
+            "Longest connection checkout.",
+            "wait_ms_max",
+            0.001,
+        ),
+    ):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for pool, stats in pools.items():
+            value = asdict(stats)[field_name] * scale
+            lines.append(f"{name}{{{_labels(pool=pool)}}} {value}")
+    return lines
+
+
+def _collect_pools() -> dict[str, PoolStats]:
+    """プライマリ・レプリカのコネクションプールの利用状況を返す."""
+    pools: dict[str, PoolStats] = {}
+    for name, target in (
+        ("primary", engine),
+        *((f"replica{n}", e) for n, e in enumerate(replicas.engines)),
+    ):
+        try:
+            pools[name] = pool_stats(target)
+        except TypeError:
+            # 利用状況を記録しないプール（テスト用のエンジンなど）
+            continue
+    return pools
+
+
+def render(metrics: RequestMetrics | None = None) -> str:
+    """集計とコネクションプールの利用状況を Prometheus のテキスト形式で返す.
+
+    Args:
+        metrics: 集計（省略時はアプリケーション全体の集計）
+
+    Returns:
+        テキスト形式のメトリクス
+    """
+    metrics = metrics or request_metrics
+    lines = [
+        "# HELP http_requests_in_flight Requests currently being processed.",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {metrics.in_flight}",
+        "# HELP http_request_duration_seconds Request latency by route.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), histogram in sorted(metrics.latency.items()):
+        labels = _labels(method=method, route=route)
+        lines += [
+            f'http_request_duration_seconds_bucket{{{labels},le="{le}"}} {count}'
+            for le, count in histogram.cumulative()
+        ]
+        lines += [
+            f"http_request_duration_seconds_sum{{{labels}}} {histogram.total}",
+            f"http_request_duration_seconds_count{{{labels}}} {sum(histogram.counts)}",
+        ]
+    lines += [
+        "# HELP http_responses_total Responses by route and status code.",
+        "# TYPE http_responses_total counter",
+    ]
+    for (method, route, status), count in sorted(metrics.responses.items()):
+        labels = _labels(method=method, route=route, status=status)
+        lines.append(f"http_responses_total{{{labels}}} {count}")
+    lines += [
+        "# HELP http_exceptions_total Requests that ended with an unhandled exception.",
+        "# TYPE http_exceptions_total counter",
+    ]
+    for (method, route), count in sorted(metrics.exceptions.items()):
+        labels = _labels(method=method, route=route)
+        lines.append(f"http_exceptions_total{{{labels}}} {count}")
+    lines += _pool_lines(_collect_pools())
+    return "\n".join(lines) + "\n"
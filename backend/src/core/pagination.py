@@ -0,0 +1,52 @@
+"""カーソル（キーセット）ページネーション.
+
+一覧の並び順キー（例: (report_date, report_id)）をクライアントに不透明な
+文字列として返し、次ページは「そのキーより後ろ」の条件で取得する。
+OFFSETによる読み飛ばしを伴わないため、深いページでも1ページ目と同じコストで取得できる。
+"""
+
+import base64
+import binascii
+import json
+
+
+class InvalidCursorError(ValueError):
+    """カーソル文字列が不正な場合の例外."""
+
+
+def encode_cursor(*values: str | int) -> str:
+    """並び順キーをカーソル文字列に変換する.
+
+    Args:
+        values: 並び順キーの値（JSONで表現できる文字列・整数）
+
+    Returns:
+        URLセーフなカーソル文字列
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list[str | int]:
+    """カーソル文字列を並び順キーに復元する.
+
+    Args:
+        cursor: encode_cursor で生成したカーソル文字列
+        size: キーの要素数
+
+    Returns:
+        並び順キーの値のリスト
+
+    Raises:
+        InvalidCursorError: 復元できない、または要素数が一致しない場合
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError(cursor) from e
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError(cursor)
+    if not all(isinstance(v, str | int) and not isinstance(v, bool) for v in values):
+        raise InvalidCursorError(cursor)
+    return values
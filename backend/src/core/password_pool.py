@@ -0,0 +1,145 @@
+"""パスワードハッシュ処理用ワーカープール.
+
+bcryptによるハッシュ化・検証は1回あたり数百ミリ秒CPUを占有するため、
+イベントループ上で直接実行するとその間すべてのリクエスト処理が停止する。
+本モジュールはこれらの処理を上限付きのスレッドプールで実行し、
+実行中・待機中の件数が上限に達した場合は即座に拒否する。
+"""
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from src.core.config import settings
+from src.core.security import get_password_hash, verify_password
+
+
+class PasswordPoolSaturatedError(Exception):
+    """ワーカープールが飽和している場合に送出される例外."""
+
+
+class PasswordHashPool:
+    """上限付きのパスワードハッシュ処理プール.
+
+    bcryptはハッシュ計算中にGILを解放するため、スレッドプールで
+    実行することでイベントループをブロックせずに並列処理できる。
+
+    Attributes:
+        max_workers: 同時に実行するスレッド数
+        max_queue: 実行待ちとして受け付ける最大件数
+        rejected_count: 飽和により拒否した累計件数
+    """
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        """プールを初期化する.
+
+        Args:
+            max_workers: 同時に実行するスレッド数
+            max_queue: 実行待ちとして受け付ける最大件数
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.rejected_count = 0
+        self._in_flight = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def capacity(self) -> int:
+        """実行中と実行待ちを合わせた受付上限."""
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        """実行中・実行待ちの件数."""
+        return self._in_flight
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """スレッドプールを取得する（初回呼び出し時に生成）."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash",
+            )
+        return self._executor
+
+    async def run[T](self, func: Callable[..., T], *args: object) -> T:
+        """関数をワーカースレッドで実行する.
+
+        件数の増減はイベントループ上でのみ行うためロックは不要。
+        呼び出し元がキャンセルされても実行中のスレッドは止まらないため、
+        件数はスレッドでの実行が終わった時点（実行前にキャンセルされた場合は
+        その時点）で減らす。
+
+        Args:
+            func: 実行する関数
+            *args: 関数に渡す引数
+
+        Returns:
+            関数の戻り値
+
+        Raises:
+            PasswordPoolSaturatedError: 受付上限に達している場合
+        """
+        if self._in_flight >= self.capacity:
+            self.rejected_count += 1
+            raise PasswordPoolSaturatedError
+        loop = asyncio.get_running_loop()
+        future = self._get_executor().submit(func, *args)
+        self._in_flight += 1
+
+        def release(_future: Future[T]) -> None:
+            # ワーカースレッドから呼ばれるため、件数はイベントループ上で減らす
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._release)
+
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self) -> None:
+        """実行を終えた処理の分だけ件数を減らす."""
+        self._in_flight -= 1
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """パスワードをワーカースレッドで検証する.
+
+        Args:
+            plain_password: 平文パスワード
+            hashed_password: ハッシュ化されたパスワード
+
+        Returns:
+            パスワードが一致する場合True
+
+        Raises:
+            PasswordPoolSaturatedError: 受付上限に達している場合
+        """
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """パスワードをワーカースレッドでハッシュ化する.
+
+        Args:
+            password: 平文パスワード
+
+        Returns:
+            ハッシュ化されたパスワード
+
+        Raises:
+            PasswordPoolSaturatedError: 受付上限に達している場合
+        """
+        return await self.run(get_password_hash, password)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """スレッドプールを停止する.
+
+        Args:
+            wait: 実行中の処理の完了を待つ場合True
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+password_pool = PasswordHashPool(
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+)
@@ -0,0 +1,196 @@
+"""リクエストごとのSQL計測.
+
+エンジンのイベント（before_cursor_execute・after_cursor_execute）で各SQL文の
+実行時間を計り、実行中のリクエストに文数・合計時間・最も遅い文を集計する。
+集計先はコンテキスト変数で受け渡すため、プライマリ・レプリカのいずれの
+エンジンで実行した文も、そのリクエストの集計となる。
+
+- QueryStatsMiddleware: リクエストごとに集計し、Server-Timing ヘッダーと
+  ログに出力する。文数・合計時間・1文の時間のいずれかがしきい値
+  （slow_request_query_count・slow_request_db_ms・slow_query_ms）を超えた
+  リクエストは警告として出力する
+- track_queries(): 任意の範囲の文を集計する（テストで文数の上限を確認する場合など）
+
+集計は入れ子にでき、内側の範囲で実行した文は外側の範囲にも数える。
+"""
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExceptionContext
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 集計中の範囲（外側から順）
+_active: ContextVar[tuple["QueryStats", ...]] = ContextVar("query_stats", default=())
+# 実行中の文の開始時刻のConnection.infoのキー
+_START_KEY = "query_stats_start"
+# ログに出力する文の最大文字数
+_STATEMENT_MAX_LENGTH = 200
+
+
+@dataclass
+class QueryStats:
+    """SQL文の集計.
+
+    Attributes:
+        count: 実行した文の数
+        total_ms: 実行時間の合計（ミリ秒）
+        slowest_ms: 最も遅い文の実行時間（ミリ秒）
+        slowest_statement: 最も遅い文（先頭 _STATEMENT_MAX_LENGTH 文字）
+    """
+
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        """実行した文を集計に加える.
+
+        Args:
+            statement: SQL文
+            elapsed_ms: 実行時間（ミリ秒）
+        """
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms >= self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = " ".join(statement.split())[:_STATEMENT_MAX_LENGTH]
+
+    def server_timing(self) -> str:
+        """Server-Timing ヘッダーの値を返す."""
+        return (
+            f'db;dur={self.total_ms:.1f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_ms:.1f}"
+        )
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """範囲内で実行したSQL文を集計する.
+
+    Yields:
+        範囲内の集計（範囲の終了まで更新される）
+    """
+    stats = QueryStats()
+    token = _active.set((*_active.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(
+    conn: Connection,
+    _cursor: Any,
+    _statement: str,
+    _parameters: Any,
+    _context: Any,
+    _executemany: bool,
+) -> None:
+    """集計中であれば文の開始時刻を記録する."""
+    if _active.get():
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(
+    conn: Connection,
+    _cursor: Any,
+    statement: str,
+    _parameters: Any,
+    _context: Any,
+    _executemany: bool,
+) -> None:
+    """文の実行時間を集計中の全範囲に加える."""
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+    for stats in _active.get():
+        stats.record(statement, elapsed_ms)
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_timer(context: ExceptionContext) -> None:
+    """失敗した文の開始時刻を破棄する."""
+    if context.connection is not None:
+        starts = context.connection.info.get(_START_KEY)
+        if starts:
+            starts.pop()
+
+
+class QueryStatsMiddleware:
+    """リクエストごとのSQL文の数・時間を Server-Timing ヘッダーとログに出力する."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """ミドルウェアを初期化する.
+
+        Args:
+            app: ASGIアプリケーション
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """リクエストを処理し、実行したSQL文を集計する."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                # ストリーミング応答ではヘッダー送信までの文のみを含む
+                if message["type"] == "http.response.start" and stats.count:
+                    message.setdefault("headers", []).append(
+                        (b"server-timing", stats.server_timing().encode())
+                    )
+                await send(message)
+
+            start = time.perf_counter()
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                _log_request(scope, stats, (time.perf_counter() - start) * 1000)
+
+
+def _log_request(scope: Scope, stats: QueryStats, elapsed_ms: float) -> None:
+    """リクエストの集計をログに出力する（しきい値を超えた場合は警告）."""
+    slow = (
+        stats.count > settings.slow_request_query_count
+        or stats.total_ms > settings.slow_request_db_ms
+        or stats.slowest_ms > settings.slow_query_ms
+    )
+    level = logging.WARNING if slow else logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return
+    route = scope.get("route")
+    path = getattr(route, "path", scope["path"])
+    logger.log(
+        level,
+        "%s %s: %d queries, db %.1fms (slowest %.1fms), total %.1fms",
+        scope["method"],
+        path,
+        stats.count,
+        stats.total_ms,
+        stats.slowest_ms,
+        elapsed_ms,
+        extra={
+            "method": scope["method"],
+            "route": path,
+            "elapsed_ms": round(elapsed_ms, 1),
+            "slow": slow,
+            "db": asdict(stats),
+        },
+    )
@@ -0,0 +1,59 @@
+"""pydanticモデルを直接JSONにするレスポンス.
+
+FastAPIはエンドポイントが返したモデルを response_model で再検証し、
+JSON互換のdict・listに変換してから標準のjsonモジュールで文字列化する。
+一覧のように要素の多いレスポンスではこの変換が処理時間の多くを占める。
+
+ModelJSONResponse は構築済みのモデルをpydantic-coreのシリアライザで直接
+JSONのバイト列にするため、再検証と中間のdict・listの生成を行わない。
+出力はFastAPIの既定の経路と同一のバイト列となる（エイリアス名を使用し、
+区切りの空白を含まず、非ASCII文字をエスケープしない）。
+
+エンドポイントが型どおりのモデルを組み立てていることが前提となるため、
+レスポンスの大きい参照系APIで個別に使用する。response_model の宣言は
+OpenAPIのスキーマとして残す。
+"""
+
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class ModelJSONResponse(JSONResponse):
+    """pydanticモデルを再検証せずにJSONへ直列化するレスポンス."""
+
+    def render(self, content: Any) -> bytes:
+        """モデルはpydantic-coreのシリアライザで、それ以外は既定の方法でJSONにする.
+
+        Args:
+            content: レスポンスの内容
+
+        Returns:
+            JSONのバイト列
+        """
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content, by_alias=True)
+        return super().render(content)
+
+
+def model_response(
+    content: BaseModel, response: Response | None = None
+) -> ModelJSONResponse:
+    """モデルをJSONレスポンスにする.
+
+    Args:
+        content: レスポンスの内容（SuccessResponse など）
+        response: エンドポイントに注入されたレスポンス（設定済みのヘッダー・
+            ステータスコードを引き継ぐ）
+
+    Returns:
+        JSONレスポンス
+    """
+    json_response = ModelJSONResponse(content)
+    if response is not None:
+        if response.status_code:
+            json_response.status_code = response.status_code
+        json_response.headers.raw.extend(response.headers.raw)
+    return json_response
@@ -1,22 +1,40 @@
 """セキュリティ関連ユーティリティ."""
 
 from datetime import UTC, datetime, timedelta
+from functools import cache
+from typing import TYPE_CHECKING
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from src.core.config import settings
 
-# パスワードハッシュ化設定
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+@cache
+def pwd_context() -> "CryptContext":
+    """パスワードハッシュ化設定を返す.
+
+    passlib の読み込みとbcryptのバックエンドの選択は、起動時間を短くするため
+    初回の使用時（または起動後のウォームアップ）まで遅らせる。
+    """
+    from passlib.context import CryptContext
+
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    context.handler().get_backend()
+    return context
 
 
 class TokenData(BaseModel):
     """JWTトークンのペイロードデータ."""
 
+    model_config = ConfigDict(frozen=True)
+
     salesperson_id: int | None = None
     email: str | None = None
+    exp: int | None = None  # 有効期限（エポック秒）
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -29,7 +47,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         パスワードが一致する場合True
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
@@ -41,7 +59,7 @@ def get_password_hash(password: str) -> str:
     Returns:
         ハッシュ化されたパスワード
     """
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -58,10 +76,10 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     if expires_delta:
         expire = datetime.now(UTC) + expires_delta
     else:
-        expire = datetime.now(UTC) + timedelta(seconds=settings.JWT_EXPIRE_SECONDS)
+        expire = datetime.now(UTC) + timedelta(seconds=settings.jwt_expire_seconds)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(
-        to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
+        to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm
     )
     return encoded_jwt
 
@@ -77,12 +95,13 @@ def decode_access_token(token: str) -> TokenData | None:
     """
     try:
         payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
+            token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm]
         )
         salesperson_id_str: str | None = payload.get("sub")
         email: str | None = payload.get("email")
+        exp: int | None = payload.get("exp")
         if salesperson_id_str is None:
             return None
-        return TokenData(salesperson_id=int(salesperson_id_str), email=email)
+        return TokenData(salesperson_id=int(salesperson_id_str), email=email, exp=exp)
     except JWTError:
         return None
@@ -1,14 +1,79 @@
 """営業日報システム FastAPI エントリーポイント."""
 
-from fastapi import FastAPI
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy.orm import configure_mappers
+
+from src.api.v1 import auth, customers, dashboard, reports, salespersons
+from src.core import health
+from src.core.config import settings
+from src.core.database import close_db, pool_stats, replicas, warm_up_pool
+from src.core.dependencies import verify_metrics_access
+from src.core.metrics import CONTENT_TYPE, MetricsMiddleware, render
+from src.core.password_pool import password_pool
+from src.core.query_stats import QueryStatsMiddleware
+from src.core.security import pwd_context
+from src.services.autosave import autosave_buffer
+from src.services.outbox import outbox_worker
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up() -> None:
+    """初回のリクエストで行われる初期化を前もって済ませる.
+
+    マッパーの構成、passlib・bcryptのバックエンドの読み込み、
+    コネクションプールの接続の確立を行う。マッパーの構成とbcryptの読み込みは
+    イベントループを止めないよう別スレッドで行う。
+    """
+    try:
+        await asyncio.to_thread(configure_mappers)
+        await asyncio.to_thread(pwd_context)
+        await warm_up_pool(count=settings.db_pool_warmup)
+        for replica in replicas.engines:
+            await warm_up_pool(replica, count=settings.db_pool_warmup)
+    except Exception:
+        logger.exception("startup warm-up failed")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """起動時に通知の配信・自動保存の書き込みを開始し、ウォームアップを行う.
+
+    ウォームアップはバックグラウンドで行い、完了するまでレディネス
+    （/api/v1/health/ready）は503を返す。ロードバランサーはウォームアップの
+    完了後にリクエストを振り分けるため、利用者のリクエストは接続の確立を待たない。
+    終了時は書き込み待ちの自動保存を書き込んでから、ワーカーと接続を解放する。
+    """
+    warming_up = asyncio.create_task(warm_up())
+    health.readiness_probe.track_warm_up(warming_up)
+    outbox_worker.start()
+    autosave_buffer.start()
+    try:
+        yield
+    finally:
+        warming_up.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warming_up
+        await autosave_buffer.stop()
+        await outbox_worker.stop()
+        password_pool.shutdown()
+        await close_db()
 
-from src.api.v1 import auth
 
 app = FastAPI(
     title="営業日報システム API",
     description="営業担当者が日々の顧客訪問活動を報告するシステム",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS設定
@@ -19,6 +84,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# リクエストごとのSQL文の数・時間を Server-Timing ヘッダーとログに出力
+app.add_middleware(QueryStatsMiddleware)
+# ルートごとの処理時間・件数を集計（/metrics）。最も外側で全体の処理時間を計る
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/")
@@ -28,10 +97,54 @@ async def root() -> dict[str, str]:
 
 
 @app.get("/api/v1/health")
+@app.get("/api/v1/health/live")
 async def health_check() -> dict[str, str]:
-    """APIヘルスチェック."""
+    """APIヘルスチェック（ライブネス。依存先は確認しない）."""
     return {"status": "ok"}
 
 
+@app.get("/api/v1/health/ready")
+async def readiness_check() -> JSONResponse:
+    """レディネス（ウォームアップの完了・データベース接続・プールの空き）の確認.
+
+    利用できない依存先がある場合は503を返す。確認結果は
+    READINESS_CACHE_SECONDS 秒の間保持する。
+    """
+    report, cached = await health.readiness_probe.check()
+    return JSONResponse(
+        {
+            "status": "ready" if report.ready else "unavailable",
+            "cached": cached,
+            "checks": {name: asdict(check) for name, check in report.checks.items()},
+        },
+        status_code=200 if report.ready else 503,
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+@app.get("/api/v1/health/db-pool")
+async def db_pool_status() -> dict[str, int | float]:
+    """コネクションプールの利用状況（使用中・オーバーフロー・取得時間）."""
+    return asdict(pool_stats())
+
+
+@app.get(
+    "/metrics",
+    include_in_schema=False,
+    dependencies=[Depends(verify_metrics_access)],
+)
+async def metrics() -> PlainTextResponse:
+    """Prometheus形式のメトリクス（処理時間・処理中の件数・コネクションプール）.
+
+    METRICS_ENABLED で公開した場合のみ返す。METRICS_TOKEN を設定した場合は
+    Bearerトークンを要求する。
+    """
+    return PlainTextResponse(render(), media_type=CONTENT_TYPE)
+
+
 # APIルーターを登録
 app.include_router(auth.router, prefix="/api/v1")
+app.include_router(reports.router, prefix="/api/v1")
+app.include_router(dashboard.router, prefix="/api/v1")
+app.include_router(customers.router, prefix="/api/v1")
+app.include_router(salespersons.router, prefix="/api/v1")
@@ -3,7 +3,10 @@
 from .base import Base, TimestampMixin
 from .customer import Customer
 from .daily_report import DailyReport, ReportStatus
+from .data_version import DataVersion
+from .outbox_event import OutboxEvent
 from .report_comment import ReportComment
+from .report_read_marker import ReportReadMarker
 from .salesperson import Salesperson
 from .visit_record import VisitRecord
 
@@ -11,9 +14,12 @@ __all__ = [
     "Base",
     "TimestampMixin",
     "Customer",
+    "DataVersion",
     "DailyReport",
     "ReportStatus",
+    "OutboxEvent",
     "ReportComment",
+    "ReportReadMarker",
     "Salesperson",
     "VisitRecord",
 ]
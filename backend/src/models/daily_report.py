@@ -4,7 +4,7 @@ import enum
 from datetime import date
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, Enum, ForeignKey, Integer, Text, UniqueConstraint
+from sqlalchemy import Date, Enum, ForeignKey, Index, Integer, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -27,11 +27,23 @@ class DailyReport(Base, TimestampMixin):
     """日報モデル。
 
     営業担当者ごと・日付ごとに1レコードを持つ。
+
+    version は日報と訪問記録の内容の版数で、ORM経由の更新ごとに1ずつ増える。
+    更新は読み込んだ時点の版数を条件とする（UPDATE ... WHERE version = 読込時の版数）
+    ため、行ロックを取らずに同時更新を検出できる。他の更新が先にコミットされて
+    いた場合は StaleDataError となる。
     """
 
     __tablename__ = "DAILY_REPORT"
     __table_args__ = (
         UniqueConstraint("salesperson_id", "report_date", name="UK_DAILY_REPORT_DATE"),
+        # 日報一覧のステータス絞り込み（担当者IN + ステータス + 日付範囲・日付順）用
+        Index(
+            "IX_DAILY_REPORT_SALESPERSON_STATUS_DATE",
+            "salesperson_id",
+            "status",
+            "report_date",
+        ),
     )
 
     report_id: Mapped[int] = mapped_column(
@@ -53,6 +65,9 @@ class DailyReport(Base, TimestampMixin):
         default=ReportStatus.DRAFT,
         index=True,
     )
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     # 営業担当者とのリレーション
     salesperson: Mapped["Salesperson"] = relationship(
@@ -0,0 +1,21 @@
+"""マスタデータの版数モデル定義。"""
+
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class DataVersion(Base):
+    """マスタデータの版数モデル。
+
+    テーブルごとに1行を持ち、ORM経由でそのテーブルの登録・更新・削除を
+    フラッシュするたびに同じトランザクション内で版数を加算する。
+    主キーの1行を参照するだけで変更の有無を判定できるため、ETagの計算や
+    メモリ上のインデックスの鮮度の確認に用いる。
+    """
+
+    __tablename__ = "DATA_VERSION"
+
+    table_name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
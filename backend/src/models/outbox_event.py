@@ -0,0 +1,44 @@
+"""通知イベント（アウトボックス）モデル定義。"""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class OutboxEvent(Base):
+    """通知イベントモデル。
+
+    日報の提出・確認、コメントの投稿など通知が必要な操作と同じトランザクションで
+    登録し、バックグラウンドのワーカーが通知先へ配信する。
+    配信に失敗したイベントは available_at を遅らせて再試行する。
+    available_at・delivered_at はアプリケーションの時刻で記録する。
+    """
+
+    __tablename__ = "OUTBOX_EVENT"
+    __table_args__ = (
+        # 未配信イベントの取得（未配信 + 配信可能日時 + イベントID順）用
+        Index("IX_OUTBOX_EVENT_PENDING", "delivered_at", "available_at", "event_id"),
+    )
+
+    event_id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+    )
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.now
+    )
+    delivered_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+    )
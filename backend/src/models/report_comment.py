@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -20,6 +20,16 @@ class ReportComment(Base):
     """
 
     __tablename__ = "REPORT_COMMENT"
+    __table_args__ = (
+        # 日報ごとのコメント取得・未読判定（report_id + 投稿日時、投稿者）用。
+        # report_id 単独のインデックスを兼ねる
+        Index(
+            "IX_REPORT_COMMENT_REPORT_CREATED",
+            "report_id",
+            "created_at",
+            "commenter_id",
+        ),
+    )
 
     comment_id: Mapped[int] = mapped_column(
         Integer,
@@ -30,7 +40,6 @@ class ReportComment(Base):
         Integer,
         ForeignKey("DAILY_REPORT.report_id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     commenter_id: Mapped[int] = mapped_column(
         Integer,
@@ -0,0 +1,45 @@
+"""日報既読マーカーモデル定義。"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ReportReadMarker(Base):
+    """日報既読マーカーモデル。
+
+    閲覧者ごと・日報ごとに、既読にした最後のコメントIDと未読コメント数を持つ。
+    未読コメント数はコメントの登録・削除時に更新されるため、一覧やダッシュボードでは
+    コメントを走査せずに未読の有無・件数を取得できる。
+    マーカーが存在しない場合は未読コメントなしとして扱う。
+    """
+
+    __tablename__ = "REPORT_READ_MARKER"
+    __table_args__ = (
+        # ダッシュボードの未読コメント数（閲覧者ごとの未読数の合計）用
+        Index("IX_REPORT_READ_MARKER_UNREAD", "salesperson_id", "unread_count"),
+    )
+
+    salesperson_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("SALESPERSON.salesperson_id"),
+        primary_key=True,
+    )
+    report_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("DAILY_REPORT.report_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    last_read_comment_id: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+    unread_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
@@ -0,0 +1,48 @@
+"""日報コメント関連スキーマ."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class CommentItem(BaseModel):
+    """コメント一覧の1件."""
+
+    comment_id: int
+    commenter_id: int
+    commenter_name: str
+    comment_text: str
+    created_at: datetime
+
+
+class CommentListData(BaseModel):
+    """コメント一覧."""
+
+    items: list[CommentItem]
+
+
+class CommentCreate(BaseModel):
+    """コメント投稿リクエスト."""
+
+    comment_text: str = Field(min_length=1, max_length=2000)
+
+
+class CommentCreateData(BaseModel):
+    """コメント投稿成功時のデータ."""
+
+    comment_id: int
+    message: str
+
+
+class CommentReadUpdate(BaseModel):
+    """コメントの既読記録リクエスト."""
+
+    last_comment_id: int = Field(ge=0)
+
+
+class CommentReadData(BaseModel):
+    """コメントの既読記録成功時のデータ."""
+
+    report_id: int
+    last_read_comment_id: int
+    unread_count: int
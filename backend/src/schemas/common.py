@@ -24,7 +24,55 @@ class ErrorResponse(BaseModel):
     error: ErrorDetail
 
 
+class Pagination(BaseModel):
+    """ページネーション情報."""
+
+    current_page: int
+    per_page: int
+    total_count: int
+    total_pages: int
+
+
+class PaginatedData[T](BaseModel):
+    """ページネーション付き一覧データ."""
+
+    items: list[T]
+    pagination: Pagination
+
+
+class CursorPagination(BaseModel):
+    """カーソルページネーション情報.
+
+    total_count は要求された場合のみ返す（未要求時はNone）。
+    """
+
+    per_page: int
+    next_cursor: str | None
+    has_next: bool
+    total_count: int | None = None
+
+
+class CursorPaginatedData[T](BaseModel):
+    """カーソルページネーション付き一覧データ."""
+
+    items: list[T]
+    pagination: CursorPagination
+
+
 class MessageData(BaseModel):
     """メッセージデータ."""
 
     message: str
+
+
+class SelectItem(BaseModel):
+    """セレクトボックスの選択肢."""
+
+    value: int
+    label: str
+
+
+class SelectListData(BaseModel):
+    """セレクトボックスの選択肢一覧."""
+
+    items: list[SelectItem]
@@ -0,0 +1,20 @@
+"""顧客関連スキーマ."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class CustomerItem(BaseModel):
+    """顧客一覧の1行."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    customer_id: int
+    company_name: str
+    contact_name: str | None
+    phone: str | None
+    address: str | None
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
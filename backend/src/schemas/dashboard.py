@@ -0,0 +1,35 @@
+"""ダッシュボード関連スキーマ."""
+
+from datetime import date
+
+from pydantic import BaseModel
+
+from src.models import ReportStatus
+
+
+class TodayReport(BaseModel):
+    """本日の日報の作成状況."""
+
+    exists: bool
+    report_id: int | None = None
+    status: ReportStatus | None = None
+    status_label: str | None = None
+
+
+class RecentReport(BaseModel):
+    """直近の日報."""
+
+    report_id: int
+    report_date: date
+    status: ReportStatus
+    status_label: str
+    visit_count: int
+    comment_count: int
+
+
+class DashboardData(BaseModel):
+    """ダッシュボード情報."""
+
+    today_report: TodayReport
+    unread_comment_count: int
+    recent_reports: list[RecentReport]
@@ -0,0 +1,151 @@
+"""日報関連スキーマ."""
+
+from datetime import date, datetime, time
+from typing import Annotated
+
+from pydantic import BaseModel, Field, PlainSerializer, field_validator
+
+from src.models import ReportStatus
+from src.schemas.comment import CommentItem
+
+# ステータスの表示名
+STATUS_LABELS: dict[ReportStatus, str] = {
+    ReportStatus.DRAFT: "下書き",
+    ReportStatus.SUBMITTED: "提出済",
+    ReportStatus.CONFIRMED: "確認済",
+}
+
+# 訪問時刻は "HH:MM" 形式で返す
+type VisitTime = Annotated[
+    time, PlainSerializer(lambda t: t.strftime("%H:%M"), return_type=str)
+]
+
+
+class ReportListItem(BaseModel):
+    """日報一覧の1行."""
+
+    report_id: int
+    report_date: date
+    salesperson_id: int
+    salesperson_name: str
+    status: ReportStatus
+    status_label: str
+    visit_count: int
+    comment_count: int
+    has_unread_comments: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+class VisitRecordItem(BaseModel):
+    """日報詳細の訪問記録."""
+
+    visit_id: int
+    customer_id: int
+    customer_name: str
+    visit_time: VisitTime | None
+    visit_content: str
+    display_order: int
+
+
+class ReportDetail(BaseModel):
+    """日報詳細."""
+
+    report_id: int
+    report_date: date
+    salesperson_id: int
+    salesperson_name: str
+    status: ReportStatus
+    status_label: str
+    problem: str | None
+    plan: str | None
+    visit_records: list[VisitRecordItem]
+    comments: list[CommentItem]
+    can_edit: bool
+    can_confirm: bool
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class VisitRecordInput(BaseModel):
+    """日報更新時の訪問記録."""
+
+    visit_id: int | None = None
+    customer_id: int
+    visit_time: time | None = None
+    visit_content: str = Field(min_length=1, max_length=2000)
+    display_order: int | None = None
+
+
+class ReportUpdate(BaseModel):
+    """日報更新リクエスト.
+
+    version には取得時の日報の版数を指定する。
+    """
+
+    report_date: date
+    problem: str | None = Field(default=None, max_length=4000)
+    plan: str | None = Field(default=None, max_length=4000)
+    status: ReportStatus = ReportStatus.DRAFT
+    visit_records: list[VisitRecordInput] = []
+    version: int
+
+
+class ReportUpdateData(BaseModel):
+    """日報更新成功時のデータ."""
+
+    report_id: int
+    status: ReportStatus
+    version: int
+    message: str
+
+
+class ReportAutosave(BaseModel):
+    """下書きの自動保存リクエスト.
+
+    指定した項目のみ更新する。version には取得時の日報の版数、または
+    直前の自動保存の応答の版数を指定する。problem・plan は null で空にできるが、
+    visit_records は省略のみ可能で null は受け付けない（空にする場合は [] を指定する）。
+    """
+
+    problem: str | None = Field(default=None, max_length=4000)
+    plan: str | None = Field(default=None, max_length=4000)
+    visit_records: list[VisitRecordInput] | None = Field(default=None)
+    version: int
+
+    @field_validator("visit_records")
+    @classmethod
+    def reject_null_visit_records(
+        cls, value: list[VisitRecordInput] | None
+    ) -> list[VisitRecordInput]:
+        """明示的な null を拒否する（省略時の既定値は検証されない）."""
+        if value is None:
+            raise ValueError("visit_records に null は指定できません")
+        return value
+
+
+class ReportAutosaveData(BaseModel):
+    """自動保存の受付時のデータ."""
+
+    report_id: int
+    version: int
+    message: str
+
+
+class ReportVersionCheck(BaseModel):
+    """日報の提出・確認リクエスト（任意）.
+
+    version を指定した場合、日報の版数が一致するときのみ操作する。
+    """
+
+    version: int
+
+
+class ReportStatusData(BaseModel):
+    """日報の提出・確認成功時のデータ."""
+
+    report_id: int
+    status: ReportStatus
+    version: int
+    message: str
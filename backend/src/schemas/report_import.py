@@ -0,0 +1,54 @@
+"""日報一括インポート関連スキーマ."""
+
+from datetime import date, datetime, time
+
+from pydantic import BaseModel, Field
+
+from src.models import ReportStatus
+
+
+class ImportVisit(BaseModel):
+    """インポートする訪問記録."""
+
+    customer_id: int
+    visit_content: str = Field(min_length=1)
+    visit_time: time | None = None
+    display_order: int | None = None
+
+
+class ImportComment(BaseModel):
+    """インポートするコメント."""
+
+    commenter_id: int
+    comment_text: str = Field(min_length=1, max_length=2000)
+    created_at: datetime | None = None
+
+
+class ImportReport(BaseModel):
+    """インポートする日報（1レコード）."""
+
+    salesperson_id: int
+    report_date: date
+    status: ReportStatus = ReportStatus.DRAFT
+    problem: str | None = None
+    plan: str | None = None
+    visits: list[ImportVisit] = Field(default_factory=list)
+    comments: list[ImportComment] = Field(default_factory=list)
+
+
+class ImportErrorItem(BaseModel):
+    """取り込めなかったレコード."""
+
+    line: int
+    message: str
+
+
+class ImportResult(BaseModel):
+    """インポート結果."""
+
+    reports: int = 0
+    visits: int = 0
+    comments: int = 0
+    batches: int = 0
+    failed: int = 0
+    errors: list[ImportErrorItem] = Field(default_factory=list)
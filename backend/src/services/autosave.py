@@ -0,0 +1,278 @@
+"""下書きの日報の自動保存（書き込みの集約）.
+
+日報の編集画面は数秒ごとに下書きを自動保存するため、編集画面を開いている
+端末ごとに日報・訪問記録への書き込みが続く。本モジュールでは自動保存の内容を
+日報ごとにプロセス内に保持し、連続する自動保存を1回の書き込みにまとめる。
+
+- 受付: add() で変更された項目のみを保持中の内容に上書きする（データベースへの
+  書き込みは行わない）
+- 書き込み: AutosaveBuffer のループが flush_seconds 秒ごとに保持中の全日報を
+  書き込む。日報ごとに1トランザクションで、版数は1つだけ上がる
+- 提出・更新前の書き込み: 日報の提出・更新（PUT）の前に flush_report() で
+  保持中の内容を書き込み、コミットする
+- 終了時の書き込み: アプリケーションの終了時（lifespan）に stop() で
+  保持中の全日報を書き込む
+
+受付時点では保存は確定しない。プロセスが異常終了した場合は、最長で
+flush_seconds 秒分の自動保存が失われる。書き込み時に日報が下書きでなくなって
+いた場合や、他の操作で更新されていた場合（版数の不一致）は、保持中の内容を
+破棄する。保持はプロセスごとのため、別インスタンスでの提出・更新の前には
+書き込まれない。受付（API）では保持中の内容がある日報のステータスと版数を
+確認し、書き込めなくなっていれば discard() で破棄して409を返すため、破棄は
+次の自動保存でクライアントに伝わる。
+"""
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.models import DailyReport, ReportStatus
+from src.services.visit_records import (
+    UnknownVisitRecordError,
+    VisitRecordDiff,
+    diff_visit_records,
+    has_unknown_customers,
+    save_report_changes,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingDraft:
+    """書き込み待ちの自動保存の内容.
+
+    Attributes:
+        salesperson_id: 日報の作成者ID
+        base_version: 書き込み対象の日報の版数（受付開始時点）
+        changes: 変更された項目（problem・plan・visit_records）
+    """
+
+    salesperson_id: int
+    base_version: int
+    changes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def saved_version(self) -> int:
+        """書き込み後の日報の版数."""
+        return self.base_version + 1
+
+
+class AutosaveBuffer:
+    """日報ごとに自動保存の内容を保持し、まとめて書き込むバッファ.
+
+    Attributes:
+        flush_seconds: 保持中の内容を書き込む間隔（秒）
+    """
+
+    def __init__(
+        self, session_factory: async_sessionmaker[AsyncSession], flush_seconds: float
+    ) -> None:
+        """バッファを初期化する.
+
+        Args:
+            session_factory: 定期・終了時の書き込みに使うセッションファクトリ
+            flush_seconds: 保持中の内容を書き込む間隔（秒）
+        """
+        self.flush_seconds = flush_seconds
+        self._session_factory = session_factory
+        self._pending: dict[int, PendingDraft] = {}
+        # 書き込み中の日報（完了を待つためのイベント）
+        self._flushing: dict[int, asyncio.Event] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def is_running(self) -> bool:
+        """書き込みループが動作中かどうか."""
+        return self._task is not None and not self._task.done()
+
+    def get(self, report_id: int) -> PendingDraft | None:
+        """日報の書き込み待ちの内容を返す.
+
+        Args:
+            report_id: 日報ID
+
+        Returns:
+            書き込み待ちの内容（無い場合はNone）
+        """
+        return self._pending.get(report_id)
+
+    async def wait_flushed(self, report_id: int) -> None:
+        """日報の書き込み中の内容があれば、コミットされるまで待つ.
+
+        Args:
+            report_id: 日報ID
+        """
+        while (flushing := self._flushing.get(report_id)) is not None:
+            await flushing.wait()
+
+    def add(
+        self,
+        report_id: int,
+        salesperson_id: int,
+        base_version: int,
+        changes: dict[str, Any],
+    ) -> PendingDraft:
+        """自動保存の内容を保持中の内容に上書きする.
+
+        Args:
+            report_id: 日報ID
+            salesperson_id: 日報の作成者ID
+            base_version: 日報の現在の版数（保持中の内容が無い場合に用いる）
+            changes: 変更された項目
+
+        Returns:
+            書き込み待ちの内容
+        """
+        draft = self._pending.get(report_id)
+        if draft is None:
+            draft = PendingDraft(salesperson_id, base_version)
+            self._pending[report_id] = draft
+        draft.changes.update(changes)
+        return draft
+
+    def discard(self, report_id: int, draft: PendingDraft) -> None:
+        """書き込めなくなった日報の保持中の内容を破棄する.
+
+        書き込みのために取り出された後であれば何もしない（書き込み時に判定する）。
+
+        Args:
+            report_id: 日報ID
+            draft: 破棄する内容
+        """
+        if self._pending.get(report_id) is draft:
+            del self._pending[report_id]
+            logger.warning(
+                "autosave of report %d discarded: report was changed elsewhere",
+                report_id,
+            )
+
+    def clear(self) -> None:
+        """保持中の内容を書き込まずに破棄する."""
+        self._pending.clear()
+
+    async def flush_report(self, db: AsyncSession, report_id: int) -> bool:
+        """日報の保持中の内容を書き込み、コミットする.
+
+        Args:
+            db: データベースセッション
+            report_id: 日報ID
+
+        Returns:
+            書き込んだ場合True
+        """
+        await self.wait_flushed(report_id)
+        draft = self._pending.pop(report_id, None)
+        if draft is None:
+            return False
+        return await self._write(db, report_id, draft)
+
+    async def flush_all(self) -> int:
+        """保持中の全日報を日報ごとのトランザクションで書き込む.
+
+        Returns:
+            書き込んだ日報数
+        """
+        written = 0
+        for report_id in list(self._pending):
+            draft = self._pending.pop(report_id, None)
+            if draft is None:
+                continue
+            async with self._session_factory() as session:
+                written += await self._write(session, report_id, draft)
+        return written
+
+    async def _write(
+        self, db: AsyncSession, report_id: int, draft: PendingDraft
+    ) -> bool:
+        """書き込み待ちの内容を1トランザクションで書き込む.
+
+        書き込めない場合は内容を破棄し、警告をログに出力する。
+        """
+        flushing = self._flushing[report_id] = asyncio.Event()
+        try:
+            reason = await self._apply(db, report_id, draft)
+            if reason is None:
+                await db.commit()
+                return True
+        except (StaleDataError, IntegrityError) as e:
+            reason = type(e).__name__
+        except Exception:
+            await db.rollback()
+            logger.exception("autosave of report %d failed", report_id)
+            return False
+        finally:
+            del self._flushing[report_id]
+            flushing.set()
+        await db.rollback()
+        logger.warning("autosave of report %d discarded: %s", report_id, reason)
+        return False
+
+    async def _apply(
+        self, db: AsyncSession, report_id: int, draft: PendingDraft
+    ) -> str | None:
+        """書き込み待ちの内容を日報に反映する.
+
+        Returns:
+            書き込めない場合はその理由、書き込んだ場合はNone
+        """
+        report = await db.get(DailyReport, report_id)
+        if report is None:
+            return "report deleted"
+        if report.status != ReportStatus.DRAFT:
+            return "report is no longer a draft"
+        if report.version != draft.base_version:
+            return "report was updated by another request"
+        diff = VisitRecordDiff()
+        if "visit_records" in draft.changes:
+            try:
+                diff = await diff_visit_records(
+                    db, report_id, draft.changes["visit_records"]
+                )
+            except UnknownVisitRecordError:
+                return "unknown visit record"
+        if await has_unknown_customers(db, diff):
+            return "unknown customer"
+        for name in ("problem", "plan"):
+            if name in draft.changes:
+                setattr(report, name, draft.changes[name])
+        await save_report_changes(db, report, diff)
+        return None
+
+    async def run(self) -> None:
+        """flush_seconds 秒ごとに保持中の全日報を書き込むことを繰り返す."""
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush_all()
+            except Exception:
+                logger.exception("autosave buffer failed to flush drafts")
+
+    def start(self) -> None:
+        """書き込みループを開始する."""
+        if not self.is_running:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """書き込みループを停止し、保持中の全日報を書き込む."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush_all()
+
+
+# アプリケーション全体で共有するバッファ
+autosave_buffer = AutosaveBuffer(AsyncSessionLocal, settings.autosave_flush_seconds)
@@ -0,0 +1,336 @@
+"""日報コメントの参照と既読管理.
+
+未読の有無・件数は、閲覧者ごと・日報ごとの既読マーカー（REPORT_READ_MARKER）に
+保持した未読コメント数から取得する。一覧やダッシュボードでコメントを走査しないよう、
+未読コメント数はコメントの登録・削除と同じトランザクション内で更新する。
+
+- コメント登録: 日報の作成者とその上位の上長全員（投稿者を除く）の未読数を+1
+- コメント削除: そのコメントを未読として数えていた閲覧者の未読数を-1
+- 既読の記録: 閲覧者のマーカーを、クライアントが表示した最後のコメントまで
+  既読にする（コメント一覧の取得は既読を記録しない）
+
+マーカーは最初の未読コメントの登録時に作成し、それより前のコメントは既読とみなす。
+ORMを経由せずにコメントを登録・削除した場合は recount_unread() で再集計すること。
+"""
+
+from sqlalchemy import Connection, Insert, delete, event, func, select, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapper, object_session
+
+from src.models import DailyReport, ReportComment, ReportReadMarker, Salesperson
+from src.schemas.comment import CommentItem
+from src.services.dashboard import record_unread_change
+from src.services.hierarchy import hierarchy_index
+
+# recount_unread() で1文にまとめて登録・更新する既読マーカーの最大数
+_UPSERT_CHUNK_SIZE = 1000
+
+
+async def list_comments(db: AsyncSession, report_id: int) -> list[CommentItem]:
+    """日報のコメントを投稿順に取得する.
+
+    Args:
+        db: データベースセッション
+        report_id: 日報ID
+
+    Returns:
+        コメント一覧
+    """
+    result = await db.execute(
+        select(
+            ReportComment.comment_id,
+            ReportComment.commenter_id,
+            Salesperson.name.label("commenter_name"),
+            ReportComment.comment_text,
+            ReportComment.created_at,
+        )
+        .join(Salesperson, Salesperson.salesperson_id == ReportComment.commenter_id)
+        .where(ReportComment.report_id == report_id)
+        .order_by(ReportComment.created_at, ReportComment.comment_id)
+    )
+    return [CommentItem.model_validate(row) for row in result.mappings()]
+
+
+async def mark_read(
+    db: AsyncSession, salesperson_id: int, report_id: int, last_comment_id: int
+) -> tuple[int, int]:
+    """指定したコメントまでを既読にする.
+
+    last_comment_id より後に投稿された他者のコメントは未読として残す。
+    既読の位置は戻さず、日報の最後のコメントより先にも進めない（クライアントが
+    古い一覧や存在しないコメントIDを指定しても、以降のコメントを既読にしない）。
+
+    Args:
+        db: データベースセッション
+        salesperson_id: 閲覧者の営業担当者ID
+        report_id: 日報ID
+        last_comment_id: 閲覧者に表示した最後のコメントID
+
+    Returns:
+        記録した既読位置のコメントIDと、残りの未読コメント数
+    """
+    is_marker = (
+        ReportReadMarker.salesperson_id == salesperson_id,
+        ReportReadMarker.report_id == report_id,
+    )
+    row = (
+        await db.execute(
+            select(
+                select(ReportReadMarker.last_read_comment_id)
+                .where(*is_marker)
+                .scalar_subquery(),
+                select(ReportReadMarker.unread_count)
+                .where(*is_marker)
+                .scalar_subquery(),
+                select(func.max(ReportComment.comment_id))
+                .where(ReportComment.report_id == report_id)
+                .scalar_subquery(),
+            )
+        )
+    ).one()
+    previous_read, previous_count = row[0] or 0, row[1]
+    last_read = max(previous_read, min(last_comment_id, row[2] or 0))
+    remaining_count = (
+        await db.scalar(
+            select(func.count()).where(
+                ReportComment.report_id == report_id,
+                ReportComment.comment_id > last_read,
+                ReportComment.commenter_id != salesperson_id,
+            )
+        )
+    ) or 0
+    if previous_count is None and remaining_count == 0:
+        # マーカーが無い場合は未読なしとして扱われるため記録不要
+        return last_read, remaining_count
+
+    connection = await db.connection()
+    await db.execute(
+        _upsert(
+            connection.dialect.name,
+            [
+                {
+                    "salesperson_id": salesperson_id,
+                    "report_id": report_id,
+                    "last_read_comment_id": last_read,
+                    "unread_count": remaining_count,
+                }
+            ],
+            {
+                "last_read_comment_id": last_read,
+                "unread_count": remaining_count,
+            },
+        )
+    )
+    record_unread_change(
+        db.sync_session, salesperson_id, remaining_count - (previous_count or 0)
+    )
+    return last_read, remaining_count
+
+
+async def recount_unread(db: AsyncSession, report_ids: list[int]) -> None:
+    """日報の既読マーカーの未読数をコメントから再集計する.
+
+    ORMを経由せずにコメントを登録・削除した後に呼び出す。マーカーの無い閲覧者は
+    他者のコメントをすべて未読として集計する。
+
+    Args:
+        db: データベースセッション
+        report_ids: 再集計する日報IDのリスト
+    """
+    if not report_ids:
+        return
+    await hierarchy_index.ensure_loaded(db)
+    owners = await db.execute(
+        select(DailyReport.report_id, DailyReport.salesperson_id).where(
+            DailyReport.report_id.in_(report_ids)
+        )
+    )
+    markers = await db.execute(
+        select(
+            ReportReadMarker.salesperson_id,
+            ReportReadMarker.report_id,
+            ReportReadMarker.last_read_comment_id,
+            ReportReadMarker.unread_count,
+        ).where(ReportReadMarker.report_id.in_(report_ids))
+    )
+    known = {(row[0], row[1]): (row[2], row[3]) for row in markers.all()}
+    comments: dict[int, list[tuple[int, int]]] = {}
+    result = await db.execute(
+        select(
+            ReportComment.report_id,
+            ReportComment.comment_id,
+            ReportComment.commenter_id,
+        ).where(ReportComment.report_id.in_(report_ids))
+    )
+    for report_id, comment_id, commenter_id in result.all():
+        comments.setdefault(report_id, []).append((comment_id, commenter_id))
+
+    rows: list[dict[str, int]] = []
+    changes: list[tuple[int, int]] = []
+    for report_id, owner_id in owners.all():
+        for reader_id in [owner_id, *hierarchy_index.managers_of(owner_id)]:
+            last_read, previous = known.get((reader_id, report_id), (0, None))
+            unread = sum(
+                1
+                for comment_id, commenter_id in comments.get(report_id, [])
+                if comment_id > last_read and commenter_id != reader_id
+            )
+            if previous is None and unread == 0:
+                continue
+            rows.append(
+                {
+                    "salesperson_id": reader_id,
+                    "report_id": report_id,
+                    "last_read_comment_id": last_read,
+                    "unread_count": unread,
+                }
+            )
+            changes.append((reader_id, unread - (previous or 0)))
+    if not rows:
+        return
+
+    connection = await db.connection()
+    for start in range(0, len(rows), _UPSERT_CHUNK_SIZE):
+        await db.execute(
+            _upsert_unread_counts(
+                connection.dialect.name, rows[start : start + _UPSERT_CHUNK_SIZE]
+            )
+        )
+    for reader_id, delta in changes:
+        record_unread_change(db.sync_session, reader_id, delta)
+
+
+def _upsert(
+    dialect_name: str, rows: list[dict[str, int]], set_: dict[str, object]
+) -> Insert:
+    """既読マーカーを登録し、既に存在する場合は set_ の内容で更新する文を返す."""
+    if dialect_name == "mysql":
+        stmt = mysql.insert(ReportReadMarker).values(rows)
+        return stmt.on_duplicate_key_update(**set_)
+    stmt = sqlite.insert(ReportReadMarker).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[ReportReadMarker.salesperson_id, ReportReadMarker.report_id],
+        set_=set_,
+    )
+
+
+def _upsert_unread_counts(dialect_name: str, rows: list[dict[str, int]]) -> Insert:
+    """既読マーカーを登録し、既に存在する場合は行ごとの未読数で更新する文を返す."""
+    if dialect_name == "mysql":
+        stmt = mysql.insert(ReportReadMarker).values(rows)
+        return stmt.on_duplicate_key_update(unread_count=stmt.inserted.unread_count)
+    stmt = sqlite.insert(ReportReadMarker).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[ReportReadMarker.salesperson_id, ReportReadMarker.report_id],
+        set_={"unread_count": stmt.excluded.unread_count},
+    )
+
+
+def _readers(connection: Connection, owner_id: int) -> list[int]:
+    """日報を閲覧できる営業担当者（作成者と上位の上長全員）を返す."""
+    if hierarchy_index.is_loaded:
+        return [owner_id, *hierarchy_index.managers_of(owner_id)]
+    readers = [owner_id]
+    manager_id = connection.scalar(
+        select(Salesperson.manager_id).where(Salesperson.salesperson_id == owner_id)
+    )
+    while manager_id is not None and manager_id not in readers:
+        readers.append(manager_id)
+        manager_id = connection.scalar(
+            select(Salesperson.manager_id).where(
+                Salesperson.salesperson_id == manager_id
+            )
+        )
+    return readers
+
+
+@event.listens_for(ReportComment, "after_insert")
+def _count_unread_on_insert(
+    _mapper: Mapper, connection: Connection, target: ReportComment
+) -> None:
+    """登録されたコメントを投稿者以外の閲覧者の未読数に加える."""
+    owner_id = connection.scalar(
+        select(DailyReport.salesperson_id).where(
+            DailyReport.report_id == target.report_id
+        )
+    )
+    if owner_id is None:
+        return
+    reader_ids = [r for r in _readers(connection, owner_id) if r != target.commenter_id]
+    if not reader_ids:
+        return
+    connection.execute(
+        _upsert(
+            connection.dialect.name,
+            [
+                {
+                    "salesperson_id": reader_id,
+                    "report_id": target.report_id,
+                    # 新規マーカーはこのコメントより前を既読とする
+                    "last_read_comment_id": target.comment_id - 1,
+                    "unread_count": 1,
+                }
+                for reader_id in reader_ids
+            ],
+            {"unread_count": ReportReadMarker.unread_count + 1},
+        )
+    )
+    session = object_session(target)
+    if session is not None:
+        for reader_id in reader_ids:
+            record_unread_change(session, reader_id, 1)
+
+
+@event.listens_for(ReportComment, "after_delete")
+def _count_unread_on_delete(
+    _mapper: Mapper, connection: Connection, target: ReportComment
+) -> None:
+    """削除されたコメントを、未読として数えていた閲覧者の未読数から除く."""
+    counted_by = (
+        ReportReadMarker.report_id == target.report_id,
+        ReportReadMarker.salesperson_id != target.commenter_id,
+        ReportReadMarker.last_read_comment_id < target.comment_id,
+        ReportReadMarker.unread_count > 0,
+    )
+    reader_ids = connection.scalars(
+        select(ReportReadMarker.salesperson_id).where(*counted_by)
+    ).all()
+    if not reader_ids:
+        return
+    connection.execute(
+        update(ReportReadMarker)
+        .where(
+            ReportReadMarker.report_id == target.report_id,
+            ReportReadMarker.salesperson_id.in_(reader_ids),
+        )
+        .values(unread_count=ReportReadMarker.unread_count - 1)
+    )
+    session = object_session(target)
+    if session is not None:
+        for reader_id in reader_ids:
+            record_unread_change(session, reader_id, -1)
+
+
+@event.listens_for(DailyReport, "after_delete")
+def _delete_markers(
+    _mapper: Mapper, connection: Connection, target: DailyReport
+) -> None:
+    """削除された日報の既読マーカーを削除する.
+
+    外部キーのカスケード削除に頼らず明示的に削除し、閲覧者の未読数の減少を記録する。
+    """
+    rows = connection.execute(
+        select(ReportReadMarker.salesperson_id, ReportReadMarker.unread_count).where(
+            ReportReadMarker.report_id == target.report_id
+        )
+    ).all()
+    if not rows:
+        return
+    connection.execute(
+        delete(ReportReadMarker).where(ReportReadMarker.report_id == target.report_id)
+    )
+    session = object_session(target)
+    if session is not None:
+        for reader_id, unread_count in rows:
+            record_unread_change(session, reader_id, -unread_count)
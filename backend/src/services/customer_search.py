@@ -0,0 +1,473 @@
+"""顧客の会社名検索インデックス.
+
+会社名を正規化した検索キーの1文字・2文字（バイグラム）ごとに顧客IDの集合を
+メモリ上に保持し、部分一致検索を全件走査なしで行う。
+
+正規化では次を同一視する。
+
+- 全角・半角（NFKC正規化。「ｶﾌﾞｼｷ」「ＡＢＣ」「㈱」など）
+- カタカナ・ひらがな、英字の大文字・小文字
+- 空白・中黒、「株式会社」「(株)」などの法人格
+
+検索結果は完全一致、前方一致、部分一致の順に並べる。前方一致は検索キーの
+昇順リストの二分探索で、部分一致は検索語の1文字・2文字のうち最も該当件数の
+少ない集合の照合で求めるため、いずれも顧客数に比例する走査を伴わない。
+
+インデックスはプロセスごとに1回データベースから構築し、構築時の CUSTOMER の
+版数（DATA_VERSION。src.services.data_version を参照）を保持する。以降は次の
+方法で更新する。
+
+- 同一プロセス内でのORM経由の登録・更新・論理削除: コミット時に差分を反映し、
+  保持している版数をコミットした版数まで進める。他のトランザクションの変更を
+  挟んでいた場合（加算前の版数が保持している版数と異なる場合）は、次回の
+  参照時に再構築する
+- 他インスタンスでの更新: customer_search_check_seconds 秒ごとに版数を参照し
+  （主キーの1行のみ）、保持している版数より新しければ再構築する。版数を
+  取得済みの呼び出し元（ETagを計算する GET /customers/select）はその版数で判定する
+- ORMを経由しない更新（版数が加算されない）: customer_search_refresh_seconds
+  経過後に再構築
+
+したがって、他インスタンスでの更新は会社名検索（GET /customers）に最大
+customer_search_check_seconds 秒（既定5秒）、ORMを経由しない更新は最大
+customer_search_refresh_seconds 秒（既定300秒）遅れて反映される。
+"""
+
+import asyncio
+import bisect
+import re
+import time
+import unicodedata
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapper, Session, object_session
+
+from src.core.config import settings
+from src.models import Customer
+from src.services import data_version
+
+# コミット待ちの変更をSession.infoに保持するキー
+_PENDING_KEY = "customer_search_pending_changes"
+# 削除を表す値
+_DELETED = object()
+
+# 検索キーから除く法人格（NFKC正規化後の表記）
+_LEGAL_FORMS = re.compile(
+    r"株式会社|有限会社|合同会社|合資会社|合名会社|\((?:株|有|同|資|名)\)"
+)
+# 検索キーから除く区切り文字
+_SEPARATORS = re.compile(r"[\s・･.,'\"-]")
+# カタカナ（ァ〜ヶ）をひらがなに変換する対応表
+_KATAKANA_TO_HIRAGANA = str.maketrans(
+    {chr(code): chr(code - 0x60) for code in range(0x30A1, 0x30F7)}
+)
+
+# 件数を指定した検索で、部分一致の順位付けに用いる候補数の上限
+_RANK_WINDOW = 1000
+
+type CustomerRow = tuple[int, str, bool]
+
+
+def normalize(text: str) -> str:
+    """会社名・検索語を検索キーに正規化する.
+
+    Args:
+        text: 会社名または検索語
+
+    Returns:
+        検索キー
+    """
+    key = unicodedata.normalize("NFKC", text).casefold()
+    key = _LEGAL_FORMS.sub("", key)
+    key = _SEPARATORS.sub("", key)
+    return key.translate(_KATAKANA_TO_HIRAGANA)
+
+
+def _grams(key: str) -> set[str]:
+    """検索キーの1文字・2文字の部分文字列を返す."""
+    return set(key) | {key[i : i + 2] for i in range(len(key) - 1)}
+
+
+@dataclass
+class _Tables:
+    """インデックス本体（再構築時はまとめて差し替える）."""
+
+    names: dict[int, str] = field(default_factory=dict)
+    keys: dict[int, str] = field(default_factory=dict)
+    inactive: set[int] = field(default_factory=set)
+    postings: dict[str, set[int]] = field(default_factory=dict)
+    # (検索キー, 顧客ID) の昇順リスト。前方一致を二分探索で取り出す
+    ordered: list[tuple[str, int]] = field(default_factory=list)
+
+    def add(self, customer_id: int, company_name: str, is_active: bool) -> None:
+        key = normalize(company_name)
+        old_key = self.keys.get(customer_id)
+        if old_key != key:
+            if old_key is not None:
+                self._unpost(customer_id, old_key)
+            self._post(customer_id, key)
+            bisect.insort(self.ordered, (key, customer_id))
+        self.names[customer_id] = company_name
+        if is_active:
+            self.inactive.discard(customer_id)
+        else:
+            self.inactive.add(customer_id)
+
+    def discard(self, customer_id: int) -> None:
+        key = self.keys.get(customer_id)
+        if key is None:
+            return
+        self._unpost(customer_id, key)
+        del self.names[customer_id]
+        self.inactive.discard(customer_id)
+
+    def _post(self, customer_id: int, key: str) -> None:
+        for gram in _grams(key):
+            self.postings.setdefault(gram, set()).add(customer_id)
+        self.keys[customer_id] = key
+
+    def _unpost(self, customer_id: int, key: str) -> None:
+        for gram in _grams(key):
+            ids = self.postings.get(gram)
+            if ids is not None:
+                ids.discard(customer_id)
+                if not ids:
+                    del self.postings[gram]
+        del self.keys[customer_id]
+        position = bisect.bisect_left(self.ordered, (key, customer_id))
+        del self.ordered[position]
+
+
+def _build_tables(rows: Iterable[CustomerRow]) -> _Tables:
+    tables = _Tables()
+    for customer_id, company_name, is_active in rows:
+        tables.names[customer_id] = company_name
+        tables._post(customer_id, normalize(company_name))
+        if not is_active:
+            tables.inactive.add(customer_id)
+    tables.ordered = sorted((key, c) for c, key in tables.keys.items())
+    return tables
+
+
+class CustomerSearchIndex:
+    """会社名の部分一致検索インデックス."""
+
+    def __init__(
+        self, refresh_seconds: float | None = None, check_seconds: float = 0
+    ) -> None:
+        """インデックスを初期化する.
+
+        Args:
+            refresh_seconds: データベースから再構築する間隔（Noneの場合は再構築しない）
+            check_seconds: データベースの版数を確認する間隔
+        """
+        self.refresh_seconds = refresh_seconds
+        self.check_seconds = check_seconds
+        self._tables = _Tables()
+        # 再構築中にコミットされた変更（構築後に再適用する）
+        self._journal: dict[int, CustomerRow | object] | None = None
+        # 再構築中にコミットされた版数の範囲
+        self._loading_commits: list[tuple[int, int]] = []
+        self._loaded_at: float | None = None
+        # 内容が一致するデータベースの版数（不明な場合はNone）
+        self._version: int | None = None
+        self._checked_at: float | None = None
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def version(self) -> int | None:
+        """内容が一致するデータベースの版数（不明な場合はNone）."""
+        return self._version
+
+    @property
+    def is_loaded(self) -> bool:
+        """インデックスが構築済みかどうか."""
+        return self._loaded_at is not None
+
+    @property
+    def is_loading(self) -> bool:
+        """データベースから構築中かどうか."""
+        return self._journal is not None
+
+    def __len__(self) -> int:
+        """登録されている顧客数（無効な顧客を含む）."""
+        return len(self._tables.keys)
+
+    def build(self, rows: Iterable[CustomerRow], version: int | None = None) -> None:
+        """(顧客ID, 会社名, 有効フラグ) の一覧からインデックスを構築する.
+
+        Args:
+            rows: 顧客ID・会社名・有効フラグの組
+            version: 一覧を取得したときのデータベースの版数
+        """
+        self._tables = _build_tables(rows)
+        self._mark_built(version)
+
+    async def load(self, db: AsyncSession) -> None:
+        """データベースからインデックスを構築する.
+
+        件数が多い場合に他のリクエストを止めないよう、構築は別スレッドで行う。
+        構築中にコミットされた変更は、差し替え後に再適用する。
+
+        Args:
+            db: データベースセッション
+        """
+        self._journal = {}
+        self._loading_commits = []
+        try:
+            # 版数と一覧は同じトランザクション（スナップショット）で取得する
+            version: int | None = await data_version.current_version(
+                db, Customer.__tablename__
+            )
+            result = await db.execute(
+                select(Customer.customer_id, Customer.company_name, Customer.is_active)
+            )
+            rows = [(row[0], row[1], row[2]) for row in result.all()]
+            tables = await asyncio.to_thread(_build_tables, rows)
+            journal = self._journal
+        finally:
+            self._journal = None
+        for customer_id, change in journal.items():
+            if isinstance(change, tuple):
+                tables.add(*change)
+            else:
+                tables.discard(customer_id)
+        # 構築中のコミットのうち、一覧に含まれないものの分だけ版数を進める
+        for first, last in sorted(self._loading_commits):
+            if version is None or last <= version:
+                continue
+            version = last if first == version + 1 else None
+        self._loading_commits = []
+        self._tables = tables
+        self._mark_built(version)
+
+    async def ensure_loaded(self, db: AsyncSession, current: int | None = None) -> None:
+        """データベースの内容と異なる可能性がある場合にデータベースから構築する.
+
+        未構築の場合、データベースの版数が保持している版数より新しい場合、
+        または再構築間隔を過ぎている場合に構築する。版数は check_seconds 秒ごとに
+        確認し、それ以外の呼び出しでは問い合わせない。
+
+        Args:
+            db: データベースセッション
+            current: 取得済みのデータベースの版数（Noneの場合は必要に応じて問い合わせる）
+        """
+        if current is None:
+            if not self._check_due():
+                return
+            current = await data_version.current_version(db, Customer.__tablename__)
+            self._checked_at = time.monotonic()
+        if not self._is_stale(current):
+            return
+        async with self._load_lock:
+            # 待機中に他のリクエストが構築を終えている場合がある
+            if self._is_stale(current):
+                await self.load(db)
+
+    def _mark_built(self, version: int | None) -> None:
+        self._loaded_at = time.monotonic()
+        self._checked_at = self._loaded_at
+        self._version = version
+
+    def _check_due(self) -> bool:
+        if self._loaded_at is None or self._version is None:
+            return True
+        if self._refresh_due():
+            return True
+        assert self._checked_at is not None
+        return time.monotonic() - self._checked_at >= self.check_seconds
+
+    def _is_stale(self, current: int) -> bool:
+        if self._loaded_at is None or self._version is None:
+            return True
+        # レプリカの遅延で古い版数を参照した場合は再構築しない
+        return current > self._version or self._refresh_due()
+
+    def _refresh_due(self) -> bool:
+        if self._loaded_at is None or self.refresh_seconds is None:
+            return False
+        return time.monotonic() - self._loaded_at >= self.refresh_seconds
+
+    def invalidate(self) -> None:
+        """インデックスを破棄し、次回参照時に再構築させる."""
+        self._tables = _Tables()
+        self._loaded_at = None
+        self._version = None
+
+    def committed(self, first: int, last: int) -> None:
+        """同一プロセスでコミットされた版数の範囲を反映する.
+
+        加算前の版数（first - 1）が保持している版数と一致する場合は、
+        保持している版数を last まで進める。一致しない場合は他のトランザクションの
+        変更を挟んでいるため、版数を不明とし次回の参照時に再構築させる。
+
+        Args:
+            first: トランザクションで加算した最初の版数
+            last: トランザクションで加算した最後の版数
+        """
+        if self.is_loading:
+            self._loading_commits.append((first, last))
+        elif self._version is not None and first == self._version + 1:
+            self._version = last
+        else:
+            self._version = None
+
+    def company_name(self, customer_id: int) -> str | None:
+        """会社名を返す.
+
+        Args:
+            customer_id: 顧客ID
+
+        Returns:
+            会社名（登録されていない場合はNone）
+        """
+        return self._tables.names.get(customer_id)
+
+    def search(
+        self, query: str, *, is_active: bool | None = True, limit: int | None = None
+    ) -> list[int]:
+        """会社名で顧客を検索する.
+
+        完全一致・前方一致（検索キーの辞書順）、部分一致（一致位置・会社名の短い順）の
+        順に返す。件数を指定した場合、部分一致の候補が多いときは先頭の一部
+        （_RANK_WINDOW 件）のみを順位付けの対象とする。
+        検索語を正規化した結果が空の場合（法人格のみなど）は全件を顧客IDの順に返す。
+
+        Args:
+            query: 検索語（部分一致）
+            is_active: 有効フラグで絞り込む（Noneの場合は絞り込まない）
+            limit: 最大件数（Noneの場合は全件）
+
+        Returns:
+            一致度の高い順に並べた顧客IDのリスト
+        """
+        tables = self._tables
+        inactive = tables.inactive
+        key = normalize(query)
+        if not key:
+            ids = (
+                tables.keys
+                if is_active is None
+                else [c for c in tables.keys if (c not in inactive) == is_active]
+            )
+            return sorted(ids)[:limit]
+
+        # 完全一致・前方一致（検索キーの辞書順のため、完全一致が先頭になる）
+        results: list[int] = []
+        ordered = tables.ordered
+        i = bisect.bisect_left(ordered, (key,))
+        while i < len(ordered) and ordered[i][0].startswith(key):
+            customer_id = ordered[i][1]
+            if is_active is None or (customer_id not in inactive) == is_active:
+                results.append(customer_id)
+                if len(results) == limit:
+                    return results
+            i += 1
+
+        # 部分一致（一致位置・会社名の短い順）
+        remaining = None if limit is None else limit - len(results)
+        keys = tables.keys
+        matches: list[tuple[int, int, int]] = []
+        for examined, customer_id in enumerate(self._candidates(tables, key), 1):
+            if (
+                remaining is not None
+                and examined > _RANK_WINDOW
+                and len(matches) >= remaining
+            ):
+                break
+            name_key = keys[customer_id]
+            # 隣接しないバイグラムの組み合わせによる誤一致を除く
+            position = name_key.find(key)
+            if position > 0 and (
+                is_active is None or (customer_id not in inactive) == is_active
+            ):
+                matches.append((position, len(name_key), customer_id))
+        matches.sort()
+        results.extend(customer_id for _, _, customer_id in matches[:remaining])
+        return results
+
+    @staticmethod
+    def _candidates(tables: _Tables, key: str) -> set[int]:
+        """検索キーを含む可能性のある顧客ID（最も件数の少ない1文字・2文字の集合）."""
+        grams = (
+            [key] if len(key) == 1 else [key[i : i + 2] for i in range(len(key) - 1)]
+        )
+        return min((tables.postings.get(gram, set()) for gram in grams), key=len)
+
+    def upsert(self, customer_id: int, company_name: str, is_active: bool) -> None:
+        """顧客の会社名・有効フラグを反映する.
+
+        Args:
+            customer_id: 顧客ID
+            company_name: 会社名
+            is_active: 有効フラグ
+        """
+        self._tables.add(customer_id, company_name, is_active)
+        if self._journal is not None:
+            self._journal[customer_id] = (customer_id, company_name, is_active)
+
+    def remove(self, customer_id: int) -> None:
+        """顧客をインデックスから削除する.
+
+        Args:
+            customer_id: 顧客ID
+        """
+        self._tables.discard(customer_id)
+        if self._journal is not None:
+            self._journal[customer_id] = _DELETED
+
+
+customer_search_index = CustomerSearchIndex(
+    refresh_seconds=settings.customer_search_refresh_seconds,
+    check_seconds=settings.customer_search_check_seconds,
+)
+data_version.track(Customer)
+data_version.on_commit(Customer.__tablename__, customer_search_index.committed)
+
+
+@event.listens_for(Customer, "after_insert")
+@event.listens_for(Customer, "after_update")
+def _record_customer_change(
+    _mapper: Mapper, _connection: object, target: Customer
+) -> None:
+    """登録・更新された顧客をコミット時の反映対象として記録する."""
+    session = object_session(target)
+    if session is not None:
+        pending = session.info.setdefault(_PENDING_KEY, {})
+        pending[target.customer_id] = (
+            target.customer_id,
+            target.company_name,
+            target.is_active,
+        )
+
+
+@event.listens_for(Customer, "after_delete")
+def _record_deletion(_mapper: Mapper, _connection: object, target: Customer) -> None:
+    """削除された顧客をコミット時の反映対象として記録する."""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, {})[target.customer_id] = _DELETED
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_on_commit(session: Session) -> None:
+    """コミットされた変更をインデックスに反映する."""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or not (
+        customer_search_index.is_loaded or customer_search_index.is_loading
+    ):
+        # 未構築の場合は初回参照時にデータベースから構築される
+        return
+    for customer_id, change in pending.items():
+        if change is _DELETED:
+            customer_search_index.remove(customer_id)
+        else:
+            customer_search_index.upsert(*change)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    """ロールバックされた変更を破棄する."""
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,484 @@
+"""ダッシュボード集計.
+
+ダッシュボード（アプリの初期画面）は本日の日報の状況・未読コメント数・直近の日報を
+表示するため、都度集計すると1回の表示ごとに複数のクエリが発生する。
+本モジュールでは営業担当者ごとの集計結果をプロセス内に保持し、日報・訪問記録・
+コメントの書き込み時に差分で更新する。これによりダッシュボードの表示はキーによる
+参照1回で完結する。
+
+集計結果は次の方法で最新に保たれる。
+
+- 同一プロセス内でのORM経由の登録・更新・削除: コミット時に差分を反映
+  （日報の削除など差分で追えない変更は、該当担当者の集計を破棄して再計算させる）
+- 他インスタンスでの更新: TTL（dashboard_cache_ttl_seconds）経過後に再計算
+
+ORMを経由しない一括登録などを行う場合は dashboard_store.invalidate() を
+明示的に呼び出すこと（訪問記録の差分更新は record_visit_count_change() で
+件数の増減を渡す）。
+
+未読コメント数は閲覧者の既読マーカー（REPORT_READ_MARKER）の未読数の合計で、
+既読マーカーの更新時に record_unread_change() で差分を受け取る。
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from sqlalchemy import Connection, event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapper, Session, object_session
+
+from src.core.cache import CacheStats, TTLCache
+from src.core.config import settings
+from src.models import (
+    DailyReport,
+    ReportComment,
+    ReportReadMarker,
+    ReportStatus,
+    VisitRecord,
+)
+from src.schemas.dashboard import DashboardData, RecentReport, TodayReport
+from src.schemas.report import STATUS_LABELS
+
+# 直近の日報として表示する日数（本日を含む）
+RECENT_DAYS = 7
+
+# コミット待ちの変更をSession.infoに保持するキー
+_PENDING_KEY = "dashboard_pending_changes"
+
+
+@dataclass
+class ReportSnapshot:
+    """集計対象期間内の日報1件分の集計."""
+
+    report_id: int
+    report_date: date
+    status: ReportStatus
+    visit_count: int = 0
+    comment_count: int = 0
+
+
+@dataclass
+class DashboardSummary:
+    """営業担当者1人分のダッシュボード集計.
+
+    Attributes:
+        salesperson_id: 営業担当者ID
+        window_start: reports に保持している日報の開始日
+        unread_comment_count: 未読コメント数
+        reports: window_start 以降の日報（日報IDをキーとする）
+    """
+
+    salesperson_id: int
+    window_start: date
+    unread_comment_count: int
+    reports: dict[int, ReportSnapshot] = field(default_factory=dict)
+
+    def to_dashboard(self, today: date) -> DashboardData:
+        """指定日時点のダッシュボード情報に変換する.
+
+        Args:
+            today: 本日の日付
+
+        Returns:
+            ダッシュボード情報
+        """
+        since = _window_start(today)
+        recent = sorted(
+            (r for r in self.reports.values() if since <= r.report_date <= today),
+            key=lambda r: (r.report_date, r.report_id),
+            reverse=True,
+        )
+        today_report = next((r for r in recent if r.report_date == today), None)
+        return DashboardData(
+            today_report=TodayReport(exists=False)
+            if today_report is None
+            else TodayReport(
+                exists=True,
+                report_id=today_report.report_id,
+                status=today_report.status,
+                status_label=STATUS_LABELS[today_report.status],
+            ),
+            unread_comment_count=self.unread_comment_count,
+            recent_reports=[
+                RecentReport(
+                    report_id=r.report_id,
+                    report_date=r.report_date,
+                    status=r.status,
+                    status_label=STATUS_LABELS[r.status],
+                    visit_count=r.visit_count,
+                    comment_count=r.comment_count,
+                )
+                for r in recent
+            ],
+        )
+
+
+def _window_start(today: date) -> date:
+    return today - timedelta(days=RECENT_DAYS - 1)
+
+
+async def load_summary(
+    db: AsyncSession, salesperson_id: int, today: date
+) -> DashboardSummary:
+    """ダッシュボード集計をデータベースから計算する.
+
+    Args:
+        db: データベースセッション
+        salesperson_id: 営業担当者ID
+        today: 本日の日付
+
+    Returns:
+        ダッシュボード集計
+    """
+    window_start = _window_start(today)
+    visit_count = (
+        select(func.count())
+        .select_from(VisitRecord)
+        .where(VisitRecord.report_id == DailyReport.report_id)
+        .correlate(DailyReport)
+        .scalar_subquery()
+    )
+    comment_count = (
+        select(func.count())
+        .select_from(ReportComment)
+        .where(ReportComment.report_id == DailyReport.report_id)
+        .correlate(DailyReport)
+        .scalar_subquery()
+    )
+    unread_comment_count = (
+        select(func.coalesce(func.sum(ReportReadMarker.unread_count), 0))
+        .where(
+            ReportReadMarker.salesperson_id == salesperson_id,
+            ReportReadMarker.unread_count > 0,
+        )
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(
+            unread_comment_count.label("unread_comment_count"),
+            DailyReport.report_id,
+            DailyReport.report_date,
+            DailyReport.status,
+            visit_count.label("visit_count"),
+            comment_count.label("comment_count"),
+        )
+        .select_from(DailyReport)
+        .where(
+            DailyReport.salesperson_id == salesperson_id,
+            DailyReport.report_date >= window_start,
+        )
+    )
+    rows = result.mappings().all()
+    if rows:
+        unread = rows[0]["unread_comment_count"]
+    else:
+        unread = await db.scalar(select(unread_comment_count)) or 0
+    return DashboardSummary(
+        salesperson_id=salesperson_id,
+        window_start=window_start,
+        unread_comment_count=unread,
+        reports={
+            row["report_id"]: ReportSnapshot(
+                report_id=row["report_id"],
+                report_date=row["report_date"],
+                status=row["status"],
+                visit_count=row["visit_count"],
+                comment_count=row["comment_count"],
+            )
+            for row in rows
+        },
+    )
+
+
+@dataclass(frozen=True)
+class _ReportChange:
+    """日報の登録・更新."""
+
+    salesperson_id: int
+    report_id: int
+    report_date: date
+    status: ReportStatus
+    created: bool
+
+
+@dataclass(frozen=True)
+class _CountChange:
+    """訪問記録・コメントの登録・削除による件数の増減."""
+
+    salesperson_id: int
+    report_id: int
+    visits: int = 0
+    comments: int = 0
+
+
+@dataclass(frozen=True)
+class _UnreadChange:
+    """閲覧者の未読コメント数の増減."""
+
+    salesperson_id: int
+    delta: int
+
+
+@dataclass(frozen=True)
+class _Invalidation:
+    """差分で追えない変更（集計を破棄して再計算させる）."""
+
+    salesperson_id: int
+
+
+type _Change = _ReportChange | _CountChange | _UnreadChange | _Invalidation
+
+
+class DashboardStore:
+    """営業担当者IDをキーとしたダッシュボード集計の保持と差分更新."""
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        """ストアを初期化する.
+
+        Args:
+            max_size: 保持する最大件数
+            ttl_seconds: 集計結果の有効秒数
+        """
+        self._cache: TTLCache[int, DashboardSummary] = TTLCache(
+            max_size=max_size, default_ttl=ttl_seconds
+        )
+        # 担当者ごとの変更回数。読み込み中に変更がコミットされた集計を保存しないために使う
+        self._versions: dict[int, int] = {}
+
+    @property
+    def stats(self) -> CacheStats:
+        """キャッシュの統計情報."""
+        return self._cache.stats
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    async def get(
+        self, db: AsyncSession, salesperson_id: int, today: date
+    ) -> DashboardSummary:
+        """ダッシュボード集計を取得する.
+
+        保持していない場合、または保持している期間が本日の集計対象期間を
+        含まない場合のみデータベースから計算する。
+
+        Args:
+            db: データベースセッション
+            salesperson_id: 営業担当者ID
+            today: 本日の日付
+
+        Returns:
+            ダッシュボード集計
+        """
+        summary = self._cache.get(salesperson_id)
+        if summary is not None and summary.window_start <= _window_start(today):
+            return summary
+
+        version = self._versions.get(salesperson_id, 0)
+        summary = await load_summary(db, salesperson_id, today)
+        # 計算中に差分がコミットされた場合、その差分が反映されていない可能性がある
+        if self._versions.get(salesperson_id, 0) == version:
+            self._cache.set(salesperson_id, summary)
+        return summary
+
+    def invalidate(self, salesperson_id: int) -> None:
+        """指定した営業担当者の集計を破棄する.
+
+        Args:
+            salesperson_id: 営業担当者ID
+        """
+        self._bump(salesperson_id)
+        self._cache.delete(salesperson_id)
+
+    def clear(self) -> None:
+        """全集計を破棄する."""
+        for salesperson_id in self._versions:
+            self._versions[salesperson_id] += 1
+        self._cache.clear()
+
+    def apply(self, change: _Change) -> None:
+        """コミットされた変更を集計に反映する.
+
+        Args:
+            change: 変更内容
+        """
+        if isinstance(change, _Invalidation):
+            self.invalidate(change.salesperson_id)
+            return
+
+        self._bump(change.salesperson_id)
+        summary = self._cache.peek(change.salesperson_id)
+        if summary is None:
+            return
+
+        if isinstance(change, _UnreadChange):
+            summary.unread_comment_count += change.delta
+            return
+
+        snapshot = summary.reports.get(change.report_id)
+        if isinstance(change, _CountChange):
+            if snapshot is not None:
+                snapshot.visit_count += change.visits
+                snapshot.comment_count += change.comments
+            return
+
+        in_window = change.report_date >= summary.window_start
+        if snapshot is not None:
+            if in_window:
+                snapshot.report_date = change.report_date
+                snapshot.status = change.status
+            else:
+                del summary.reports[change.report_id]
+        elif change.created and in_window:
+            summary.reports[change.report_id] = ReportSnapshot(
+                report_id=change.report_id,
+                report_date=change.report_date,
+                status=change.status,
+            )
+        elif in_window:
+            # 期間外から期間内に移動した日報は件数が不明なため再計算させる
+            self._cache.delete(change.salesperson_id)
+
+    def _bump(self, salesperson_id: int) -> None:
+        self._versions[salesperson_id] = self._versions.get(salesperson_id, 0) + 1
+
+
+dashboard_store = DashboardStore(
+    max_size=settings.dashboard_cache_max_size,
+    ttl_seconds=settings.dashboard_cache_ttl_seconds,
+)
+
+
+def _record(session: Session | None, change: _Change) -> None:
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, []).append(change)
+
+
+def record_unread_change(session: Session, salesperson_id: int, delta: int) -> None:
+    """閲覧者の未読コメント数の増減をコミット時の反映対象として記録する.
+
+    Args:
+        session: 既読マーカーを更新したセッション
+        salesperson_id: 閲覧者の営業担当者ID
+        delta: 未読コメント数の増減
+    """
+    if delta:
+        _record(session, _UnreadChange(salesperson_id, delta))
+
+
+def record_visit_count_change(
+    session: Session, salesperson_id: int, report_id: int, delta: int
+) -> None:
+    """ORMを経由しない訪問記録の登録・削除による件数の増減を記録する.
+
+    Args:
+        session: 訪問記録を登録・削除したセッション
+        salesperson_id: 日報の作成者ID
+        report_id: 日報ID
+        delta: 訪問件数の増減
+    """
+    if delta:
+        _record(session, _CountChange(salesperson_id, report_id, visits=delta))
+
+
+def _report_owner(
+    session: Session, connection: Connection, report_id: int
+) -> int | None:
+    """日報の作成者IDを返す.
+
+    セッション内に日報が読み込まれていればそれを使い、無ければ問い合わせる。
+    """
+    report = session.identity_map.get(session.identity_key(DailyReport, report_id))
+    if report is not None:
+        return report.salesperson_id
+    return connection.scalar(
+        select(DailyReport.salesperson_id).where(DailyReport.report_id == report_id)
+    )
+
+
+def _record_report(target: DailyReport, created: bool) -> None:
+    _record(
+        object_session(target),
+        _ReportChange(
+            salesperson_id=target.salesperson_id,
+            report_id=target.report_id,
+            report_date=target.report_date,
+            status=target.status,
+            created=created,
+        ),
+    )
+
+
+@event.listens_for(DailyReport, "after_insert")
+def _record_report_insert(
+    _mapper: Mapper, _connection: Connection, target: DailyReport
+) -> None:
+    """登録された日報をコミット時の反映対象として記録する."""
+    _record_report(target, created=True)
+
+
+@event.listens_for(DailyReport, "after_update")
+def _record_report_update(
+    _mapper: Mapper, _connection: Connection, target: DailyReport
+) -> None:
+    """更新された日報をコミット時の反映対象として記録する."""
+    _record_report(target, created=False)
+
+
+@event.listens_for(DailyReport, "after_delete")
+def _record_report_deletion(
+    _mapper: Mapper, _connection: Connection, target: DailyReport
+) -> None:
+    """削除された日報の作成者を再計算対象として記録する.
+
+    紐づくコメントはデータベースのカスケード削除で消えるため、差分では追えない。
+    """
+    _record(object_session(target), _Invalidation(target.salesperson_id))
+
+
+def _record_count_change(
+    connection: Connection,
+    target: VisitRecord | ReportComment,
+    sign: int,
+) -> None:
+    session = object_session(target)
+    if session is None:
+        return
+    owner_id = _report_owner(session, connection, target.report_id)
+    if owner_id is None:
+        return
+    if isinstance(target, VisitRecord):
+        change = _CountChange(owner_id, target.report_id, visits=sign)
+    else:
+        change = _CountChange(owner_id, target.report_id, comments=sign)
+    _record(session, change)
+
+
+@event.listens_for(VisitRecord, "after_insert")
+@event.listens_for(ReportComment, "after_insert")
+def _record_child_insert(
+    _mapper: Mapper, connection: Connection, target: VisitRecord | ReportComment
+) -> None:
+    """登録された訪問記録・コメントをコミット時の反映対象として記録する."""
+    _record_count_change(connection, target, 1)
+
+
+@event.listens_for(VisitRecord, "after_delete")
+@event.listens_for(ReportComment, "after_delete")
+def _record_child_delete(
+    _mapper: Mapper, connection: Connection, target: VisitRecord | ReportComment
+) -> None:
+    """削除された訪問記録・コメントをコミット時の反映対象として記録する."""
+    _record_count_change(connection, target, -1)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_on_commit(session: Session) -> None:
+    """コミットされた変更を集計に反映する."""
+    for change in session.info.pop(_PENDING_KEY, ()):
+        dashboard_store.apply(change)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    """ロールバックされた変更を破棄する."""
+    session.info.pop(_PENDING_KEY, None)
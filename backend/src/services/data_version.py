@@ -0,0 +1,118 @@
+"""マスタデータの版数（DATA_VERSION）.
+
+track() で登録したモデルについて、ORM経由の登録・更新・削除をフラッシュする
+たびに、同じトランザクション内で DATA_VERSION の該当テーブルの版数を加算する。
+版数は主キーの1行を参照するだけで取得できるため、全件の集計を伴わずに
+変更の有無を判定できる（ETagの計算、メモリ上のインデックスの鮮度の確認）。
+
+加算した行はトランザクションの終了までロックされるため、同じテーブルの版数を
+加算するトランザクション同士は直列化される。コミット時には on_commit() で
+登録した関数に、そのトランザクションで加算した最初と最後の版数を渡す。
+最初の版数が手元の版数の次であれば、その間に他のトランザクション（他の
+インスタンスを含む）による変更が無かったことが分かる。
+
+ORMを経由しない更新（SQLの直接実行など）では版数は加算されない。
+"""
+
+from collections.abc import Callable
+
+from sqlalchemy import Connection, event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapper, Session, object_session
+
+from src.models import Base, DataVersion
+
+# フラッシュ待ちの変更があるテーブル名をSession.infoに保持するキー
+_CHANGED_KEY = "data_version_changed_tables"
+# トランザクション内で加算した（最初の版数, 最後の版数）をSession.infoに保持するキー
+_BUMPED_KEY = "data_version_bumped"
+
+type CommitCallback = Callable[[int, int], None]
+
+_callbacks: dict[str, list[CommitCallback]] = {}
+
+
+def track(model: type[Base]) -> None:
+    """モデルの登録・更新・削除で版数を加算するよう登録する.
+
+    Args:
+        model: 対象のモデル
+    """
+    table_name = model.__tablename__
+
+    def record(_mapper: Mapper, _connection: object, target: Base) -> None:
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(_CHANGED_KEY, set()).add(table_name)
+
+    for identifier in ("after_insert", "after_update", "after_delete"):
+        event.listen(model, identifier, record)
+
+
+def on_commit(table_name: str, callback: CommitCallback) -> None:
+    """版数を加算したトランザクションのコミット時に呼び出す関数を登録する.
+
+    Args:
+        table_name: テーブル名
+        callback: (最初の版数, 最後の版数) を受け取る関数
+    """
+    _callbacks.setdefault(table_name, []).append(callback)
+
+
+async def current_version(db: AsyncSession, table_name: str) -> int:
+    """テーブルの現在の版数を返す.
+
+    Args:
+        db: データベースセッション
+        table_name: テーブル名
+
+    Returns:
+        版数（一度も加算されていない場合は0）
+    """
+    version = await db.scalar(
+        select(DataVersion.version).where(DataVersion.table_name == table_name)
+    )
+    return version or 0
+
+
+def _bump(connection: Connection, table_name: str) -> int:
+    """版数を加算し、加算後の版数を返す."""
+    condition = DataVersion.table_name == table_name
+    result = connection.execute(
+        update(DataVersion).where(condition).values(version=DataVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        # マイグレーションで登録していない環境（テスト用のDBなど）
+        connection.execute(insert(DataVersion).values(table_name=table_name, version=1))
+    return connection.execute(select(DataVersion.version).where(condition)).scalar_one()
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_changed(session: Session, _flush_context: object) -> None:
+    """フラッシュした変更のあるテーブルの版数を加算する."""
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if not changed:
+        return
+    connection = session.connection()
+    bumped = session.info.setdefault(_BUMPED_KEY, {})
+    # ロックを取得する順序を固定し、デッドロックを避ける
+    for table_name in sorted(changed):
+        version = _bump(connection, table_name)
+        first, _ = bumped.get(table_name, (version, version))
+        bumped[table_name] = (first, version)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_commit(session: Session) -> None:
+    """加算した版数を登録された関数に通知する."""
+    bumped = session.info.pop(_BUMPED_KEY, None)
+    for table_name, (first, last) in (bumped or {}).items():
+        for callback in _callbacks.get(table_name, []):
+            callback(first, last)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    """ロールバックされた加算を破棄する."""
+    session.info.pop(_CHANGED_KEY, None)
+    session.info.pop(_BUMPED_KEY, None)
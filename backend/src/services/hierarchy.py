@@ -0,0 +1,302 @@
+"""営業担当者の上長・部下階層インデックス.
+
+SALESPERSON.manager_id から上長→部下の対応と推移的閉包（全階層の部下集合）を
+メモリ上に保持し、上長判定・部下判定をO(1)で行う。
+
+インデックスはプロセスごとに1回データベースから構築し、以降は次の方法で更新する。
+
+- 同一プロセス内でのORM経由の登録・更新・削除: コミット時に差分を反映
+- 他インスタンスでの更新: hierarchy_refresh_seconds 経過後に再構築
+"""
+
+import asyncio
+import time
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapper, Session, object_session
+
+from src.core.config import settings
+from src.models import Salesperson
+
+# コミット待ちの変更をSession.infoに保持するキー
+_PENDING_KEY = "hierarchy_pending_changes"
+# 削除を表す値（manager_id の None と区別する）
+_DELETED = object()
+
+
+class HierarchyIndex:
+    """上長・部下の階層インデックス."""
+
+    def __init__(self, refresh_seconds: float | None = None) -> None:
+        """インデックスを初期化する.
+
+        Args:
+            refresh_seconds: データベースから再構築する間隔（Noneの場合は再構築しない）
+        """
+        self.refresh_seconds = refresh_seconds
+        self._manager_of: dict[int, int | None] = {}
+        self._children: dict[int, set[int]] = {}
+        # 推移的閉包（全階層の部下）。参照時に計算し、階層変更時に破棄する
+        self._descendants: dict[int, frozenset[int]] = {}
+        self._loaded_at: float | None = None
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        """インデックスが構築済みかどうか."""
+        return self._loaded_at is not None
+
+    def build(self, rows: list[tuple[int, int | None]]) -> None:
+        """(営業担当者ID, 上長ID) の一覧からインデックスを構築する.
+
+        Args:
+            rows: 営業担当者IDと上長IDの組のリスト
+        """
+        manager_of: dict[int, int | None] = {}
+        children: dict[int, set[int]] = {}
+        for salesperson_id, manager_id in rows:
+            manager_of[salesperson_id] = manager_id
+            if manager_id is not None:
+                children.setdefault(manager_id, set()).add(salesperson_id)
+        self._manager_of = manager_of
+        self._children = children
+        self._descendants = {}
+        self._loaded_at = time.monotonic()
+
+    async def load(self, db: AsyncSession) -> None:
+        """データベースからインデックスを構築する.
+
+        Args:
+            db: データベースセッション
+        """
+        result = await db.execute(
+            select(Salesperson.salesperson_id, Salesperson.manager_id)
+        )
+        self.build([(row[0], row[1]) for row in result.all()])
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """未構築または再構築間隔を過ぎている場合にデータベースから構築する.
+
+        Args:
+            db: データベースセッション
+        """
+        if not self._is_stale():
+            return
+        async with self._load_lock:
+            # 待機中に他のリクエストが構築を終えている場合がある
+            if self._is_stale():
+                await self.load(db)
+
+    def _is_stale(self) -> bool:
+        if self._loaded_at is None:
+            return True
+        if self.refresh_seconds is None:
+            return False
+        return time.monotonic() - self._loaded_at >= self.refresh_seconds
+
+    def invalidate(self) -> None:
+        """インデックスを破棄し、次回参照時に再構築させる."""
+        self._loaded_at = None
+
+    def is_manager(self, salesperson_id: int) -> bool:
+        """上長かどうかを判定する.
+
+        上長IDを持たない（最上位の）担当者、または部下を持つ担当者を上長とみなす。
+
+        Args:
+            salesperson_id: 営業担当者ID
+
+        Returns:
+            上長の場合True
+        """
+        if salesperson_id not in self._manager_of:
+            return False
+        return self._manager_of[salesperson_id] is None or bool(
+            self._children.get(salesperson_id)
+        )
+
+    def manager_of(self, salesperson_id: int) -> int | None:
+        """直属の上長IDを返す.
+
+        Args:
+            salesperson_id: 営業担当者ID
+
+        Returns:
+            上長ID（存在しない場合はNone）
+        """
+        return self._manager_of.get(salesperson_id)
+
+    def managers_of(self, salesperson_id: int) -> list[int]:
+        """上位の上長IDを直属の上長から順に返す.
+
+        Args:
+            salesperson_id: 営業担当者ID
+
+        Returns:
+            上長IDのリスト（本人は含まない）
+        """
+        managers: list[int] = []
+        node = self._manager_of.get(salesperson_id)
+        while node is not None and node != salesperson_id and node not in managers:
+            managers.append(node)
+            node = self._manager_of.get(node)
+        return managers
+
+    def direct_subordinates(self, salesperson_id: int) -> frozenset[int]:
+        """直属の部下IDの集合を返す.
+
+        Args:
+            salesperson_id: 営業担当者ID
+
+        Returns:
+            直属の部下IDの集合
+        """
+        return frozenset(self._children.get(salesperson_id, ()))
+
+    def subordinates(self, salesperson_id: int) -> frozenset[int]:
+        """全階層の部下IDの集合を返す.
+
+        Args:
+            salesperson_id: 営業担当者ID
+
+        Returns:
+            配下の全営業担当者IDの集合（本人は含まない）
+        """
+        cached = self._descendants.get(salesperson_id)
+        if cached is not None:
+            return cached
+
+        # 深い階層でも再帰上限に達しないよう、後順で反復的に計算する
+        stack: list[tuple[int, bool]] = [(salesperson_id, False)]
+        visiting: set[int] = set()
+        while stack:
+            node, expanded = stack.pop()
+            if node in self._descendants:
+                continue
+            children = self._children.get(node, ())
+            if expanded:
+                result: set[int] = set(children)
+                for child in children:
+                    result |= self._descendants.get(child, frozenset())
+                result.discard(node)
+                self._descendants[node] = frozenset(result)
+                continue
+            if node in visiting:
+                # 循環した上長設定は無視する
+                continue
+            visiting.add(node)
+            stack.append((node, True))
+            stack.extend((child, False) for child in children)
+        return self._descendants.get(salesperson_id, frozenset())
+
+    def self_and_subordinates(self, salesperson_id: int) -> frozenset[int]:
+        """本人と全階層の部下IDの集合を返す（日報の閲覧可能範囲）.
+
+        Args:
+            salesperson_id: 営業担当者ID
+
+        Returns:
+            本人と配下の全営業担当者IDの集合
+        """
+        return self.subordinates(salesperson_id) | {salesperson_id}
+
+    def is_subordinate_of(self, salesperson_id: int, manager_id: int) -> bool:
+        """指定した上長の配下（全階層）かどうかを判定する.
+
+        Args:
+            salesperson_id: 判定対象の営業担当者ID
+            manager_id: 上長ID
+
+        Returns:
+            配下の場合True
+        """
+        return salesperson_id in self.subordinates(manager_id)
+
+    def upsert(self, salesperson_id: int, manager_id: int | None) -> None:
+        """営業担当者の上長設定を反映する.
+
+        Args:
+            salesperson_id: 営業担当者ID
+            manager_id: 上長ID
+        """
+        old_manager_id = self._manager_of.get(salesperson_id)
+        exists = salesperson_id in self._manager_of
+        if exists and old_manager_id == manager_id:
+            return
+
+        if old_manager_id is not None:
+            self._invalidate_ancestors(old_manager_id)
+            siblings = self._children.get(old_manager_id)
+            if siblings is not None:
+                siblings.discard(salesperson_id)
+        self._manager_of[salesperson_id] = manager_id
+        if manager_id is not None:
+            self._children.setdefault(manager_id, set()).add(salesperson_id)
+            self._invalidate_ancestors(manager_id)
+
+    def remove(self, salesperson_id: int) -> None:
+        """営業担当者をインデックスから削除する.
+
+        Args:
+            salesperson_id: 営業担当者ID
+        """
+        if salesperson_id not in self._manager_of:
+            return
+        manager_id = self._manager_of.pop(salesperson_id)
+        if manager_id is not None:
+            self._invalidate_ancestors(manager_id)
+            self._children.get(manager_id, set()).discard(salesperson_id)
+        self._descendants.pop(salesperson_id, None)
+
+    def _invalidate_ancestors(self, salesperson_id: int) -> None:
+        """指定した担当者とその上位全員の閉包キャッシュを破棄する."""
+        node: int | None = salesperson_id
+        seen: set[int] = set()
+        while node is not None and node not in seen:
+            seen.add(node)
+            self._descendants.pop(node, None)
+            node = self._manager_of.get(node)
+
+
+hierarchy_index = HierarchyIndex(refresh_seconds=settings.hierarchy_refresh_seconds)
+
+
+@event.listens_for(Salesperson, "after_insert")
+@event.listens_for(Salesperson, "after_update")
+def _record_manager_change(
+    _mapper: Mapper, _connection: object, target: Salesperson
+) -> None:
+    """登録・更新された営業担当者の上長設定をコミット時の反映対象として記録する."""
+    session = object_session(target)
+    if session is not None:
+        pending = session.info.setdefault(_PENDING_KEY, {})
+        pending[target.salesperson_id] = target.manager_id
+
+
+@event.listens_for(Salesperson, "after_delete")
+def _record_deletion(_mapper: Mapper, _connection: object, target: Salesperson) -> None:
+    """削除された営業担当者をコミット時の反映対象として記録する."""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, {})[target.salesperson_id] = _DELETED
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_on_commit(session: Session) -> None:
+    """コミットされた変更をインデックスに反映する."""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or not hierarchy_index.is_loaded:
+        # 未構築の場合は初回参照時にデータベースから構築される
+        return
+    for salesperson_id, manager_id in pending.items():
+        if manager_id is _DELETED:
+            hierarchy_index.remove(salesperson_id)
+        else:
+            hierarchy_index.upsert(salesperson_id, manager_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    """ロールバックされた変更を破棄する."""
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,384 @@
+"""通知イベントの登録と配信（トランザクショナル・アウトボックス）.
+
+日報の提出・確認、コメントの投稿は上長や作成者への通知を伴うが、
+リクエスト内で通知を配信すると配信先の応答時間がそのまま書き込みAPIの
+応答時間に加わる。本モジュールでは通知をイベントとして OUTBOX_EVENT に
+登録し、バックグラウンドのワーカーが配信する。
+
+- 登録: enqueue() で操作と同じセッションに追加する。操作と同じトランザクションで
+  コミットされるため、ロールバックされた操作の通知は配信されない
+- 配信: OutboxWorker が未配信のイベントをイベントIDの順に batch_size 件ずつ
+  取り出して配信する。コミット時に起床するため、通常は登録の直後に配信される
+- 取り出し: 短いトランザクションで試行回数を加算し、配信可能日時を
+  lease_seconds 秒後に延ばして（リース）コミットする。配信はトランザクションの
+  外で行い、結果は別の短いトランザクションで記録する。配信先が応答しない間も
+  行ロックやトランザクションを保持しない。リース期間内に配信が終わらない
+  イベントは失敗として記録し、記録前にプロセスが停止したイベントはリース期間の
+  経過後に再び取り出される
+- 再試行: 配信に失敗したイベントは、失敗ごとに2倍（上限あり）の待ち時間の後に
+  再試行する。max_attempts 回失敗したイベントは配信を打ち切る
+
+配信は少なくとも1回（at-least-once）行われる。配信後の記録の前にプロセスが
+停止した場合は同じイベントが再配信されるため、配信先は event_id で重複を
+除くこと。結果の記録は取り出し時の試行回数が変わっていない場合に限る
+（リース切れで他のワーカーが取り出し直したイベントの結果を上書きしない）。
+"""
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Protocol
+
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+# イベント種別
+REPORT_SUBMITTED = "report.submitted"
+REPORT_CONFIRMED = "report.confirmed"
+COMMENT_POSTED = "comment.posted"
+
+# イベントを登録したセッションに付ける印のSession.infoのキー
+_ENQUEUED_KEY = "outbox_enqueued"
+
+
+@dataclass(frozen=True)
+class Notification:
+    """配信する通知."""
+
+    event_id: int
+    event_type: str
+    payload: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class _Outcome:
+    """配信の結果（error がNoneの場合は成功）."""
+
+    notification: Notification
+    attempts: int
+    error: str | None = None
+
+
+class NotificationSink(Protocol):
+    """通知の配信先."""
+
+    async def deliver(self, notification: Notification) -> None:
+        """通知を配信する（失敗時は例外を送出する）."""
+        ...
+
+
+class LogSink:
+    """通知をログに出力する配信先."""
+
+    async def deliver(self, notification: Notification) -> None:
+        """通知をログに出力する.
+
+        Args:
+            notification: 通知
+        """
+        logger.info(
+            "notification %d %s: %s",
+            notification.event_id,
+            notification.event_type,
+            notification.payload,
+        )
+
+
+class MemorySink:
+    """通知をメモリに保持する配信先（ローカル確認・テスト用）.
+
+    Attributes:
+        delivered: 配信された通知
+        failures: 失敗させる残りの配信回数
+    """
+
+    def __init__(self, failures: int = 0) -> None:
+        """配信先を初期化する.
+
+        Args:
+            failures: 最初に失敗させる配信回数
+        """
+        self.delivered: list[Notification] = []
+        self.failures = failures
+
+    async def deliver(self, notification: Notification) -> None:
+        """通知を保持する.
+
+        Args:
+            notification: 通知
+
+        Raises:
+            ConnectionError: 失敗させる配信回数が残っている場合
+        """
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("notification sink unavailable")
+        self.delivered.append(notification)
+
+
+def enqueue(db: AsyncSession, event_type: str, payload: dict[str, Any]) -> None:
+    """通知イベントを登録する.
+
+    操作と同じセッションに追加し、操作と同じトランザクションでコミットする。
+
+    Args:
+        db: データベースセッション
+        event_type: イベント種別
+        payload: 通知の内容（JSONに変換できる値）
+    """
+    db.add(OutboxEvent(event_type=event_type, payload=payload))
+    db.info[_ENQUEUED_KEY] = True
+
+
+class OutboxWorker:
+    """未配信の通知イベントを配信するワーカー.
+
+    Attributes:
+        sink: 通知の配信先
+        batch_size: 1回に取り出して配信するイベント数
+        poll_seconds: 未配信イベントを確認する間隔（秒）
+        max_attempts: 配信を打ち切るまでの試行回数
+        retry_base_seconds: 1回目の失敗後の再試行までの秒数
+        retry_max_seconds: 再試行までの秒数の上限
+        lease_seconds: 取り出したイベントを他のワーカーが取り出さない秒数
+            （この間に終わらない配信は失敗とする）
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        sink: NotificationSink,
+        *,
+        batch_size: int,
+        poll_seconds: float,
+        max_attempts: int,
+        retry_base_seconds: float,
+        retry_max_seconds: float,
+        lease_seconds: float,
+        clock: Callable[[], datetime] = datetime.now,
+    ) -> None:
+        """ワーカーを初期化する.
+
+        Args:
+            session_factory: セッションファクトリ
+            sink: 通知の配信先
+            batch_size: 1回に取り出して配信するイベント数
+            poll_seconds: 未配信イベントを確認する間隔（秒）
+            max_attempts: 配信を打ち切るまでの試行回数
+            retry_base_seconds: 1回目の失敗後の再試行までの秒数
+            retry_max_seconds: 再試行までの秒数の上限
+            lease_seconds: 取り出したイベントを他のワーカーが取り出さない秒数
+            clock: 現在日時を返す関数
+        """
+        self.sink = sink
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.lease_seconds = lease_seconds
+        self._session_factory = session_factory
+        self._clock = clock
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """配信ループが動作中かどうか."""
+        return self._task is not None and not self._task.done()
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        """attempts 回目の失敗後、再試行までの待ち時間を返す.
+
+        Args:
+            attempts: 失敗した回数
+
+        Returns:
+            再試行までの待ち時間
+        """
+        seconds = self.retry_base_seconds * 2 ** (attempts - 1)
+        return timedelta(seconds=min(seconds, self.retry_max_seconds))
+
+    async def drain_batch(self) -> int:
+        """配信可能なイベントを最大 batch_size 件配信する.
+
+        取り出し・配信・結果の記録をそれぞれ別に行い、配信中はトランザクションを
+        保持しない。複数のインスタンスで同時に実行しても、取り出し時のロック
+        （SKIP LOCKED）とリースにより同じイベントを取り出さない。
+
+        Returns:
+            配信を試みたイベント数
+        """
+        claimed = await self._claim()
+        if not claimed:
+            return 0
+        outcomes: list[_Outcome] = []
+        try:
+            async with asyncio.timeout(self.lease_seconds):
+                for notification, attempts in claimed:
+                    outcomes.append(await self._deliver(notification, attempts))
+        except TimeoutError:
+            outcomes += [
+                _Outcome(notification, attempts, "TimeoutError: lease expired")
+                for notification, attempts in claimed[len(outcomes) :]
+            ]
+        await self._record(outcomes)
+        return len(claimed)
+
+    async def _claim(self) -> list[tuple[Notification, int]]:
+        """配信可能なイベントを取り出し、リース期間の間は他のワーカーから隠す.
+
+        Returns:
+            取り出した通知と、加算後の試行回数
+        """
+        async with self._session_factory() as session:
+            now = self._clock()
+            events = list(
+                await session.scalars(
+                    select(OutboxEvent)
+                    .where(
+                        OutboxEvent.delivered_at.is_(None),
+                        OutboxEvent.available_at <= now,
+                        OutboxEvent.attempts < self.max_attempts,
+                    )
+                    .order_by(OutboxEvent.event_id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+            )
+            lease_until = now + timedelta(seconds=self.lease_seconds)
+            claimed = []
+            for outbox_event in events:
+                outbox_event.attempts += 1
+                outbox_event.available_at = lease_until
+                claimed.append(
+                    (
+                        Notification(
+                            event_id=outbox_event.event_id,
+                            event_type=outbox_event.event_type,
+                            payload=outbox_event.payload,
+                        ),
+                        outbox_event.attempts,
+                    )
+                )
+            await session.commit()
+        return claimed
+
+    async def _deliver(self, notification: Notification, attempts: int) -> _Outcome:
+        """通知を配信し、結果を返す."""
+        try:
+            await self.sink.deliver(notification)
+        except Exception as e:
+            return _Outcome(notification, attempts, f"{type(e).__name__}: {e}")
+        return _Outcome(notification, attempts)
+
+    async def _record(self, outcomes: list[_Outcome]) -> None:
+        """配信の結果を記録する.
+
+        取り出し後に他のワーカーが取り出し直したイベント（試行回数が異なる）は
+        記録しない。
+        """
+        now = self._clock()
+        async with self._session_factory() as session:
+            for outcome in outcomes:
+                event_id = outcome.notification.event_id
+                if outcome.error is None:
+                    values: dict[str, Any] = {"delivered_at": now, "last_error": None}
+                else:
+                    values = {
+                        "available_at": now + self.retry_delay(outcome.attempts),
+                        "last_error": outcome.error,
+                    }
+                    log = (
+                        logger.error
+                        if outcome.attempts >= self.max_attempts
+                        else logger.warning
+                    )
+                    log(
+                        "notification %d delivery failed (%d/%d): %s",
+                        event_id,
+                        outcome.attempts,
+                        self.max_attempts,
+                        outcome.error,
+                    )
+                await session.execute(
+                    update(OutboxEvent)
+                    .where(
+                        OutboxEvent.event_id == event_id,
+                        OutboxEvent.attempts == outcome.attempts,
+                        OutboxEvent.delivered_at.is_(None),
+                    )
+                    .values(**values)
+                )
+            await session.commit()
+
+    async def run(self) -> None:
+        """未配信のイベントがなくなるまで配信し、次の登録か確認間隔まで待つことを繰り返す."""
+        while True:
+            self._wakeup.clear()
+            try:
+                while await self.drain_batch() >= self.batch_size:
+                    pass
+            except Exception:
+                logger.exception("outbox worker failed to drain events")
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+
+    def wake(self) -> None:
+        """登録されたイベントの配信のため、待機中の配信ループを起こす."""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """配信ループを開始する."""
+        if not self.is_running:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """配信ループを停止する.
+
+        配信中のバッチは中断され、記録前のイベントはリース期間の経過後に
+        再配信される。
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+
+# アプリケーション全体で共有するワーカー
+outbox_worker = OutboxWorker(
+    AsyncSessionLocal,
+    LogSink(),
+    batch_size=settings.outbox_batch_size,
+    poll_seconds=settings.outbox_poll_seconds,
+    max_attempts=settings.outbox_max_attempts,
+    retry_base_seconds=settings.outbox_retry_base_seconds,
+    retry_max_seconds=settings.outbox_retry_max_seconds,
+    lease_seconds=settings.outbox_lease_seconds,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_worker(session: Session) -> None:
+    """イベントを登録したトランザクションのコミット後にワーカーを起こす."""
+    if session.info.pop(_ENQUEUED_KEY, False):
+        outbox_worker.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_enqueued(session: Session) -> None:
+    """ロールバックしたイベントの印を取り除く."""
+    session.info.pop(_ENQUEUED_KEY, None)
@@ -0,0 +1,165 @@
+"""日報のCSVエクスポート.
+
+日報・訪問記録・顧客を結合した行をサーバーサイドカーソルで逐次取得し、
+export_fetch_size 行ごとにCSVへ変換して返す。結果全体を保持しないため、
+出力件数によらずメモリ使用量は一定となる。
+
+出力は1行1訪問記録（訪問記録のない日報は訪問記録の列を空欄とした1行）で、
+列名は一括インポート（report_import）のCSVと共通のため、そのまま取り込める。
+Excelで開いても文字化けしないよう、先頭にBOMを付与する。
+
+表計算ソフトで開いたときに数式として実行されないよう（CSVインジェクション）、
+自由入力の列（担当者名・課題・計画・会社名・訪問内容）で = + - @ タブ CR から
+始まる値には先頭に ' を付ける。インポートでは付けた ' を取り除く。
+"""
+
+import csv
+import io
+from collections.abc import AsyncIterator
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Customer, DailyReport, Salesperson, VisitRecord
+from src.services.reports import ReportListFilter
+
+# 表計算ソフトが数式として解釈する先頭の文字
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_formula(value: str | None) -> str | None:
+    """数式として解釈される値の先頭に ' を付ける.
+
+    Args:
+        value: セルの値
+
+    Returns:
+        エスケープした値
+    """
+    if value is not None and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def unescape_formula(value: str | None) -> str | None:
+    """escape_formula() で付けた先頭の ' を取り除く.
+
+    Args:
+        value: セルの値
+
+    Returns:
+        エスケープを取り除いた値
+    """
+    if (
+        value is not None
+        and value[:1] == "'"
+        and value[1:].startswith(_FORMULA_PREFIXES)
+    ):
+        return value[1:]
+    return value
+
+
+EXPORT_COLUMNS = (
+    "report_id",
+    "report_date",
+    "salesperson_id",
+    "salesperson_name",
+    "status",
+    "problem",
+    "plan",
+    "customer_id",
+    "company_name",
+    "visit_time",
+    "visit_content",
+)
+
+
+def build_report_export_query(filters: ReportListFilter) -> Select:
+    """エクスポート対象の行を取得するクエリを構築する.
+
+    Args:
+        filters: 検索条件
+
+    Returns:
+        日報の新しい順・訪問記録の表示順に並べたクエリ
+    """
+    return (
+        select(
+            DailyReport.report_id,
+            DailyReport.report_date,
+            DailyReport.salesperson_id,
+            Salesperson.name,
+            DailyReport.status,
+            DailyReport.problem,
+            DailyReport.plan,
+            VisitRecord.customer_id,
+            Customer.company_name,
+            VisitRecord.visit_time,
+            VisitRecord.visit_content,
+        )
+        .join(Salesperson, Salesperson.salesperson_id == DailyReport.salesperson_id)
+        .outerjoin(VisitRecord, VisitRecord.report_id == DailyReport.report_id)
+        .outerjoin(Customer, Customer.customer_id == VisitRecord.customer_id)
+        .where(*filters.conditions())
+        .order_by(
+            DailyReport.report_date.desc(),
+            DailyReport.report_id.desc(),
+            VisitRecord.display_order,
+            VisitRecord.visit_id,
+        )
+    )
+
+
+async def stream_report_csv(
+    db: AsyncSession, filters: ReportListFilter, fetch_size: int
+) -> AsyncIterator[bytes]:
+    """日報をCSVとして逐次出力する.
+
+    Args:
+        db: データベースセッション
+        filters: 検索条件
+        fetch_size: 1回に取得・出力する行数
+
+    Yields:
+        UTF-8（BOM付き）でエンコードしたCSVの断片
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\r\n")
+    writer.writerow(EXPORT_COLUMNS)
+    yield ("\ufeff" + buffer.getvalue()).encode()
+
+    result = await db.stream(
+        build_report_export_query(filters).execution_options(yield_per=fetch_size)
+    )
+    async for rows in result.partitions():
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            (
+                report_id,
+                report_date.isoformat(),
+                salesperson_id,
+                escape_formula(name),
+                status.value,
+                escape_formula(problem),
+                escape_formula(plan),
+                customer_id,
+                escape_formula(company_name),
+                visit_time.strftime("%H:%M") if visit_time is not None else None,
+                escape_formula(visit_content),
+            )
+            for (
+                report_id,
+                report_date,
+                salesperson_id,
+                name,
+                status,
+                problem,
+                plan,
+                customer_id,
+                company_name,
+                visit_time,
+                visit_content,
+            ) in rows
+        )
+        yield buffer.getvalue().encode()
@@ -0,0 +1,399 @@
+"""日報の一括インポート.
+
+過去の日報を訪問記録・コメントごと取り込む。入力は1行1日報のNDJSON、または
+1行1訪問記録のCSVで、入力を逐次解析しながら batch_size 件ごとに次の処理を行う。
+
+1. スキーマ検証（不正なレコードは行番号付きのエラーとして除外）
+2. 営業担当者・顧客の存在、日報の重複、登録権限をまとめて確認
+3. 日報・訪問記録・コメントをそれぞれ executemany で一括登録してコミット
+
+バッチごとにコミットするため、途中のバッチが失敗しても前のバッチは登録済みとなる。
+保持するのは処理中のバッチのみで、入力件数によらずメモリ使用量は一定となる。
+
+ORMを経由しないため、ダッシュボード集計はバッチのコミット後に明示的に破棄する。
+取り込んだコメントは既読マーカーを作成しないため、既読として扱われる。
+"""
+
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Collection
+from datetime import date, datetime
+from typing import Literal
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Customer, DailyReport, ReportComment, Salesperson, VisitRecord
+from src.schemas.report_import import ImportErrorItem, ImportReport, ImportResult
+from src.services.dashboard import dashboard_store
+from src.services.report_export import unescape_formula
+
+type ImportFormat = Literal["ndjson", "csv"]
+# 解析結果（行番号と、レコードまたは解析エラーのメッセージ）
+type ParsedRecord = tuple[int, dict[str, object] | str]
+
+# CSVの列（1行1訪問記録。同じ担当者・日付の連続した行を1件の日報とする）
+CSV_COLUMNS = (
+    "salesperson_id",
+    "report_date",
+    "status",
+    "problem",
+    "plan",
+    "customer_id",
+    "visit_content",
+    "visit_time",
+)
+# 結果に含めるエラーの上限（件数は failed で返す）
+MAX_REPORTED_ERRORS = 100
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """UTF-8のバイト列を逐次デコードし、行単位で返す.
+
+    Args:
+        chunks: 入力のバイト列
+
+    Yields:
+        改行を除いた1行
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.removesuffix("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+async def parse_ndjson(lines: AsyncIterable[str]) -> AsyncIterator[ParsedRecord]:
+    """NDJSONを1行1日報として解析する.
+
+    Args:
+        lines: 入力の行
+
+    Yields:
+        行番号と、日報のデータまたはエラーメッセージ
+    """
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, f"JSONの形式が不正です: {e.msg}"
+            continue
+        if not isinstance(data, dict):
+            yield line_no, "JSONオブジェクトではありません"
+            continue
+        yield line_no, data
+
+
+async def parse_csv(lines: AsyncIterable[str]) -> AsyncIterator[ParsedRecord]:
+    """CSVを解析し、同じ担当者・日付の連続した行を1件の日報にまとめる.
+
+    1行目はヘッダー行とし、CSV_COLUMNS の列を持つこと。customer_id が空の行は
+    訪問記録を持たない日報とする。コメントはCSVでは取り込めない。
+    エクスポートで数式の実行を防ぐために付けた先頭の ' は取り除く。
+
+    Args:
+        lines: 入力の行
+
+    Yields:
+        日報の先頭行の行番号と、日報のデータまたはエラーメッセージ
+    """
+    header: list[str] | None = None
+    current: dict[str, object] | None = None
+    current_key: tuple[str | None, str | None] = (None, None)
+    current_line = 0
+    async for line_no, row in _csv_rows(lines):
+        if header is None:
+            header = row
+            missing = [c for c in CSV_COLUMNS if c not in header]
+            if missing:
+                yield line_no, f"CSVの列が不足しています: {', '.join(missing)}"
+                return
+            continue
+        values = dict(zip(header, row, strict=False))
+        key = (values.get("salesperson_id"), values.get("report_date"))
+        if current is None or key != current_key:
+            if current is not None:
+                yield current_line, current
+            current_key, current_line = key, line_no
+            visits: list[dict[str, str | None]] = []
+            current = {
+                "salesperson_id": key[0],
+                "report_date": key[1],
+                "problem": unescape_formula(values.get("problem")) or None,
+                "plan": unescape_formula(values.get("plan")) or None,
+                "visits": visits,
+            }
+            # 空欄の場合はスキーマの既定値を使う
+            if values.get("status"):
+                current["status"] = values["status"]
+        if values.get("customer_id"):
+            visits.append(
+                {
+                    "customer_id": values["customer_id"],
+                    "visit_content": unescape_formula(values.get("visit_content")),
+                    "visit_time": values.get("visit_time") or None,
+                }
+            )
+    if current is not None:
+        yield current_line, current
+
+
+async def _csv_rows(lines: AsyncIterable[str]) -> AsyncIterator[tuple[int, list[str]]]:
+    """引用符内の改行を考慮してCSVを1レコードずつ返す."""
+    line_no = 0
+    start = 0
+    buffer: list[str] = []
+    async for line in lines:
+        line_no += 1
+        if not buffer:
+            start = line_no
+            if not line.strip():
+                continue
+        buffer.append(line)
+        record = "\n".join(buffer)
+        # 引用符が閉じていない場合は次の行に続く
+        if record.count('"') % 2:
+            continue
+        buffer = []
+        yield start, next(csv.reader([record]))
+    if buffer:
+        yield start, next(csv.reader(["\n".join(buffer)]))
+
+
+def parse_records(
+    lines: AsyncIterable[str], import_format: ImportFormat
+) -> AsyncIterator[ParsedRecord]:
+    """入力形式に応じて解析する.
+
+    Args:
+        lines: 入力の行
+        import_format: 入力形式
+
+    Returns:
+        行番号と、日報のデータまたはエラーメッセージ
+    """
+    if import_format == "csv":
+        return parse_csv(lines)
+    return parse_ndjson(lines)
+
+
+class _Collector:
+    """インポート結果の集計."""
+
+    def __init__(self) -> None:
+        self.result = ImportResult()
+
+    def fail(self, line: int, message: str) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) < MAX_REPORTED_ERRORS:
+            self.result.errors.append(ImportErrorItem(line=line, message=message))
+
+
+async def import_reports(
+    db: AsyncSession,
+    records: AsyncIterable[ParsedRecord],
+    *,
+    batch_size: int,
+    allowed_salesperson_ids: Collection[int] | None = None,
+) -> ImportResult:
+    """日報を訪問記録・コメントごと一括登録する.
+
+    Args:
+        db: データベースセッション（バッチごとにコミットする）
+        records: parse_records() の解析結果
+        batch_size: 1トランザクションで登録する日報の件数
+        allowed_salesperson_ids: 日報を登録できる営業担当者ID（Noneの場合は制限なし）
+
+    Returns:
+        登録件数と取り込めなかったレコードのエラー
+    """
+    collector = _Collector()
+    batch: list[tuple[int, ImportReport]] = []
+    async for line, data in records:
+        if isinstance(data, str):
+            collector.fail(line, data)
+            continue
+        try:
+            report = ImportReport.model_validate(data)
+        except ValidationError as e:
+            collector.fail(line, _validation_message(e))
+            continue
+        if (
+            allowed_salesperson_ids is not None
+            and report.salesperson_id not in allowed_salesperson_ids
+        ):
+            collector.fail(line, "この担当者の日報を登録する権限がありません")
+            continue
+        batch.append((line, report))
+        if len(batch) >= batch_size:
+            await _write_batch(db, batch, collector)
+            batch = []
+    if batch:
+        await _write_batch(db, batch, collector)
+    return collector.result
+
+
+def _validation_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}"
+
+
+async def _write_batch(
+    db: AsyncSession, batch: list[tuple[int, ImportReport]], collector: _Collector
+) -> None:
+    """1バッチ分の参照先を確認し、1トランザクションで登録する."""
+    valid = await _check_references(db, batch, collector)
+    if not valid:
+        return
+
+    try:
+        await db.execute(
+            insert(DailyReport),
+            [
+                {
+                    "salesperson_id": report.salesperson_id,
+                    "report_date": report.report_date,
+                    "status": report.status,
+                    "problem": report.problem,
+                    "plan": report.plan,
+                }
+                for _, report in valid
+            ],
+        )
+        # MySQLは複数行INSERTで採番結果を返さないため、一意キーで引き直す
+        keys = [(report.salesperson_id, report.report_date) for _, report in valid]
+        rows = await db.execute(
+            select(
+                DailyReport.salesperson_id,
+                DailyReport.report_date,
+                DailyReport.report_id,
+            ).where(
+                tuple_(DailyReport.salesperson_id, DailyReport.report_date).in_(keys)
+            )
+        )
+        report_ids = {(row[0], row[1]): row[2] for row in rows.all()}
+
+        visits = [
+            {
+                "report_id": report_ids[key],
+                "customer_id": visit.customer_id,
+                "visit_content": visit.visit_content,
+                "visit_time": visit.visit_time,
+                "display_order": (
+                    order if visit.display_order is None else visit.display_order
+                ),
+            }
+            for key, (_, report) in zip(keys, valid, strict=True)
+            for order, visit in enumerate(report.visits)
+        ]
+        now = datetime.now()
+        comments = [
+            {
+                "report_id": report_ids[key],
+                "commenter_id": comment.commenter_id,
+                "comment_text": comment.comment_text,
+                "created_at": comment.created_at or now,
+            }
+            for key, (_, report) in zip(keys, valid, strict=True)
+            for comment in report.comments
+        ]
+        if visits:
+            await db.execute(insert(VisitRecord), visits)
+        if comments:
+            await db.execute(insert(ReportComment), comments)
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        first, last = valid[0][0], valid[-1][0]
+        for line, _ in valid:
+            collector.fail(
+                line,
+                f"{first}〜{last}行目のバッチを登録できませんでした: {type(e).__name__}",
+            )
+        return
+
+    result = collector.result
+    result.batches += 1
+    result.reports += len(valid)
+    result.visits += len(visits)
+    result.comments += len(comments)
+    for salesperson_id in {report.salesperson_id for _, report in valid}:
+        dashboard_store.invalidate(salesperson_id)
+
+
+async def _check_references(
+    db: AsyncSession, batch: list[tuple[int, ImportReport]], collector: _Collector
+) -> list[tuple[int, ImportReport]]:
+    """参照先の存在と日報の重複をバッチ単位で確認し、登録可能なレコードを返す."""
+    salesperson_ids = {report.salesperson_id for _, report in batch} | {
+        comment.commenter_id for _, report in batch for comment in report.comments
+    }
+    customer_ids = {visit.customer_id for _, report in batch for visit in report.visits}
+    keys = {(report.salesperson_id, report.report_date) for _, report in batch}
+
+    known_salespersons = set(
+        (
+            await db.scalars(
+                select(Salesperson.salesperson_id).where(
+                    Salesperson.salesperson_id.in_(salesperson_ids)
+                )
+            )
+        ).all()
+    )
+    known_customers = set(
+        (
+            await db.scalars(
+                select(Customer.customer_id).where(
+                    Customer.customer_id.in_(customer_ids)
+                )
+            )
+        ).all()
+        if customer_ids
+        else ()
+    )
+    existing = {
+        (row[0], row[1])
+        for row in (
+            await db.execute(
+                select(DailyReport.salesperson_id, DailyReport.report_date).where(
+                    tuple_(DailyReport.salesperson_id, DailyReport.report_date).in_(
+                        keys
+                    )
+                )
+            )
+        ).all()
+    }
+
+    valid: list[tuple[int, ImportReport]] = []
+    seen: set[tuple[int, date]] = set()
+    for line, report in batch:
+        key = (report.salesperson_id, report.report_date)
+        if report.salesperson_id not in known_salespersons:
+            collector.fail(line, f"営業担当者が存在しません: {report.salesperson_id}")
+        elif missing := sorted(
+            {v.customer_id for v in report.visits} - known_customers
+        ):
+            collector.fail(line, f"顧客が存在しません: {missing[0]}")
+        elif missing := sorted(
+            {c.commenter_id for c in report.comments} - known_salespersons
+        ):
+            collector.fail(line, f"コメント者が存在しません: {missing[0]}")
+        elif key in existing or key in seen:
+            collector.fail(line, "同じ担当者・日付の日報が既に存在します")
+        else:
+            seen.add(key)
+            valid.append((line, report))
+    return valid
@@ -0,0 +1,455 @@
+"""日報の参照系クエリ.
+
+日報一覧は1行ごとに訪問件数・コメント件数・未読有無を返すため、
+リレーションを遅延読み込みすると1ページあたりN+1回のクエリが発生する。
+本モジュールでは対象ページの日報IDを絞り込んだ上で、件数を相関サブクエリで
+集計し、1ページを1回のSQLで取得する。
+
+ページの指定方法はページ番号（OFFSET）とカーソル（キーセット）の2通りを持つ。
+カーソル方式は (report_date, report_id) の位置から続きを取得するため、
+深いページでも読み飛ばしが発生せず、総件数のCOUNTも要求時のみ実行する。
+
+日報詳細は、内容を決める値（日報の版数、日報・訪問記録・コメントと参照先の
+担当者・顧客の更新日時、件数、最大ID）を1回の集計クエリで取得する
+get_report_version() を持ち、クライアントのキャッシュが有効な場合は本体を
+読み込まずに済むようにしている。
+"""
+
+from collections.abc import Collection
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import (
+    ColumnElement,
+    RowMapping,
+    Select,
+    and_,
+    exists,
+    func,
+    or_,
+    select,
+    true,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from src.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from src.models import (
+    Customer,
+    DailyReport,
+    ReportComment,
+    ReportReadMarker,
+    ReportStatus,
+    Salesperson,
+    VisitRecord,
+)
+from src.schemas.report import (
+    STATUS_LABELS,
+    ReportDetail,
+    ReportListItem,
+    VisitRecordItem,
+)
+from src.services.comments import list_comments
+
+
+@dataclass(frozen=True)
+class ReportListFilter:
+    """日報一覧の検索条件.
+
+    Attributes:
+        salesperson_ids: 対象とする営業担当者IDの集合（閲覧権限で絞り込み済み）
+        date_from: 検索開始日
+        date_to: 検索終了日
+        status: ステータス
+    """
+
+    salesperson_ids: Collection[int]
+    date_from: date | None = None
+    date_to: date | None = None
+    status: ReportStatus | None = None
+
+    def conditions(self) -> list[ColumnElement[bool]]:
+        """DAILY_REPORTに対するWHERE条件を返す."""
+        conditions: list[ColumnElement[bool]] = [
+            DailyReport.salesperson_id.in_(self.salesperson_ids)
+        ]
+        if self.date_from is not None:
+            conditions.append(DailyReport.report_date >= self.date_from)
+        if self.date_to is not None:
+            conditions.append(DailyReport.report_date <= self.date_to)
+        if self.status is not None:
+            conditions.append(DailyReport.status == self.status)
+        return conditions
+
+
+def encode_report_cursor(report_date: date, report_id: int) -> str:
+    """日報一覧の並び順キーをカーソル文字列に変換する.
+
+    Args:
+        report_date: 日報日付
+        report_id: 日報ID
+
+    Returns:
+        カーソル文字列
+    """
+    return encode_cursor(report_date.isoformat(), report_id)
+
+
+def decode_report_cursor(cursor: str) -> tuple[date, int]:
+    """カーソル文字列を日報一覧の並び順キーに復元する.
+
+    Args:
+        cursor: encode_report_cursor で生成したカーソル文字列
+
+    Returns:
+        (日報日付, 日報ID)
+
+    Raises:
+        InvalidCursorError: カーソルが不正な場合
+    """
+    report_date, report_id = decode_cursor(cursor, 2)
+    if not isinstance(report_date, str) or not isinstance(report_id, int):
+        raise InvalidCursorError(cursor)
+    try:
+        return date.fromisoformat(report_date), report_id
+    except ValueError as e:
+        raise InvalidCursorError(cursor) from e
+
+
+def build_report_list_query(
+    filters: ReportListFilter,
+    viewer_id: int,
+    limit: int,
+    offset: int = 0,
+    *,
+    after: tuple[date, int] | None = None,
+    include_total: bool = True,
+) -> Select:
+    """日報一覧の1ページを取得するクエリを構築する.
+
+    対象ページの日報IDを派生テーブルで先に確定させ、訪問件数・コメント件数は
+    そのページの行に対してのみ集計する。総件数も同じ文のスカラーサブクエリで返す。
+
+    Args:
+        filters: 検索条件
+        viewer_id: 閲覧者の営業担当者ID（未読判定に使用）
+        limit: 取得件数
+        offset: 取得開始位置
+        after: この (日報日付, 日報ID) より後ろの行から取得する（カーソル方式）
+        include_total: 総件数の列（total_count）を含めるかどうか
+
+    Returns:
+        1ページ分の行を返すSELECT文
+    """
+    conditions = filters.conditions()
+    page_conditions = list(conditions)
+    if after is not None:
+        # (report_date, report_id) < (x, y) を展開する。先頭の report_date <= x は
+        # 冗長だが、これが無いとORが索引ごとに分割され（SQLiteのMULTI-INDEX OR）、
+        # カーソル以降の全行を読んでからソートする実行計画になる
+        after_date, after_id = after
+        page_conditions.append(DailyReport.report_date <= after_date)
+        page_conditions.append(
+            or_(
+                DailyReport.report_date < after_date,
+                and_(
+                    DailyReport.report_date == after_date,
+                    DailyReport.report_id < after_id,
+                ),
+            )
+        )
+    page = (
+        select(DailyReport.report_id)
+        .where(*page_conditions)
+        .order_by(DailyReport.report_date.desc(), DailyReport.report_id.desc())
+        .limit(limit)
+        .offset(offset)
+        .subquery("page")
+    )
+    visit_count = (
+        select(func.count())
+        .select_from(VisitRecord)
+        .where(VisitRecord.report_id == DailyReport.report_id)
+        .correlate(DailyReport)
+        .scalar_subquery()
+    )
+    comment_count = (
+        select(func.count())
+        .select_from(ReportComment)
+        .where(ReportComment.report_id == DailyReport.report_id)
+        .correlate(DailyReport)
+        .scalar_subquery()
+    )
+    # 未読の有無はコメントを走査せず、閲覧者の既読マーカーの未読数から判定する
+    has_unread_comments = exists().where(
+        ReportReadMarker.salesperson_id == viewer_id,
+        ReportReadMarker.report_id == DailyReport.report_id,
+        ReportReadMarker.unread_count > 0,
+    )
+    columns = [
+        DailyReport.report_id,
+        DailyReport.report_date,
+        DailyReport.salesperson_id,
+        Salesperson.name.label("salesperson_name"),
+        DailyReport.status,
+        visit_count.label("visit_count"),
+        comment_count.label("comment_count"),
+        has_unread_comments.label("has_unread_comments"),
+        DailyReport.created_at,
+        DailyReport.updated_at,
+    ]
+    if include_total:
+        total_count = (
+            select(func.count()).select_from(DailyReport).where(*conditions)
+        ).scalar_subquery()
+        columns.append(total_count.label("total_count"))
+    return (
+        select(*columns)
+        .join(page, page.c.report_id == DailyReport.report_id)
+        .join(Salesperson, Salesperson.salesperson_id == DailyReport.salesperson_id)
+        .order_by(DailyReport.report_date.desc(), DailyReport.report_id.desc())
+    )
+
+
+async def list_reports(
+    db: AsyncSession,
+    filters: ReportListFilter,
+    viewer_id: int,
+    page: int,
+    per_page: int,
+) -> tuple[list[ReportListItem], int]:
+    """日報一覧の1ページと総件数を取得する.
+
+    通常は1回のクエリで完結する。最終ページより後ろを指定された場合のみ、
+    総件数を得るために追加でCOUNTを発行する。
+
+    Args:
+        db: データベースセッション
+        filters: 検索条件
+        viewer_id: 閲覧者の営業担当者ID
+        page: ページ番号（1始まり）
+        per_page: 1ページあたりの件数
+
+    Returns:
+        日報一覧と総件数
+    """
+    if not filters.salesperson_ids:
+        return [], 0
+
+    result = await db.execute(
+        build_report_list_query(filters, viewer_id, per_page, (page - 1) * per_page)
+    )
+    rows = result.mappings().all()
+    if rows:
+        total_count = rows[0]["total_count"]
+    elif page == 1:
+        total_count = 0
+    else:
+        total_count = await _count_reports(db, filters)
+    return [_to_list_item(row) for row in rows], total_count
+
+
+async def list_reports_after(
+    db: AsyncSession,
+    filters: ReportListFilter,
+    viewer_id: int,
+    cursor: str | None,
+    per_page: int,
+    *,
+    with_total: bool = False,
+) -> tuple[list[ReportListItem], str | None, int | None]:
+    """カーソル位置から日報一覧の1ページを取得する.
+
+    次ページの有無を判定するため per_page + 1 件を取得する。総件数は
+    with_total が指定された場合のみ同じクエリ内で集計する。
+
+    Args:
+        db: データベースセッション
+        filters: 検索条件
+        viewer_id: 閲覧者の営業担当者ID
+        cursor: 前ページの next_cursor（Noneの場合は先頭から）
+        per_page: 1ページあたりの件数
+        with_total: 総件数を集計するかどうか
+
+    Returns:
+        日報一覧、次ページのカーソル（最終ページの場合はNone）、総件数（未要求時はNone）
+
+    Raises:
+        InvalidCursorError: カーソルが不正な場合
+    """
+    after = decode_report_cursor(cursor) if cursor else None
+    if not filters.salesperson_ids:
+        return [], None, 0 if with_total else None
+
+    result = await db.execute(
+        build_report_list_query(
+            filters, viewer_id, per_page + 1, after=after, include_total=with_total
+        )
+    )
+    rows = result.mappings().all()
+    total_count: int | None = None
+    if with_total:
+        total_count = rows[0]["total_count"] if rows else None
+        if total_count is None:
+            total_count = 0 if after is None else await _count_reports(db, filters)
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_report_cursor(last["report_date"], last["report_id"])
+    return [_to_list_item(row) for row in rows], next_cursor, total_count
+
+
+async def _count_reports(db: AsyncSession, filters: ReportListFilter) -> int:
+    total_count = await db.scalar(
+        select(func.count()).select_from(DailyReport).where(*filters.conditions())
+    )
+    return total_count or 0
+
+
+def _to_list_item(row: RowMapping) -> ReportListItem:
+    return ReportListItem(
+        report_id=row["report_id"],
+        report_date=row["report_date"],
+        salesperson_id=row["salesperson_id"],
+        salesperson_name=row["salesperson_name"],
+        status=row["status"],
+        status_label=STATUS_LABELS[row["status"]],
+        visit_count=row["visit_count"],
+        comment_count=row["comment_count"],
+        has_unread_comments=bool(row["has_unread_comments"]),
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+    )
+
+
+@dataclass(frozen=True)
+class ReportVersion:
+    """日報詳細の内容を決める値.
+
+    Attributes:
+        salesperson_id: 日報の営業担当者ID（閲覧権限の確認に用いる）
+        status: ステータス
+        parts: 日報の版数、日報・訪問記録・コメントの更新日時・件数・最大ID
+            （ETagの計算に用いる）
+    """
+
+    salesperson_id: int
+    status: ReportStatus
+    parts: tuple[object, ...]
+
+
+async def get_report_version(db: AsyncSession, report_id: int) -> ReportVersion | None:
+    """日報詳細の内容を決める値を1回のクエリで取得する.
+
+    訪問記録・コメントの追加・変更・削除、担当者名・顧客名の変更のいずれでも
+    値が変わる。
+
+    Args:
+        db: データベースセッション
+        report_id: 日報ID
+
+    Returns:
+        内容を決める値（日報が存在しない場合はNone）
+    """
+    visits = (
+        select(
+            func.count().label("count"),
+            func.max(VisitRecord.visit_id).label("max_id"),
+            func.max(VisitRecord.updated_at).label("updated_at"),
+            func.max(Customer.updated_at).label("customer_updated_at"),
+        )
+        .join(Customer, Customer.customer_id == VisitRecord.customer_id)
+        .where(VisitRecord.report_id == report_id)
+        .subquery()
+    )
+    commenter = aliased(Salesperson)
+    comments = (
+        select(
+            func.count().label("count"),
+            func.max(ReportComment.comment_id).label("max_id"),
+            func.max(commenter.updated_at).label("commenter_updated_at"),
+        )
+        .join(commenter, commenter.salesperson_id == ReportComment.commenter_id)
+        .where(ReportComment.report_id == report_id)
+        .subquery()
+    )
+    row = (
+        await db.execute(
+            select(
+                DailyReport.salesperson_id,
+                DailyReport.status,
+                DailyReport.version,
+                DailyReport.updated_at,
+                Salesperson.updated_at,
+                visits,
+                comments,
+            )
+            .select_from(DailyReport)
+            .join(Salesperson, Salesperson.salesperson_id == DailyReport.salesperson_id)
+            # 集計結果はいずれも1行のため、無条件で結合する
+            .join(visits, true())
+            .join(comments, true())
+            .where(DailyReport.report_id == report_id)
+        )
+    ).one_or_none()
+    if row is None:
+        return None
+    return ReportVersion(salesperson_id=row[0], status=row[1], parts=(report_id, *row))
+
+
+async def get_report_detail(
+    db: AsyncSession, report_id: int, *, can_edit: bool, can_confirm: bool
+) -> ReportDetail | None:
+    """日報詳細を訪問記録・コメントごと取得する.
+
+    Args:
+        db: データベースセッション
+        report_id: 日報ID
+        can_edit: 閲覧者が編集できるかどうか
+        can_confirm: 閲覧者が確認できるかどうか
+
+    Returns:
+        日報詳細（日報が存在しない場合はNone）
+    """
+    row = (
+        await db.execute(
+            select(DailyReport, Salesperson.name)
+            .join(Salesperson, Salesperson.salesperson_id == DailyReport.salesperson_id)
+            .where(DailyReport.report_id == report_id)
+        )
+    ).one_or_none()
+    if row is None:
+        return None
+    report, salesperson_name = row[0], row[1]
+    visits = await db.execute(
+        select(
+            VisitRecord.visit_id,
+            VisitRecord.customer_id,
+            Customer.company_name.label("customer_name"),
+            VisitRecord.visit_time,
+            VisitRecord.visit_content,
+            VisitRecord.display_order,
+        )
+        .join(Customer, Customer.customer_id == VisitRecord.customer_id)
+        .where(VisitRecord.report_id == report_id)
+        .order_by(VisitRecord.display_order, VisitRecord.visit_id)
+    )
+    return ReportDetail(
+        report_id=report.report_id,
+        report_date=report.report_date,
+        salesperson_id=report.salesperson_id,
+        salesperson_name=salesperson_name,
+        status=report.status,
+        status_label=STATUS_LABELS[report.status],
+        problem=report.problem,
+        plan=report.plan,
+        visit_records=[VisitRecordItem.model_validate(v) for v in visits.mappings()],
+        comments=await list_comments(db, report_id),
+        can_edit=can_edit,
+        can_confirm=can_confirm,
+        version=report.version,
+        created_at=report.created_at,
+        updated_at=report.updated_at,
+    )
@@ -0,0 +1,203 @@
+"""日報の訪問記録の差分更新.
+
+日報の更新（PUT /reports/{id}）は訪問記録を全件受け取るが、全件を削除して
+登録し直すと、1項目の変更でも全訪問記録のDELETE・INSERTと更新日時の変更が
+発生する。本モジュールでは既存の訪問記録とリクエストの差分を計算し、
+必要な登録・更新・削除のみを種類ごとに1回の文（executemany）で実行する。
+
+リクエストの訪問記録は次の順で既存の訪問記録に対応付ける。
+
+1. visit_id が指定されている場合は、その訪問記録
+2. visit_id が無い場合は、まだ対応付いていない同じ表示順の訪問記録
+3. いずれにも該当しない場合は新規登録
+
+対応付いた訪問記録は内容が変わった場合のみ更新し、対応付かなかった既存の
+訪問記録は削除する。ORMを経由しないため、ダッシュボードの訪問件数は
+record_visit_count_change() により反映する。
+
+日報の更新（PUT /reports/{id}）と自動保存の書き込みは save_report_changes() で
+行う。日報の版数の比較（楽観的排他制御）を先に行うため、競合した場合は
+訪問記録に書き込まない。
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Customer, DailyReport, VisitRecord
+from src.schemas.report import VisitRecordInput
+from src.services.dashboard import record_visit_count_change
+
+# 差分の比較・更新の対象とする列
+_FIELDS = ("customer_id", "visit_time", "visit_content", "display_order")
+
+
+class UnknownVisitRecordError(Exception):
+    """日報に存在しない訪問記録IDが指定された場合の例外."""
+
+
+@dataclass
+class VisitRecordDiff:
+    """訪問記録の差分.
+
+    Attributes:
+        inserts: 登録する訪問記録
+        updates: 内容が変わった訪問記録（visit_id と全項目）
+        delete_ids: 削除する訪問記録ID
+        customer_ids: 存在を確認すべき顧客ID（新規・変更された顧客のみ）
+    """
+
+    inserts: list[dict[str, Any]] = field(default_factory=list)
+    updates: list[dict[str, Any]] = field(default_factory=list)
+    delete_ids: list[int] = field(default_factory=list)
+    customer_ids: set[int] = field(default_factory=set)
+
+    @property
+    def has_changes(self) -> bool:
+        """書き込む変更があるかどうか."""
+        return bool(self.inserts or self.updates or self.delete_ids)
+
+    @property
+    def visit_count_delta(self) -> int:
+        """訪問件数の増減."""
+        return len(self.inserts) - len(self.delete_ids)
+
+
+async def diff_visit_records(
+    db: AsyncSession, report_id: int, visits: Sequence[VisitRecordInput]
+) -> VisitRecordDiff:
+    """既存の訪問記録とリクエストの差分を計算する.
+
+    Args:
+        db: データベースセッション
+        report_id: 日報ID
+        visits: リクエストの訪問記録（表示順の指定が無い場合は1からの連番とする）
+
+    Returns:
+        訪問記録の差分
+
+    Raises:
+        UnknownVisitRecordError: 日報に存在しない訪問記録IDが指定された場合
+    """
+    rows = await db.execute(
+        select(VisitRecord.visit_id, *(getattr(VisitRecord, f) for f in _FIELDS))
+        .where(VisitRecord.report_id == report_id)
+        .order_by(VisitRecord.visit_id)
+    )
+    existing = {row["visit_id"]: dict(row) for row in rows.mappings()}
+
+    requested = [
+        {
+            "customer_id": visit.customer_id,
+            "visit_time": visit.visit_time,
+            "visit_content": visit.visit_content,
+            "display_order": (
+                visit.display_order if visit.display_order is not None else order
+            ),
+        }
+        for order, visit in enumerate(visits, start=1)
+    ]
+    matched: list[int | None] = [None] * len(requested)
+    claimed: set[int] = set()
+    for index, visit in enumerate(visits):
+        if visit.visit_id is None:
+            continue
+        if visit.visit_id not in existing or visit.visit_id in claimed:
+            raise UnknownVisitRecordError(visit.visit_id)
+        matched[index] = visit.visit_id
+        claimed.add(visit.visit_id)
+    unclaimed_by_order: dict[int, list[int]] = {}
+    for visit_id, row in existing.items():
+        if visit_id not in claimed:
+            unclaimed_by_order.setdefault(row["display_order"], []).append(visit_id)
+    for index, values in enumerate(requested):
+        candidates = unclaimed_by_order.get(values["display_order"])
+        if matched[index] is None and candidates:
+            visit_id = candidates.pop(0)
+            matched[index] = visit_id
+            claimed.add(visit_id)
+
+    diff = VisitRecordDiff()
+    for visit_id, values in zip(matched, requested, strict=True):
+        if visit_id is None:
+            diff.inserts.append({"report_id": report_id, **values})
+            diff.customer_ids.add(values["customer_id"])
+            continue
+        current = existing[visit_id]
+        if any(current[f] != values[f] for f in _FIELDS):
+            diff.updates.append({"visit_id": visit_id, **values})
+            if current["customer_id"] != values["customer_id"]:
+                diff.customer_ids.add(values["customer_id"])
+    diff.delete_ids = [visit_id for visit_id in existing if visit_id not in claimed]
+    return diff
+
+
+async def apply_visit_record_diff(db: AsyncSession, diff: VisitRecordDiff) -> None:
+    """訪問記録の差分を書き込む.
+
+    登録・更新・削除をそれぞれ1回の文で実行し、変更の無い訪問記録には書き込まない。
+
+    Args:
+        db: データベースセッション
+        diff: 訪問記録の差分
+    """
+    if diff.delete_ids:
+        await db.execute(
+            delete(VisitRecord)
+            .where(VisitRecord.visit_id.in_(diff.delete_ids))
+            .execution_options(synchronize_session=False)
+        )
+    if diff.updates:
+        await db.execute(update(VisitRecord), diff.updates)
+    if diff.inserts:
+        await db.execute(insert(VisitRecord), diff.inserts)
+
+
+async def has_unknown_customers(db: AsyncSession, diff: VisitRecordDiff) -> bool:
+    """差分で新たに参照する顧客に、存在しないものがあるかを確認する.
+
+    Args:
+        db: データベースセッション
+        diff: 訪問記録の差分
+
+    Returns:
+        存在しない顧客がある場合True
+    """
+    if not diff.customer_ids:
+        return False
+    found = set(
+        await db.scalars(
+            select(Customer.customer_id).where(
+                Customer.customer_id.in_(diff.customer_ids)
+            )
+        )
+    )
+    return found != diff.customer_ids
+
+
+async def save_report_changes(
+    db: AsyncSession, report: DailyReport, diff: VisitRecordDiff
+) -> None:
+    """日報の変更と訪問記録の差分を書き込む.
+
+    訪問記録のみの変更でも日報の版数を上げる。日報の書き込み（版数の比較）を
+    先に行い、成功した場合のみ訪問記録に書き込む。
+
+    Args:
+        db: データベースセッション
+        report: 変更を設定した日報
+        diff: 訪問記録の差分
+
+    Raises:
+        StaleDataError: 読み込み後に日報が他の操作で更新されていた場合
+    """
+    if diff.has_changes:
+        report.updated_at = func.now()
+    await db.flush()
+    await apply_visit_record_diff(db, diff)
+    record_visit_count_change(
+        db.sync_session, report.salesperson_id, report.report_id, diff.visit_count_delta
+    )
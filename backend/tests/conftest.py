@@ -1,16 +1,176 @@
 """pytest共通設定・フィクスチャ."""
 
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
 
+from src.core.database import get_db, recent_writers
+from src.core.dependencies import token_cache
+from src.core.identity import identity_cache
+from src.core.metrics import request_metrics
+from src.core.query_stats import QueryStats, track_queries
+from src.core.security import create_access_token
 from src.main import app
+from src.models import Base, Salesperson
+from src.services.autosave import autosave_buffer
+from src.services.customer_search import customer_search_index
+from src.services.dashboard import dashboard_store
+from src.services.hierarchy import hierarchy_index
+
+# max_queries フィクスチャの型
+type MaxQueries = Callable[[int], AbstractContextManager[QueryStats]]
+
+
+def auth_headers(salesperson_id: int) -> dict[str, str]:
+    """指定した営業担当者のAuthorizationヘッダーを生成する."""
+    token = create_access_token({"sub": str(salesperson_id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(autouse=True)
+def _reset_caches() -> Iterator[None]:
+    """テスト間でプロセス内キャッシュを共有しないようにする."""
+    token_cache.clear()
+    identity_cache.clear()
+    hierarchy_index.invalidate()
+    customer_search_index.invalidate()
+    dashboard_store.clear()
+    recent_writers.clear()
+    autosave_buffer.clear()
+    request_metrics.clear()
+    yield
+    token_cache.clear()
+    identity_cache.clear()
+    hierarchy_index.invalidate()
+    customer_search_index.invalidate()
+    dashboard_store.clear()
+    recent_writers.clear()
+    autosave_buffer.clear()
+    request_metrics.clear()
+
+
+@pytest.fixture
+async def db_engine() -> AsyncGenerator[AsyncEngine, None]:
+    """テスト用インメモリSQLiteエンジン."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(db_engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """テスト用セッションファクトリ."""
+    return async_sessionmaker(
+        bind=db_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+
+
+@pytest.fixture
+async def db_session(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncGenerator[AsyncSession, None]:
+    """テスト用データベースセッション."""
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+def executed_statements(db_engine: AsyncEngine) -> Iterator[list[str]]:
+    """テスト用エンジンで実行されたSQL文を記録する."""
+    statements: list[str] = []
+
+    def record(_conn: object, _cursor: object, statement: str, *_args: object) -> None:
+        statements.append(statement)
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(db_engine.sync_engine, "before_cursor_execute", record)
 
 
 @pytest.fixture
-async def client() -> AsyncGenerator[AsyncClient, None]:
-    """テスト用HTTPクライアント."""
+def max_queries() -> MaxQueries:
+    """ブロック内で実行されたSQL文の数が上限以下であることを確認する.
+
+    使用例:
+        with max_queries(3):
+            await client.get("/api/v1/reports")
+    """
+
+    @contextmanager
+    def check(limit: int) -> Iterator[QueryStats]:
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= limit, (
+            f"{stats.count} queries executed (max {limit}), "
+            f"slowest: {stats.slowest_statement}"
+        )
+
+    return check
+
+
+@pytest.fixture
+async def salespersons(db_session: AsyncSession) -> dict[str, Salesperson]:
+    """上長・部下・無効ユーザーの営業担当者を登録する."""
+    manager = Salesperson(
+        salesperson_id=10,
+        name="佐藤課長",
+        email="sato@example.com",
+        password_hash="x",
+        is_active=True,
+    )
+    member = Salesperson(
+        salesperson_id=1,
+        name="山田太郎",
+        email="yamada@example.com",
+        password_hash="x",
+        manager_id=10,
+        is_active=True,
+    )
+    inactive = Salesperson(
+        salesperson_id=99,
+        name="無効ユーザー",
+        email="inactive@example.com",
+        password_hash="x",
+        manager_id=10,
+        is_active=False,
+    )
+    db_session.add_all([manager, member, inactive])
+    await db_session.commit()
+    return {"manager": manager, "member": member, "inactive": inactive}
+
+
+@pytest.fixture
+async def client(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncGenerator[AsyncClient, None]:
+    """テスト用HTTPクライアント（データベースはテスト用SQLiteを使用）."""
+
+    async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    app.dependency_overrides[get_db] = override_get_db
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
+    app.dependency_overrides.pop(get_db, None)
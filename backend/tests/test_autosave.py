@@ -0,0 +1,140 @@
+"""下書きの自動保存（書き込みの集約）のテスト."""
+
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.models import Customer, DailyReport, Salesperson, VisitRecord
+from src.schemas.report import VisitRecordInput
+from src.services.autosave import AutosaveBuffer
+
+
+@pytest.fixture
+async def draft(
+    db_session: AsyncSession, salespersons: dict[str, Salesperson]
+) -> DailyReport:
+    """訪問記録2件の下書きの日報を登録する."""
+    db_session.add(Customer(customer_id=1, company_name="株式会社A"))
+    report = DailyReport(
+        salesperson_id=salespersons["member"].salesperson_id,
+        report_date=date(2026, 1, 10),
+        visit_records=[
+            VisitRecord(customer_id=1, visit_content=f"訪問{n}", display_order=n)
+            for n in (1, 2)
+        ],
+    )
+    db_session.add(report)
+    await db_session.commit()
+    return report
+
+
+@pytest.fixture
+def buffer(session_factory: async_sessionmaker[AsyncSession]) -> AutosaveBuffer:
+    """テスト用DBに書き込むバッファ（定期書き込みは60秒ごと）."""
+    return AutosaveBuffer(session_factory, flush_seconds=60)
+
+
+async def _reload(db_session: AsyncSession, report_id: int) -> DailyReport:
+    report = await db_session.get(DailyReport, report_id, populate_existing=True)
+    assert report is not None
+    return report
+
+
+class TestAutosaveBuffer:
+    """AutosaveBufferのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_into_one_write(
+        self,
+        db_session: AsyncSession,
+        draft: DailyReport,
+        buffer: AutosaveBuffer,
+        executed_statements: list[str],
+    ) -> None:
+        """連続する自動保存は項目ごとに後の内容で上書きされ、1回の更新で書き込まれること."""
+        report_id = draft.report_id
+        buffer.add(report_id, 1, 1, {"problem": "価格"})
+        buffer.add(report_id, 1, 1, {"plan": "再訪問"})
+        buffer.add(
+            report_id,
+            1,
+            1,
+            {
+                "problem": "価格交渉",
+                "visit_records": [
+                    VisitRecordInput(customer_id=1, visit_content="訪問1"),
+                    VisitRecordInput(customer_id=1, visit_content="修正"),
+                ],
+            },
+        )
+        assert executed_statements == []
+
+        assert await buffer.flush_all() == 1
+
+        writes = [
+            " ".join(statement.split()[:2])
+            for statement in executed_statements
+            if not statement.startswith("SELECT")
+        ]
+        assert writes == ['UPDATE "DAILY_REPORT"', 'UPDATE "VISIT_RECORD"']
+        report = await _reload(db_session, report_id)
+        assert (report.problem, report.plan, report.version) == (
+            "価格交渉",
+            "再訪問",
+            2,
+        )
+        assert len(buffer) == 0
+        assert await buffer.flush_all() == 0
+
+    @pytest.mark.asyncio
+    async def test_discards_stale_draft(
+        self, db_session: AsyncSession, draft: DailyReport, buffer: AutosaveBuffer
+    ) -> None:
+        """受付後に他の操作で更新された日報には書き込まず、内容を破棄すること."""
+        buffer.add(draft.report_id, 1, 1, {"problem": "スマートフォンから"})
+        draft.problem = "PCから"
+        await db_session.commit()
+
+        assert await buffer.flush_all() == 0
+
+        report = await _reload(db_session, draft.report_id)
+        assert (report.problem, report.version) == ("PCから", 2)
+        assert len(buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_flushes_on_interval(
+        self,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        draft: DailyReport,
+    ) -> None:
+        """書き込みループが flush_seconds ごとに保持中の内容を書き込むこと."""
+        buffer = AutosaveBuffer(session_factory, flush_seconds=0.01)
+        buffer.start()
+        try:
+            buffer.add(draft.report_id, 1, 1, {"problem": "価格交渉"})
+            async with asyncio.timeout(5):
+                while len(buffer):
+                    await asyncio.sleep(0.01)
+        finally:
+            await buffer.stop()
+
+        report = await _reload(db_session, draft.report_id)
+        assert report.problem == "価格交渉"
+        assert buffer.is_running is False
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending(
+        self, db_session: AsyncSession, draft: DailyReport, buffer: AutosaveBuffer
+    ) -> None:
+        """停止時（アプリケーションの終了時）に保持中の内容を書き込むこと."""
+        buffer.start()
+        buffer.add(draft.report_id, 1, 1, {"plan": "再訪問"})
+
+        await buffer.stop()
+
+        report = await _reload(db_session, draft.report_id)
+        assert (report.plan, report.version) == ("再訪問", 2)
+        assert len(buffer) == 0
@@ -0,0 +1,356 @@
+"""顧客APIと会社名検索インデックスのテスト."""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Customer, DataVersion
+from src.services.customer_search import (
+    CustomerSearchIndex,
+    customer_search_index,
+    normalize,
+)
+from tests.conftest import auth_headers
+
+
+@pytest.fixture
+def index() -> CustomerSearchIndex:
+    """表記の揺れを含む会社名の検索インデックス."""
+    index = CustomerSearchIndex()
+    index.build(
+        [
+            (1, "株式会社サンプル商事", True),
+            (2, "ｻﾝﾌﾟﾙ", True),
+            (3, "東京サンプル販売(株)", True),
+            (4, "ＡＢＣ　ホールディングス", True),
+            (5, "サンプル物産", False),
+        ]
+    )
+    return index
+
+
+@pytest.fixture
+async def customers(db_session: AsyncSession) -> list[Customer]:
+    """有効な顧客2件と無効な顧客1件を登録する."""
+    created = [
+        Customer(customer_id=1, company_name="株式会社アルファ", contact_name="田中"),
+        Customer(customer_id=2, company_name="アルファ商事"),
+        Customer(customer_id=3, company_name="ベータ工業", is_active=False),
+    ]
+    db_session.add_all(created)
+    await db_session.commit()
+    return created
+
+
+class TestCustomerSearchIndex:
+    """CustomerSearchIndexのテスト."""
+
+    def test_normalize(self) -> None:
+        """全角・半角、カナ、大文字・小文字、法人格、空白が同一視されること."""
+        assert normalize("ｻﾝﾌﾟﾙ") == normalize("さんぷる") == normalize("サンプル")
+        assert normalize("ＡＢＣ　ホールディングス") == "abcほーるでぃんぐす"
+        assert normalize("㈱サンプル") == normalize("株式会社 サンプル")
+
+    def test_ranks_exact_prefix_substring(self, index: CustomerSearchIndex) -> None:
+        """完全一致・前方一致・部分一致の順に並び、無効な顧客は除かれること."""
+        assert index.search("さんぷる") == [2, 1, 3]
+        assert index.search("サンプル", limit=2) == [2, 1]
+        assert index.search("サンプル", is_active=None) == [2, 1, 5, 3]
+        assert index.search("abc") == [4]
+        assert index.search("東") == [3]
+        assert index.search("商販") == []
+
+    def test_incremental_updates(self, index: CustomerSearchIndex) -> None:
+        """会社名の変更・論理削除・削除が検索結果に反映されること."""
+        index.upsert(1, "株式会社テスト", True)
+        index.upsert(3, "東京サンプル販売(株)", False)
+        index.upsert(6, "ネオサンプル", True)
+        index.remove(2)
+
+        assert index.search("サンプル") == [6]
+        assert index.search("てすと") == [1]
+        assert index.company_name(6) == "ネオサンプル"
+        assert index.company_name(2) is None
+
+    @pytest.mark.usefixtures("customers")
+    @pytest.mark.asyncio
+    async def test_applies_commits(self, db_session: AsyncSession) -> None:
+        """ORM経由の変更がコミット時に反映され、ロールバック時は破棄されること."""
+        await customer_search_index.ensure_loaded(db_session)
+        customer = await db_session.get(Customer, 2)
+        assert customer is not None
+
+        customer.company_name = "ガンマ商事"
+        db_session.add(Customer(customer_id=4, company_name="アルファ建設"))
+        await db_session.commit()
+        assert customer_search_index.search("アルファ") == [1, 4]
+
+        customer.is_active = False
+        await db_session.flush()
+        await db_session.rollback()
+        assert customer_search_index.search("ガンマ") == [2]
+
+    @pytest.mark.usefixtures("customers")
+    @pytest.mark.asyncio
+    async def test_local_commit_does_not_reload(
+        self,
+        db_session: AsyncSession,
+        executed_statements: list[str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """同一プロセスのコミットは版数を進めるのみで、再構築しないこと."""
+        await customer_search_index.ensure_loaded(db_session)
+        version = customer_search_index.version
+        assert version is not None
+        customer = await db_session.get(Customer, 2)
+        assert customer is not None
+
+        customer.company_name = "ガンマ商事"
+        await db_session.commit()
+        executed_statements.clear()
+        monkeypatch.setattr(customer_search_index, "check_seconds", 0)
+        await customer_search_index.ensure_loaded(db_session)
+
+        assert customer_search_index.version == version + 1
+        # 版数の確認（主キーの1行）のみで、顧客の一覧は取得しない
+        assert len(executed_statements) == 1
+        assert "DATA_VERSION" in executed_statements[0]
+        assert customer_search_index.search("ガンマ") == [2]
+
+    @pytest.mark.usefixtures("customers")
+    @pytest.mark.asyncio
+    async def test_reloads_on_other_instance_change(
+        self, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """他インスタンスでの変更は、版数の確認間隔の経過後に検出されること."""
+        monkeypatch.setattr(customer_search_index, "check_seconds", 3600)
+        await customer_search_index.ensure_loaded(db_session)
+        # 他インスタンスでのORM経由の登録（顧客の登録と版数の加算）を再現する
+        await db_session.execute(
+            Customer.__table__.insert().values(
+                customer_id=4, company_name="アルファ物産", is_active=True
+            )
+        )
+        await db_session.execute(
+            update(DataVersion)
+            .where(DataVersion.table_name == "CUSTOMER")
+            .values(version=DataVersion.version + 1)
+        )
+        await db_session.commit()
+
+        await customer_search_index.ensure_loaded(db_session)
+        assert customer_search_index.search("アルファ") == [1, 2]
+
+        monkeypatch.setattr(customer_search_index, "check_seconds", 0)
+        await customer_search_index.ensure_loaded(db_session)
+        assert customer_search_index.search("アルファ") == [1, 2, 4]
+
+    def test_interleaved_commit_forces_reload(self, index: CustomerSearchIndex) -> None:
+        """他のトランザクションの変更を挟んだコミットでは版数が不明になること."""
+        index.build([(1, "株式会社サンプル商事", True)], version=3)
+
+        index.committed(4, 5)
+        assert index.version == 5
+
+        index.committed(7, 7)
+        assert index.version is None
+
+
+class TestGetCustomers:
+    """GET /customers のテスト."""
+
+    @pytest.mark.usefixtures("salespersons", "customers")
+    @pytest.mark.asyncio
+    async def test_search_by_company_name(self, client: AsyncClient) -> None:
+        """会社名の部分一致で、表記の揺れを吸収して検索されること."""
+        response = await client.get(
+            "/api/v1/customers",
+            params={"company_name": "ｱﾙﾌｧ", "per_page": 1},
+            headers=auth_headers(1),
+        )
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert [c["customer_id"] for c in data["items"]] == [1]
+        assert data["items"][0]["contact_name"] == "田中"
+        assert data["pagination"]["total_count"] == 2
+        assert data["pagination"]["total_pages"] == 2
+
+    @pytest.mark.usefixtures("salespersons", "customers")
+    @pytest.mark.asyncio
+    async def test_filter_by_is_active(self, client: AsyncClient) -> None:
+        """会社名の指定がない場合は有効フラグで絞り込み、顧客IDの順に返すこと."""
+        response = await client.get(
+            "/api/v1/customers",
+            params={"is_active": "false"},
+            headers=auth_headers(1),
+        )
+
+        data = response.json()["data"]
+        assert [c["customer_id"] for c in data["items"]] == [3]
+        assert data["pagination"]["total_count"] == 1
+
+
+class TestGetCustomersCursor:
+    """GET /customers のカーソル方式のテスト."""
+
+    async def _walk(self, client: AsyncClient, params: dict[str, str]) -> list[int]:
+        """next_cursor を辿って全ページの顧客IDを取得する."""
+        walked_ids: list[int] = []
+        cursor = ""
+        while True:
+            response = await client.get(
+                "/api/v1/customers",
+                params={**params, "cursor": cursor, "per_page": "1"},
+                headers=auth_headers(1),
+            )
+            assert response.status_code == 200
+            data = response.json()["data"]
+            walked_ids.extend(c["customer_id"] for c in data["items"])
+            if not data["pagination"]["has_next"]:
+                assert data["pagination"]["next_cursor"] is None
+                return walked_ids
+            cursor = data["pagination"]["next_cursor"]
+
+    @pytest.mark.usefixtures("salespersons", "customers")
+    @pytest.mark.asyncio
+    async def test_walks_all_pages_in_order(self, client: AsyncClient) -> None:
+        """next_cursor を辿るとページ番号方式と同じ順序で全件取得できること."""
+        assert await self._walk(client, {}) == [1, 2, 3]
+        assert await self._walk(client, {"is_active": "true"}) == [1, 2]
+        assert await self._walk(client, {"company_name": "あるふぁ"}) == [1, 2]
+
+    @pytest.mark.usefixtures("salespersons", "customers")
+    @pytest.mark.asyncio
+    async def test_search_resumes_after_removed_customer(
+        self, client: AsyncClient, db_session: AsyncSession
+    ) -> None:
+        """前ページの最後の顧客が検索結果から外れても、続きを欠落なく返すこと."""
+        first = await client.get(
+            "/api/v1/customers",
+            params={"company_name": "アルファ", "cursor": "", "per_page": 1},
+            headers=auth_headers(1),
+        )
+        customer = await db_session.get(Customer, 1)
+        assert customer is not None
+        customer.company_name = "株式会社ガンマ"
+        await db_session.commit()
+
+        second = await client.get(
+            "/api/v1/customers",
+            params={
+                "company_name": "アルファ",
+                "cursor": first.json()["data"]["pagination"]["next_cursor"],
+                "per_page": 1,
+            },
+            headers=auth_headers(1),
+        )
+
+        assert [c["customer_id"] for c in first.json()["data"]["items"]] == [1]
+        assert [c["customer_id"] for c in second.json()["data"]["items"]] == [2]
+
+    @pytest.mark.usefixtures("salespersons", "customers")
+    @pytest.mark.asyncio
+    async def test_with_total(self, client: AsyncClient) -> None:
+        """with_total を指定すると検索条件に一致する総件数が返されること."""
+        for params, expected in (
+            ({"is_active": "true"}, 2),
+            ({"company_name": "ベータ", "is_active": "false"}, 1),
+        ):
+            response = await client.get(
+                "/api/v1/customers",
+                params={**params, "cursor": "", "with_total": "true"},
+                headers=auth_headers(1),
+            )
+
+            pagination = response.json()["data"]["pagination"]
+            assert pagination["total_count"] == expected
+            assert pagination["has_next"] is False
+
+    @pytest.mark.usefixtures("salespersons", "customers")
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, client: AsyncClient) -> None:
+        """不正なカーソル・検索条件の異なるカーソルは400となること."""
+        first = await client.get(
+            "/api/v1/customers",
+            params={"cursor": "", "per_page": 1},
+            headers=auth_headers(1),
+        )
+        id_cursor = first.json()["data"]["pagination"]["next_cursor"]
+
+        for params in (
+            {"cursor": "not-a-cursor"},
+            {"cursor": id_cursor, "company_name": "アルファ"},
+        ):
+            response = await client.get(
+                "/api/v1/customers", params=params, headers=auth_headers(1)
+            )
+
+            assert response.status_code == 400
+            assert response.json()["detail"]["code"] == "BAD_REQUEST"
+
+
+class TestGetCustomerOptions:
+    """GET /customers/select のテスト."""
+
+    @pytest.mark.usefixtures("salespersons", "customers")
+    @pytest.mark.asyncio
+    async def test_lists_active_customers(self, client: AsyncClient) -> None:
+        """有効な顧客のみが選択肢として返されること."""
+        response = await client.get("/api/v1/customers/select", headers=auth_headers(1))
+
+        assert response.json()["data"]["items"] == [
+            {"value": 1, "label": "株式会社アルファ"},
+            {"value": 2, "label": "アルファ商事"},
+        ]
+
+    @pytest.mark.usefixtures("salespersons", "customers")
+    @pytest.mark.asyncio
+    async def test_search_with_limit(self, client: AsyncClient) -> None:
+        """会社名を指定すると一致度の高い順に最大limit件が返されること."""
+        response = await client.get(
+            "/api/v1/customers/select",
+            params={"q": "あるふぁ", "limit": 1},
+            headers=auth_headers(1),
+        )
+
+        assert response.json()["data"]["items"] == [
+            {"value": 1, "label": "株式会社アルファ"}
+        ]
+
+    @pytest.mark.usefixtures("salespersons", "customers")
+    @pytest.mark.asyncio
+    async def test_etag_from_database(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        executed_statements: list[str],
+    ) -> None:
+        """ETagは検索インデックスの構築によらず、顧客の変更でのみ変わること."""
+        url = "/api/v1/customers/select"
+        etag = (await client.get(url, headers=auth_headers(1))).headers["ETag"]
+        # 別インスタンスでの構築を再現する
+        customer_search_index.invalidate()
+        executed_statements.clear()
+
+        cached = await client.get(
+            url, headers={**auth_headers(1), "If-None-Match": etag}
+        )
+
+        assert cached.status_code == 304
+        assert not customer_search_index.is_loaded
+        assert "max(" not in " ".join(executed_statements).lower()
+
+        db_session.add(Customer(customer_id=4, company_name="デルタ商会"))
+        await db_session.commit()
+        changed = await client.get(
+            url, headers={**auth_headers(1), "If-None-Match": etag}
+        )
+
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert changed.json()["data"]["items"][-1] == {
+            "value": 4,
+            "label": "デルタ商会",
+        }
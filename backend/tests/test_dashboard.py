@@ -0,0 +1,318 @@
+"""ダッシュボードのテスト."""
+
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.models import (
+    Customer,
+    DailyReport,
+    ReportComment,
+    ReportStatus,
+    VisitRecord,
+)
+from src.services.comments import recount_unread
+from src.services.dashboard import dashboard_store, load_summary
+from tests.conftest import auth_headers
+
+TODAY = date(2026, 1, 10)
+MEMBER_ID = 1
+MANAGER_ID = 10
+
+
+async def _add_reports(db: AsyncSession, today: date) -> list[DailyReport]:
+    """部下(1)の日報を本日から10日前まで隔日で登録する.
+
+    本日の日報には訪問記録2件と、上長・本人のコメントを1件ずつ登録する。
+    """
+    db.add(Customer(customer_id=1, company_name="株式会社A"))
+    reports = [
+        DailyReport(
+            salesperson_id=MEMBER_ID,
+            report_date=today - timedelta(days=days_ago),
+            status=ReportStatus.DRAFT if days_ago == 0 else ReportStatus.SUBMITTED,
+        )
+        for days_ago in range(0, 11, 2)
+    ]
+    reports[0].visit_records = [
+        VisitRecord(customer_id=1, visit_content=f"訪問{n}", display_order=n)
+        for n in range(2)
+    ]
+    reports[0].comments = [
+        ReportComment(commenter_id=MANAGER_ID, comment_text="確認しました"),
+        ReportComment(commenter_id=MEMBER_ID, comment_text="ありがとうございます"),
+    ]
+    reports[-1].comments = [
+        ReportComment(commenter_id=MANAGER_ID, comment_text="古い日報へのコメント")
+    ]
+    db.add_all(reports)
+    await db.commit()
+    return reports
+
+
+class TestGetDashboard:
+    """GET /dashboard のテスト."""
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_dashboard(
+        self, client: AsyncClient, db_session: AsyncSession
+    ) -> None:
+        """本日の日報・未読コメント数・直近7日間の日報が返されること."""
+        reports = await _add_reports(db_session, date.today())
+
+        response = await client.get("/api/v1/dashboard", headers=auth_headers(1))
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["today_report"] == {
+            "exists": True,
+            "report_id": reports[0].report_id,
+            "status": "draft",
+            "status_label": "下書き",
+        }
+        assert data["unread_comment_count"] == 2
+        recent = data["recent_reports"]
+        assert [item["report_id"] for item in recent] == [
+            r.report_id for r in reports[:4]
+        ]
+        assert recent[0]["visit_count"] == 2
+        assert recent[0]["comment_count"] == 2
+        assert recent[1]["status_label"] == "提出済"
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_without_today_report(self, client: AsyncClient) -> None:
+        """本日の日報が無い場合は exists が false となること."""
+        response = await client.get("/api/v1/dashboard", headers=auth_headers(1))
+
+        assert response.json()["data"] == {
+            "today_report": {
+                "exists": False,
+                "report_id": None,
+                "status": None,
+                "status_label": None,
+            },
+            "unread_comment_count": 0,
+            "recent_reports": [],
+        }
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_served_without_queries(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        executed_statements: list[str],
+    ) -> None:
+        """2回目以降はクエリを発行せずに返されること."""
+        await _add_reports(db_session, date.today())
+        headers = auth_headers(1)
+        first = await client.get("/api/v1/dashboard", headers=headers)
+
+        executed_statements.clear()
+        second = await client.get("/api/v1/dashboard", headers=headers)
+
+        assert second.json() == first.json()
+        assert executed_statements == []
+
+
+class TestDashboardConsistency:
+    """差分更新した集計と再計算した集計の一致を確認するテスト."""
+
+    @staticmethod
+    async def _assert_consistent(
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> None:
+        async with session_factory() as db:
+            cached = await dashboard_store.get(db, MEMBER_ID, TODAY)
+            fresh = await load_summary(db, MEMBER_ID, TODAY)
+        assert cached.to_dashboard(TODAY) == fresh.to_dashboard(TODAY)
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_incremental_updates_match_recomputation(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        db_session: AsyncSession,
+    ) -> None:
+        """日報・訪問記録・コメントの書き込み後も再計算結果と一致すること."""
+        reports = await _add_reports(db_session, TODAY - timedelta(days=1))
+        async with session_factory() as db:
+            await dashboard_store.get(db, MEMBER_ID, TODAY)
+        hits = dashboard_store.stats.hits
+
+        # 本日の日報を訪問記録・コメント付きで作成
+        today_report = DailyReport(
+            salesperson_id=MEMBER_ID,
+            report_date=TODAY,
+            visit_records=[VisitRecord(customer_id=1, visit_content="新規訪問")],
+            comments=[ReportComment(commenter_id=MANAGER_ID, comment_text="了解")],
+        )
+        db_session.add(today_report)
+        await db_session.commit()
+        await self._assert_consistent(session_factory)
+
+        # 既存の日報に訪問記録・コメントを追加し、ステータスを更新
+        reports[1].status = ReportStatus.CONFIRMED
+        db_session.add_all(
+            [
+                VisitRecord(
+                    report_id=reports[1].report_id,
+                    customer_id=1,
+                    visit_content="追加訪問",
+                ),
+                ReportComment(
+                    report_id=reports[-1].report_id,
+                    commenter_id=MANAGER_ID,
+                    comment_text="期間外の日報へのコメント",
+                ),
+                ReportComment(
+                    report_id=reports[1].report_id,
+                    commenter_id=MEMBER_ID,
+                    comment_text="本人のコメント",
+                ),
+            ]
+        )
+        await db_session.commit()
+        await self._assert_consistent(session_factory)
+
+        # 訪問記録・コメントを削除
+        await db_session.refresh(reports[0], ["visit_records", "comments"])
+        await db_session.delete(reports[0].visit_records[0])
+        await db_session.delete(reports[0].comments[0])
+        await db_session.commit()
+        await self._assert_consistent(session_factory)
+
+        # 日報の日付を集計期間外に移動
+        reports[2].report_date = TODAY - timedelta(days=30)
+        await db_session.commit()
+        await self._assert_consistent(session_factory)
+
+        # ここまでは差分で反映され、再計算は発生していない
+        assert dashboard_store.stats.hits - hits == 4
+
+        # 日報を削除（コメントはカスケード削除されるため再計算される）
+        await db_session.delete(today_report)
+        await db_session.commit()
+        await self._assert_consistent(session_factory)
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_rollback_is_not_applied(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        db_session: AsyncSession,
+    ) -> None:
+        """ロールバックされた書き込みは集計に反映されないこと."""
+        reports = await _add_reports(db_session, TODAY)
+        async with session_factory() as db:
+            before = (await dashboard_store.get(db, MEMBER_ID, TODAY)).to_dashboard(
+                TODAY
+            )
+
+        db_session.add(
+            ReportComment(
+                report_id=reports[0].report_id,
+                commenter_id=MANAGER_ID,
+                comment_text="取り消されるコメント",
+            )
+        )
+        await db_session.flush()
+        await db_session.rollback()
+
+        async with session_factory() as db:
+            after = (await dashboard_store.get(db, MEMBER_ID, TODAY)).to_dashboard(
+                TODAY
+            )
+        assert after == before
+        await self._assert_consistent(session_factory)
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_explicit_invalidation(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        db_session: AsyncSession,
+    ) -> None:
+        """ORMを経由しない書き込みは invalidate 後に反映されること."""
+        reports = await _add_reports(db_session, TODAY)
+        async with session_factory() as db:
+            await dashboard_store.get(db, MEMBER_ID, TODAY)
+
+        await db_session.execute(
+            delete(ReportComment).where(ReportComment.report_id == reports[0].report_id)
+        )
+        await recount_unread(db_session, [reports[0].report_id])
+        await db_session.commit()
+        dashboard_store.invalidate(MEMBER_ID)
+
+        await self._assert_consistent(session_factory)
+        async with session_factory() as db:
+            summary = await dashboard_store.get(db, MEMBER_ID, TODAY)
+        # 残りは期間外の日報への上長のコメントのみ
+        assert summary.unread_comment_count == 1
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_recount_upserts_in_one_statement(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        db_session: AsyncSession,
+        executed_statements: list[str],
+    ) -> None:
+        """複数の日報・閲覧者の既読マーカーを1文で再集計すること."""
+        reports = await _add_reports(db_session, TODAY)
+        report_ids = [reports[0].report_id, reports[-1].report_id]
+        await db_session.execute(
+            delete(ReportComment).where(ReportComment.report_id.in_(report_ids))
+        )
+        executed_statements.clear()
+
+        await recount_unread(db_session, report_ids)
+        await db_session.commit()
+        dashboard_store.invalidate(MEMBER_ID)
+        dashboard_store.invalidate(MANAGER_ID)
+
+        upserts = [s for s in executed_statements if s.lstrip().startswith("INSERT")]
+        assert len(upserts) == 1
+        await self._assert_consistent(session_factory)
+        async with session_factory() as db:
+            summary = await dashboard_store.get(db, MEMBER_ID, TODAY)
+        assert summary.unread_comment_count == 0
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_reading_comments_updates_unread(
+        self,
+        client: AsyncClient,
+        session_factory: async_sessionmaker[AsyncSession],
+        db_session: AsyncSession,
+    ) -> None:
+        """コメントの既読の記録で未読数が差分更新されること."""
+        reports = await _add_reports(db_session, TODAY)
+        async with session_factory() as db:
+            summary = await dashboard_store.get(db, MEMBER_ID, TODAY)
+        assert summary.unread_comment_count == 2
+        hits = dashboard_store.stats.hits
+
+        comments = await client.get(
+            f"/api/v1/reports/{reports[0].report_id}/comments",
+            headers=auth_headers(MEMBER_ID),
+        )
+        await client.put(
+            f"/api/v1/reports/{reports[0].report_id}/comments/read",
+            json={
+                "last_comment_id": comments.json()["data"]["items"][-1]["comment_id"]
+            },
+            headers=auth_headers(MEMBER_ID),
+        )
+
+        async with session_factory() as db:
+            summary = await dashboard_store.get(db, MEMBER_ID, TODAY)
+        assert summary.unread_comment_count == 1
+        assert dashboard_store.stats.hits - hits == 1
+        await self._assert_consistent(session_factory)
@@ -1,7 +1,23 @@
 """データベースモジュールのテスト."""
 
+from collections.abc import AsyncGenerator
+from datetime import date
+from pathlib import Path
+
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from src.core import database
+from src.core.database import (
+    InstrumentedQueuePool,
+    ReplicaSet,
+    pool_stats,
+    warm_up_pool,
+)
+from src.models import Base, DailyReport, ReportComment, ReportStatus, Salesperson
+from tests.conftest import auth_headers
 
 
 class TestDatabaseModule:
@@ -73,3 +89,185 @@ class TestDatabaseExports:
         assert settings is not None
         assert get_db is not None
         assert callable(get_db)
+
+
+class TestIndexes:
+    """一覧・ダッシュボード用インデックスのテスト."""
+
+    @staticmethod
+    def _index_columns(model: type) -> dict[str, list[str]]:
+        return {
+            index.name: [column.name for column in index.columns]
+            for index in model.__table__.indexes
+        }
+
+    def test_daily_report_composite_index(self) -> None:
+        """日報に担当者・ステータス・日付の複合インデックスがあること."""
+        from src.models import DailyReport
+
+        indexes = self._index_columns(DailyReport)
+        assert indexes["IX_DAILY_REPORT_SALESPERSON_STATUS_DATE"] == [
+            "salesperson_id",
+            "status",
+            "report_date",
+        ]
+
+    def test_report_comment_composite_index(self) -> None:
+        """コメントの report_id 索引が投稿日時・投稿者を含む複合インデックスであること."""
+        from src.models import ReportComment
+
+        indexes = self._index_columns(ReportComment)
+        assert indexes["IX_REPORT_COMMENT_REPORT_CREATED"] == [
+            "report_id",
+            "created_at",
+            "commenter_id",
+        ]
+        assert not any(columns == ["report_id"] for columns in indexes.values())
+
+
+class TestConnectionPool:
+    """コネクションプールの事前接続と利用状況のテスト."""
+
+    @staticmethod
+    def _engine(path: Path) -> AsyncEngine:
+        return create_async_engine(
+            f"sqlite+aiosqlite:///{path}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=3,
+            max_overflow=2,
+        )
+
+    @pytest.mark.asyncio
+    async def test_warm_up_fills_pool(self, tmp_path: Path) -> None:
+        """プールサイズを上限に接続が確立され、プールに戻されること."""
+        engine = self._engine(tmp_path / "pool.db")
+        try:
+            assert await warm_up_pool(engine, count=5) == 3
+
+            stats = pool_stats(engine)
+            assert stats.checked_in == 3
+            assert stats.checked_out == 0
+            assert stats.acquisitions == 3
+
+            async with engine.connect():
+                stats = pool_stats(engine)
+            assert stats.checked_out == 1
+            assert stats.checked_in == 2
+            assert stats.acquisitions == 4
+            assert stats.wait_ms_max >= stats.wait_ms_avg > 0
+        finally:
+            await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_warm_up_failure_does_not_raise(self, tmp_path: Path) -> None:
+        """接続できない場合は例外とせず0件を返すこと."""
+        engine = self._engine(tmp_path / "missing" / "pool.db")
+        try:
+            assert await warm_up_pool(engine, count=2) == 0
+        finally:
+            await engine.dispose()
+
+
+class TestReadReplicas:
+    """読み取り専用レプリカへの振り分けのテスト."""
+
+    @pytest.fixture
+    async def replica_engine(
+        self, tmp_path: Path, salespersons: dict[str, Salesperson]
+    ) -> AsyncGenerator[AsyncEngine, None]:
+        """営業担当者のみを登録したレプリカ（日報の複製が遅れている状態）."""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add_all(
+                Salesperson(
+                    salesperson_id=s.salesperson_id,
+                    name=s.name,
+                    email=s.email,
+                    password_hash=s.password_hash,
+                    manager_id=s.manager_id,
+                    is_active=s.is_active,
+                )
+                for s in salespersons.values()
+            )
+            await session.commit()
+        yield engine
+        await engine.dispose()
+
+    def test_round_robin_skips_down_replicas(self) -> None:
+        """先頭を順にずらし、停止中のレプリカは再試行時間まで除くこと."""
+        now = [0.0]
+        engines = [create_async_engine("sqlite+aiosqlite://") for _ in range(3)]
+        replica_set = ReplicaSet(engines, retry_seconds=30, clock=lambda: now[0])
+
+        assert replica_set.candidates() == engines
+        assert replica_set.candidates() == [engines[1], engines[2], engines[0]]
+
+        replica_set.mark_down(engines[0])
+        assert replica_set.candidates() == [engines[2], engines[1]]
+        now[0] = 30.0
+        assert replica_set.candidates() == engines
+
+    @pytest.mark.asyncio
+    async def test_fails_over_to_next_replica(
+        self,
+        tmp_path: Path,
+        replica_engine: AsyncEngine,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """接続できないレプリカを外して次のレプリカを使い、全滅時はNoneを返すこと."""
+        broken = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}"
+        )
+        replica_set = ReplicaSet([broken, replica_engine], retry_seconds=30)
+        monkeypatch.setattr(database, "replicas", replica_set)
+
+        async with database.replica_session() as session:
+            assert session is not None
+            assert await session.scalar(select(func.count(Salesperson.salesperson_id)))
+        assert replica_set.is_down(broken)
+
+        replica_set.mark_down(replica_engine)
+        async with database.replica_session() as session:
+            assert session is None
+        await broken.dispose()
+
+    @pytest.mark.asyncio
+    async def test_reads_own_writes_from_primary(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        replica_engine: AsyncEngine,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """参照はレプリカから行い、更新をコミットした本人の参照はプライマリに向けること."""
+        monkeypatch.setattr(
+            database, "replicas", ReplicaSet([replica_engine], retry_seconds=30)
+        )
+        report = DailyReport(
+            salesperson_id=1,
+            report_date=date(2026, 1, 10),
+            status=ReportStatus.SUBMITTED,
+            comments=[ReportComment(commenter_id=10, comment_text="確認")],
+        )
+        db_session.add(report)
+        await db_session.commit()
+
+        async def report_count(viewer_id: int) -> int:
+            response = await client.get(
+                "/api/v1/reports", headers=auth_headers(viewer_id)
+            )
+            return response.json()["data"]["pagination"]["total_count"]
+
+        assert await report_count(1) == 0
+
+        # コメントの既読の記録で既読位置が記録される
+        await client.put(
+            f"/api/v1/reports/{report.report_id}/comments/read",
+            json={"last_comment_id": report.comments[0].comment_id},
+            headers=auth_headers(1),
+        )
+
+        assert await report_count(1) == 1
+        assert await report_count(10) == 0
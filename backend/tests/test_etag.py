@@ -0,0 +1,216 @@
+"""ETagによる条件付きGETのテスト."""
+
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.etag import compute_etag, etag_matches
+from src.models import (
+    Customer,
+    DailyReport,
+    ReportComment,
+    ReportStatus,
+    Salesperson,
+    VisitRecord,
+)
+from tests.conftest import auth_headers
+
+
+@pytest.fixture
+async def report(
+    db_session: AsyncSession, salespersons: dict[str, Salesperson]
+) -> DailyReport:
+    """部下(1)の提出済み日報（訪問記録1件）を登録する."""
+    db_session.add(Customer(customer_id=1, company_name="株式会社A"))
+    report = DailyReport(
+        salesperson_id=salespersons["member"].salesperson_id,
+        report_date=date(2026, 1, 10),
+        status=ReportStatus.SUBMITTED,
+        visit_records=[VisitRecord(customer_id=1, visit_content="定期訪問")],
+    )
+    db_session.add(report)
+    await db_session.commit()
+    return report
+
+
+async def _revalidate(client: AsyncClient, url: str, viewer_id: int) -> int:
+    """1回目の応答のETagで再取得し、ステータスコードを返す."""
+    first = await client.get(url, headers=auth_headers(viewer_id))
+    assert first.status_code == 200
+    second = await client.get(
+        url,
+        headers={"If-None-Match": first.headers["etag"], **auth_headers(viewer_id)},
+    )
+    return second.status_code
+
+
+class TestEtagMatches:
+    """etag_matches のテスト."""
+
+    def test_weak_comparison(self) -> None:
+        """弱いETag・強いETag・複数指定・* のいずれでも一致と判定すること."""
+        etag = compute_etag(1, "a")
+
+        assert etag.startswith('W/"')
+        assert etag_matches(etag, etag) is True
+        assert etag_matches(etag.removeprefix("W/"), etag) is True
+        assert etag_matches(f'"other", {etag}', etag) is True
+        assert etag_matches("*", etag) is True
+        assert etag_matches(compute_etag(1, "b"), etag) is False
+        assert etag_matches(None, etag) is False
+
+
+class TestReportDetailEtag:
+    """GET /reports/{report_id} の条件付きGETのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_not_modified_with_single_query(
+        self,
+        client: AsyncClient,
+        report: DailyReport,
+        executed_statements: list[str],
+    ) -> None:
+        """ETagが一致する場合は本体を読み込まずに304を返すこと."""
+        url = f"/api/v1/reports/{report.report_id}"
+        first = await client.get(url, headers=auth_headers(1))
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        executed_statements.clear()
+        second = await client.get(
+            url, headers={"If-None-Match": first.headers["etag"], **auth_headers(1)}
+        )
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == first.headers["etag"]
+        assert len(executed_statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_etag_differs_by_viewer(
+        self, client: AsyncClient, report: DailyReport
+    ) -> None:
+        """確認可否が異なる閲覧者とはETagを共有しないこと."""
+        url = f"/api/v1/reports/{report.report_id}"
+        member = await client.get(url, headers=auth_headers(1))
+
+        manager = await client.get(
+            url, headers={"If-None-Match": member.headers["etag"], **auth_headers(10)}
+        )
+
+        assert manager.status_code == 200
+        assert manager.json()["data"]["can_confirm"] is True
+
+    @pytest.mark.asyncio
+    async def test_invalidated_by_writes(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        report: DailyReport,
+    ) -> None:
+        """コメント投稿・訪問記録の追加・ステータス変更で200に戻ること."""
+        url = f"/api/v1/reports/{report.report_id}"
+        assert await _revalidate(client, url, 1) == 304
+
+        for change in (
+            lambda: db_session.add(
+                ReportComment(
+                    report_id=report.report_id, commenter_id=10, comment_text="確認"
+                )
+            ),
+            lambda: db_session.add(
+                VisitRecord(
+                    report_id=report.report_id, customer_id=1, visit_content="追加"
+                )
+            ),
+            lambda: setattr(report, "status", ReportStatus.CONFIRMED),
+        ):
+            etag = (await client.get(url, headers=auth_headers(1))).headers["etag"]
+            change()
+            await db_session.commit()
+
+            response = await client.get(
+                url, headers={"If-None-Match": etag, **auth_headers(1)}
+            )
+            assert response.status_code == 200
+
+
+class TestSelectListEtag:
+    """セレクトボックス用リストの条件付きGETのテスト."""
+
+    @pytest.mark.usefixtures("report")
+    @pytest.mark.asyncio
+    async def test_customer_select(
+        self, client: AsyncClient, db_session: AsyncSession
+    ) -> None:
+        """顧客の登録でETagが変わり、検索語ごとに別のETagとなること."""
+        url = "/api/v1/customers/select"
+        assert await _revalidate(client, url, 1) == 304
+        first = await client.get(url, headers=auth_headers(1))
+        assert first.headers["cache-control"] == "private, max-age=60"
+        searched = await client.get(url, params={"q": "A"}, headers=auth_headers(1))
+        assert searched.headers["etag"] != first.headers["etag"]
+
+        db_session.add(Customer(customer_id=2, company_name="株式会社B"))
+        await db_session.commit()
+        response = await client.get(
+            url, headers={"If-None-Match": first.headers["etag"], **auth_headers(1)}
+        )
+
+        assert response.status_code == 200
+        assert len(response.json()["data"]["items"]) == 2
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_salesperson_select(
+        self, client: AsyncClient, db_session: AsyncSession
+    ) -> None:
+        """有効な担当者の増減でETagが変わること."""
+        url = "/api/v1/salespersons/select"
+        assert await _revalidate(client, url, 1) == 304
+        first = await client.get(url, headers=auth_headers(1))
+        assert first.json()["data"]["items"] == [
+            {"value": 1, "label": "山田太郎"},
+            {"value": 10, "label": "佐藤課長"},
+        ]
+
+        inactive = await db_session.get(Salesperson, 99)
+        assert inactive is not None
+        inactive.is_active = True
+        await db_session.commit()
+        response = await client.get(
+            url, headers={"If-None-Match": first.headers["etag"], **auth_headers(1)}
+        )
+
+        assert response.status_code == 200
+        assert len(response.json()["data"]["items"]) == 3
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_salesperson_select_rename(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        executed_statements: list[str],
+    ) -> None:
+        """担当者名の変更でETagが変わり、判定に集計を伴わないこと."""
+        url = "/api/v1/salespersons/select"
+        first = await client.get(url, headers=auth_headers(1))
+        executed_statements.clear()
+        assert await _revalidate(client, url, 1) == 304
+        assert "max(" not in " ".join(executed_statements).lower()
+
+        member = await db_session.get(Salesperson, 1)
+        assert member is not None
+        member.name = "山田一郎"
+        await db_session.commit()
+        response = await client.get(
+            url, headers={"If-None-Match": first.headers["etag"], **auth_headers(1)}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"]["items"][0] == {
+            "value": 1,
+            "label": "山田一郎",
+        }
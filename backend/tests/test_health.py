@@ -0,0 +1,161 @@
+"""レディネスプローブのテスト."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from src.core import health
+from src.core.database import InstrumentedQueuePool
+from src.core.health import ReadinessProbe
+from src.core.query_stats import track_queries
+
+
+class Clock:
+    """進められる時計."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _probe(target: AsyncEngine, clock: Clock | None = None) -> ReadinessProbe:
+    return ReadinessProbe(
+        target,
+        cache_seconds=2,
+        timeout_seconds=0.2,
+        saturation=0.9,
+        max_overflow=0,
+        clock=clock or Clock(),
+    )
+
+
+def _unreachable_engine() -> AsyncEngine:
+    """接続の確立に失敗するエンジン."""
+
+    async def refuse() -> None:
+        raise ConnectionRefusedError("database unreachable")
+
+    return create_async_engine("sqlite+aiosqlite://", async_creator=refuse)
+
+
+class TestReadinessProbe:
+    """ReadinessProbeのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_probe_storm_runs_one_query(self, db_engine: AsyncEngine) -> None:
+        """同時のプローブと保持期間内のプローブは1回の問い合わせを共有すること."""
+        clock = Clock()
+        probe = _probe(db_engine, clock)
+
+        with track_queries() as stats:
+            results = await asyncio.gather(*(probe.check() for _ in range(20)))
+            report, cached = await probe.check()
+        assert stats.count == 1
+        assert {id(r) for r, _ in results} == {id(report)}
+        assert cached is True
+        assert report.ready is True
+        assert report.checks["database"].latency_ms >= 0
+
+        clock.now += 2
+        with track_queries() as stats:
+            _, cached = await probe.check()
+        assert (stats.count, cached) == (1, False)
+
+    @pytest.mark.asyncio
+    async def test_not_ready_until_warm_up(self, db_engine: AsyncEngine) -> None:
+        """ウォームアップが終わるまで利用不可とし、完了後は保持期間内でも利用可能とすること."""
+        probe = _probe(db_engine)
+        finish = asyncio.Event()
+
+        async def warm_up() -> None:
+            await finish.wait()
+
+        warming_up = asyncio.create_task(warm_up())
+        probe.track_warm_up(warming_up)
+
+        report, _ = await probe.check()
+        assert report.ready is False
+        assert report.checks["warm_up"].detail == "in progress"
+
+        finish.set()
+        await warming_up
+        report, cached = await probe.check()
+        assert (report.ready, cached) == (True, False)
+
+    @pytest.mark.asyncio
+    async def test_unreachable_database(self) -> None:
+        """接続できないデータベースは利用不可とし、理由を返すこと."""
+        target = _unreachable_engine()
+        try:
+            report, _ = await _probe(target).check()
+        finally:
+            await target.dispose()
+
+        assert report.ready is False
+        assert report.checks["database"].ok is False
+        assert report.checks["database"].detail == "ConnectionRefusedError"
+
+    @pytest.mark.asyncio
+    async def test_saturated_pool(self, tmp_path: Path) -> None:
+        """プールの接続がすべて使用中であれば利用不可とすること."""
+        target = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path}/app.db",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+        )
+        try:
+            async with target.connect():
+                report, _ = await _probe(target).check()
+        finally:
+            await target.dispose()
+
+        assert report.checks["database"].detail == "timeout"
+        assert report.checks["db_pool"].ok is False
+        assert report.checks["db_pool"].detail == "1/1 connections in use"
+
+
+class TestHealthEndpoints:
+    """ヘルスチェックAPIのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_liveness(self, client: AsyncClient) -> None:
+        """ライブネスは依存先を確認せずに200を返すこと."""
+        response = await client.get("/api/v1/health/live")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    @pytest.mark.asyncio
+    async def test_readiness(
+        self,
+        client: AsyncClient,
+        db_engine: AsyncEngine,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """依存先ごとの結果と時間を返し、利用できない場合は503を返すこと."""
+        monkeypatch.setattr(health, "readiness_probe", _probe(db_engine))
+        first = await client.get("/api/v1/health/ready")
+        second = await client.get("/api/v1/health/ready")
+
+        assert first.status_code == 200
+        assert first.json()["status"] == "ready"
+        assert (first.json()["cached"], second.json()["cached"]) == (False, True)
+        assert set(first.json()["checks"]) == {"warm_up", "database", "db_pool"}
+        assert set(first.json()["checks"]["database"]) == {
+            "ok",
+            "latency_ms",
+            "detail",
+        }
+
+        unreachable = _unreachable_engine()
+        monkeypatch.setattr(health, "readiness_probe", _probe(unreachable))
+        response = await client.get("/api/v1/health/ready")
+        await unreachable.dispose()
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "unavailable"
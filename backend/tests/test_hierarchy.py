@@ -0,0 +1,135 @@
+"""上長・部下階層インデックスのテスト."""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.password_pool import PasswordHashPool
+from src.models import Salesperson
+from src.services.hierarchy import HierarchyIndex, hierarchy_index
+
+
+class PlainPasswordPool(PasswordHashPool):
+    """平文比較で検証するテスト用プール."""
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return plain_password == hashed_password
+
+
+@pytest.fixture
+def org_chart() -> HierarchyIndex:
+    """部長(1) - 課長(2, 3) - 担当(4, 5, 6) の3階層."""
+    index = HierarchyIndex()
+    index.build([(1, None), (2, 1), (3, 1), (4, 2), (5, 2), (6, 3)])
+    return index
+
+
+class TestHierarchyIndex:
+    """HierarchyIndexのテスト."""
+
+    def test_is_manager(self, org_chart: HierarchyIndex) -> None:
+        """部下を持つ担当者と最上位の担当者が上長と判定されること."""
+        assert org_chart.is_manager(1) is True
+        assert org_chart.is_manager(2) is True
+        assert org_chart.is_manager(4) is False
+        assert org_chart.is_manager(999) is False
+
+    def test_transitive_subordinates(self, org_chart: HierarchyIndex) -> None:
+        """全階層の部下が返されること."""
+        assert org_chart.subordinates(1) == {2, 3, 4, 5, 6}
+        assert org_chart.subordinates(2) == {4, 5}
+        assert org_chart.direct_subordinates(1) == {2, 3}
+        assert org_chart.is_subordinate_of(6, 1) is True
+        assert org_chart.is_subordinate_of(6, 2) is False
+        assert org_chart.is_subordinate_of(1, 1) is False
+
+    def test_upsert_moves_subtree(self, org_chart: HierarchyIndex) -> None:
+        """上長の変更が上位階層の閉包に反映されること."""
+        org_chart.subordinates(1)  # 閉包を計算済みにする
+
+        org_chart.upsert(2, 3)
+
+        assert org_chart.subordinates(3) == {2, 4, 5, 6}
+        assert org_chart.subordinates(1) == {2, 3, 4, 5, 6}
+        assert org_chart.direct_subordinates(1) == {3}
+
+        org_chart.upsert(7, 4)
+        assert org_chart.is_manager(4) is True
+        assert org_chart.is_subordinate_of(7, 1) is True
+
+    def test_remove(self, org_chart: HierarchyIndex) -> None:
+        """削除した担当者が上位階層の閉包から除かれること."""
+        org_chart.subordinates(1)
+
+        org_chart.remove(6)
+
+        assert org_chart.subordinates(1) == {2, 3, 4, 5}
+        assert org_chart.is_manager(3) is False
+
+    def test_cycle_does_not_hang(self) -> None:
+        """循環した上長設定でも計算が終了すること."""
+        index = HierarchyIndex()
+        index.build([(1, 2), (2, 1)])
+
+        assert index.subordinates(1) <= {1, 2}
+
+
+class TestHierarchyIndexSync:
+    """データベースとの同期のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_loads_and_applies_commits(
+        self, db_session: AsyncSession, salespersons: dict[str, Salesperson]
+    ) -> None:
+        """構築後のORM経由の登録・更新がコミット時に反映されること."""
+        await hierarchy_index.ensure_loaded(db_session)
+        member_id = salespersons["member"].salesperson_id
+        assert hierarchy_index.is_manager(member_id) is False
+
+        db_session.add(
+            Salesperson(
+                salesperson_id=2,
+                name="新人",
+                email="new@example.com",
+                password_hash="x",
+                manager_id=member_id,
+            )
+        )
+        await db_session.commit()
+        assert hierarchy_index.is_manager(member_id) is True
+
+        salespersons["manager"].manager_id = member_id
+        await db_session.flush()
+        await db_session.rollback()
+        assert not hierarchy_index.is_subordinate_of(10, member_id)
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_login_reports_is_manager_without_scan(
+        self,
+        client: AsyncClient,
+        monkeypatch: pytest.MonkeyPatch,
+        executed_statements: list[str],
+    ) -> None:
+        """ログイン時の上長判定がインデックスから行われること."""
+        from src.api.v1 import auth
+
+        monkeypatch.setattr(
+            auth, "password_pool", PlainPasswordPool(max_workers=1, max_queue=0)
+        )
+
+        manager = await client.post(
+            "/api/v1/auth/login", json={"email": "sato@example.com", "password": "x"}
+        )
+        executed_statements.clear()
+        member = await client.post(
+            "/api/v1/auth/login", json={"email": "yamada@example.com", "password": "x"}
+        )
+
+        assert manager.status_code == 200
+        assert manager.json()["data"]["user"]["is_manager"] is True
+        assert member.status_code == 200
+        assert member.json()["data"]["user"]["is_manager"] is False
+        # 2回目以降のログインはユーザー取得の1クエリのみ
+        selects = [s for s in executed_statements if s.lstrip().startswith("SELECT")]
+        assert len(selects) == 1
@@ -0,0 +1,131 @@
+"""ログインユーザー情報キャッシュのテスト."""
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.dependencies import get_current_user
+from src.core.identity import IdentityCache, identity_cache
+from src.core.security import create_access_token
+from src.models import Salesperson
+from tests.conftest import auth_headers
+
+
+class TestGetCurrentUserFromDatabase:
+    """get_current_userのDB連携のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_loads_user_from_database(
+        self, db_session: AsyncSession, salespersons: dict[str, Salesperson]
+    ) -> None:
+        """営業担当者テーブルの情報が返されること."""
+        token = create_access_token({"sub": "1"})
+
+        user = await get_current_user(token, db_session)
+
+        assert user.name == "山田太郎"
+        assert user.email == "yamada@example.com"
+        assert user.manager_id == salespersons["manager"].salesperson_id
+        assert user.is_active is True
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_cached_user_issues_no_query(
+        self,
+        db_session: AsyncSession,
+        executed_statements: list[str],
+    ) -> None:
+        """2回目以降はクエリを発行しないこと."""
+        token = create_access_token({"sub": "1"})
+
+        await get_current_user(token, db_session)
+        assert len(executed_statements) == 1
+        hits = identity_cache.stats.hits
+
+        await get_current_user(token, db_session)
+        assert len(executed_statements) == 1
+        assert identity_cache.stats.hits == hits + 1
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_inactive_user_rejected(self, db_session: AsyncSession) -> None:
+        """無効化されたユーザーは401となること."""
+        token = create_access_token({"sub": "99"})
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(token, db_session)
+
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_unknown_user_rejected(self, db_session: AsyncSession) -> None:
+        """存在しないユーザーは401となること."""
+        token = create_access_token({"sub": "12345"})
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(token, db_session)
+
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_logout_uses_database_user(self, client: AsyncClient) -> None:
+        """認証が必要なAPIで無効ユーザーが拒否されること."""
+        active = await client.post("/api/v1/auth/logout", headers=auth_headers(1))
+        inactive = await client.post("/api/v1/auth/logout", headers=auth_headers(99))
+
+        assert active.status_code == 200
+        assert inactive.status_code == 401
+
+
+class TestIdentityCacheInvalidation:
+    """キャッシュ無効化のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_deactivation_invalidates_on_commit(
+        self, db_session: AsyncSession, salespersons: dict[str, Salesperson]
+    ) -> None:
+        """無効化がコミットされると次のリクエストで拒否されること."""
+        token = create_access_token({"sub": "1"})
+        await get_current_user(token, db_session)
+
+        salespersons["member"].is_active = False
+        await db_session.commit()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(token, db_session)
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_rollback_keeps_cache(
+        self,
+        db_session: AsyncSession,
+        salespersons: dict[str, Salesperson],
+        executed_statements: list[str],
+    ) -> None:
+        """ロールバックされた更新ではキャッシュが削除されないこと."""
+        token = create_access_token({"sub": "1"})
+        await get_current_user(token, db_session)
+
+        salespersons["member"].name = "変更後"
+        await db_session.flush()
+        await db_session.rollback()
+        executed_statements.clear()
+
+        user = await get_current_user(token, db_session)
+        assert user.name == "山田太郎"
+        assert executed_statements == []
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_reloads_after_ttl(self, db_session: AsyncSession) -> None:
+        """TTL経過後はデータベースから再読み込みすること."""
+        cache = IdentityCache(max_size=10, ttl_seconds=0)
+
+        await cache.get(db_session, 1)
+        await cache.get(db_session, 1)
+
+        assert cache.stats.hits == 0
+        assert cache.stats.misses == 2
@@ -1,8 +1,12 @@
 """メインAPIのテスト."""
 
+import asyncio
+
 import pytest
 from httpx import AsyncClient
 
+from src import main
+
 
 @pytest.mark.asyncio
 async def test_root(client: AsyncClient) -> None:
@@ -18,3 +22,72 @@ async def test_health_check(client: AsyncClient) -> None:
     response = await client.get("/api/v1/health")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_db_pool_status(client: AsyncClient) -> None:
+    """コネクションプールの利用状況が返されること."""
+    response = await client.get("/api/v1/health/db-pool")
+    assert response.status_code == 200
+    assert set(response.json()) == {
+        "size",
+        "checked_out",
+        "checked_in",
+        "overflow",
+        "acquisitions",
+        "wait_ms_avg",
+        "wait_ms_max",
+    }
+
+
+@pytest.mark.asyncio
+async def test_lifespan(monkeypatch: pytest.MonkeyPatch) -> None:
+    """事前接続が終わるまでレディネスを利用不可とし、終了時に接続とワーカープールを解放すること."""
+    calls: list[str] = []
+    connected = asyncio.Event()
+
+    async def warm_up_pool(count: int) -> int:
+        await connected.wait()
+        calls.append(f"warm_up:{count}")
+        return count
+
+    async def close_db() -> None:
+        calls.append("close_db")
+
+    monkeypatch.setattr(main, "warm_up_pool", warm_up_pool)
+    monkeypatch.setattr(main, "close_db", close_db)
+    monkeypatch.setattr(
+        main.password_pool, "shutdown", lambda: calls.append("shutdown")
+    )
+    monkeypatch.setattr(
+        main.outbox_worker, "start", lambda: calls.append("outbox_start")
+    )
+
+    async def stop_outbox() -> None:
+        calls.append("outbox_stop")
+
+    monkeypatch.setattr(main.outbox_worker, "stop", stop_outbox)
+    monkeypatch.setattr(
+        main.autosave_buffer, "start", lambda: calls.append("autosave_start")
+    )
+
+    async def stop_autosave() -> None:
+        calls.append("autosave_stop")
+
+    monkeypatch.setattr(main.autosave_buffer, "stop", stop_autosave)
+
+    probe = main.health.readiness_probe
+    monkeypatch.setattr(probe, "_warm_up", None)
+    async with main.lifespan(main.app):
+        # ウォームアップの完了まではレディネスを利用不可とする
+        assert calls == ["outbox_start", "autosave_start"]
+        assert probe._check_warm_up().ok is False
+        connected.set()
+        async with asyncio.timeout(5):
+            while len(calls) < 3:
+                await asyncio.sleep(0.01)
+            while not probe._check_warm_up().ok:
+                await asyncio.sleep(0.01)
+        assert calls[2] == f"warm_up:{main.settings.db_pool_warmup}"
+    # 書き込み待ちの自動保存は接続の解放より前に書き込む
+    assert calls[3:] == ["autosave_stop", "outbox_stop", "shutdown", "close_db"]
@@ -0,0 +1,122 @@
+"""Prometheus形式のメトリクスのテスト."""
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.core.config import settings
+from src.core.metrics import (
+    Histogram,
+    MetricsMiddleware,
+    RequestMetrics,
+    render,
+    request_metrics,
+)
+from tests.conftest import auth_headers
+
+
+class TestHistogram:
+    """Histogramのテスト."""
+
+    def test_cumulative_buckets(self) -> None:
+        """上限ちょうどの値はそのバケットに数え、累積の件数を返すこと."""
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        assert list(histogram.cumulative()) == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+        assert histogram.total == pytest.approx(3.65)
+
+
+class TestMetricsMiddleware:
+    """MetricsMiddlewareのテスト."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("salespersons")
+    async def test_counts_by_route_and_status(self, client: AsyncClient) -> None:
+        """パスのテンプレート・ステータスコードごとに数え、一致しないパスはまとめること."""
+        await client.get("/api/v1/reports/1", headers=auth_headers(1))
+        await client.get("/api/v1/reports/2", headers=auth_headers(1))
+        await client.get("/api/v1/reports/1")
+        await client.get("/no-such-path")
+
+        assert request_metrics.responses == {
+            ("GET", "/api/v1/reports/{report_id}", 404): 2,
+            ("GET", "/api/v1/reports/{report_id}", 401): 1,
+            ("GET", "unmatched", 404): 1,
+        }
+        assert (
+            sum(request_metrics.latency[("GET", "/api/v1/reports/{report_id}")].counts)
+            == 3
+        )
+        assert request_metrics.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_counts_unhandled_exception(self) -> None:
+        """未処理の例外で終了したリクエストは500と例外の件数に数えること."""
+        inner = FastAPI()
+
+        @inner.get("/boom")
+        async def boom() -> None:
+            raise RuntimeError("boom")
+
+        metrics = RequestMetrics()
+        inner.add_middleware(MetricsMiddleware, metrics=metrics)
+        transport = ASGITransport(app=inner, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/boom")
+
+        assert response.status_code == 500
+        assert metrics.responses == {("GET", "/boom", 500): 1}
+        assert metrics.exceptions == {("GET", "/boom"): 1}
+
+
+class TestMetricsEndpoint:
+    """GET /metrics のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_text_format(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """処理時間のヒストグラム・件数・プールの利用状況をテキスト形式で返すこと."""
+        monkeypatch.setattr(settings, "metrics_enabled", True)
+        await client.get("/api/v1/health")
+        response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        labels = 'method="GET",route="/api/v1/health"'
+        assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in body
+        assert f"http_request_duration_seconds_count{{{labels}}} 1" in body
+        assert f'http_responses_total{{{labels},status="200"}} 1' in body
+        # /metrics 自身は処理中として数える
+        assert "http_requests_in_flight 1\n" in body
+        assert 'db_pool_size{pool="primary"}' in body
+        assert render(RequestMetrics()).count("# TYPE") == 10
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, client: AsyncClient) -> None:
+        """既定ではメトリクスを公開しないこと."""
+        assert settings.metrics_enabled is False
+
+        response = await client.get("/metrics")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_requires_token(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """トークンを設定した場合は一致するBearerトークンのみ許可すること."""
+        monkeypatch.setattr(settings, "metrics_enabled", True)
+        monkeypatch.setattr(settings, "metrics_token", "scrape-secret")
+
+        missing = await client.get("/metrics")
+        wrong = await client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+        allowed = await client.get(
+            "/metrics", headers={"Authorization": "Bearer scrape-secret"}
+        )
+
+        assert (missing.status_code, wrong.status_code) == (401, 401)
+        assert allowed.status_code == 200
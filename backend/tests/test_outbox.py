@@ -0,0 +1,224 @@
+"""通知イベント（アウトボックス）の配信のテスト."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.models import OutboxEvent
+from src.services import outbox
+from src.services.outbox import MemorySink, Notification, OutboxWorker, enqueue
+
+START = datetime(2026, 1, 10, 18, 0)
+
+
+class Clock:
+    """進められる時計."""
+
+    def __init__(self) -> None:
+        self.now = START
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    """テスト用の時計."""
+    return Clock()
+
+
+@pytest.fixture
+def worker(
+    session_factory: async_sessionmaker[AsyncSession], clock: Clock
+) -> OutboxWorker:
+    """メモリに配信するワーカー（2件ずつ・最大3回・1秒から倍々で再試行）."""
+    return OutboxWorker(
+        session_factory,
+        MemorySink(),
+        batch_size=2,
+        poll_seconds=60,
+        max_attempts=3,
+        retry_base_seconds=1,
+        retry_max_seconds=3,
+        lease_seconds=30,
+        clock=clock,
+    )
+
+
+async def _enqueue(db_session: AsyncSession, count: int) -> None:
+    for n in range(count):
+        db_session.add(
+            OutboxEvent(event_type="test", payload={"n": n}, available_at=START)
+        )
+    await db_session.commit()
+
+
+class StallingSink(MemorySink):
+    """指定した通知で失敗、または応答しなくなる配信先."""
+
+    def __init__(self, fail: int | None = None, stall: int | None = None) -> None:
+        super().__init__()
+        self.fail = fail
+        self.stall = stall
+        self.stalled = asyncio.Event()
+
+    async def deliver(self, notification: Notification) -> None:
+        n = notification.payload["n"]
+        if n == self.stall:
+            self.stalled.set()
+            await asyncio.Event().wait()
+        if n == self.fail:
+            raise ConnectionError("notification sink unavailable")
+        await super().deliver(notification)
+
+
+def _sink(worker: OutboxWorker) -> MemorySink:
+    assert isinstance(worker.sink, MemorySink)
+    return worker.sink
+
+
+class TestOutboxWorker:
+    """OutboxWorkerのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_drains_in_order_by_batch(
+        self, db_session: AsyncSession, worker: OutboxWorker
+    ) -> None:
+        """イベントIDの順に batch_size 件ずつ配信し、配信済みは再配信しないこと."""
+        await _enqueue(db_session, 3)
+
+        assert await worker.drain_batch() == 2
+        assert await worker.drain_batch() == 1
+        assert await worker.drain_batch() == 0
+
+        assert [n.payload["n"] for n in _sink(worker).delivered] == [0, 1, 2]
+        event = await db_session.get(OutboxEvent, 1, populate_existing=True)
+        assert event is not None
+        assert event.delivered_at == START
+        assert event.attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_with_backoff(
+        self, db_session: AsyncSession, worker: OutboxWorker, clock: Clock
+    ) -> None:
+        """失敗したイベントは待ち時間を倍々に延ばして再試行し、上限回数で打ち切ること."""
+        worker.sink = MemorySink(failures=3)
+        await _enqueue(db_session, 1)
+
+        assert await worker.drain_batch() == 1
+        assert await worker.drain_batch() == 0
+        clock.now += timedelta(seconds=1)
+        assert await worker.drain_batch() == 1
+        clock.now += timedelta(seconds=1)
+        assert await worker.drain_batch() == 0
+        clock.now += timedelta(seconds=1)
+        assert await worker.drain_batch() == 1
+        clock.now += timedelta(hours=1)
+        assert await worker.drain_batch() == 0
+
+        event = await db_session.get(OutboxEvent, 1, populate_existing=True)
+        assert event is not None
+        assert event.attempts == 3
+        assert event.delivered_at is None
+        assert event.last_error == "ConnectionError: notification sink unavailable"
+        assert worker.retry_delay(5) == timedelta(seconds=3)
+
+    @pytest.mark.asyncio
+    async def test_failure_mid_batch(
+        self, db_session: AsyncSession, worker: OutboxWorker
+    ) -> None:
+        """バッチの途中で配信に失敗しても、残りのイベントを配信して結果を記録すること."""
+        worker.sink = StallingSink(fail=1)
+        worker.batch_size = 3
+        await _enqueue(db_session, 3)
+
+        assert await worker.drain_batch() == 3
+
+        assert [n.payload["n"] for n in _sink(worker).delivered] == [0, 2]
+        failed = await db_session.get(OutboxEvent, 2, populate_existing=True)
+        assert failed is not None
+        assert failed.delivered_at is None
+        assert failed.attempts == 1
+        assert failed.available_at == START + timedelta(seconds=1)
+        assert failed.last_error == "ConnectionError: notification sink unavailable"
+
+    @pytest.mark.asyncio
+    async def test_stalled_sink_holds_no_lock(
+        self,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        worker: OutboxWorker,
+    ) -> None:
+        """配信先が応答しない間はリースのみで他のワーカーから隠し、リース切れで失敗とすること."""
+        sink = StallingSink(stall=1)
+        worker.sink = sink
+        worker.batch_size = 3
+        worker.lease_seconds = 0.2
+        await _enqueue(db_session, 3)
+
+        draining = asyncio.create_task(worker.drain_batch())
+        async with asyncio.timeout(5):
+            await sink.stalled.wait()
+        # 取り出しはコミット済みで、他のワーカーはリース中のイベントを取り出さない
+        claimed = await db_session.get(OutboxEvent, 3, populate_existing=True)
+        assert claimed is not None
+        assert claimed.attempts == 1
+        assert claimed.available_at == START + timedelta(seconds=0.2)
+        other = OutboxWorker(
+            session_factory,
+            MemorySink(),
+            batch_size=3,
+            poll_seconds=60,
+            max_attempts=3,
+            retry_base_seconds=1,
+            retry_max_seconds=3,
+            lease_seconds=30,
+            clock=lambda: START,
+        )
+        assert await other.drain_batch() == 0
+
+        assert await draining == 3
+        assert [n.payload["n"] for n in sink.delivered] == [0]
+        for event_id in (2, 3):
+            event = await db_session.get(OutboxEvent, event_id, populate_existing=True)
+            assert event is not None
+            assert event.delivered_at is None
+            assert event.last_error == "TimeoutError: lease expired"
+            assert event.available_at == START + timedelta(seconds=1)
+
+    @pytest.mark.asyncio
+    async def test_wakes_on_commit(
+        self,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """コミットで待機中のワーカーが起き、ロールバックしたイベントは配信されないこと."""
+        worker = OutboxWorker(
+            session_factory,
+            MemorySink(),
+            batch_size=2,
+            poll_seconds=60,
+            max_attempts=3,
+            retry_base_seconds=1,
+            retry_max_seconds=3,
+            lease_seconds=30,
+        )
+        monkeypatch.setattr(outbox, "outbox_worker", worker)
+        worker.start()
+        try:
+            enqueue(db_session, "test", {"n": "rolled back"})
+            await db_session.rollback()
+            enqueue(db_session, "test", {"n": "committed"})
+            await db_session.commit()
+
+            async with asyncio.timeout(5):
+                while not _sink(worker).delivered:
+                    await asyncio.sleep(0.01)
+        finally:
+            await worker.stop()
+
+        assert [n.payload for n in _sink(worker).delivered] == [{"n": "committed"}]
+        assert worker.is_running is False
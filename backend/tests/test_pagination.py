@@ -0,0 +1,35 @@
+"""カーソルページネーションのテスト."""
+
+import pytest
+
+from src.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+class TestCursor:
+    """encode_cursor / decode_cursor のテスト."""
+
+    def test_round_trip(self) -> None:
+        """エンコードした値を復元できること."""
+        cursor = encode_cursor("2026-01-10", 123)
+
+        assert decode_cursor(cursor, 2) == ["2026-01-10", 123]
+
+    def test_url_safe(self) -> None:
+        """URLにそのまま含められる文字のみで構成されること."""
+        cursor = encode_cursor("日本語?&=", 2**40)
+
+        assert all(c.isalnum() or c in "-_" for c in cursor)
+
+    @pytest.mark.parametrize(
+        "cursor",
+        ["", "not-a-cursor", encode_cursor(1), encode_cursor("a", 1, 2)],
+    )
+    def test_invalid(self, cursor: str) -> None:
+        """復元できない、または要素数が異なるカーソルは例外となること."""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, 2)
+
+    def test_rejects_non_scalar_values(self) -> None:
+        """文字列・整数以外の値を含むカーソルは例外となること."""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(encode_cursor("a", True), 2)  # type: ignore[arg-type]
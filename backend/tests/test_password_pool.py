@@ -0,0 +1,139 @@
+"""パスワードハッシュ処理プールのテスト."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.password_pool import PasswordHashPool, PasswordPoolSaturatedError
+
+
+def _blocking_sleep(seconds: float) -> float:
+    """GILを解放して待機する（bcryptの代わり）."""
+    time.sleep(seconds)
+    return seconds
+
+
+class TestPasswordHashPool:
+    """PasswordHashPoolのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_run_returns_result(self) -> None:
+        """ワーカーで実行した結果が返されること."""
+        pool = PasswordHashPool(max_workers=1, max_queue=0)
+        try:
+            assert await pool.run(_blocking_sleep, 0.01) == 0.01
+            assert pool.in_flight == 0
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self) -> None:
+        """実行中もイベントループが応答し続けること."""
+        pool = PasswordHashPool(max_workers=1, max_queue=0)
+        try:
+            task = asyncio.create_task(pool.run(_blocking_sleep, 0.3))
+            await asyncio.sleep(0)
+
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            elapsed = time.perf_counter() - start
+
+            assert elapsed < 0.2
+            await task
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_saturated(self) -> None:
+        """受付上限を超えた場合は即座に拒否されること."""
+        pool = PasswordHashPool(max_workers=1, max_queue=1)
+        release = threading.Event()
+        try:
+            tasks = [asyncio.create_task(pool.run(release.wait, 5)) for _ in range(2)]
+            await asyncio.sleep(0)
+            assert pool.in_flight == 2
+
+            with pytest.raises(PasswordPoolSaturatedError):
+                await pool.run(release.wait, 5)
+            assert pool.rejected_count == 1
+
+            release.set()
+            await asyncio.gather(*tasks)
+            assert pool.in_flight == 0
+        finally:
+            release.set()
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_run_counts_until_thread_finishes(self) -> None:
+        """呼び出し元がキャンセルされても、スレッドでの実行中は件数に含まれること."""
+        pool = PasswordHashPool(max_workers=1, max_queue=0)
+        release = threading.Event()
+        try:
+            task = asyncio.create_task(pool.run(release.wait, 5))
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            assert pool.in_flight == 1
+            with pytest.raises(PasswordPoolSaturatedError):
+                await pool.run(release.wait, 5)
+
+            release.set()
+            for _ in range(100):
+                if pool.in_flight == 0:
+                    break
+                await asyncio.sleep(0.01)
+            assert pool.in_flight == 0
+            assert await pool.run(_blocking_sleep, 0.01) == 0.01
+        finally:
+            release.set()
+            pool.shutdown()
+
+
+class TestLoginSaturation:
+    """ログインAPIの飽和時応答のテスト."""
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_login_returns_503_when_saturated(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """プールが飽和している場合は503とRetry-Afterが返されること."""
+        from src.api.v1 import auth
+
+        monkeypatch.setattr(
+            auth, "password_pool", PasswordHashPool(max_workers=0, max_queue=0)
+        )
+
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": "yamada@example.com", "password": "password123"},
+        )
+
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+        assert response.json()["detail"]["code"] == "SERVICE_UNAVAILABLE"
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_unknown_user_does_not_use_pool(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """存在しないユーザーはプールを使わず401が返されること."""
+        from src.api.v1 import auth
+
+        monkeypatch.setattr(
+            auth, "password_pool", PasswordHashPool(max_workers=0, max_queue=0)
+        )
+
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": "unknown@example.com", "password": "password123"},
+        )
+
+        assert response.status_code == 401
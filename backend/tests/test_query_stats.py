@@ -0,0 +1,89 @@
+"""リクエストごとのSQL計測のテスト."""
+
+import logging
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import query_stats
+from src.core.query_stats import track_queries
+from src.models import Salesperson
+from tests.conftest import MaxQueries, auth_headers
+
+
+class TestTrackQueries:
+    """track_queriesのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_counts_nested_ranges(self, db_session: AsyncSession) -> None:
+        """範囲内の文を数え、内側の範囲の文は外側の範囲にも数えること."""
+        with track_queries() as outer:
+            await db_session.execute(text("SELECT 1"))
+            with track_queries() as inner:
+                await db_session.execute(select(Salesperson.salesperson_id))
+        await db_session.execute(text("SELECT 2"))
+
+        assert (outer.count, inner.count) == (2, 1)
+        assert outer.total_ms >= inner.total_ms >= inner.slowest_ms > 0
+        assert inner.slowest_statement is not None
+        assert inner.slowest_statement.startswith('SELECT "SALESPERSON".salesperson_id')
+
+
+class TestQueryStatsMiddleware:
+    """QueryStatsMiddlewareのテスト."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("salespersons")
+    async def test_server_timing_header(self, client: AsyncClient) -> None:
+        """SQLを実行したリクエストには文の数と時間が Server-Timing で返ること."""
+        response = await client.get(
+            "/api/v1/salespersons/select", headers=auth_headers(1)
+        )
+        health = await client.get("/api/v1/health")
+
+        db, slowest = response.headers["server-timing"].split(", ")
+        assert db.startswith("db;dur=")
+        assert db.endswith(' queries"')
+        assert slowest.startswith("db-slowest;dur=")
+        assert "server-timing" not in health.headers
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("salespersons")
+    async def test_logs_slow_request(
+        self,
+        client: AsyncClient,
+        caplog: pytest.LogCaptureFixture,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """文の数がしきい値を超えたリクエストはルートごとに警告ログを出力すること."""
+        monkeypatch.setattr(query_stats.settings, "slow_request_query_count", 0)
+
+        with caplog.at_level(logging.WARNING, logger=query_stats.__name__):
+            await client.get("/api/v1/salespersons/select", headers=auth_headers(1))
+
+        [record] = caplog.records
+        assert record.getMessage().startswith("GET /api/v1/salespersons/select: ")
+        assert record.__dict__["slow"] is True
+        assert record.__dict__["db"]["count"] > 0
+
+
+class TestMaxQueriesFixture:
+    """max_queries フィクスチャのテスト."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("salespersons")
+    async def test_limits_queries_per_request(
+        self, client: AsyncClient, max_queries: MaxQueries
+    ) -> None:
+        """上限以下なら成功し、超えた場合は文の数と最も遅い文を示して失敗すること."""
+        with max_queries(5) as stats:
+            await client.get("/api/v1/salespersons/select", headers=auth_headers(1))
+        assert stats.count > 0
+
+        with (
+            pytest.raises(AssertionError, match=r"queries executed \(max 0\)"),
+            max_queries(0),
+        ):
+            await client.get("/api/v1/salespersons/select", headers=auth_headers(10))
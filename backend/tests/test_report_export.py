@@ -0,0 +1,195 @@
+"""日報CSVエクスポートのテスト."""
+
+import csv
+import io
+import tracemalloc
+from datetime import date, time, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Customer, DailyReport, ReportStatus, Salesperson, VisitRecord
+from src.services.report_export import EXPORT_COLUMNS, stream_report_csv
+from src.services.reports import ReportListFilter
+from tests.conftest import auth_headers
+
+BASE_DATE = date(2026, 1, 10)
+
+
+@pytest.fixture
+async def reports(
+    db_session: AsyncSession, salespersons: dict[str, Salesperson]
+) -> list[DailyReport]:
+    """部下(1)の日報2件（訪問記録2件・なし）と上長(10)の日報1件を登録する."""
+    db_session.add_all(
+        [
+            Customer(customer_id=1, company_name="株式会社A"),
+            Customer(customer_id=2, company_name="株式会社B"),
+        ]
+    )
+    member_id = salespersons["member"].salesperson_id
+    created = [
+        DailyReport(
+            salesperson_id=member_id,
+            report_date=BASE_DATE,
+            status=ReportStatus.SUBMITTED,
+            problem="値引き交渉,\n要相談",
+            visit_records=[
+                VisitRecord(customer_id=2, visit_content="見積提出", display_order=1),
+                VisitRecord(
+                    customer_id=1,
+                    visit_content="定期訪問",
+                    visit_time=time(9, 30),
+                    display_order=0,
+                ),
+            ],
+        ),
+        DailyReport(
+            salesperson_id=member_id, report_date=BASE_DATE - timedelta(days=1)
+        ),
+        DailyReport(
+            salesperson_id=salespersons["manager"].salesperson_id,
+            report_date=BASE_DATE,
+        ),
+    ]
+    db_session.add_all(created)
+    await db_session.commit()
+    return created
+
+
+def _parse(body: bytes) -> list[dict[str, str]]:
+    text = body.decode()
+    assert text.startswith("\ufeff")
+    return list(csv.DictReader(io.StringIO(text[1:])))
+
+
+class TestGetReportsExport:
+    """GET /reports/export のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_exports_visits_as_rows(
+        self, client: AsyncClient, reports: list[DailyReport]
+    ) -> None:
+        """1行1訪問記録で、訪問記録のない日報も1行として出力されること."""
+        response = await client.get(
+            "/api/v1/reports/export",
+            params={"salesperson_id": 1},
+            headers=auth_headers(10),
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "attachment" in response.headers["content-disposition"]
+        rows = _parse(response.content)
+        assert [(r["report_id"], r["company_name"], r["visit_time"]) for r in rows] == [
+            (str(reports[0].report_id), "株式会社A", "09:30"),
+            (str(reports[0].report_id), "株式会社B", ""),
+            (str(reports[1].report_id), "", ""),
+        ]
+        assert rows[0]["problem"] == "値引き交渉,\n要相談"
+        assert rows[0]["salesperson_name"] == "山田太郎"
+        assert rows[0]["status"] == "submitted"
+
+    @pytest.mark.asyncio
+    async def test_escapes_formulas(
+        self, client: AsyncClient, db_session: AsyncSession, reports: list[DailyReport]
+    ) -> None:
+        """数式として解釈される値は先頭に ' を付けて出力されること."""
+        reports[1].problem = '=HYPERLINK("http://example.com","詳細")'
+        reports[1].plan = "-3%の値引き"
+        db_session.add(
+            VisitRecord(
+                report_id=reports[1].report_id,
+                customer_id=1,
+                visit_content="@SUM(A1)",
+            )
+        )
+        await db_session.commit()
+
+        response = await client.get(
+            "/api/v1/reports/export",
+            params={"salesperson_id": 1},
+            headers=auth_headers(10),
+        )
+
+        rows = _parse(response.content)
+        assert rows[2]["problem"] == '\'=HYPERLINK("http://example.com","詳細")'
+        assert rows[2]["plan"] == "'-3%の値引き"
+        assert rows[2]["visit_content"] == "'@SUM(A1)"
+        assert rows[0]["problem"] == "値引き交渉,\n要相談"
+
+    @pytest.mark.usefixtures("reports")
+    @pytest.mark.asyncio
+    async def test_member_exports_own_reports(self, client: AsyncClient) -> None:
+        """一般営業は自分の日報のみ出力されること."""
+        response = await client.get(
+            "/api/v1/reports/export",
+            params={"date_from": BASE_DATE.isoformat()},
+            headers=auth_headers(1),
+        )
+
+        rows = _parse(response.content)
+        assert list(rows[0]) == list(EXPORT_COLUMNS)
+        assert {r["salesperson_id"] for r in rows} == {"1"}
+        assert len(rows) == 2
+
+    @pytest.mark.usefixtures("reports")
+    @pytest.mark.asyncio
+    async def test_member_cannot_export_manager(self, client: AsyncClient) -> None:
+        """閲覧権限のない担当者を指定すると403となること."""
+        response = await client.get(
+            "/api/v1/reports/export",
+            params={"salesperson_id": 10},
+            headers=auth_headers(1),
+        )
+
+        assert response.status_code == 403
+
+
+class TestStreamReportCsv:
+    """stream_report_csv のメモリ使用量のテスト."""
+
+    @staticmethod
+    async def _add_reports(db: AsyncSession, start: int, count: int) -> None:
+        await db.execute(
+            insert(DailyReport),
+            [
+                {
+                    "salesperson_id": 1,
+                    "report_date": BASE_DATE - timedelta(days=n),
+                    "status": ReportStatus.SUBMITTED,
+                    "problem": "課題" * 20,
+                }
+                for n in range(start, start + count)
+            ],
+        )
+        await db.commit()
+
+    @staticmethod
+    async def _peak_bytes(db: AsyncSession) -> tuple[int, int]:
+        """出力サイズと出力中の最大メモリ使用量を返す."""
+        tracemalloc.start()
+        try:
+            size = 0
+            async for chunk in stream_report_csv(
+                db, ReportListFilter(frozenset({1})), fetch_size=100
+            ):
+                size += len(chunk)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return size, peak
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_peak_memory_is_flat(self, db_session: AsyncSession) -> None:
+        """出力件数を5倍にしても最大メモリ使用量が増えないこと."""
+        await self._add_reports(db_session, 0, 1000)
+        small_size, small_peak = await self._peak_bytes(db_session)
+        await self._add_reports(db_session, 1000, 4000)
+        large_size, large_peak = await self._peak_bytes(db_session)
+
+        assert large_size > small_size * 4
+        assert large_peak < small_peak * 1.5
@@ -0,0 +1,264 @@
+"""日報一括インポートのテスト."""
+
+import json
+from collections.abc import AsyncIterator
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.models import Customer, DailyReport, ReportComment, VisitRecord
+from src.services.report_import import iter_lines, parse_csv
+from tests.conftest import auth_headers
+
+NDJSON_HEADERS = {"Content-Type": "application/x-ndjson"}
+
+
+async def _aiter[T](items: list[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item
+
+
+def _ndjson(*records: object) -> str:
+    return "\n".join(json.dumps(r, ensure_ascii=False) for r in records) + "\n"
+
+
+def _report(day: int, salesperson_id: int = 1, **fields: object) -> dict:
+    return {
+        "salesperson_id": salesperson_id,
+        "report_date": f"2025-04-{day:02d}",
+        "status": "confirmed",
+        "visits": [
+            {"customer_id": 1, "visit_content": "定期訪問", "visit_time": "10:00"},
+            {"customer_id": 1, "visit_content": "見積提出"},
+        ],
+        "comments": [{"commenter_id": 10, "comment_text": "確認しました"}],
+        **fields,
+    }
+
+
+@pytest.fixture
+async def customer(db_session: AsyncSession) -> Customer:
+    """インポート先の顧客を登録する."""
+    customer = Customer(customer_id=1, company_name="株式会社A")
+    db_session.add(customer)
+    await db_session.commit()
+    return customer
+
+
+class TestParsers:
+    """入力の解析のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_iter_lines_across_chunks(self) -> None:
+        """チャンク境界で分割された行・マルチバイト文字を復元すること."""
+        data = "\ufeff一行目\r\n二行目\n三行目".encode()
+        chunks = [data[i : i + 4] for i in range(0, len(data), 4)]
+
+        lines = [line async for line in iter_lines(_aiter(chunks))]
+
+        assert lines == ["一行目", "二行目", "三行目"]
+
+    @pytest.mark.asyncio
+    async def test_parse_csv_groups_rows(self) -> None:
+        """同じ担当者・日付の連続した行が1件の日報にまとめられること."""
+        lines = [
+            "salesperson_id,report_date,status,problem,plan,customer_id,"
+            "visit_content,visit_time",
+            '1,2025-04-01,submitted,"複数行の',
+            '課題",,1,訪問A,09:30',
+            "1,2025-04-01,submitted,,,2,訪問B,",
+            "1,2025-04-02,,,,,,",
+        ]
+
+        records = [r async for r in parse_csv(_aiter(lines))]
+
+        assert [line for line, _ in records] == [2, 5]
+        first = records[0][1]
+        assert isinstance(first, dict)
+        assert first["problem"] == "複数行の\n課題"
+        assert [v["visit_content"] for v in first["visits"]] == ["訪問A", "訪問B"]
+        assert records[1][1] == {
+            "salesperson_id": "1",
+            "report_date": "2025-04-02",
+            "problem": None,
+            "plan": None,
+            "visits": [],
+        }
+
+    @pytest.mark.asyncio
+    async def test_parse_csv_unescapes_formulas(self) -> None:
+        """エクスポートで数式の先頭に付けた ' が取り除かれること."""
+        lines = [
+            "salesperson_id,report_date,status,problem,plan,customer_id,"
+            "visit_content,visit_time",
+            "1,2025-04-01,,'=1+1,'いつも通り,1,'@SUM(A1),",
+        ]
+
+        records = [r async for r in parse_csv(_aiter(lines))]
+
+        record = records[0][1]
+        assert isinstance(record, dict)
+        assert record["problem"] == "=1+1"
+        assert record["plan"] == "'いつも通り"
+        assert record["visits"][0]["visit_content"] == "@SUM(A1)"
+
+    @pytest.mark.asyncio
+    async def test_parse_csv_missing_columns(self) -> None:
+        """必須の列が無い場合はエラーとなること."""
+        records = [r async for r in parse_csv(_aiter(["salesperson_id,report_date"]))]
+
+        assert records == [
+            (
+                1,
+                "CSVの列が不足しています: status, problem, plan, "
+                "customer_id, visit_content, visit_time",
+            )
+        ]
+
+
+class TestPostReportsImport:
+    """POST /reports/import のテスト."""
+
+    @pytest.mark.usefixtures("salespersons", "customer")
+    @pytest.mark.asyncio
+    async def test_imports_ndjson_in_batches(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """日報・訪問記録・コメントがバッチごとに登録されること."""
+        monkeypatch.setattr(settings, "import_batch_size", 2)
+        body = _ndjson(*(_report(day) for day in range(1, 6)))
+
+        response = await client.post(
+            "/api/v1/reports/import",
+            content=body,
+            headers={**NDJSON_HEADERS, **auth_headers(1)},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"] == {
+            "reports": 5,
+            "visits": 10,
+            "comments": 5,
+            "batches": 3,
+            "failed": 0,
+            "errors": [],
+        }
+        report = await db_session.scalar(
+            select(DailyReport).where(DailyReport.report_date == date(2025, 4, 1))
+        )
+        assert report is not None
+        visits = (
+            await db_session.scalars(
+                select(VisitRecord)
+                .where(VisitRecord.report_id == report.report_id)
+                .order_by(VisitRecord.display_order)
+            )
+        ).all()
+        assert [(v.visit_content, v.display_order) for v in visits] == [
+            ("定期訪問", 0),
+            ("見積提出", 1),
+        ]
+        assert (
+            await db_session.scalar(select(func.count()).select_from(ReportComment))
+            == 5
+        )
+
+    @pytest.mark.usefixtures("salespersons", "customer")
+    @pytest.mark.asyncio
+    async def test_reports_invalid_records(self, client: AsyncClient) -> None:
+        """不正なレコードは行番号付きで報告され、他のレコードは登録されること."""
+        body = "\n".join(
+            [
+                json.dumps(_report(1)),
+                "{not json",
+                json.dumps(
+                    _report(2, visits=[{"customer_id": 99, "visit_content": "x"}])
+                ),
+                json.dumps(_report(3, salesperson_id=10)),
+                json.dumps(_report(1)),
+                json.dumps({"salesperson_id": 1}),
+                json.dumps(
+                    _report(4, comments=[{"commenter_id": 5, "comment_text": "x"}])
+                ),
+            ]
+        )
+
+        response = await client.post(
+            "/api/v1/reports/import",
+            content=body,
+            headers={**NDJSON_HEADERS, **auth_headers(1)},
+        )
+
+        data = response.json()["data"]
+        assert data["reports"] == 1
+        assert data["failed"] == 6
+        errors = {e["line"]: e["message"] for e in data["errors"]}
+        assert errors[2].startswith("JSONの形式が不正です")
+        assert errors[3] == "顧客が存在しません: 99"
+        assert errors[4] == "この担当者の日報を登録する権限がありません"
+        assert errors[5] == "同じ担当者・日付の日報が既に存在します"
+        assert errors[6].startswith("report_date:")
+        assert errors[7] == "コメント者が存在しません: 5"
+
+    @pytest.mark.usefixtures("salespersons", "customer")
+    @pytest.mark.asyncio
+    async def test_imports_csv(
+        self, client: AsyncClient, db_session: AsyncSession
+    ) -> None:
+        """CSVの日報が訪問記録ごと登録されること."""
+        body = (
+            "salesperson_id,report_date,status,problem,plan,customer_id,"
+            "visit_content,visit_time\n"
+            "1,2025-04-01,submitted,課題,,1,訪問A,09:30\n"
+            "1,2025-04-01,submitted,課題,,1,訪問B,\n"
+        )
+
+        response = await client.post(
+            "/api/v1/reports/import",
+            content=body.encode(),
+            headers={"Content-Type": "text/csv; charset=utf-8", **auth_headers(10)},
+        )
+
+        assert response.json()["data"]["reports"] == 1
+        assert response.json()["data"]["visits"] == 2
+        report = await db_session.scalar(select(DailyReport))
+        assert report is not None
+        assert report.problem == "課題"
+
+    @pytest.mark.usefixtures("salespersons", "customer")
+    @pytest.mark.asyncio
+    async def test_invalidates_dashboard(self, client: AsyncClient) -> None:
+        """インポート後のダッシュボードに登録した日報が反映されること."""
+        headers = auth_headers(1)
+        before = await client.get("/api/v1/dashboard", headers=headers)
+        assert before.json()["data"]["today_report"]["exists"] is False
+
+        today = date.today().isoformat()
+        await client.post(
+            "/api/v1/reports/import",
+            content=_ndjson({"salesperson_id": 1, "report_date": today}),
+            headers={**NDJSON_HEADERS, **headers},
+        )
+
+        after = await client.get("/api/v1/dashboard", headers=headers)
+        assert after.json()["data"]["today_report"]["exists"] is True
+
+    @pytest.mark.usefixtures("salespersons")
+    @pytest.mark.asyncio
+    async def test_unsupported_content_type(self, client: AsyncClient) -> None:
+        """未対応のContent-Typeは400となること."""
+        response = await client.post(
+            "/api/v1/reports/import",
+            content="{}",
+            headers={"Content-Type": "application/json", **auth_headers(1)},
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"]["code"] == "BAD_REQUEST"
@@ -0,0 +1,1153 @@
+"""日報APIのテスト."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.models import (
+    Base,
+    Customer,
+    DailyReport,
+    OutboxEvent,
+    ReportComment,
+    ReportStatus,
+    Salesperson,
+    VisitRecord,
+)
+from src.services.autosave import autosave_buffer
+from tests.conftest import MaxQueries, auth_headers
+
+BASE_DATE = date(2026, 1, 10)
+
+
+@pytest.fixture
+async def reports(
+    db_session: AsyncSession, salespersons: dict[str, Salesperson]
+) -> list[DailyReport]:
+    """部下(1)の日報5件と上長(10)の日報1件を登録する.
+
+    部下の日報には日付が新しいものから順に i 件の訪問記録を登録し、
+    最新の日報には上長のコメントを2件登録する。
+    """
+    customer = Customer(customer_id=1, company_name="株式会社A")
+    db_session.add(customer)
+    member_id = salespersons["member"].salesperson_id
+    manager_id = salespersons["manager"].salesperson_id
+
+    created: list[DailyReport] = []
+    for i in range(5):
+        report = DailyReport(
+            salesperson_id=member_id,
+            report_date=BASE_DATE - timedelta(days=i),
+            status=ReportStatus.SUBMITTED if i % 2 == 0 else ReportStatus.DRAFT,
+            visit_records=[
+                VisitRecord(customer_id=1, visit_content=f"訪問{n}", display_order=n)
+                for n in range(i)
+            ],
+        )
+        created.append(report)
+    created[0].comments = [
+        ReportComment(commenter_id=manager_id, comment_text="確認しました"),
+        ReportComment(commenter_id=manager_id, comment_text="明日相談しましょう"),
+    ]
+    created.append(
+        DailyReport(
+            salesperson_id=manager_id,
+            report_date=BASE_DATE,
+            status=ReportStatus.SUBMITTED,
+        )
+    )
+    db_session.add_all(created)
+    await db_session.commit()
+    return created
+
+
+class TestGetReports:
+    """GET /reports のテスト."""
+
+    @pytest.mark.usefixtures("reports")
+    @pytest.mark.asyncio
+    async def test_member_sees_own_reports(self, client: AsyncClient) -> None:
+        """一般営業は自分の日報のみ取得できること."""
+        response = await client.get("/api/v1/reports", headers=auth_headers(1))
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert [item["salesperson_id"] for item in data["items"]] == [1] * 5
+        assert data["pagination"] == {
+            "current_page": 1,
+            "per_page": 20,
+            "total_count": 5,
+            "total_pages": 1,
+        }
+
+        latest = data["items"][0]
+        assert latest["report_date"] == "2026-01-10"
+        assert latest["salesperson_name"] == "山田太郎"
+        assert latest["status"] == "submitted"
+        assert latest["status_label"] == "提出済"
+        assert latest["visit_count"] == 0
+        assert latest["comment_count"] == 2
+        assert latest["has_unread_comments"] is True
+        assert [item["visit_count"] for item in data["items"]] == [0, 1, 2, 3, 4]
+
+    @pytest.mark.usefixtures("reports")
+    @pytest.mark.asyncio
+    async def test_manager_sees_subordinate_reports(self, client: AsyncClient) -> None:
+        """上長は自分と部下の日報を取得できること."""
+        response = await client.get("/api/v1/reports", headers=auth_headers(10))
+
+        data = response.json()["data"]
+        assert data["pagination"]["total_count"] == 6
+        assert {item["salesperson_id"] for item in data["items"]} == {1, 10}
+        # 自分のコメントは未読扱いにならない
+        assert not any(item["has_unread_comments"] for item in data["items"])
+
+    @pytest.mark.usefixtures("reports")
+    @pytest.mark.asyncio
+    async def test_filters_and_pagination(self, client: AsyncClient) -> None:
+        """検索条件とページネーションが適用されること."""
+        response = await client.get(
+            "/api/v1/reports",
+            params={
+                "salesperson_id": 1,
+                "status": "submitted",
+                "date_from": "2026-01-07",
+                "per_page": 1,
+                "page": 2,
+            },
+            headers=auth_headers(10),
+        )
+
+        data = response.json()["data"]
+        assert [item["report_date"] for item in data["items"]] == ["2026-01-08"]
+        assert data["pagination"]["total_count"] == 2
+        assert data["pagination"]["total_pages"] == 2
+
+    @pytest.mark.usefixtures("reports")
+    @pytest.mark.asyncio
+    async def test_page_beyond_last(self, client: AsyncClient) -> None:
+        """最終ページより後ろでも総件数が返されること."""
+        response = await client.get(
+            "/api/v1/reports", params={"page": 5}, headers=auth_headers(1)
+        )
+
+        data = response.json()["data"]
+        assert data["items"] == []
+        assert data["pagination"]["total_count"] == 5
+
+    @pytest.mark.usefixtures("reports")
+    @pytest.mark.asyncio
+    async def test_member_cannot_view_manager(self, client: AsyncClient) -> None:
+        """部下以外の担当者を指定すると403となること."""
+        response = await client.get(
+            "/api/v1/reports", params={"salesperson_id": 10}, headers=auth_headers(1)
+        )
+
+        assert response.status_code == 403
+        assert response.json()["detail"]["code"] == "FORBIDDEN"
+
+    @pytest.mark.usefixtures("reports")
+    @pytest.mark.asyncio
+    async def test_single_query_per_page(
+        self, client: AsyncClient, executed_statements: list[str]
+    ) -> None:
+        """認証情報がキャッシュ済みなら1ページ1クエリで取得されること."""
+        headers = auth_headers(10)
+        await client.get("/api/v1/reports", headers=headers)
+
+        for per_page in (1, 3, 100):
+            executed_statements.clear()
+            response = await client.get(
+                "/api/v1/reports", params={"per_page": per_page}, headers=headers
+            )
+            assert response.status_code == 200
+            assert len(executed_statements) == 1
+
+
+class TestGetReportsCursor:
+    """GET /reports のカーソル方式のテスト."""
+
+    @pytest.mark.usefixtures("reports")
+    @pytest.mark.asyncio
+    async def test_walks_all_pages_in_order(self, client: AsyncClient) -> None:
+        """next_cursor を辿るとページ番号方式と同じ順序で全件取得できること."""
+        headers = auth_headers(10)
+        expected = await client.get(
+            "/api/v1/reports", params={"per_page": 100}, headers=headers
+        )
+        expected_ids = [item["report_id"] for item in expected.json()["data"]["items"]]
+
+        walked_ids: list[int] = []
+        cursor = ""
+        while True:
+            response = await client.get(
+                "/api/v1/reports",
+                params={"cursor": cursor, "per_page": 4},
+                headers=headers,
+            )
+            assert response.status_code == 200
+            data = response.json()["data"]
+            walked_ids.extend(item["report_id"] for item in data["items"])
+            assert data["pagination"]["total_count"] is None
+            if not data["pagination"]["has_next"]:
+                assert data["pagination"]["next_cursor"] is None
+                break
+            cursor = data["pagination"]["next_cursor"]
+
+        assert walked_ids == expected_ids
+        assert len(walked_ids) == 6
+
+    @pytest.mark.usefixtures("reports")
+    @pytest.mark.asyncio
+    async def test_same_report_date_is_not_skipped(self, client: AsyncClient) -> None:
+        """同じ日付の日報がページ境界をまたいでも欠落しないこと."""
+        headers = auth_headers(10)
+        first = await client.get(
+            "/api/v1/reports", params={"cursor": "", "per_page": 1}, headers=headers
+        )
+        second = await client.get(
+            "/api/v1/reports",
+            params={
+                "cursor": first.json()["data"]["pagination"]["next_cursor"],
+                "per_page": 1,
+            },
+            headers=headers,
+        )
+
+        dates = [
+            first.json()["data"]["items"][0]["report_date"],
+            second.json()["data"]["items"][0]["report_date"],
+        ]
+        assert dates == ["2026-01-10", "2026-01-10"]
+
+    @pytest.mark.usefixtures("reports")
+    @pytest.mark.asyncio
+    async def test_with_total(self, client: AsyncClient) -> None:
+        """with_total を指定すると検索条件に一致する総件数が返されること."""
+        response = await client.get(
+            "/api/v1/reports",
+            params={"cursor": "", "with_total": True, "status": "submitted"},
+            headers=auth_headers(10),
+        )
+
+        pagination = response.json()["data"]["pagination"]
+        assert pagination["total_count"] == 4
+        assert pagination["has_next"] is False
+
+    @pytest.mark.usefixtures("reports")
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, client: AsyncClient) -> None:
+        """不正なカーソルは400となること."""
+        response = await client.get(
+            "/api/v1/reports",
+            params={"cursor": "not-a-cursor"},
+            headers=auth_headers(1),
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"]["code"] == "BAD_REQUEST"
+
+    @pytest.mark.usefixtures("reports")
+    @pytest.mark.asyncio
+    async def test_single_query_without_count(
+        self, client: AsyncClient, executed_statements: list[str]
+    ) -> None:
+        """カーソル方式は1ページ1クエリで、総件数のCOUNTを含まないこと."""
+        headers = auth_headers(10)
+        first = await client.get(
+            "/api/v1/reports", params={"cursor": "", "per_page": 2}, headers=headers
+        )
+
+        executed_statements.clear()
+        response = await client.get(
+            "/api/v1/reports",
+            params={
+                "cursor": first.json()["data"]["pagination"]["next_cursor"],
+                "per_page": 2,
+            },
+            headers=headers,
+        )
+
+        assert response.status_code == 200
+        assert len(executed_statements) == 1
+        # 訪問件数・コメント件数のみで、総件数のCOUNTは含まない
+        assert executed_statements[0].count("count(") == 2
+
+
+class TestGetReport:
+    """GET /reports/{report_id} のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_returns_visits_and_comments(
+        self,
+        client: AsyncClient,
+        reports: list[DailyReport],
+        max_queries: MaxQueries,
+    ) -> None:
+        """訪問記録を表示順に、コメントを投稿順に含めて返すこと."""
+        report = reports[2]
+
+        # 認証・階層・版数の確認と、日報・訪問記録・コメントの取得
+        with max_queries(6):
+            response = await client.get(
+                f"/api/v1/reports/{report.report_id}", headers=auth_headers(1)
+            )
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["salesperson_name"] == "山田太郎"
+        assert data["status_label"] == "提出済"
+        assert [
+            (v["visit_content"], v["customer_name"]) for v in data["visit_records"]
+        ] == [
+            ("訪問0", "株式会社A"),
+            ("訪問1", "株式会社A"),
+        ]
+        assert data["comments"] == []
+        assert (data["can_edit"], data["can_confirm"]) == (False, False)
+
+    @pytest.mark.asyncio
+    async def test_actions_depend_on_viewer(
+        self, client: AsyncClient, reports: list[DailyReport]
+    ) -> None:
+        """下書きは本人のみ編集でき、提出済は上長のみ確認できること."""
+        draft_id = reports[1].report_id
+        submitted_id = reports[0].report_id
+
+        own_draft = await client.get(
+            f"/api/v1/reports/{draft_id}", headers=auth_headers(1)
+        )
+        manager_view = await client.get(
+            f"/api/v1/reports/{submitted_id}", headers=auth_headers(10)
+        )
+
+        assert own_draft.json()["data"]["can_edit"] is True
+        assert manager_view.json()["data"]["can_confirm"] is True
+        assert manager_view.json()["data"]["can_edit"] is False
+        assert [
+            c["commenter_name"] for c in manager_view.json()["data"]["comments"]
+        ] == [
+            "佐藤課長",
+            "佐藤課長",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_not_found_and_forbidden(
+        self, client: AsyncClient, reports: list[DailyReport]
+    ) -> None:
+        """存在しない日報は404、閲覧権限のない日報は403となること."""
+        not_found = await client.get("/api/v1/reports/9999", headers=auth_headers(1))
+        forbidden = await client.get(
+            f"/api/v1/reports/{reports[-1].report_id}", headers=auth_headers(1)
+        )
+
+        assert not_found.status_code == 404
+        assert forbidden.status_code == 403
+
+
+class TestGetReportComments:
+    """GET /reports/{report_id}/comments・PUT /comments/read と未読管理のテスト."""
+
+    @staticmethod
+    async def _has_unread(client: AsyncClient, viewer_id: int, report_id: int) -> bool:
+        response = await client.get("/api/v1/reports", headers=auth_headers(viewer_id))
+        items = response.json()["data"]["items"]
+        return next(i for i in items if i["report_id"] == report_id)[
+            "has_unread_comments"
+        ]
+
+    @staticmethod
+    async def _read_all(client: AsyncClient, viewer_id: int, report_id: int) -> None:
+        """コメント一覧を取得し、表示した最後のコメントまで既読にする."""
+        url = f"/api/v1/reports/{report_id}/comments"
+        comments = (await client.get(url, headers=auth_headers(viewer_id))).json()
+        last_id = max((c["comment_id"] for c in comments["data"]["items"]), default=0)
+        response = await client.put(
+            f"{url}/read",
+            json={"last_comment_id": last_id},
+            headers=auth_headers(viewer_id),
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_lists_comments_without_marking_read(
+        self,
+        client: AsyncClient,
+        reports: list[DailyReport],
+        executed_statements: list[str],
+    ) -> None:
+        """コメントが投稿順に返され、一覧の取得では既読を記録しないこと."""
+        report_id = reports[0].report_id
+
+        response = await client.get(
+            f"/api/v1/reports/{report_id}/comments", headers=auth_headers(1)
+        )
+
+        assert response.status_code == 200
+        comments = response.json()["data"]["items"]
+        assert [c["comment_text"] for c in comments] == [
+            "確認しました",
+            "明日相談しましょう",
+        ]
+        assert comments[0]["commenter_id"] == 10
+        assert comments[0]["commenter_name"] == "佐藤課長"
+        assert not any(
+            sql.lstrip().startswith(("INSERT", "UPDATE")) for sql in executed_statements
+        )
+        assert await self._has_unread(client, 1, report_id) is True
+
+    @pytest.mark.asyncio
+    async def test_marks_read_up_to_displayed_comment(
+        self, client: AsyncClient, reports: list[DailyReport]
+    ) -> None:
+        """表示したコメントまでを既読にし、既読位置は戻らず最後のコメントを超えないこと."""
+        report_id = reports[0].report_id
+        url = f"/api/v1/reports/{report_id}/comments"
+        comments = (await client.get(url, headers=auth_headers(1))).json()
+        first_id, last_id = (c["comment_id"] for c in comments["data"]["items"])
+
+        async def mark(last_comment_id: int) -> dict:
+            response = await client.put(
+                f"{url}/read",
+                json={"last_comment_id": last_comment_id},
+                headers=auth_headers(1),
+            )
+            assert response.status_code == 200
+            return response.json()["data"]
+
+        assert await mark(first_id) == {
+            "report_id": report_id,
+            "last_read_comment_id": first_id,
+            "unread_count": 1,
+        }
+        assert await self._has_unread(client, 1, report_id) is True
+        assert (await mark(9999))["last_read_comment_id"] == last_id
+        assert await mark(first_id) == {
+            "report_id": report_id,
+            "last_read_comment_id": last_id,
+            "unread_count": 0,
+        }
+        assert await self._has_unread(client, 1, report_id) is False
+
+    @pytest.mark.asyncio
+    async def test_new_and_deleted_comments(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        reports: list[DailyReport],
+    ) -> None:
+        """既読後のコメントは未読となり、削除されると未読でなくなること."""
+        report_id = reports[0].report_id
+        await self._read_all(client, 1, report_id)
+
+        comment = ReportComment(
+            report_id=report_id, commenter_id=10, comment_text="追記です"
+        )
+        db_session.add(comment)
+        await db_session.commit()
+        assert await self._has_unread(client, 1, report_id) is True
+
+        await db_session.delete(comment)
+        await db_session.commit()
+        assert await self._has_unread(client, 1, report_id) is False
+
+    @pytest.mark.asyncio
+    async def test_subordinate_comment_is_unread_for_manager(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        reports: list[DailyReport],
+    ) -> None:
+        """部下のコメントは上長の未読となり、投稿者本人の未読にはならないこと."""
+        report_id = reports[1].report_id
+        db_session.add(
+            ReportComment(report_id=report_id, commenter_id=1, comment_text="報告")
+        )
+        await db_session.commit()
+
+        assert await self._has_unread(client, 10, report_id) is True
+        assert await self._has_unread(client, 1, report_id) is False
+
+        await self._read_all(client, 10, report_id)
+        assert await self._has_unread(client, 10, report_id) is False
+
+    @pytest.mark.asyncio
+    async def test_not_found_and_forbidden(
+        self, client: AsyncClient, reports: list[DailyReport]
+    ) -> None:
+        """存在しない日報は404、閲覧権限のない日報は403となること."""
+        for method, suffix, json in (
+            ("GET", "", None),
+            ("PUT", "/read", {"last_comment_id": 1}),
+        ):
+            not_found = await client.request(
+                method,
+                f"/api/v1/reports/9999/comments{suffix}",
+                json=json,
+                headers=auth_headers(1),
+            )
+            forbidden = await client.request(
+                method,
+                f"/api/v1/reports/{reports[-1].report_id}/comments{suffix}",
+                json=json,
+                headers=auth_headers(1),
+            )
+
+            assert not_found.status_code == 404
+            assert not_found.json()["detail"]["code"] == "NOT_FOUND"
+            assert forbidden.status_code == 403
+            assert forbidden.json()["detail"]["code"] == "FORBIDDEN"
+
+
+async def _outbox_events(db_session: AsyncSession) -> list[tuple[str, dict]]:
+    """登録された通知イベントの種別と内容を返す."""
+    result = await db_session.execute(
+        select(OutboxEvent.event_type, OutboxEvent.payload).order_by(
+            OutboxEvent.event_id
+        )
+    )
+    return [(row[0], row[1]) for row in result.all()]
+
+
+class TestUpdateReport:
+    """PUT /reports/{report_id} のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_updates_report_and_visits(
+        self, client: AsyncClient, reports: list[DailyReport]
+    ) -> None:
+        """日報と訪問記録が更新され、版数が1つ上がること."""
+        report_id = reports[1].report_id
+
+        response = await client.put(
+            f"/api/v1/reports/{report_id}",
+            json={
+                "report_date": reports[1].report_date.isoformat(),
+                "problem": "価格交渉",
+                "plan": "再訪問",
+                "status": "draft",
+                "visit_records": [
+                    {"customer_id": 1, "visit_time": "10:00", "visit_content": "提案"},
+                    {"customer_id": 1, "visit_content": "見積提出"},
+                ],
+                "version": 1,
+            },
+            headers=auth_headers(1),
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"]["version"] == 2
+        detail = (
+            await client.get(f"/api/v1/reports/{report_id}", headers=auth_headers(1))
+        ).json()["data"]
+        assert (detail["problem"], detail["plan"], detail["version"]) == (
+            "価格交渉",
+            "再訪問",
+            2,
+        )
+        assert [
+            (v["visit_time"], v["visit_content"], v["display_order"])
+            for v in detail["visit_records"]
+        ] == [("10:00", "提案", 1), (None, "見積提出", 2)]
+
+    @pytest.mark.asyncio
+    async def test_stale_version_conflicts(
+        self, client: AsyncClient, reports: list[DailyReport]
+    ) -> None:
+        """取得後に他の端末で更新された日報への更新は409となり、上書きしないこと."""
+        report_id = reports[1].report_id
+        body = {"report_date": reports[1].report_date.isoformat(), "version": 1}
+
+        first = await client.put(
+            f"/api/v1/reports/{report_id}",
+            json={**body, "problem": "スマートフォンから"},
+            headers=auth_headers(1),
+        )
+        second = await client.put(
+            f"/api/v1/reports/{report_id}",
+            json={**body, "problem": "PCから"},
+            headers=auth_headers(1),
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 409
+        assert second.json()["detail"]["code"] == "CONFLICT"
+        detail = (
+            await client.get(f"/api/v1/reports/{report_id}", headers=auth_headers(1))
+        ).json()["data"]
+        assert detail["problem"] == "スマートフォンから"
+
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_update(
+        self, client: AsyncClient, reports: list[DailyReport]
+    ) -> None:
+        """本人の下書き以外・存在しない顧客・既存の日付への更新は拒否されること."""
+        draft = reports[1]
+        body = {"report_date": draft.report_date.isoformat(), "version": 1}
+
+        for report_id, viewer_id, override, expected in (
+            (9999, 1, {}, 404),
+            (draft.report_id, 10, {}, 403),
+            (reports[0].report_id, 1, {}, 403),
+            (
+                draft.report_id,
+                1,
+                {"visit_records": [{"customer_id": 999, "visit_content": "訪問"}]},
+                422,
+            ),
+            (draft.report_id, 1, {"status": "submitted"}, 422),
+            (
+                draft.report_id,
+                1,
+                {
+                    "visit_records": [
+                        {"visit_id": 9999, "customer_id": 1, "visit_content": "訪問"}
+                    ]
+                },
+                422,
+            ),
+            (
+                draft.report_id,
+                1,
+                {"report_date": reports[0].report_date.isoformat()},
+                409,
+            ),
+        ):
+            response = await client.put(
+                f"/api/v1/reports/{report_id}",
+                json={**body, **override},
+                headers=auth_headers(viewer_id),
+            )
+            assert response.status_code == expected
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("reports")
+    async def test_one_field_edit_writes_one_visit(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        executed_statements: list[str],
+    ) -> None:
+        """20件の訪問記録のうち1件の1項目の変更は、その1行のみ更新すること."""
+        report = DailyReport(
+            salesperson_id=1,
+            report_date=date(2026, 2, 1),
+            visit_records=[
+                VisitRecord(customer_id=1, visit_content=f"訪問{n}", display_order=n)
+                for n in range(1, 21)
+            ],
+        )
+        db_session.add(report)
+        await db_session.commit()
+        detail = (
+            await client.get(
+                f"/api/v1/reports/{report.report_id}", headers=auth_headers(1)
+            )
+        ).json()["data"]
+        visits = [
+            {key: v[key] for key in ("visit_id", "customer_id", "visit_content")}
+            | {"display_order": v["display_order"]}
+            for v in detail["visit_records"]
+        ]
+        visits[4]["visit_content"] = "訪問内容を修正"
+
+        executed_statements.clear()
+        response = await client.put(
+            f"/api/v1/reports/{report.report_id}",
+            json={
+                "report_date": "2026-02-01",
+                "visit_records": visits,
+                "version": detail["version"],
+            },
+            headers=auth_headers(1),
+        )
+
+        assert response.status_code == 200
+        # 日報・訪問記録の読み込み各1回と、日報（版数）・変更した1行の更新のみ
+        writes = [
+            " ".join(statement.split()[:2])
+            for statement in executed_statements
+            if not statement.startswith("SELECT")
+        ]
+        assert writes == ['UPDATE "DAILY_REPORT"', 'UPDATE "VISIT_RECORD"']
+        assert len(executed_statements) == 4
+        after = (
+            await client.get(
+                f"/api/v1/reports/{report.report_id}", headers=auth_headers(1)
+            )
+        ).json()["data"]
+        assert [v["visit_id"] for v in after["visit_records"]] == [
+            v["visit_id"] for v in visits
+        ]
+        assert after["visit_records"][4]["visit_content"] == "訪問内容を修正"
+
+    @pytest.mark.asyncio
+    async def test_diff_inserts_updates_and_deletes(
+        self,
+        client: AsyncClient,
+        reports: list[DailyReport],
+        executed_statements: list[str],
+    ) -> None:
+        """訪問記録の追加・変更・削除が、種類ごとに1回の文で書き込まれること."""
+        report = reports[3]
+        [first, second, third] = (
+            await client.get(
+                f"/api/v1/reports/{report.report_id}", headers=auth_headers(1)
+            )
+        ).json()["data"]["visit_records"]
+
+        executed_statements.clear()
+        response = await client.put(
+            f"/api/v1/reports/{report.report_id}",
+            json={
+                "report_date": report.report_date.isoformat(),
+                "visit_records": [
+                    {
+                        "visit_id": third["visit_id"],
+                        "customer_id": 1,
+                        "visit_content": "訪問2",
+                        "display_order": 0,
+                    },
+                    # visit_id 無しでも同じ表示順の訪問記録に対応付ける
+                    {"customer_id": 1, "visit_content": "修正", "display_order": 1},
+                    {"customer_id": 1, "visit_content": "追加1", "display_order": 5},
+                    {"customer_id": 1, "visit_content": "追加2", "display_order": 6},
+                ],
+                "version": 1,
+            },
+            headers=auth_headers(1),
+        )
+
+        assert response.status_code == 200
+        writes = [
+            " ".join(statement.split()[:3])
+            for statement in executed_statements
+            if not statement.startswith("SELECT")
+        ]
+        assert writes == [
+            'UPDATE "DAILY_REPORT" SET',
+            'DELETE FROM "VISIT_RECORD"',
+            'UPDATE "VISIT_RECORD" SET',
+            'INSERT INTO "VISIT_RECORD"',
+        ]
+        after = (
+            await client.get(
+                f"/api/v1/reports/{report.report_id}", headers=auth_headers(1)
+            )
+        ).json()["data"]["visit_records"]
+        assert [(v["visit_id"], v["visit_content"]) for v in after[:2]] == [
+            (third["visit_id"], "訪問2"),
+            (second["visit_id"], "修正"),
+        ]
+        assert first["visit_id"] not in {v["visit_id"] for v in after}
+        assert [v["visit_content"] for v in after[2:]] == ["追加1", "追加2"]
+
+    @pytest.mark.asyncio
+    async def test_submit_with_update(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        reports: list[DailyReport],
+    ) -> None:
+        """ステータスに提出済を指定すると、更新と同時に提出され通知が登録されること."""
+        report_id = reports[1].report_id
+
+        response = await client.put(
+            f"/api/v1/reports/{report_id}",
+            json={
+                "report_date": reports[1].report_date.isoformat(),
+                "status": "submitted",
+                "visit_records": [{"customer_id": 1, "visit_content": "提案"}],
+                "version": 1,
+            },
+            headers=auth_headers(1),
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"]["status"] == "submitted"
+        assert [event[0] for event in await _outbox_events(db_session)] == [
+            "report.submitted"
+        ]
+
+
+class TestAutosaveReport:
+    """PATCH /reports/{report_id} のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_until_submit(
+        self,
+        client: AsyncClient,
+        reports: list[DailyReport],
+        executed_statements: list[str],
+    ) -> None:
+        """自動保存は受付のみで書き込まず、提出の前にまとめて書き込まれること."""
+        report_id = reports[1].report_id
+        url = f"/api/v1/reports/{report_id}"
+
+        first = await client.patch(
+            url, json={"problem": "価格", "version": 1}, headers=auth_headers(1)
+        )
+        executed_statements.clear()
+        second = await client.patch(
+            url,
+            json={"problem": "価格交渉", "plan": "再訪問", "version": 2},
+            headers=auth_headers(1),
+        )
+
+        assert (first.status_code, second.status_code) == (202, 202)
+        assert second.json()["data"]["version"] == 2
+        # 書き込み待ちの内容がある日報はステータスと版数のみを参照する
+        assert len(executed_statements) == 1
+        assert executed_statements[0].lstrip().startswith("SELECT")
+        unsaved = (await client.get(url, headers=auth_headers(1))).json()["data"]
+        assert (unsaved["problem"], unsaved["version"]) == (None, 1)
+
+        submitted = await client.put(
+            f"{url}/submit", json={"version": 2}, headers=auth_headers(1)
+        )
+
+        assert submitted.status_code == 200
+        detail = (await client.get(url, headers=auth_headers(1))).json()["data"]
+        assert (detail["problem"], detail["plan"], detail["status"]) == (
+            "価格交渉",
+            "再訪問",
+            "submitted",
+        )
+        assert detail["version"] == 3
+
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_autosave(
+        self, client: AsyncClient, reports: list[DailyReport]
+    ) -> None:
+        """本人の下書き以外・版数の不一致の自動保存は拒否されること."""
+        for report_id, viewer_id, version, expected in (
+            (9999, 1, 1, 404),
+            (reports[1].report_id, 10, 1, 403),
+            (reports[0].report_id, 1, 1, 403),
+            (reports[1].report_id, 1, 5, 409),
+        ):
+            response = await client.patch(
+                f"/api/v1/reports/{report_id}",
+                json={"problem": "価格交渉", "version": version},
+                headers=auth_headers(viewer_id),
+            )
+            assert response.status_code == expected
+
+    @pytest.mark.asyncio
+    async def test_discards_when_changed_elsewhere(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        reports: list[DailyReport],
+    ) -> None:
+        """他のインスタンスで提出された日報の自動保存は、受付済みの内容を破棄して409となること."""
+        report_id = reports[1].report_id
+        url = f"/api/v1/reports/{report_id}"
+        accepted = await client.patch(
+            url, json={"problem": "価格", "version": 1}, headers=auth_headers(1)
+        )
+        assert accepted.status_code == 202
+        # 別インスタンスでの提出（このプロセスの保持中の内容は書き込まれない）
+        await db_session.execute(
+            update(DailyReport)
+            .where(DailyReport.report_id == report_id)
+            .values(status=ReportStatus.SUBMITTED, version=DailyReport.version + 1)
+        )
+        await db_session.commit()
+
+        response = await client.patch(
+            url, json={"plan": "再訪問", "version": 2}, headers=auth_headers(1)
+        )
+
+        assert response.status_code == 409
+        assert response.json()["detail"]["code"] == "CONFLICT"
+        assert autosave_buffer.get(report_id) is None
+
+    @pytest.mark.asyncio
+    async def test_rejects_null_visit_records(
+        self, client: AsyncClient, reports: list[DailyReport]
+    ) -> None:
+        """visit_records の null は422となり、受付済みの自動保存は失われないこと."""
+        report_id = reports[1].report_id
+        url = f"/api/v1/reports/{report_id}"
+        await client.patch(
+            url, json={"problem": "価格交渉", "version": 1}, headers=auth_headers(1)
+        )
+
+        response = await client.patch(
+            url,
+            json={"plan": "再訪問", "visit_records": None, "version": 2},
+            headers=auth_headers(1),
+        )
+
+        assert response.status_code == 422
+        submitted = await client.put(
+            f"{url}/submit", json={"version": 2}, headers=auth_headers(1)
+        )
+        assert submitted.status_code == 200
+        detail = (await client.get(url, headers=auth_headers(1))).json()["data"]
+        assert (detail["problem"], detail["plan"]) == ("価格交渉", None)
+
+
+class TestSubmitReport:
+    """PUT /reports/{report_id}/submit のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_submit_enqueues_notification(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        reports: list[DailyReport],
+    ) -> None:
+        """提出済となり、上長への通知が同じトランザクションで登録されること."""
+        report_id = reports[1].report_id
+
+        response = await client.put(
+            f"/api/v1/reports/{report_id}/submit", headers=auth_headers(1)
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"]["status"] == "submitted"
+        assert await _outbox_events(db_session) == [
+            (
+                "report.submitted",
+                {
+                    "report_id": report_id,
+                    "salesperson_id": 1,
+                    "report_date": reports[1].report_date.isoformat(),
+                    "recipient_ids": [10],
+                },
+            )
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_submission(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        reports: list[DailyReport],
+    ) -> None:
+        """本人以外・提出済・訪問記録なしの提出は拒否され、通知も登録されないこと."""
+        empty = DailyReport(salesperson_id=1, report_date=date(2026, 2, 1))
+        db_session.add(empty)
+        await db_session.commit()
+
+        for report_id, viewer_id, expected in (
+            (reports[1].report_id, 10, 403),
+            (reports[0].report_id, 1, 422),
+            (empty.report_id, 1, 422),
+        ):
+            response = await client.put(
+                f"/api/v1/reports/{report_id}/submit", headers=auth_headers(viewer_id)
+            )
+            assert response.status_code == expected
+
+        assert await _outbox_events(db_session) == []
+
+    @pytest.mark.asyncio
+    async def test_stale_version_conflicts(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        reports: list[DailyReport],
+    ) -> None:
+        """版数を指定した場合、取得後に更新された日報の提出は409となること."""
+        report_id = reports[1].report_id
+        await client.put(
+            f"/api/v1/reports/{report_id}",
+            json={
+                "report_date": reports[1].report_date.isoformat(),
+                "visit_records": [{"customer_id": 1, "visit_content": "提案"}],
+                "version": 1,
+            },
+            headers=auth_headers(1),
+        )
+
+        response = await client.put(
+            f"/api/v1/reports/{report_id}/submit",
+            json={"version": 1},
+            headers=auth_headers(1),
+        )
+
+        assert response.status_code == 409
+        assert await _outbox_events(db_session) == []
+
+
+class TestConfirmReport:
+    """PUT /reports/{report_id}/confirm のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_manager_confirms(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        reports: list[DailyReport],
+    ) -> None:
+        """上長は部下の提出済の日報を確認でき、作成者への通知が登録されること."""
+        report_id = reports[2].report_id
+
+        response = await client.put(
+            f"/api/v1/reports/{report_id}/confirm", headers=auth_headers(10)
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"]["status"] == "confirmed"
+        [(event_type, payload)] = await _outbox_events(db_session)
+        assert event_type == "report.confirmed"
+        assert payload["confirmed_by"] == 10
+        assert payload["recipient_ids"] == [1]
+
+    @pytest.mark.asyncio
+    async def test_rejects_non_manager_and_draft(
+        self, client: AsyncClient, reports: list[DailyReport]
+    ) -> None:
+        """本人による確認と下書きの確認は拒否されること."""
+        own = await client.put(
+            f"/api/v1/reports/{reports[2].report_id}/confirm", headers=auth_headers(1)
+        )
+        draft = await client.put(
+            f"/api/v1/reports/{reports[1].report_id}/confirm", headers=auth_headers(10)
+        )
+
+        assert own.status_code == 403
+        assert draft.status_code == 422
+
+
+class TestPostReportComment:
+    """POST /reports/{report_id}/comments のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_post_enqueues_notification(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        reports: list[DailyReport],
+    ) -> None:
+        """コメントが登録され、投稿者以外の閲覧者への通知が登録されること."""
+        report_id = reports[1].report_id
+
+        response = await client.post(
+            f"/api/v1/reports/{report_id}/comments",
+            json={"comment_text": "進捗を教えてください"},
+            headers=auth_headers(10),
+        )
+
+        assert response.status_code == 201
+        comment_id = response.json()["data"]["comment_id"]
+        assert await _outbox_events(db_session) == [
+            (
+                "comment.posted",
+                {
+                    "report_id": report_id,
+                    "comment_id": comment_id,
+                    "commenter_id": 10,
+                    "recipient_ids": [1],
+                },
+            )
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rejects_too_long_comment(
+        self, client: AsyncClient, reports: list[DailyReport]
+    ) -> None:
+        """2000文字を超えるコメントは拒否されること."""
+        response = await client.post(
+            f"/api/v1/reports/{reports[1].report_id}/comments",
+            json={"comment_text": "あ" * 2001},
+            headers=auth_headers(10),
+        )
+
+        assert response.status_code == 422
+
+
+class TestConcurrentReportUpdates:
+    """日報の同時更新のテスト（接続ごとに独立したトランザクションを持つファイルDB）."""
+
+    @pytest.fixture
+    async def db_engine(self, tmp_path: Path) -> AsyncGenerator[AsyncEngine, None]:
+        """テスト用ファイルSQLiteエンジン."""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        yield engine
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_parallel_updates_have_single_winner(
+        self,
+        client: AsyncClient,
+        reports: list[DailyReport],
+        executed_statements: list[str],
+    ) -> None:
+        """同じ版数からの同時更新は1件のみ成功し、他は409となること（行ロックなし）."""
+        report_id = reports[1].report_id
+
+        responses = await asyncio.gather(
+            *(
+                client.put(
+                    f"/api/v1/reports/{report_id}",
+                    json={
+                        "report_date": reports[1].report_date.isoformat(),
+                        "problem": f"端末{n}",
+                        "visit_records": [
+                            {"customer_id": 1, "visit_content": f"端末{n}の訪問"}
+                        ],
+                        "version": 1,
+                    },
+                    headers=auth_headers(1),
+                )
+                for n in range(5)
+            )
+        )
+
+        statuses = [response.status_code for response in responses]
+        assert sorted(statuses) == [200, 409, 409, 409, 409]
+        winner = statuses.index(200)
+        detail = (
+            await client.get(f"/api/v1/reports/{report_id}", headers=auth_headers(1))
+        ).json()["data"]
+        assert detail["version"] == 2
+        assert detail["problem"] == f"端末{winner}"
+        assert [v["visit_content"] for v in detail["visit_records"]] == [
+            f"端末{winner}の訪問"
+        ]
+        assert not any("FOR UPDATE" in statement for statement in executed_statements)
+
+    @pytest.mark.asyncio
+    async def test_write_after_concurrent_update_conflicts(
+        self,
+        client: AsyncClient,
+        session_factory: async_sessionmaker[AsyncSession],
+        db_session: AsyncSession,
+        reports: list[DailyReport],
+    ) -> None:
+        """読み込み後に他の操作で更新された日報の書き込みは失敗すること."""
+        report_id = reports[2].report_id
+        async with session_factory() as stale:
+            report = await stale.get(DailyReport, report_id)
+            assert report is not None
+
+            confirmed = await client.put(
+                f"/api/v1/reports/{report_id}/confirm", headers=auth_headers(10)
+            )
+            report.problem = "確認前の内容への追記"
+            with pytest.raises(StaleDataError):
+                await stale.flush()
+
+        assert confirmed.status_code == 200
+        assert [event[0] for event in await _outbox_events(db_session)] == [
+            "report.confirmed"
+        ]
@@ -0,0 +1,102 @@
+"""pydanticモデルを直接JSONにするレスポンスのテスト."""
+
+from datetime import date, datetime, time
+
+import pytest
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from pydantic import BaseModel
+
+from src.core.responses import ModelJSONResponse, model_response
+from src.main import app
+from src.models import ReportStatus
+from src.schemas.comment import CommentItem
+from src.schemas.common import SuccessResponse
+from src.schemas.report import ReportDetail, VisitRecordItem
+
+
+async def _default_body(path: str, content: BaseModel) -> bytes:
+    """FastAPIの既定の経路（response_model による再検証）で直列化する."""
+    route = next(
+        r
+        for r in app.routes
+        if isinstance(r, APIRoute) and r.path == path and "GET" in r.methods
+    )
+    serialized = await serialize_response(
+        field=route.response_field, response_content=content
+    )
+    return JSONResponse(serialized).body
+
+
+class TestModelJSONResponse:
+    """ModelJSONResponse のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_same_bytes_as_default(self) -> None:
+        """非ASCII文字・日時・列挙型・Noneを含む内容がFastAPIの既定と同一となること."""
+        created = datetime(2026, 1, 10, 18, 30, 5)
+        content = SuccessResponse(
+            data=ReportDetail(
+                report_id=1,
+                report_date=date(2026, 1, 10),
+                salesperson_id=1,
+                salesperson_name="山田太郎",
+                status=ReportStatus.SUBMITTED,
+                status_label="提出済",
+                problem=None,
+                plan="明日も訪問",
+                visit_records=[
+                    VisitRecordItem(
+                        visit_id=1,
+                        customer_id=1,
+                        customer_name="株式会社A",
+                        visit_time=time(9, 30),
+                        visit_content='"定期"訪問\n',
+                        display_order=1,
+                    )
+                ],
+                comments=[
+                    CommentItem(
+                        comment_id=1,
+                        commenter_id=10,
+                        commenter_name="佐藤課長",
+                        comment_text="確認しました",
+                        created_at=created,
+                    )
+                ],
+                can_edit=False,
+                can_confirm=True,
+                version=3,
+                created_at=created,
+                updated_at=created,
+            )
+        )
+
+        expected = await _default_body("/api/v1/reports/{report_id}", content)
+
+        assert ModelJSONResponse(content).body == expected
+
+    def test_falls_back_for_plain_content(self) -> None:
+        """モデル以外の内容は JSONResponse と同じ方法で直列化すること."""
+        content = {"message": "完了", "items": [1, 2]}
+
+        assert ModelJSONResponse(content).body == JSONResponse(content).body
+
+
+class TestModelResponse:
+    """model_response のテスト."""
+
+    def test_carries_injected_headers(self) -> None:
+        """注入されたレスポンスのヘッダー・ステータスコードを引き継ぐこと."""
+        injected = Response()
+        del injected.headers["content-length"]
+        injected.status_code = 201
+        injected.headers["ETag"] = 'W/"abc"'
+
+        response = model_response(SuccessResponse(data=None), injected)
+
+        assert response.status_code == 201
+        assert response.headers["etag"] == 'W/"abc"'
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["content-length"] == str(len(response.body))
@@ -0,0 +1,123 @@
+"""TTLキャッシュと検証済みトークンキャッシュのテスト."""
+
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import dependencies
+from src.core.cache import TTLCache
+from src.core.dependencies import get_current_user, token_cache
+from src.core.security import TokenData, create_access_token
+from src.models import Salesperson
+
+
+class FakeClock:
+    """テスト用の時刻."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    """TTLCacheのテスト."""
+
+    def test_get_and_stats(self) -> None:
+        """登録した値が取得でき、ヒット・ミスが記録されること."""
+        cache: TTLCache[str, int] = TTLCache(max_size=10)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.hit_rate == 0.5
+
+    def test_lru_eviction(self) -> None:
+        """上限を超えた場合は最も使われていないエントリが削除されること."""
+        cache: TTLCache[str, int] = TTLCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.peek("a") == 1
+        assert cache.peek("b") is None
+        assert cache.peek("c") == 3
+        assert cache.stats.evictions == 1
+
+    def test_expiration(self) -> None:
+        """有効期限を過ぎたエントリは取得できないこと."""
+        clock = FakeClock()
+        cache: TTLCache[str, int] = TTLCache(max_size=10, default_ttl=5, clock=clock)
+        cache.set("ttl", 1)
+        cache.set("abs", 2, expires_at=clock.now + 10)
+
+        clock.now += 5
+        assert cache.get("ttl") is None
+        assert cache.get("abs") == 2
+
+        clock.now += 5
+        assert cache.get("abs") is None
+        assert cache.stats.expirations == 2
+        assert len(cache) == 0
+
+    def test_disabled_when_max_size_zero(self) -> None:
+        """上限が0の場合はキャッシュしないこと."""
+        cache: TTLCache[str, int] = TTLCache(max_size=0)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+
+
+class TestTokenCache:
+    """get_current_userのトークンキャッシュのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_second_call_skips_decode(
+        self,
+        db_session: AsyncSession,
+        salespersons: dict[str, Salesperson],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """2回目以降はトークンをデコードせずキャッシュから返すこと."""
+        token = create_access_token({"sub": "1", "email": "yamada@example.com"})
+        calls = 0
+        original = dependencies.decode_access_token
+
+        def counting_decode(value: str) -> TokenData | None:
+            nonlocal calls
+            calls += 1
+            return original(value)
+
+        monkeypatch.setattr(dependencies, "decode_access_token", counting_decode)
+
+        first = await get_current_user(token, db_session)
+        second = await get_current_user(token, db_session)
+
+        assert first == second
+        assert first.salesperson_id == salespersons["member"].salesperson_id
+        assert calls == 1
+
+    def test_entry_expires_with_token(self) -> None:
+        """キャッシュの有効期限がトークンのexpと一致すること."""
+        token = create_access_token({"sub": "1"}, expires_delta=timedelta(seconds=60))
+        token_data = dependencies._verify_token(token)
+
+        assert token_data is not None
+        digest = dependencies._token_digest(token)
+        _, expires_at = token_cache._entries[digest]
+        assert expires_at == token_data.exp
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_not_cached(self, db_session: AsyncSession) -> None:
+        """無効なトークンは401となりキャッシュされないこと."""
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user("invalid-token", db_session)
+
+        assert exc_info.value.status_code == 401
+        assert len(token_cache) == 0
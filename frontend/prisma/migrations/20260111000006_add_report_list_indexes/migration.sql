@@ -0,0 +1,15 @@
+-- AddIndex: 日報一覧・コメント取得用の複合インデックス
+-- ER図・テーブル定義書（docs/er-diagram.md）に基づき作成
+
+-- インデックス: 営業担当者 + ステータス + 報告日（日報一覧のステータス絞り込み用）
+CREATE INDEX `IX_DAILY_REPORT_SALESPERSON_STATUS_DATE`
+    ON `DAILY_REPORT`(`salesperson_id`, `status`, `report_date`);
+
+-- インデックス: 日報ID + 投稿日時 + コメント者ID（日報ごとのコメント取得・未読判定用）
+CREATE INDEX `IX_REPORT_COMMENT_REPORT_CREATED`
+    ON `REPORT_COMMENT`(`report_id`, `created_at`, `commenter_id`);
+
+-- DropIndex: 日報ID単独のインデックス
+-- 外部キー FK_REPORT_COMMENT_REPORT のインデックスは IX_REPORT_COMMENT_REPORT_CREATED が
+-- 兼ねるため、複合インデックスの作成後に削除する
+DROP INDEX `IX_REPORT_COMMENT_REPORT` ON `REPORT_COMMENT`;
@@ -0,0 +1,9 @@
+-- Rollback: 日報一覧・コメント取得用の複合インデックスの削除
+-- このファイルは手動ロールバック用です
+--
+-- 注意: 外部キー FK_REPORT_COMMENT_REPORT 用のインデックスを先に作成してから
+--       複合インデックスを削除する必要があります
+
+CREATE INDEX `IX_REPORT_COMMENT_REPORT` ON `REPORT_COMMENT`(`report_id`);
+DROP INDEX `IX_REPORT_COMMENT_REPORT_CREATED` ON `REPORT_COMMENT`;
+DROP INDEX `IX_DAILY_REPORT_SALESPERSON_STATUS_DATE` ON `DAILY_REPORT`;
@@ -0,0 +1,33 @@
+-- CreateTable: REPORT_READ_MARKER（日報既読マーカー）
+-- 閲覧者ごと・日報ごとのコメント既読位置と未読コメント数を保持する
+-- ER図・テーブル定義書（docs/er-diagram.md）に基づき作成
+--
+-- 依存テーブル:
+--   - SALESPERSON (salesperson_id)
+--   - DAILY_REPORT (report_id)
+
+CREATE TABLE `REPORT_READ_MARKER` (
+    `salesperson_id` INTEGER NOT NULL COMMENT '閲覧者ID（日報の作成者または上位の上長）',
+    `report_id` INTEGER NOT NULL COMMENT '日報ID',
+    `last_read_comment_id` INTEGER NOT NULL DEFAULT 0 COMMENT '既読コメントID（このID以下は既読）',
+    `unread_count` INTEGER NOT NULL DEFAULT 0 COMMENT '未読コメント数',
+    `updated_at` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3) ON UPDATE CURRENT_TIMESTAMP(3) COMMENT '更新日時',
+
+    -- インデックス: 閲覧者ID + 未読コメント数（ダッシュボードの未読コメント数の集計用）
+    INDEX `IX_REPORT_READ_MARKER_UNREAD`(`salesperson_id`, `unread_count`),
+
+    -- 主キー: 閲覧者ごと・日報ごとに1レコード
+    PRIMARY KEY (`salesperson_id`, `report_id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- AddForeignKey: 閲覧者（営業担当者）への参照
+-- 既読マーカーがある営業担当者は削除不可（RESTRICT）
+ALTER TABLE `REPORT_READ_MARKER` ADD CONSTRAINT `FK_REPORT_READ_MARKER_SALESPERSON`
+    FOREIGN KEY (`salesperson_id`) REFERENCES `SALESPERSON`(`salesperson_id`)
+    ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey: 日報への参照
+-- 日報削除時は既読マーカーもカスケード削除
+ALTER TABLE `REPORT_READ_MARKER` ADD CONSTRAINT `FK_REPORT_READ_MARKER_REPORT`
+    FOREIGN KEY (`report_id`) REFERENCES `DAILY_REPORT`(`report_id`)
+    ON DELETE CASCADE ON UPDATE CASCADE;
@@ -0,0 +1,11 @@
+-- Rollback: REPORT_READ_MARKERテーブルの削除
+-- このファイルは手動ロールバック用です
+--
+-- 注意: 外部キー制約を先に削除してからテーブルを削除する必要があります
+
+-- 外部キー制約を削除
+ALTER TABLE `REPORT_READ_MARKER` DROP FOREIGN KEY `FK_REPORT_READ_MARKER_SALESPERSON`;
+ALTER TABLE `REPORT_READ_MARKER` DROP FOREIGN KEY `FK_REPORT_READ_MARKER_REPORT`;
+
+-- テーブルを削除
+DROP TABLE IF EXISTS `REPORT_READ_MARKER`;
@@ -0,0 +1,20 @@
+-- CreateTable: OUTBOX_EVENT（通知イベント）
+-- 日報の提出・確認、コメントの投稿など通知が必要な操作と同じトランザクションで登録し、
+-- バックグラウンドのワーカーが通知先へ配信する
+-- ER図・テーブル定義書（docs/er-diagram.md）に基づき作成
+
+CREATE TABLE `OUTBOX_EVENT` (
+    `event_id` INTEGER NOT NULL AUTO_INCREMENT,
+    `event_type` VARCHAR(50) NOT NULL COMMENT 'イベント種別（report.submitted / report.confirmed / comment.posted）',
+    `payload` JSON NOT NULL COMMENT '通知内容（日報ID・通知先の営業担当者IDなど）',
+    `attempts` INTEGER NOT NULL DEFAULT 0 COMMENT '配信試行回数',
+    `available_at` DATETIME(3) NOT NULL COMMENT '配信可能日時（配信失敗時は再試行の日時）',
+    `delivered_at` DATETIME(3) NULL COMMENT '配信日時（NULLは未配信）',
+    `last_error` TEXT NULL COMMENT '最後の配信エラー',
+    `created_at` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3) COMMENT '作成日時',
+
+    -- インデックス: 配信日時 + 配信可能日時 + イベントID（ワーカーによる未配信イベントの取得用）
+    INDEX `IX_OUTBOX_EVENT_PENDING`(`delivered_at`, `available_at`, `event_id`),
+
+    PRIMARY KEY (`event_id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
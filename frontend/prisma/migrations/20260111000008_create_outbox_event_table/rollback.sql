@@ -0,0 +1,4 @@
+-- Rollback: OUTBOX_EVENTテーブルの削除
+-- このファイルは手動ロールバック用です
+
+DROP TABLE IF EXISTS `OUTBOX_EVENT`;
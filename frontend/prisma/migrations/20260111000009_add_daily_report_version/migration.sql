@@ -0,0 +1,6 @@
+-- AddColumn: 日報の版数（楽観的排他制御用）
+-- 日報・訪問記録の更新ごとに加算し、更新時に版数が一致しない場合は競合とする
+-- ER図・テーブル定義書（docs/er-diagram.md）に基づき作成
+
+ALTER TABLE `DAILY_REPORT`
+    ADD COLUMN `version` INTEGER NOT NULL DEFAULT 1 COMMENT '版数（日報・訪問記録の更新ごとに加算）' AFTER `status`;
@@ -0,0 +1,4 @@
+-- Rollback: 日報の版数の削除
+-- このファイルは手動ロールバック用です
+
+ALTER TABLE `DAILY_REPORT` DROP COLUMN `version`;
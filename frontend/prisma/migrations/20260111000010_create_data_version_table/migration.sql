@@ -0,0 +1,14 @@
+-- CreateTable: DATA_VERSION（マスタデータ版数）
+-- マスタデータのテーブルごとに1行を持ち、アプリケーションが登録・更新・削除を
+-- 書き込むたびに同じトランザクション内で版数を加算する
+-- ER図・テーブル定義書（docs/er-diagram.md）に基づき作成
+
+CREATE TABLE `DATA_VERSION` (
+    `table_name` VARCHAR(50) NOT NULL COMMENT 'テーブル名',
+    `version` INTEGER NOT NULL DEFAULT 0 COMMENT '版数（変更のたびに加算）',
+
+    PRIMARY KEY (`table_name`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- InsertData: 版数を管理するテーブル
+INSERT INTO `DATA_VERSION` (`table_name`, `version`) VALUES ('CUSTOMER', 0), ('SALESPERSON', 0);
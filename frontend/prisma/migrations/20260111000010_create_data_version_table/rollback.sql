@@ -0,0 +1,4 @@
+-- Rollback: DATA_VERSIONテーブルの削除
+-- このファイルは手動ロールバック用です
+
+DROP TABLE IF EXISTS `DATA_VERSION`;